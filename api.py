@@ -1,51 +1,86 @@
 """ForgeOps REST API — full CRUD for the work ledger.
 
 Covers: work items, repositories, assignments, execution records, reviews,
-attachments, activity log, and status overview.
+attachments, activity log, change feed, event streams and status overview.
 """
 
+import asyncio
+import hashlib
+import json
 import os
-from typing import Optional
+from collections import OrderedDict
+from typing import Literal, Optional
 
-from fastapi import Depends, FastAPI, HTTPException, Header
+from fastapi import Depends, FastAPI, HTTPException, Header, Query, Request, Response, WebSocket
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from starlette.datastructures import Headers
 from pydantic import BaseModel
+from sqlmodel import Session
 
 from core.database import (
+    MAX_TREE_DEPTH,
+    BulkResult,
+    WorkItemFilter,
     add_repository,
     block_work_item,
+    bulk_assign,
+    bulk_block,
+    bulk_transition,
+    bulk_unblock,
+    claim_next_work_item,
     create_assignment,
     create_attachment,
     create_db_and_tables,
     create_execution_record,
     create_review,
     create_work_item,
+    create_work_items_bulk,
     get_activity_log,
     get_assignments,
     get_attachments,
+    get_changes,
     get_child_progress,
     get_children,
     get_current_assignment,
     get_execution_records,
+    get_ledger_version,
     get_repositories,
     get_repository,
+    get_review_queue,
     get_reviews,
+    get_status_summary,
+    get_subtree,
+    get_subtree_progress,
     get_work_item,
     list_items_by_executor,
-    list_work_items,
+    list_work_items_page,
     delete_work_item,
     fast_track_work_item,
     remove_repository,
     transition_work_item,
     unblock_work_item,
+    unit_of_work,
     update_repository,
     update_work_item,
 )
+from config import EVENT_OUTBOX, PAGE_SIZE_DEFAULT, PAGE_SIZE_MAX, RESPONSE_CACHE_SIZE
+from core.batch import BatchError, run_batch
+from core.event_stream import EventBroadcaster, StreamFilter
+from core.hooks import HookEvent
+from core.leases import get_leases, heartbeat
 from core.state_engine import InvalidTransitionError, RepoConcurrencyError
 from models import (
+    ActivityLog,
+    Assignment,
+    Attachment,
+    ExecutionRecord,
     ExecutionStatus,
     ExecutorType,
     Priority,
+    Review,
     ReviewDecision,
+    WorkItem,
     WorkItemState,
 )
 
@@ -58,15 +93,138 @@ engine = create_db_and_tables()
 API_BEARER_TOKEN = os.environ.get("API_BEARER_TOKEN")
 
 
-def verify_token(authorization: Optional[str] = Header(None)):
-    """Bearer token auth. Skipped if API_BEARER_TOKEN is not set."""
+def _token_error(authorization: Optional[str]) -> Optional[str]:
     if not API_BEARER_TOKEN:
-        return
+        return None
     if not authorization:
-        raise HTTPException(status_code=401, detail="Missing Authorization header")
+        return "Missing Authorization header"
     scheme, _, token = authorization.partition(" ")
     if scheme.lower() != "bearer" or token != API_BEARER_TOKEN:
-        raise HTTPException(status_code=401, detail="Invalid bearer token")
+        return "Invalid bearer token"
+    return None
+
+
+def verify_token(authorization: Optional[str] = Header(None)):
+    """Bearer token auth. Skipped if API_BEARER_TOKEN is not set."""
+    error = _token_error(authorization)
+    if error:
+        raise HTTPException(status_code=401, detail=error)
+
+
+# --- Sessions ---------------------------------------------------------------
+
+
+def read_session():
+    """One read session per GET request."""
+    with Session(engine) as session:
+        yield session
+
+
+def write_session():
+    """One unit of work per mutating request: a single commit, hooks fired after it.
+
+    Declared with ``scope="function"`` so the commit happens before the response
+    is sent: a failed commit becomes a 500, and a client never reads ahead of it.
+    """
+    with unit_of_work(engine) as session:
+        yield session
+
+
+# --- Conditional GETs -------------------------------------------------------
+
+# Streams, and lease listings, which change with the clock and with heartbeats alone.
+_UNVERSIONED_PATHS = frozenset({"/events/stream", "/leases"})
+
+
+class ConditionalGetMiddleware:
+    """Tag GET responses with the ledger version; answer If-None-Match with 304 and repeats from an LRU cache.
+
+    The tag is the version plus a hash of the path and query, so it only ever
+    matches the resource it was issued for. The version is read before the
+    endpoint runs, so a write committing meanwhile makes the next request miss
+    rather than serve a stale body. Entries are keyed by (path, query, version)
+    and dropped as soon as a newer version is stored. Only 200s are tagged and
+    cached: a matching If-None-Match is answered with 304 straight from a cached
+    entry, or else once the endpoint has rendered a 200, so an unknown id or a
+    bad query still gets its 404 or 422. Requests failing auth pass straight
+    through to be refused.
+    """
+
+    def __init__(self, app, *, max_entries: int = RESPONSE_CACHE_SIZE):
+        self.app = app
+        self.max_entries = max_entries
+        self._cache: OrderedDict[tuple[str, bytes, int], tuple[int, list, bytes]] = OrderedDict()
+        self._version = 0
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "GET" or scope["path"] in _UNVERSIONED_PATHS:
+            return await self.app(scope, receive, send)
+        headers = Headers(scope=scope)
+        if _token_error(headers.get("authorization")):
+            return await self.app(scope, receive, send)
+
+        version = await run_in_threadpool(get_ledger_version, engine)
+        key = (scope["path"], scope["query_string"], version)
+        etag = _etag(key)
+        not_modified = _etag_matches(headers.get("if-none-match"), etag)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            if not_modified:
+                return await Response(status_code=304, headers={"ETag": etag})(scope, receive, send)
+            status, response_headers, body = cached
+            await send({"type": "http.response.start", "status": status, "headers": response_headers})
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        start, chunks = {}, []
+
+        async def send_tagged(message):
+            if message["type"] == "http.response.start":
+                if message["status"] == 200:
+                    message["headers"] = [*message.get("headers", []), (b"etag", etag.encode())]
+                start.update(message)
+                if message["status"] == 200 and not_modified:
+                    message = {"type": message["type"], "status": 304, "headers": [(b"etag", etag.encode())]}
+            elif message["type"] == "http.response.body" and start.get("status") == 200:
+                chunks.append(message.get("body", b""))
+                done = not message.get("more_body", False)
+                if done and self.max_entries:
+                    self._store(key, (200, start["headers"], b"".join(chunks)))
+                if not_modified:
+                    if not done:
+                        return
+                    message = {"type": message["type"], "body": b""}
+            await send(message)
+
+        await self.app(scope, receive, send_tagged)
+
+    def _store(self, key: tuple[str, bytes, int], entry: tuple[int, list, bytes]) -> None:
+        version = key[2]
+        if version < self._version:
+            return  # rendered before a newer write; nobody will ask for that version again
+        if version > self._version:
+            self._cache.clear()
+            self._version = version
+        self._cache[key] = entry
+        if len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+
+def _etag(key: tuple[str, bytes, int]) -> str:
+    path, query, version = key
+    digest = hashlib.blake2b(f"{path}?".encode() + query, digest_size=8).hexdigest()
+    return f'"{version}-{digest}"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag in tags or "*" in tags
+
+
+app.add_middleware(ConditionalGetMiddleware)
 
 
 # --- Request schemas ------------------------------------------------------
@@ -76,15 +234,74 @@ class WorkItemCreate(BaseModel):
     title: str
     repo_name: Optional[str] = None
     description: Optional[str] = None
+    branch: Optional[str] = None
     state: WorkItemState = WorkItemState.queued
     priority: Priority = Priority.medium
     parent_id: Optional[int] = None
     created_by: Optional[str] = None
 
 
+class WorkItemBulkCreate(BaseModel):
+    items: list[WorkItemCreate]
+    created_by: Optional[str] = None
+
+
+class WorkItemFilterBody(BaseModel):
+    task_ids: Optional[list[int]] = None
+    repo_name: Optional[str] = None
+    state: Optional[WorkItemState] = None
+    is_blocked: Optional[bool] = None
+    priority: Optional[Priority] = None
+    parent_id: Optional[int] = None
+
+
+class BulkTransitionRequest(BaseModel):
+    where: WorkItemFilterBody
+    state: WorkItemState
+    actor: Optional[str] = None
+
+
+class BulkBlockRequest(BaseModel):
+    where: WorkItemFilterBody
+    blocked: bool = True
+    reason: Optional[str] = None
+    actor: Optional[str] = None
+
+
+class BulkAssignRequest(BaseModel):
+    where: WorkItemFilterBody
+    executor: str
+    executor_type: ExecutorType = ExecutorType.human
+    actor: Optional[str] = None
+
+
+class ClaimRequest(BaseModel):
+    executor: str
+    executor_type: ExecutorType = ExecutorType.agent
+    repo_name: Optional[str] = None
+    start: bool = True  # fast-track to executing; False stops at assigned
+    actor: Optional[str] = None
+
+
+class HeartbeatRequest(BaseModel):
+    executor: Optional[str] = None
+    ttl_s: Optional[float] = None
+
+
+class BatchOperation(BaseModel):
+    op: str
+    args: dict = {}
+    ref: Optional[str] = None
+
+
+class BatchRequest(BaseModel):
+    operations: list[BatchOperation]
+
+
 class WorkItemUpdate(BaseModel):
     title: Optional[str] = None
     description: Optional[str] = None
+    branch: Optional[str] = None
     priority: Optional[Priority] = None
 
 
@@ -124,6 +341,9 @@ class RepositoryUpdate(BaseModel):
     language: Optional[str] = None
     deploy_target: Optional[str] = None
     notes: Optional[str] = None
+    workflow: Optional[str | dict[str, list[str]]] = None  # preset name or state → next states; "default" resets
+    # {"repo": N, "branch": N, "executor": N}, null leaving a key uncapped; "default" resets to one per repo
+    concurrency: Optional[str | dict[str, Optional[int]]] = None
 
 
 class AssignmentCreate(BaseModel):
@@ -164,17 +384,29 @@ def _serialize_work_item(item):
         "title": item.title,
         "description": item.description,
         "repository": item.repository.name if item.repository else None,
+        "branch": item.branch,
         "state": item.state.value,
         "priority": item.priority.value,
         "is_blocked": item.is_blocked,
         "blocked_reason": item.blocked_reason,
         "parent_id": item.parent_id,
+        "children_total": item.children_total,
+        "children_done": item.children_done,
         "created_by": item.created_by,
         "created_at": str(item.created_at),
         "updated_at": str(item.updated_at),
     }
 
 
+def _serialize_bulk_result(result: BulkResult):
+    return {
+        "matched": result.matched,
+        "updated": result.updated,
+        "updated_count": len(result.updated),
+        "failed": [{"task_id": task_id, "error": error} for task_id, error in result.failed.items()],
+    }
+
+
 def _serialize_repo(r):
     return {
         "repo_id": r.repo_id,
@@ -188,6 +420,8 @@ def _serialize_repo(r):
         "language": r.language,
         "deploy_target": r.deploy_target,
         "notes": r.notes,
+        "workflow": r.workflow,
+        "concurrency": r.concurrency,
     }
 
 
@@ -243,6 +477,7 @@ def _serialize_activity(entry):
         "action": entry.action.value,
         "detail": entry.detail,
         "actor": entry.actor,
+        "ref_id": entry.ref_id,
         "created_at": str(entry.created_at),
     }
 
@@ -252,28 +487,48 @@ def _serialize_activity(entry):
 
 @app.get("/work-items")
 def list_work_items_endpoint(
+    response: Response,
     repo: Optional[str] = None,
     state: Optional[WorkItemState] = None,
     priority: Optional[Priority] = None,
     is_blocked: Optional[bool] = None,
     parent_id: Optional[int] = None,
+    order_by: Literal["task_id", "updated_at"] = "task_id",
+    limit: int = Query(PAGE_SIZE_DEFAULT, ge=1, le=PAGE_SIZE_MAX),
+    cursor: Optional[str] = None,
     _=Depends(verify_token),
+    session: Session = Depends(read_session),
 ):
-    items = list_work_items(
-        engine,
-        repo_name=repo,
-        state=state,
-        priority=priority,
-        is_blocked=is_blocked,
-        parent_id=parent_id,
-    )
-    return [_serialize_work_item(i) for i in items]
+    """One page of work items. Pass the ``X-Next-Cursor`` response header back as ``cursor`` for the next."""
+    try:
+        page = list_work_items_page(
+            session,
+            repo_name=repo,
+            state=state,
+            priority=priority,
+            is_blocked=is_blocked,
+            parent_id=parent_id,
+            order_by=order_by,
+            limit=limit,
+            cursor=cursor,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    _set_next_cursor(response, page.next_cursor)
+    return [_serialize_work_item(i) for i in page.items]
+
+
+def _set_next_cursor(response: Response, next_cursor: Optional[str]) -> None:
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
 
 
 @app.post("/work-items", status_code=201)
-def create_work_item_endpoint(body: WorkItemCreate, _=Depends(verify_token)):
+def create_work_item_endpoint(
+    body: WorkItemCreate, _=Depends(verify_token), session: Session = Depends(write_session, scope="function")
+):
     item = create_work_item(
-        engine,
+        session,
         body.title,
         repo_name=body.repo_name,
         description=body.description,
@@ -281,103 +536,289 @@ def create_work_item_endpoint(body: WorkItemCreate, _=Depends(verify_token)):
         priority=body.priority,
         parent_id=body.parent_id,
         created_by=body.created_by,
+        branch=body.branch,
+    )
+    return _serialize_work_item(item)
+
+
+@app.post("/work-items:bulk", status_code=201)
+def create_work_items_bulk_endpoint(
+    body: WorkItemBulkCreate, _=Depends(verify_token), session: Session = Depends(write_session, scope="function")
+):
+    """Create many work items in one transaction; returns their task_ids in request order."""
+    try:
+        task_ids = create_work_items_bulk(
+            session,
+            [i.model_dump(exclude_unset=True) for i in body.items],
+            created_by=body.created_by,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return {"task_ids": task_ids, "count": len(task_ids)}
+
+
+@app.post("/work-items:bulk-transition")
+def bulk_transition_endpoint(
+    body: BulkTransitionRequest, _=Depends(verify_token), session: Session = Depends(write_session, scope="function")
+):
+    """Transition every matching item in one transaction; items that can't move are listed in ``failed``."""
+    try:
+        result = bulk_transition(session, WorkItemFilter(**body.where.model_dump()), body.state, actor=body.actor)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return _serialize_bulk_result(result)
+
+
+@app.post("/work-items:bulk-block")
+def bulk_block_endpoint(
+    body: BulkBlockRequest, _=Depends(verify_token), session: Session = Depends(write_session, scope="function")
+):
+    """Block (with ``reason``) or unblock every matching item in one transaction."""
+    where = WorkItemFilter(**body.where.model_dump())
+    try:
+        if body.blocked:
+            if not body.reason:
+                raise ValueError("reason is required when blocking")
+            result = bulk_block(session, where, body.reason, actor=body.actor)
+        else:
+            result = bulk_unblock(session, where, actor=body.actor)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return _serialize_bulk_result(result)
+
+
+@app.post("/work-items:bulk-assign")
+def bulk_assign_endpoint(
+    body: BulkAssignRequest, _=Depends(verify_token), session: Session = Depends(write_session, scope="function")
+):
+    """Assign every matching item to one executor in one transaction."""
+    try:
+        result = bulk_assign(
+            session, WorkItemFilter(**body.where.model_dump()), body.executor, body.executor_type, actor=body.actor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return _serialize_bulk_result(result)
+
+
+@app.post("/queue/claim")
+def claim_endpoint(
+    body: ClaimRequest, _=Depends(verify_token), session: Session = Depends(write_session, scope="function")
+):
+    """Atomically take the next queued item: assign it and move it to executing. 204 when nothing is claimable."""
+    item = claim_next_work_item(
+        session, body.executor, body.executor_type, repo_name=body.repo_name, start=body.start, actor=body.actor
     )
-    return _serialize_work_item(get_work_item(engine, item.task_id))
+    if item is None:
+        return Response(status_code=204)
+    return _serialize_work_item(item)
+
+
+@app.post("/work-items/{task_id}/heartbeat")
+def heartbeat_endpoint(task_id: int, body: Optional[HeartbeatRequest] = None, _=Depends(verify_token)):
+    """Extend an executing item's lease: one single-row UPDATE outside any unit of work.
+
+    409 means the item holds no lease any more (it left executing or was swept), so the executor should stop.
+    """
+    body = body or HeartbeatRequest()
+    options = {"ttl_s": body.ttl_s} if body.ttl_s is not None else {}
+    expires_at = heartbeat(engine, task_id, executor=body.executor, **options)
+    if expires_at is None:
+        raise HTTPException(status_code=409, detail=f"Work item {task_id} holds no execution lease")
+    return {"task_id": task_id, "expires_at": expires_at.isoformat()}
+
+
+@app.get("/leases")
+def list_leases_endpoint(
+    expired: bool = Query(False, description="Only lapsed leases"),
+    _=Depends(verify_token),
+    session: Session = Depends(read_session),
+):
+    return [
+        {
+            "task_id": lease.task_id,
+            "executor": lease.executor,
+            "started_at": lease.started_at.isoformat(),
+            "heartbeat_at": lease.heartbeat_at.isoformat() if lease.heartbeat_at else None,
+            "expires_at": lease.expires_at.isoformat(),
+        }
+        for lease in get_leases(session, expired=expired)
+    ]
 
 
 @app.get("/work-items/{task_id}")
-def get_work_item_endpoint(task_id: int, _=Depends(verify_token)):
-    item = get_work_item(engine, task_id)
+def get_work_item_endpoint(task_id: int, _=Depends(verify_token), session: Session = Depends(read_session)):
+    item = get_work_item(session, task_id)
     if not item:
         raise HTTPException(status_code=404, detail=f"Work item {task_id} not found")
     return _serialize_work_item(item)
 
 
 @app.patch("/work-items/{task_id}")
-def update_work_item_endpoint(task_id: int, body: WorkItemUpdate, _=Depends(verify_token)):
+def update_work_item_endpoint(
+    task_id: int,
+    body: WorkItemUpdate,
+    _=Depends(verify_token),
+    session: Session = Depends(write_session, scope="function"),
+):
     kwargs = body.model_dump(exclude_none=True)
     if not kwargs:
         raise HTTPException(status_code=400, detail="No fields to update")
-    item = update_work_item(engine, task_id, **kwargs)
+    item = update_work_item(session, task_id, **kwargs)
     if not item:
         raise HTTPException(status_code=404, detail=f"Work item {task_id} not found")
-    return _serialize_work_item(get_work_item(engine, item.task_id))
+    return _serialize_work_item(item)
 
 
 @app.delete("/work-items/{task_id}", status_code=204)
-def delete_work_item_endpoint(task_id: int, _=Depends(verify_token)):
-    if not delete_work_item(engine, task_id):
+def delete_work_item_endpoint(
+    task_id: int, _=Depends(verify_token), session: Session = Depends(write_session, scope="function")
+):
+    if not delete_work_item(session, task_id):
         raise HTTPException(status_code=404, detail=f"Work item {task_id} not found")
 
 
 @app.post("/work-items/{task_id}/transition")
-def transition_work_item_endpoint(task_id: int, body: WorkItemTransition, _=Depends(verify_token)):
+def transition_work_item_endpoint(
+    task_id: int,
+    body: WorkItemTransition,
+    _=Depends(verify_token),
+    session: Session = Depends(write_session, scope="function"),
+):
     try:
-        item = transition_work_item(engine, task_id, body.state, actor=body.actor)
+        item = transition_work_item(session, task_id, body.state, actor=body.actor)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except InvalidTransitionError as e:
         raise HTTPException(status_code=409, detail=str(e))
     except RepoConcurrencyError as e:
         raise HTTPException(status_code=409, detail=str(e))
-    return _serialize_work_item(get_work_item(engine, item.task_id))
+    return _serialize_work_item(item)
 
 
 @app.post("/work-items/{task_id}/fast-track")
-def fast_track_work_item_endpoint(task_id: int, body: WorkItemTransition, _=Depends(verify_token)):
+def fast_track_work_item_endpoint(
+    task_id: int,
+    body: WorkItemTransition,
+    _=Depends(verify_token),
+    session: Session = Depends(write_session, scope="function"),
+):
     try:
-        item = fast_track_work_item(engine, task_id, body.state, actor=body.actor)
+        item = fast_track_work_item(session, task_id, body.state, actor=body.actor)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except InvalidTransitionError as e:
         raise HTTPException(status_code=409, detail=str(e))
     except RepoConcurrencyError as e:
         raise HTTPException(status_code=409, detail=str(e))
-    return _serialize_work_item(get_work_item(engine, item.task_id))
+    return _serialize_work_item(item)
 
 
 @app.post("/work-items/{task_id}/block")
-def block_work_item_endpoint(task_id: int, body: BlockRequest, _=Depends(verify_token)):
+def block_work_item_endpoint(
+    task_id: int,
+    body: BlockRequest,
+    _=Depends(verify_token),
+    session: Session = Depends(write_session, scope="function"),
+):
     try:
-        item = block_work_item(engine, task_id, body.reason, actor=body.actor)
+        item = block_work_item(session, task_id, body.reason, actor=body.actor)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
-    return _serialize_work_item(get_work_item(engine, item.task_id))
+    return _serialize_work_item(item)
 
 
 @app.post("/work-items/{task_id}/unblock")
-def unblock_work_item_endpoint(task_id: int, body: UnblockRequest = UnblockRequest(), _=Depends(verify_token)):
+def unblock_work_item_endpoint(
+    task_id: int,
+    body: UnblockRequest = UnblockRequest(),
+    _=Depends(verify_token),
+    session: Session = Depends(write_session, scope="function"),
+):
     try:
-        item = unblock_work_item(engine, task_id, actor=body.actor)
+        item = unblock_work_item(session, task_id, actor=body.actor)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
-    return _serialize_work_item(get_work_item(engine, item.task_id))
+    return _serialize_work_item(item)
 
 
 @app.get("/work-items/{task_id}/children")
-def get_children_endpoint(task_id: int, _=Depends(verify_token)):
-    children = get_children(engine, task_id)
-    done, total = get_child_progress(engine, task_id)
-    return {
-        "parent_id": task_id,
-        "children": [_serialize_work_item(c) for c in children],
-        "progress": {"done": done, "total": total},
-    }
+def get_children_endpoint(
+    task_id: int,
+    recursive: bool = False,
+    max_depth: Optional[int] = Query(None, ge=1, le=MAX_TREE_DEPTH),
+    _=Depends(verify_token),
+    session: Session = Depends(read_session),
+):
+    done, total = get_child_progress(session, task_id)
+    result = {"parent_id": task_id, "progress": {"done": done, "total": total}}
+    if recursive:
+        nodes = get_subtree(session, task_id, max_depth=max_depth)
+        done, total = get_subtree_progress(session, task_id)
+        result["children"] = [{**_serialize_work_item(n.item), "depth": n.depth} for n in nodes]
+        result["subtree_progress"] = {"done": done, "total": total}
+    else:
+        result["children"] = [_serialize_work_item(c) for c in get_children(session, task_id)]
+    return result
+
+
+# --- Batch ----------------------------------------------------------------
+
+
+_BATCH_SERIALIZERS = {
+    WorkItem: _serialize_work_item,
+    Assignment: _serialize_assignment,
+    ExecutionRecord: _serialize_execution_record,
+    Review: _serialize_review,
+    Attachment: _serialize_attachment,
+    ActivityLog: _serialize_activity,
+}
+
+
+@app.post("/batch")
+def batch_endpoint(
+    body: BatchRequest, _=Depends(verify_token), session: Session = Depends(write_session, scope="function")
+):
+    """Run an ordered list of operations in one transaction; all succeed or none are applied.
+
+    A ``task_id`` or ``parent_id`` of ``"$<ref>"`` or ``"$<index>"`` refers to an id returned by an earlier operation.
+    """
+    try:
+        steps = run_batch(session, [operation.model_dump() for operation in body.operations])
+    except BatchError as e:
+        status = 409 if isinstance(e.cause, (InvalidTransitionError, RepoConcurrencyError)) else 422
+        raise HTTPException(status_code=status, detail={"index": e.index, "op": e.op, "error": str(e.cause)})
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return {"results": [_serialize_batch_step(step) for step in steps], "count": len(steps)}
+
+
+def _serialize_batch_step(step):
+    result = step.result
+    if isinstance(result, list):
+        result = [_BATCH_SERIALIZERS[type(row)](row) for row in result]
+    elif result is not None:
+        result = _BATCH_SERIALIZERS[type(result)](result)
+    return {"op": step.op, "ref": step.ref, "result": result}
 
 
 # --- Repositories ---------------------------------------------------------
 
 
 @app.get("/repositories")
-def list_repositories_endpoint(include_archived: bool = False, _=Depends(verify_token)):
-    repos = get_repositories(engine, include_archived=include_archived)
+def list_repositories_endpoint(
+    include_archived: bool = False, _=Depends(verify_token), session: Session = Depends(read_session)
+):
+    repos = get_repositories(session, include_archived=include_archived)
     return [_serialize_repo(r) for r in repos]
 
 
 @app.post("/repositories", status_code=201)
-def create_repository_endpoint(body: RepositoryCreate, _=Depends(verify_token)):
+def create_repository_endpoint(
+    body: RepositoryCreate, _=Depends(verify_token), session: Session = Depends(write_session, scope="function")
+):
     repo = add_repository(
-        engine,
+        session,
         body.name,
         org=body.org,
         default_branch=body.default_branch,
@@ -388,27 +829,37 @@ def create_repository_endpoint(body: RepositoryCreate, _=Depends(verify_token)):
 
 
 @app.get("/repositories/{name}")
-def get_repository_endpoint(name: str, _=Depends(verify_token)):
-    repo = get_repository(engine, name)
+def get_repository_endpoint(name: str, _=Depends(verify_token), session: Session = Depends(read_session)):
+    repo = get_repository(session, name)
     if not repo:
         raise HTTPException(status_code=404, detail=f"Repository '{name}' not found")
     return _serialize_repo(repo)
 
 
 @app.patch("/repositories/{name}")
-def update_repository_endpoint(name: str, body: RepositoryUpdate, _=Depends(verify_token)):
+def update_repository_endpoint(
+    name: str,
+    body: RepositoryUpdate,
+    _=Depends(verify_token),
+    session: Session = Depends(write_session, scope="function"),
+):
     kwargs = body.model_dump(exclude_none=True)
     if not kwargs:
         raise HTTPException(status_code=400, detail="No fields to update")
-    repo = update_repository(engine, name, **kwargs)
+    try:
+        repo = update_repository(session, name, **kwargs)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
     if not repo:
         raise HTTPException(status_code=404, detail=f"Repository '{name}' not found")
     return _serialize_repo(repo)
 
 
 @app.delete("/repositories/{name}", status_code=204)
-def delete_repository_endpoint(name: str, _=Depends(verify_token)):
-    if not remove_repository(engine, name):
+def delete_repository_endpoint(
+    name: str, _=Depends(verify_token), session: Session = Depends(write_session, scope="function")
+):
+    if not remove_repository(session, name):
         raise HTTPException(status_code=404, detail=f"Repository '{name}' not found")
 
 
@@ -416,30 +867,35 @@ def delete_repository_endpoint(name: str, _=Depends(verify_token)):
 
 
 @app.get("/work-items/{task_id}/assignments")
-def list_assignments_endpoint(task_id: int, _=Depends(verify_token)):
-    return [_serialize_assignment(a) for a in get_assignments(engine, task_id)]
+def list_assignments_endpoint(task_id: int, _=Depends(verify_token), session: Session = Depends(read_session)):
+    return [_serialize_assignment(a) for a in get_assignments(session, task_id)]
 
 
 @app.post("/work-items/{task_id}/assignments", status_code=201)
-def create_assignment_endpoint(task_id: int, body: AssignmentCreate, _=Depends(verify_token)):
-    item = get_work_item(engine, task_id)
+def create_assignment_endpoint(
+    task_id: int,
+    body: AssignmentCreate,
+    _=Depends(verify_token),
+    session: Session = Depends(write_session, scope="function"),
+):
+    item = get_work_item(session, task_id)
     if not item:
         raise HTTPException(status_code=404, detail=f"Work item {task_id} not found")
-    assignment = create_assignment(engine, task_id, body.executor, body.executor_type, actor=body.actor)
+    assignment = create_assignment(session, task_id, body.executor, body.executor_type, actor=body.actor)
     return _serialize_assignment(assignment)
 
 
 @app.get("/work-items/{task_id}/assignments/current")
-def get_current_assignment_endpoint(task_id: int, _=Depends(verify_token)):
-    assignment = get_current_assignment(engine, task_id)
+def get_current_assignment_endpoint(task_id: int, _=Depends(verify_token), session: Session = Depends(read_session)):
+    assignment = get_current_assignment(session, task_id)
     if not assignment:
         raise HTTPException(status_code=404, detail=f"No assignment for work item {task_id}")
     return _serialize_assignment(assignment)
 
 
 @app.get("/executors/{executor}/work-items")
-def list_executor_work_items(executor: str, _=Depends(verify_token)):
-    items = list_items_by_executor(engine, executor)
+def list_executor_work_items(executor: str, _=Depends(verify_token), session: Session = Depends(read_session)):
+    items = list_items_by_executor(session, executor)
     return [_serialize_work_item(i) for i in items]
 
 
@@ -447,17 +903,22 @@ def list_executor_work_items(executor: str, _=Depends(verify_token)):
 
 
 @app.get("/work-items/{task_id}/runs")
-def list_runs_endpoint(task_id: int, _=Depends(verify_token)):
-    return [_serialize_execution_record(r) for r in get_execution_records(engine, task_id)]
+def list_runs_endpoint(task_id: int, _=Depends(verify_token), session: Session = Depends(read_session)):
+    return [_serialize_execution_record(r) for r in get_execution_records(session, task_id)]
 
 
 @app.post("/work-items/{task_id}/runs", status_code=201)
-def create_run_endpoint(task_id: int, body: ExecutionRecordCreate, _=Depends(verify_token)):
-    item = get_work_item(engine, task_id)
+def create_run_endpoint(
+    task_id: int,
+    body: ExecutionRecordCreate,
+    _=Depends(verify_token),
+    session: Session = Depends(write_session, scope="function"),
+):
+    item = get_work_item(session, task_id)
     if not item:
         raise HTTPException(status_code=404, detail=f"Work item {task_id} not found")
     record = create_execution_record(
-        engine,
+        session,
         task_id,
         body.executor,
         body.status,
@@ -473,18 +934,32 @@ def create_run_endpoint(task_id: int, body: ExecutionRecordCreate, _=Depends(ver
 # --- Reviews --------------------------------------------------------------
 
 
+@app.get("/review-queue")
+def review_queue_endpoint(_=Depends(verify_token), session: Session = Depends(read_session)):
+    """Items awaiting review, each with its latest execution record."""
+    return [
+        {**_serialize_work_item(item), "last_run": _serialize_execution_record(run) if run else None}
+        for item, run in get_review_queue(session)
+    ]
+
+
 @app.get("/work-items/{task_id}/reviews")
-def list_reviews_endpoint(task_id: int, _=Depends(verify_token)):
-    return [_serialize_review(rv) for rv in get_reviews(engine, task_id)]
+def list_reviews_endpoint(task_id: int, _=Depends(verify_token), session: Session = Depends(read_session)):
+    return [_serialize_review(rv) for rv in get_reviews(session, task_id)]
 
 
 @app.post("/work-items/{task_id}/reviews", status_code=201)
-def create_review_endpoint(task_id: int, body: ReviewCreate, _=Depends(verify_token)):
-    item = get_work_item(engine, task_id)
+def create_review_endpoint(
+    task_id: int,
+    body: ReviewCreate,
+    _=Depends(verify_token),
+    session: Session = Depends(write_session, scope="function"),
+):
+    item = get_work_item(session, task_id)
     if not item:
         raise HTTPException(status_code=404, detail=f"Work item {task_id} not found")
     review = create_review(
-        engine,
+        session,
         task_id,
         body.reviewer,
         body.decision,
@@ -498,16 +973,21 @@ def create_review_endpoint(task_id: int, body: ReviewCreate, _=Depends(verify_to
 
 
 @app.get("/work-items/{task_id}/attachments")
-def list_attachments_endpoint(task_id: int, _=Depends(verify_token)):
-    return [_serialize_attachment(att) for att in get_attachments(engine, task_id)]
+def list_attachments_endpoint(task_id: int, _=Depends(verify_token), session: Session = Depends(read_session)):
+    return [_serialize_attachment(att) for att in get_attachments(session, task_id)]
 
 
 @app.post("/work-items/{task_id}/attachments", status_code=201)
-def create_attachment_endpoint(task_id: int, body: AttachmentCreate, _=Depends(verify_token)):
-    item = get_work_item(engine, task_id)
+def create_attachment_endpoint(
+    task_id: int,
+    body: AttachmentCreate,
+    _=Depends(verify_token),
+    session: Session = Depends(write_session, scope="function"),
+):
+    item = get_work_item(session, task_id)
     if not item:
         raise HTTPException(status_code=404, detail=f"Work item {task_id} not found")
-    att = create_attachment(engine, task_id, body.url_or_path, label=body.label)
+    att = create_attachment(session, task_id, body.url_or_path, label=body.label)
     return _serialize_attachment(att)
 
 
@@ -519,24 +999,153 @@ def get_activity_endpoint(
     task_id: Optional[int] = None,
     limit: int = 50,
     _=Depends(verify_token),
+    session: Session = Depends(read_session),
 ):
-    entries = get_activity_log(engine, task_id=task_id, limit=limit)
+    entries = get_activity_log(session, task_id=task_id, limit=limit)
     return [_serialize_activity(e) for e in entries]
 
 
+@app.get("/changes")
+def get_changes_endpoint(
+    since: Optional[int] = Query(None, ge=0),
+    limit: int = Query(PAGE_SIZE_DEFAULT, ge=1, le=PAGE_SIZE_MAX),
+    _=Depends(verify_token),
+    session: Session = Depends(read_session),
+):
+    """Everything that changed after ``since``; omit it to get the current cursor."""
+    changes = get_changes(session, since, limit=limit)
+    return {
+        "cursor": changes.cursor,
+        "has_more": changes.has_more,
+        "work_items": [_serialize_work_item(item) for item in changes.work_items],
+        "deleted": changes.deleted,
+        "assignments": [_serialize_assignment(a) for a in changes.assignments],
+        "runs": [_serialize_execution_record(r) for r in changes.runs],
+        "reviews": [_serialize_review(rv) for rv in changes.reviews],
+        "attachments": [_serialize_attachment(att) for att in changes.attachments],
+    }
+
+
+# --- Event streams ----------------------------------------------------------
+
+broadcaster = EventBroadcaster(engine)
+
+
+def _stream_filter(
+    events: Optional[str], repo: Optional[str], task_id: Optional[int], executor: Optional[str]
+) -> StreamFilter:
+    kinds = None
+    if events:
+        kinds = frozenset(name.strip() for name in events.split(",") if name.strip())
+        unknown = kinds - {event.value for event in HookEvent}
+        if unknown:
+            raise ValueError(f"Unknown event(s): {', '.join(sorted(unknown))}")
+    return StreamFilter(events=kinds, repo=repo, task_id=task_id, executor=executor)
+
+
+def _sse(body: Optional[dict]) -> str:
+    if body is None:
+        return ": keepalive\n\n"
+    cursor = body["event_id"] if "event_id" in body else body["next_event_id"] - 1
+    return f"id: {cursor}\nevent: {body['event']}\ndata: {json.dumps(body)}\n\n"
+
+
+@app.get("/events/stream")
+async def event_stream_endpoint(
+    request: Request,
+    events: Optional[str] = None,
+    repo: Optional[str] = None,
+    task_id: Optional[int] = None,
+    executor: Optional[str] = None,
+    since: Optional[int] = Query(None, ge=0),
+    last_event_id: Optional[str] = Header(None),
+    _=Depends(verify_token),
+):
+    """Server-sent events: committed hook events, resumable from ``since`` or the Last-Event-ID header."""
+    if not EVENT_OUTBOX:
+        raise HTTPException(status_code=503, detail="Event streams need FORGEOPS_EVENT_OUTBOX=1")
+    try:
+        where = _stream_filter(events, repo, task_id, executor)
+        if last_event_id is not None:
+            since = int(last_event_id)  # a reconnecting EventSource resumes where it left off
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    if since is None:
+        since = await asyncio.to_thread(broadcaster.head)
+
+    async def stream():
+        # An id-only message sets the client's Last-Event-ID before the first event arrives.
+        yield f"id: {since}\n\n"
+        async for body in broadcaster.listen(since, where):
+            if await request.is_disconnected():
+                return
+            yield _sse(body)
+
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    return StreamingResponse(stream(), media_type="text/event-stream", headers=headers)
+
+
+@app.websocket("/events/ws")
+async def event_websocket_endpoint(
+    websocket: WebSocket,
+    events: Optional[str] = None,
+    repo: Optional[str] = None,
+    task_id: Optional[int] = None,
+    executor: Optional[str] = None,
+    since: Optional[int] = None,
+):
+    """The same events as /events/stream, one JSON message each, after a ``stream_open`` message with the cursor."""
+    error = _token_error(websocket.headers.get("authorization"))
+    if error is None and not EVENT_OUTBOX:
+        error = "Event streams need FORGEOPS_EVENT_OUTBOX=1"
+    try:
+        where = _stream_filter(events, repo, task_id, executor)
+    except ValueError as e:
+        error = error or str(e)
+    if error:
+        await websocket.close(code=1008, reason=error)
+        return
+    await websocket.accept()
+    if since is None:
+        since = await asyncio.to_thread(broadcaster.head)
+    await websocket.send_json({"event": "stream_open", "cursor": since})
+
+    async def pump():
+        async for body in broadcaster.listen(since, where):
+            if body is not None:
+                await websocket.send_json(body)
+
+    sender = asyncio.create_task(pump())
+    try:
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+    finally:
+        sender.cancel()
+
+
 @app.get("/status")
-def status_overview_endpoint(_=Depends(verify_token)):
-    all_items = list_work_items(engine)
-    by_state = {}
-    for item in all_items:
-        by_state.setdefault(item.state.value, []).append(item)
+def status_overview_endpoint(_=Depends(verify_token), session: Session = Depends(read_session)):
+    summary = get_status_summary(session)
+    return {
+        "total": summary.total,
+        "by_state": summary.by_state,
+        "by_repo": [{"repository": repo, "by_state": counts} for repo, counts in summary.by_repo_state.items()],
+        "blocked_count": summary.blocked_count,
+        "executing": [_serialize_status_item(i) for i in summary.executing],
+        "blocked": [_serialize_status_item(i) for i in summary.blocked],
+        "awaiting_review": [_serialize_status_item(i) for i in summary.awaiting_review],
+    }
 
+
+def _serialize_status_item(item):
     return {
-        "total": len(all_items),
-        "by_state": {state: len(items) for state, items in by_state.items()},
-        "executing": [_serialize_work_item(i) for i in by_state.get("executing", [])],
-        "blocked": [_serialize_work_item(i) for i in all_items if i.is_blocked],
-        "awaiting_review": [_serialize_work_item(i) for i in by_state.get("awaiting_review", [])],
+        "task_id": item.task_id,
+        "title": item.title,
+        "repository": item.repository,
+        "state": item.state.value,
+        "priority": item.priority.value,
+        "is_blocked": item.is_blocked,
+        "blocked_reason": item.blocked_reason,
     }
 
 
@@ -545,10 +1154,18 @@ def status_overview_endpoint(_=Depends(verify_token)):
 
 @app.get("/issues")
 def get_issues_legacy(
+    response: Response,
     repo: Optional[str] = None,
     state: Optional[WorkItemState] = None,
+    limit: int = Query(PAGE_SIZE_DEFAULT, ge=1, le=PAGE_SIZE_MAX),
+    cursor: Optional[str] = None,
     _=Depends(verify_token),
+    session: Session = Depends(read_session),
 ):
     """Legacy endpoint — use /work-items instead."""
-    items = list_work_items(engine, repo_name=repo, state=state)
-    return [_serialize_work_item(i) for i in items]
+    try:
+        page = list_work_items_page(session, repo_name=repo, state=state, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    _set_next_cursor(response, page.next_cursor)
+    return [_serialize_work_item(i) for i in page.items]
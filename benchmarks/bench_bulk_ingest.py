@@ -0,0 +1,71 @@
+"""Benchmark: bulk ingestion throughput versus one create_work_item() call per row.
+
+Seeds a release-sized plan through ``create_work_items_bulk`` and through the
+per-item path (sampled, since it is orders of magnitude slower), and reports
+items per second for each. Exits non-zero when the bulk path falls below
+``TARGET_ITEMS_PER_S``.
+
+Run: uv run python benchmarks/bench_bulk_ingest.py [--items 50000] [--repos 20]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import core.database as db  # noqa: E402
+
+TARGET_ITEMS_PER_S = 10_000
+
+
+def _plan(count: int, repos: int) -> list[dict]:
+    priorities = ("low", "medium", "high", "urgent")
+    return [
+        {
+            "title": f"Release task {n}",
+            "repo_name": f"repo-{n % repos:02d}",
+            "description": "Seeded by bench_bulk_ingest",
+            "priority": priorities[n % len(priorities)],
+        }
+        for n in range(count)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=50_000)
+    parser.add_argument("--repos", type=int, default=20)
+    parser.add_argument("--per-item-sample", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = db.create_db_and_tables(Path(tmp) / "bench.db")
+        db.add_repositories_bulk(engine, [f"repo-{n:02d}" for n in range(args.repos)])
+
+        sample = _plan(args.per_item_sample, args.repos)
+        started = time.perf_counter()
+        for spec in sample:
+            db.create_work_item(engine, spec.pop("title"), **spec)
+        per_item_rate = args.per_item_sample / (time.perf_counter() - started)
+
+        plan = _plan(args.items, args.repos)
+        started = time.perf_counter()
+        task_ids = db.create_work_items_bulk(engine, plan, created_by="bench")
+        bulk_rate = len(task_ids) / (time.perf_counter() - started)
+        db.dispose_engines()
+
+    print(f"{'path':<28}{'items/s':>12}")
+    print(f"{'create_work_item (loop)':<28}{per_item_rate:>12,.0f}")
+    print(f"{'create_work_items_bulk':<28}{bulk_rate:>12,.0f}")
+    print(f"speedup: {bulk_rate / per_item_rate:.0f}x")
+
+    if bulk_rate < TARGET_ITEMS_PER_S:
+        print(f"FAIL: bulk ingest below {TARGET_ITEMS_PER_S:,} items/s")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""Benchmark: claim latency, throughput and fairness with many concurrent claimers.
+
+Seeds a scratch ledger with queued items of mixed priority, then starts
+``--claimers`` processes that each call ``claim_next_work_item`` until the queue
+is empty, as separate agents would. With ``--repos`` the items are spread over
+that many repositories and each claimer works on its item for ``--hold-ms``
+before completing it, which frees the slot for the next claim; a claimer that
+finds every repository busy waits and retries. ``--per-repo`` sets each
+repository's concurrency policy to that many executing items, so running with 1
+and then N shows what the policy buys. Reports claim latency percentiles, claims
+per second, the spread of claims across claimers (Jain's fairness index, 1.0 =
+perfectly even) and priority inversions in commit order. Exits non-zero if an
+item was claimed twice or not at all.
+
+Run: uv run python benchmarks/bench_claim_queue.py [--items 2000] [--claimers 8] [--repos 0]
+                                                  [--per-repo 1] [--hold-ms 0]
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlmodel import Session, func, select  # noqa: E402
+
+from core.database import (  # noqa: E402
+    add_repositories_bulk,
+    claim_next_work_item,
+    create_db_and_tables,
+    create_work_items_bulk,
+    dispose_engines,
+    get_engine,
+    transition_work_item,
+    update_repository,
+)
+from models import Assignment, Priority, WorkItem, WorkItemState  # noqa: E402
+
+
+def _queued(engine) -> int:
+    with Session(engine) as session:
+        return session.exec(select(func.count()).where(WorkItem.state == WorkItemState.queued)).one()
+
+
+def _claimer(db_path: str, name: str, complete: bool, hold_s: float, start_at: float) -> list[tuple[int, float]]:
+    engine = get_engine(db_path)
+    time.sleep(max(0.0, start_at - time.time()))
+    claims = []
+    while True:
+        started = time.perf_counter()
+        item = claim_next_work_item(engine, name)
+        latency = time.perf_counter() - started
+        if item is None:
+            if complete and _queued(engine):
+                time.sleep(0.001)  # every repository is at capacity; wait for a slot
+                continue
+            break
+        claims.append((item.task_id, latency))
+        if complete:
+            time.sleep(hold_s)
+            transition_work_item(engine, item.task_id, WorkItemState.completed)
+    dispose_engines()
+    return claims
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=2_000)
+    parser.add_argument("--claimers", type=int, default=8)
+    parser.add_argument("--repos", type=int, default=0, help="spread items over this many repositories (0 = none)")
+    parser.add_argument("--per-repo", type=int, default=1, help="executing items allowed per repository")
+    parser.add_argument("--hold-ms", type=float, default=0.0, help="time each claimer works on an item")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = str(Path(tmp) / "bench.db")
+        engine = create_db_and_tables(db_path)
+        repos = [f"repo-{n}" for n in range(args.repos)]
+        add_repositories_bulk(engine, repos)
+        for name in repos:
+            update_repository(engine, name, concurrency={"repo": args.per_repo})
+        create_work_items_bulk(
+            engine,
+            [
+                {
+                    "title": f"Task {n}",
+                    "priority": rng.choice(list(Priority)).value,
+                    "repo_name": repos[n % len(repos)] if repos else None,
+                }
+                for n in range(args.items)
+            ],
+        )
+
+        start_at = time.time() + 1.0
+        with ProcessPoolExecutor(args.claimers) as pool:
+            futures = [
+                pool.submit(_claimer, db_path, f"agent-{n}", bool(repos), args.hold_ms / 1000, start_at)
+                for n in range(args.claimers)
+            ]
+            results = [future.result() for future in futures]
+        elapsed = time.time() - start_at
+
+        with Session(engine) as session:
+            committed = session.exec(
+                select(WorkItem.priority_rank).join(Assignment).order_by(Assignment.assignment_id)
+            ).all()
+        dispose_engines()
+
+    claimed = [task_id for claims in results for task_id, _ in claims]
+    latencies = sorted(latency for claims in results for _, latency in claims)
+    per_claimer = [len(claims) for claims in results]
+    jain = sum(per_claimer) ** 2 / (len(per_claimer) * sum(n * n for n in per_claimer)) if claimed else 0.0
+    inversions = sum(1 for earlier, later in zip(committed, committed[1:]) if later < earlier)
+
+    def pct(p: float) -> float:
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+
+    print(
+        f"claimers: {args.claimers}  items: {args.items:,}  repos: {args.repos or 'none'}"
+        f"  per repo: {args.per_repo}  hold: {args.hold_ms:g}ms"
+    )
+    print(f"{'claims/s':<24}{len(claimed) / elapsed:>10,.0f}")
+    print(f"{'latency p50 / p99 ms':<24}{pct(0.50):>10.2f} / {pct(0.99):.2f}")
+    print(f"{'claims per claimer':<24}{min(per_claimer):>10} – {max(per_claimer)}  (Jain {jain:.3f})")
+    print(f"{'priority inversions':<24}{inversions:>10}")
+
+    duplicates = len(claimed) - len(set(claimed))
+    if duplicates or len(claimed) != args.items:
+        print(f"FAIL: {duplicates} duplicate claim(s), {args.items - len(set(claimed))} item(s) never claimed")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Benchmark: per-command database setup cost and the shell-completion path.
+
+Every CLI command and ``main._complete_repo`` start with ``create_db_and_tables()``.
+This measures it against the old behaviour (fresh engine + ``create_all`` per
+call) and checks the warm paths against a latency budget. Exits non-zero when a
+budget is exceeded.
+
+Run: uv run python benchmarks/bench_cli_latency.py [--iterations 200]
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlmodel import SQLModel, create_engine  # noqa: E402
+
+import core.database as db  # noqa: E402
+
+# Budgets for the median of each warm path, in milliseconds.
+BUDGET_MS = {
+    "warm process start": 5.0,
+    "warm in-process call": 1.0,
+    "repo completion (50 repos)": 10.0,
+}
+
+
+def _median_ms(fn, iterations: int) -> float:
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.db"
+        import config
+
+        config.DB_PATH = db.DB_PATH = path
+        engine = db.create_db_and_tables(path)
+        for i in range(50):
+            db.add_repository(engine, f"repo-{i:02d}")
+
+        import main as cli
+
+        def legacy():
+            e = create_engine(f"sqlite:///{path}")
+            SQLModel.metadata.create_all(e)
+            e.dispose()
+
+        def warm_process_start():
+            db.dispose_engines()
+            db.create_db_and_tables(path)
+
+        results = {
+            "legacy (engine + create_all)": _median_ms(legacy, args.iterations),
+            "warm process start": _median_ms(warm_process_start, args.iterations),
+            "warm in-process call": _median_ms(lambda: db.create_db_and_tables(path), args.iterations),
+            "repo completion (50 repos)": _median_ms(lambda: cli._complete_repo("repo-4"), args.iterations),
+        }
+        db.dispose_engines()
+
+    failed = False
+    print(f"{'path':<32}{'median ms':>12}{'budget ms':>12}")
+    for label, ms in results.items():
+        budget = BUDGET_MS.get(label)
+        verdict = ""
+        if budget is not None and ms > budget:
+            verdict = "  OVER BUDGET"
+            failed = True
+        print(f"{label:<32}{ms:>12.3f}{budget if budget is not None else '—':>12}{verdict}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
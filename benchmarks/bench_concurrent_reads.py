@@ -0,0 +1,112 @@
+"""Benchmark: read throughput while a writer is active, bare engine vs tuned profile.
+
+Seeds a scratch ledger, then runs one writer thread creating work items as fast
+as it can alongside several reader threads issuing ``get_work_item`` and
+filtered ``list_work_items`` calls. Reports reads/s, p99 read latency, writes/s and lock errors
+for a bare ``create_engine`` (rollback journal) and the configured profile.
+
+Run: uv run python benchmarks/bench_concurrent_reads.py [--seconds 5] [--readers 4]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy.exc import OperationalError  # noqa: E402
+from sqlmodel import SQLModel  # noqa: E402
+
+from core.database import add_repository, create_work_item, get_engine, get_work_item, list_work_items  # noqa: E402
+from models import WorkItemState  # noqa: E402
+
+SEED_ITEMS = 2000
+
+
+def _run(db_path: Path, pragmas, seconds: float, readers: int) -> dict:
+    engine = get_engine(db_path, pragmas=pragmas)
+    SQLModel.metadata.create_all(engine)
+    add_repository(engine, "bench-repo")
+    for i in range(SEED_ITEMS):
+        create_work_item(engine, f"Seed {i}", repo_name="bench-repo")
+
+    stop = threading.Event()
+    counts = {"reads": 0, "writes": 0, "read_errors": 0, "write_errors": 0}
+    latencies: list[float] = []
+    lock = threading.Lock()
+
+    def writer():
+        n = 0
+        while not stop.is_set():
+            try:
+                create_work_item(engine, f"Write {n}", repo_name="bench-repo")
+                n += 1
+            except OperationalError:
+                with lock:
+                    counts["write_errors"] += 1
+        with lock:
+            counts["writes"] += n
+
+    def reader():
+        n = errors = 0
+        rng = random.Random()
+        local: list[float] = []
+        while not stop.is_set():
+            started = time.perf_counter()
+            try:
+                if n % 10 == 0:
+                    list_work_items(engine, state=WorkItemState.executing)
+                else:
+                    get_work_item(engine, rng.randint(1, SEED_ITEMS))
+                n += 1
+                local.append(time.perf_counter() - started)
+            except OperationalError:
+                errors += 1
+        with lock:
+            counts["reads"] += n
+            counts["read_errors"] += errors
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=writer)] + [threading.Thread(target=reader) for _ in range(readers)]
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+    engine.dispose()
+    latencies.sort()
+    return {
+        "reads/s": counts["reads"] / seconds,
+        "p99 ms": latencies[int(len(latencies) * 0.99)] * 1000 if latencies else 0.0,
+        "writes/s": counts["writes"] / seconds,
+        "read errors": counts["read_errors"],
+        "write errors": counts["write_errors"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--readers", type=int, default=4)
+    args = parser.parse_args()
+
+    profiles = {"bare (rollback journal)": {}, "tuned (config.SQLITE_PRAGMAS)": None}
+    print(f"{'profile':<32}{'reads/s':>10}{'p99 ms':>10}{'writes/s':>10}{'read err':>10}{'write err':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, pragmas in profiles.items():
+            db_path = Path(tmp) / f"bench-{len(os.listdir(tmp))}.db"
+            r = _run(db_path, pragmas, args.seconds, args.readers)
+            print(
+                f"{label:<32}{r['reads/s']:>10.0f}{r['p99 ms']:>10.1f}{r['writes/s']:>10.0f}"
+                f"{r['read errors']:>10}{r['write errors']:>10}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Benchmark: list_items_by_executor against a ledger with many historic assignments.
+
+Seeds ``--assignments`` assignment rows spread over ``--tasks`` work items and a
+handful of executors (each task reassigned several times), then times the
+current single-query implementation against the previous per-task loop, and
+reports the query plan so index use is visible.
+
+Run: uv run python benchmarks/bench_executor_items.py [--assignments 100000] [--tasks 20000]
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import event, insert  # noqa: E402
+from sqlmodel import Session, col, select  # noqa: E402
+
+import core.database as db  # noqa: E402
+from models import Assignment, ExecutorType, WorkItem  # noqa: E402
+
+EXECUTORS = ("agent-alpha", "agent-beta", "agent-gamma", "alice", "bob")
+
+
+def _seed(engine, assignments: int, tasks: int) -> None:
+    task_ids = db.create_work_items_bulk(engine, [{"title": f"Task {n}"} for n in range(tasks)])
+    start = datetime.now(UTC) - timedelta(days=365)
+    rows = [
+        {
+            "task_id": task_ids[n % tasks],
+            "executor": EXECUTORS[(n * 7 + n // tasks) % len(EXECUTORS)],
+            "executor_type": ExecutorType.agent,
+            "assigned_at": start + timedelta(seconds=n),
+        }
+        for n in range(assignments)
+    ]
+    with db.unit_of_work(engine) as session:
+        session.execute(insert(Assignment.__table__), rows)
+    with engine.connect() as conn:
+        conn.exec_driver_sql("ANALYZE")
+
+
+def _per_task_loop(engine, executor: str) -> list[WorkItem]:
+    """The pre-index implementation: 2N + 1 round trips."""
+    with Session(engine) as session:
+        task_ids = {a.task_id for a in session.exec(select(Assignment).where(Assignment.executor == executor))}
+        result = []
+        for tid in task_ids:
+            latest = session.exec(
+                select(Assignment).where(Assignment.task_id == tid).order_by(col(Assignment.assigned_at).desc())
+            ).first()
+            if latest and latest.executor == executor:
+                result.append(session.get(WorkItem, tid))
+        return sorted(result, key=lambda x: x.task_id)
+
+
+def _median_ms(fn, iterations: int) -> float:
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--assignments", type=int, default=100_000)
+    parser.add_argument("--tasks", type=int, default=20_000)
+    parser.add_argument("--iterations", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = db.create_db_and_tables(Path(tmp) / "bench.db")
+        _seed(engine, args.assignments, args.tasks)
+        executor = EXECUTORS[0]
+
+        current = db.list_items_by_executor(engine, executor)
+        legacy = _per_task_loop(engine, executor)
+        assert [i.task_id for i in current] == [i.task_id for i in legacy], "implementations disagree"
+
+        statements = []
+        event.listen(engine, "before_cursor_execute", lambda conn, cur, stmt, *rest: statements.append(stmt))
+        single_ms = _median_ms(lambda: db.list_items_by_executor(engine, executor), args.iterations)
+        queries = len(statements) // args.iterations
+        loop_ms = _median_ms(lambda: _per_task_loop(engine, executor), 1)
+
+        with engine.connect() as conn:
+            plan = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statements[0], (executor, 1, executor)).all()
+        db.dispose_engines()
+
+    print(f"{args.assignments:,} assignments over {args.tasks:,} tasks; {len(current):,} items for {executor}")
+    print(f"{'path':<26}{'median ms':>12}{'queries':>10}")
+    print(f"{'single query':<26}{single_ms:>12.1f}{queries:>10}")
+    print(f"{'per-task loop (2N+1)':<26}{loop_ms:>12.1f}{'~' + str(2 * len(legacy) + 1):>10}")
+    print("\nquery plan:")
+    for row in plan:
+        print(f"  {row[-1]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Benchmark: event outbox delivery throughput to a local HTTP receiver.
+
+Seeds the outbox through ``bulk_transition`` (one event per item) with
+``EVENT_OUTBOX`` on, then drains it to a stand-in webhook on 127.0.0.1 with
+``OutboxWorker.run_once`` and reports events per second, both for the write
+side and for delivery. Exits non-zero when delivery falls below
+``TARGET_EVENTS_PER_S``.
+
+Run: uv run python benchmarks/bench_outbox_delivery.py [--events 5000] [--batch-size 100]
+"""
+
+import argparse
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import core.database as db  # noqa: E402
+from core.outbox import OutboxWorker, add_subscriber  # noqa: E402
+from models import WorkItemState  # noqa: E402
+
+TARGET_EVENTS_PER_S = 1_000
+
+
+class _Sink(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, as a real webhook receiver would
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.received += 1
+        self.send_response(204)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=5_000)
+    parser.add_argument("--batch-size", type=int, default=100)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Sink)
+    server.received = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    with tempfile.TemporaryDirectory() as tmp, patch.object(db, "EVENT_OUTBOX", True):
+        engine = db.create_db_and_tables(Path(tmp) / "bench.db")
+        add_subscriber(engine, "sink", f"http://127.0.0.1:{server.server_port}/hooks")
+        task_ids = db.create_work_items_bulk(engine, [{"title": f"Task {n}"} for n in range(args.events)])
+
+        started = time.perf_counter()
+        db.bulk_transition(engine, db.WorkItemFilter(task_ids=task_ids), WorkItemState.assigned)
+        write_rate = args.events / (time.perf_counter() - started)
+
+        worker = OutboxWorker(engine, batch_size=args.batch_size)
+        started = time.perf_counter()
+        while worker.run_once():
+            pass
+        delivery_rate = server.received / (time.perf_counter() - started)
+        worker.stop()
+        db.dispose_engines()
+    server.shutdown()
+
+    print(f"{'path':<34}{'events/s':>12}")
+    print(f"{'bulk_transition + outbox write':<34}{write_rate:>12,.0f}")
+    print(f"{'OutboxWorker → HTTP receiver':<34}{delivery_rate:>12,.0f}")
+    print(f"delivered: {server.received:,} of {args.events:,}")
+
+    if server.received != args.events or delivery_rate < TARGET_EVENTS_PER_S:
+        print(f"FAIL: delivery below {TARGET_EVENTS_PER_S:,} events/s or events missing")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,7 @@ from core.database import (
     get_work_item,
     list_items_by_executor,
     transition_work_item,
+    unit_of_work,
 )
 from core.state_engine import InvalidTransitionError
 from models import ExecutorType, WorkItemState
@@ -30,14 +31,15 @@ def assign(task_id: int, executor: str, executor_type_str: str = "human") -> Non
         console.print(f"[red]Work item WI-{task_id} not found.[/red]")
         return
 
-    create_assignment(engine, task_id, executor, etype, actor=executor)
+    with unit_of_work(engine) as session:
+        create_assignment(session, task_id, executor, etype, actor=executor)
 
-    # Auto-transition to assigned if currently queued or rework_required
-    if item.state in (WorkItemState.queued, WorkItemState.rework_required):
-        try:
-            transition_work_item(engine, task_id, WorkItemState.assigned, actor=executor)
-        except InvalidTransitionError:
-            pass  # Don't fail the assignment if transition isn't valid
+        # Auto-transition to assigned if currently queued or rework_required
+        if item.state in (WorkItemState.queued, WorkItemState.rework_required):
+            try:
+                transition_work_item(session, task_id, WorkItemState.assigned, actor=executor)
+            except InvalidTransitionError:
+                pass  # Don't fail the assignment if transition isn't valid
 
     console.print(f"[green]WI-{task_id} assigned to {executor} ({etype.value})[/green]")
 
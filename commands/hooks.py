@@ -0,0 +1,88 @@
+"""Outbox commands — hooks-subscribe, hooks-unsubscribe, hooks-status, hooks-worker."""
+
+import logging
+from typing import Optional
+
+from rich.console import Console
+from rich.table import Table
+
+import config
+from core.database import create_db_and_tables
+from core.outbox import OutboxWorker, add_subscriber, get_outbox_status, remove_subscriber
+
+console = Console()
+
+
+def _warn_if_disabled() -> None:
+    if not config.EVENT_OUTBOX:
+        console.print("[yellow]FORGEOPS_EVENT_OUTBOX is not set to 1 — no events are being recorded.[/yellow]")
+
+
+def hooks_subscribe(name: str, url: str, *, events: Optional[list[str]] = None, from_start: bool = False) -> None:
+    engine = create_db_and_tables()
+    try:
+        subscriber = add_subscriber(engine, name, url, events=events, from_start=from_start)
+    except ValueError as e:
+        console.print(f"[red]{e}[/red]")
+        return
+    scope = subscriber.events or "all events"
+    console.print(f"[green]Subscribed {subscriber.name} → {subscriber.url}[/green] ({scope})")
+    _warn_if_disabled()
+
+
+def hooks_unsubscribe(name: str) -> None:
+    engine = create_db_and_tables()
+    if remove_subscriber(engine, name):
+        console.print(f"[green]Removed subscriber {name}[/green]")
+    else:
+        console.print(f"[red]No subscriber named {name}[/red]")
+
+
+def hooks_status() -> None:
+    engine = create_db_and_tables()
+    statuses = get_outbox_status(engine)
+    if not statuses:
+        console.print("No outbox subscribers.")
+        console.print("Use [bold]hooks-subscribe <name> <url>[/bold] to add one.")
+        _warn_if_disabled()
+        return
+
+    table = Table(title="Outbox subscribers", show_lines=False)
+    table.add_column("Name", style="bold cyan")
+    table.add_column("URL")
+    table.add_column("Events")
+    table.add_column("Offset", justify="right")
+    table.add_column("Pending", justify="right")
+    table.add_column("Dead", justify="right")
+    table.add_column("Last error")
+    for subscriber, pending, dead in statuses:
+        table.add_row(
+            subscriber.name,
+            subscriber.url,
+            subscriber.events or "all",
+            str(subscriber.last_event_id),
+            str(pending),
+            f"[red]{dead}[/red]" if dead else "0",
+            subscriber.last_error or "—",
+        )
+    console.print(table)
+    _warn_if_disabled()
+
+
+def hooks_worker(*, once: bool = False, batch_size: int = config.OUTBOX_BATCH_SIZE) -> None:
+    engine = create_db_and_tables()
+    worker = OutboxWorker(engine, batch_size=batch_size)
+    if once:
+        delivered = worker.run_once()
+        worker.stop()
+        console.print(f"Delivered {delivered} event(s)")
+        return
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    console.print(f"Delivering outbox events every {worker.poll_interval_s:g}s — Ctrl-C to stop")
+    try:
+        worker.run_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        worker.stop()
@@ -0,0 +1,56 @@
+"""Import Command - Bulk-load work items from a JSON or JSON Lines file."""
+
+import json
+from pathlib import Path
+from typing import Optional
+
+from rich.console import Console
+
+from core.database import add_repositories_bulk, create_db_and_tables, create_work_items_bulk, unit_of_work
+
+console = Console()
+
+
+def _read_items(path: Path) -> list[dict]:
+    """Accept a JSON array, a ``{"items": [...]}`` object, or one JSON object per line."""
+    text = path.read_text()
+    if path.suffix == ".jsonl":
+        data = [json.loads(line) for line in text.splitlines() if line.strip()]
+    else:
+        data = json.loads(text)
+        if isinstance(data, dict):
+            data = data.get("items", [])
+        if not isinstance(data, list):
+            raise ValueError("expected a list of work items")
+    for index, item in enumerate(data):
+        if not isinstance(item, dict):
+            raise ValueError(f"item {index} is not an object")
+    return data
+
+
+def import_items(file: str, *, created_by: Optional[str] = None, create_repos: bool = False) -> None:
+    path = Path(file)
+    try:
+        items = _read_items(path)
+    except (OSError, json.JSONDecodeError) as e:
+        console.print(f"[red]Could not read {path}: {e}[/red]")
+        return
+    except ValueError as e:
+        console.print(f"[red]Import failed, nothing was written: {e}[/red]")
+        return
+
+    if not items:
+        console.print(f"[yellow]No work items found in {path}.[/yellow]")
+        return
+
+    engine = create_db_and_tables()
+    try:
+        with unit_of_work(engine) as session:
+            if create_repos:
+                add_repositories_bulk(session, sorted({i["repo_name"] for i in items if i.get("repo_name")}))
+            task_ids = create_work_items_bulk(session, items, created_by=created_by)
+    except ValueError as e:
+        console.print(f"[red]Import failed, nothing was written: {e}[/red]")
+        return
+
+    console.print(f"[green]Imported {len(task_ids)} work items[/green] (WI-{task_ids[0]} .. WI-{task_ids[-1]}).")
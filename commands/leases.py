@@ -0,0 +1,62 @@
+"""Lease commands — leases, lease-sweeper."""
+
+import logging
+from datetime import UTC, datetime
+
+from rich.console import Console
+from rich.table import Table
+
+from core.database import create_db_and_tables
+from core.leases import LeaseSweeper, get_leases
+
+console = Console()
+
+
+def leases(*, expired: bool = False) -> None:
+    engine = create_db_and_tables()
+    rows = get_leases(engine, expired=expired)
+    if not rows:
+        console.print("No expired leases." if expired else "No executing items hold a lease.")
+        return
+
+    now = datetime.now(UTC)
+    table = Table(title="Execution leases", show_lines=False)
+    table.add_column("ID", style="bold cyan")
+    table.add_column("Executor")
+    table.add_column("Started")
+    table.add_column("Last heartbeat")
+    table.add_column("Expires in", justify="right")
+    for lease in rows:
+        remaining = (lease.expires_at.replace(tzinfo=UTC) - now).total_seconds()
+        table.add_row(
+            f"WI-{lease.task_id}",
+            lease.executor or "—",
+            f"{lease.started_at:%Y-%m-%d %H:%M:%S}",
+            f"{lease.heartbeat_at:%H:%M:%S}" if lease.heartbeat_at else "—",
+            f"{remaining:.0f}s" if remaining > 0 else "[red]expired[/red]",
+        )
+    console.print(table)
+
+
+def lease_sweeper(*, once: bool = False, interval_s: float, state: str) -> None:
+    engine = create_db_and_tables()
+    try:
+        sweeper = LeaseSweeper(engine, interval_s=interval_s, state=state)
+        if once:
+            swept = sweeper.run_once()
+            console.print(
+                f"Reclaimed {len(swept)} item(s)" + (f": {', '.join(f'WI-{t}' for t in swept)}" if swept else "")
+            )
+            return
+    except ValueError as e:
+        console.print(f"[red]{e}[/red]")
+        return
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    console.print(f"Sweeping expired leases every {sweeper.interval_s:g}s to {sweeper.state.value} — Ctrl-C to stop")
+    try:
+        sweeper.run_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sweeper.stop()
@@ -5,7 +5,7 @@ from typing import Optional
 from rich.console import Console
 from rich.table import Table
 
-from core.database import create_db_and_tables, list_work_items
+from core.database import create_db_and_tables, list_work_items_page
 from models import Priority, WorkItemState
 
 console = Console()
@@ -16,6 +16,8 @@ def list_issues(
     state_filter: Optional[str] = None,
     show_blocked: Optional[bool] = None,
     priority_filter: Optional[str] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
 ) -> None:
     engine = create_db_and_tables()
 
@@ -35,13 +37,20 @@ def list_issues(
             console.print(f"[red]Unknown priority: {priority_filter}[/red]")
             return
 
-    items = list_work_items(
-        engine,
-        repo_name=repo_filter,
-        state=state,
-        is_blocked=show_blocked,
-        priority=priority,
-    )
+    try:
+        page = list_work_items_page(
+            engine,
+            repo_name=repo_filter,
+            state=state,
+            is_blocked=show_blocked,
+            priority=priority,
+            limit=limit,
+            cursor=cursor,
+        )
+    except ValueError as e:
+        console.print(f"[red]{e}[/red]")
+        return
+    items = page.items
 
     if not items:
         label = ""
@@ -103,4 +112,7 @@ def list_issues(
         )
 
     console.print(table)
-    console.print(f"\nTotal: {len(items)} work item(s)")
+    if page.next_cursor:
+        console.print(f"\nShowing {len(items)} work item(s). Next page: --cursor {page.next_cursor}")
+    else:
+        console.print(f"\nTotal: {len(items)} work item(s)")
@@ -8,10 +8,10 @@ from rich.table import Table
 from core.database import (
     create_db_and_tables,
     create_review,
-    get_execution_records,
+    get_review_queue,
     get_work_item,
-    list_work_items,
     transition_work_item,
+    unit_of_work,
 )
 from core.state_engine import InvalidTransitionError
 from models import ReviewDecision, WorkItemState
@@ -21,8 +21,8 @@ console = Console()
 
 def review_queue() -> None:
     engine = create_db_and_tables()
-    items = list_work_items(engine, state=WorkItemState.awaiting_review)
-    if not items:
+    queue = get_review_queue(engine)
+    if not queue:
         console.print("No items awaiting review.")
         return
 
@@ -33,12 +33,10 @@ def review_queue() -> None:
     table.add_column("Title")
     table.add_column("Last Run")
 
-    for item in items:
+    for item, r in queue:
         repo_name = item.repository.name if item.repository else "—"
-        records = get_execution_records(engine, item.task_id)
         last_run = ""
-        if records:
-            r = records[-1]
+        if r:
             parts = []
             if r.branch:
                 parts.append(r.branch)
@@ -57,7 +55,7 @@ def review_queue() -> None:
         )
 
     console.print(table)
-    console.print(f"\nTotal: {len(items)} item(s) awaiting review")
+    console.print(f"\nTotal: {len(queue)} item(s) awaiting review")
 
 
 def approve(task_id: int, reviewer: str, *, note: Optional[str] = None) -> None:
@@ -72,12 +70,13 @@ def approve(task_id: int, reviewer: str, *, note: Optional[str] = None) -> None:
         console.print(f"[red]WI-{task_id} is in state '{item.state.value}', not 'awaiting_review'.[/red]")
         return
 
-    create_review(engine, task_id, reviewer, ReviewDecision.accepted, note=note, actor=reviewer)
+    with unit_of_work(engine) as session:
+        create_review(session, task_id, reviewer, ReviewDecision.accepted, note=note, actor=reviewer)
 
-    try:
-        transition_work_item(engine, task_id, WorkItemState.accepted, actor=reviewer)
-    except InvalidTransitionError:
-        pass
+        try:
+            transition_work_item(session, task_id, WorkItemState.accepted, actor=reviewer)
+        except InvalidTransitionError:
+            pass
 
     console.print(f"[green]WI-{task_id} approved by {reviewer}[/green]")
 
@@ -94,12 +93,13 @@ def request_changes(task_id: int, reviewer: str, *, note: Optional[str] = None)
         console.print(f"[red]WI-{task_id} is in state '{item.state.value}', not 'awaiting_review'.[/red]")
         return
 
-    create_review(engine, task_id, reviewer, ReviewDecision.rework_required, note=note, actor=reviewer)
+    with unit_of_work(engine) as session:
+        create_review(session, task_id, reviewer, ReviewDecision.rework_required, note=note, actor=reviewer)
 
-    try:
-        transition_work_item(engine, task_id, WorkItemState.rework_required, actor=reviewer)
-    except InvalidTransitionError:
-        pass
+        try:
+            transition_work_item(session, task_id, WorkItemState.rework_required, actor=reviewer)
+        except InvalidTransitionError:
+            pass
 
     console.print(f"[yellow]WI-{task_id} sent back for rework by {reviewer}[/yellow]")
     if note:
@@ -11,6 +11,7 @@ from config import BASE_DIR
 from core.database import (
     create_db_and_tables,
     get_activity_log,
+    get_status_summary,
     list_work_items,
 )
 from models import WorkItemState
@@ -22,46 +23,40 @@ SNAPSHOT_FILE = BASE_DIR / ".forgeops_snapshot.json"
 
 def status_overview() -> None:
     engine = create_db_and_tables()
-    all_items = list_work_items(engine)
+    summary = get_status_summary(engine)
 
-    if not all_items:
+    if not summary.total:
         console.print("No work items in the ledger.")
         return
 
-    # Group by state
-    by_state: dict[str, list] = {}
-    for item in all_items:
-        by_state.setdefault(item.state.value, []).append(item)
-
     # Summary panel
     summary_parts = []
     for state in WorkItemState:
-        count = len(by_state.get(state.value, []))
+        count = summary.by_state.get(state.value, 0)
         if count:
             summary_parts.append(f"{state.value}: {count}")
+    if summary.blocked_count:
+        summary_parts.append(f"blocked: {summary.blocked_count}")
     console.print(Panel(" | ".join(summary_parts), title="[bold]Status Overview[/bold]"))
 
     # Executing items (with repo concurrency info)
-    executing = by_state.get("executing", [])
-    if executing:
+    if summary.executing:
         table = Table(title="Currently Executing")
         table.add_column("ID", style="bold cyan", no_wrap=True)
         table.add_column("Repository", style="magenta")
         table.add_column("Title")
-        for item in executing:
-            repo = item.repository.name if item.repository else "—"
-            table.add_row(f"WI-{item.task_id}", repo, item.title)
+        for item in summary.executing:
+            table.add_row(f"WI-{item.task_id}", item.repository or "—", item.title)
         console.print(table)
 
     # Blocked items
-    blocked = [i for i in all_items if i.is_blocked]
-    if blocked:
+    if summary.blocked:
         table = Table(title="Blocked Items")
         table.add_column("ID", style="bold cyan", no_wrap=True)
         table.add_column("State")
         table.add_column("Reason", style="red")
         table.add_column("Title")
-        for item in blocked:
+        for item in summary.blocked:
             table.add_row(
                 f"WI-{item.task_id}",
                 item.state.value,
@@ -71,15 +66,13 @@ def status_overview() -> None:
         console.print(table)
 
     # Awaiting review
-    awaiting = by_state.get("awaiting_review", [])
-    if awaiting:
+    if summary.awaiting_review:
         table = Table(title="Awaiting Review")
         table.add_column("ID", style="bold cyan", no_wrap=True)
         table.add_column("Repository", style="magenta")
         table.add_column("Title")
-        for item in awaiting:
-            repo = item.repository.name if item.repository else "—"
-            table.add_row(f"WI-{item.task_id}", repo, item.title)
+        for item in summary.awaiting_review:
+            table.add_row(f"WI-{item.task_id}", item.repository or "—", item.title)
         console.print(table)
 
     # Recent activity
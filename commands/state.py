@@ -1,17 +1,19 @@
-"""State engine commands — update-status, block, unblock."""
+"""State engine commands — update-status, bulk-transition, block, unblock."""
 
 from typing import Optional
 
 from rich.console import Console
 
 from core.database import (
+    WorkItemFilter,
     block_work_item,
+    bulk_transition,
     create_db_and_tables,
     transition_work_item,
     unblock_work_item,
 )
 from core.state_engine import InvalidTransitionError, RepoConcurrencyError
-from models import WorkItemState
+from models import Priority, WorkItemState
 
 console = Console()
 
@@ -38,6 +40,39 @@ def update_status(task_id: int, state_str: str, *, actor: Optional[str] = None)
         console.print(f"[red]{e}[/red]")
 
 
+def bulk_transition_items(
+    state_str: str,
+    *,
+    task_ids: Optional[list[int]] = None,
+    repo_name: Optional[str] = None,
+    from_state: Optional[str] = None,
+    blocked: Optional[bool] = None,
+    priority: Optional[str] = None,
+    parent_id: Optional[int] = None,
+    actor: Optional[str] = None,
+) -> None:
+    engine = create_db_and_tables()
+
+    try:
+        new_state = WorkItemState(state_str)
+        where = WorkItemFilter(
+            task_ids=task_ids or None,
+            repo_name=repo_name,
+            state=WorkItemState(from_state) if from_state else None,
+            is_blocked=blocked,
+            priority=Priority(priority) if priority else None,
+            parent_id=parent_id,
+        )
+        result = bulk_transition(engine, where, new_state, actor=actor)
+    except ValueError as e:
+        console.print(f"[red]{e}[/red]")
+        return
+
+    console.print(f"[green]{len(result.updated)} of {result.matched} matching items → {new_state.value}[/green]")
+    for task_id, error in result.failed.items():
+        console.print(f"[red]WI-{task_id}: {error}[/red]")
+
+
 def block(task_id: int, reason: str, *, actor: Optional[str] = None) -> None:
     engine = create_db_and_tables()
     try:
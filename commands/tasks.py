@@ -9,6 +9,8 @@ from core.database import (
     create_db_and_tables,
     create_work_item,
     get_child_progress,
+    get_subtree,
+    get_subtree_progress,
     get_work_item,
     list_work_items,
 )
@@ -52,7 +54,7 @@ def add_task(
     console.print(f"[green]Sub-task WI-{child.task_id} created under WI-{parent_id}[/green]")
 
 
-def list_tasks(parent_id: int) -> None:
+def list_tasks(parent_id: int, *, tree: bool = False, max_depth: Optional[int] = None) -> None:
     engine = create_db_and_tables()
 
     parent = get_work_item(engine, parent_id)
@@ -60,10 +62,19 @@ def list_tasks(parent_id: int) -> None:
         console.print(f"[red]Work item WI-{parent_id} not found.[/red]")
         return
 
-    children = list_work_items(engine, parent_id=parent_id)
-    done, total = get_child_progress(engine, parent_id)
-
-    if not children:
+    if tree:
+        try:
+            nodes = get_subtree(engine, parent_id, max_depth=max_depth)
+        except ValueError as e:
+            console.print(f"[red]{e}[/red]")
+            return
+        rows = [(node.item, node.depth) for node in nodes]
+        done, total = get_subtree_progress(engine, parent_id)
+    else:
+        rows = [(child, 1) for child in list_work_items(engine, parent_id=parent_id)]
+        done, total = get_child_progress(engine, parent_id)
+
+    if not rows:
         console.print(f"No sub-tasks for WI-{parent_id}.")
         return
 
@@ -74,14 +85,17 @@ def list_tasks(parent_id: int) -> None:
     table.add_column("ID", style="bold cyan", no_wrap=True)
     table.add_column("State", no_wrap=True)
     table.add_column("Priority", no_wrap=True)
+    table.add_column("Sub-tasks", no_wrap=True)
     table.add_column("Title")
 
-    for child in children:
+    for child, depth in rows:
         blocked = " [red]BLOCKED[/red]" if child.is_blocked else ""
+        subtasks = f"{child.children_done}/{child.children_total}" if child.children_total else ""
         table.add_row(
-            f"WI-{child.task_id}",
+            "  " * (depth - 1) + f"WI-{child.task_id}",
             child.state.value,
             child.priority.value,
+            subtasks,
             child.title + blocked,
         )
 
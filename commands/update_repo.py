@@ -23,6 +23,8 @@ def update_repo(
     language: Optional[str] = None,
     deploy_target: Optional[str] = None,
     notes: Optional[str] = None,
+    workflow: Optional[str] = None,
+    concurrency: Optional[str] = None,
 ) -> None:
     engine = create_db_and_tables()
     repo_manager = RepositoryManager(engine)
@@ -49,6 +51,10 @@ def update_repo(
         updates["deploy_target"] = deploy_target
     if notes is not None:
         updates["notes"] = notes
+    if workflow is not None:
+        updates["workflow"] = workflow
+    if concurrency is not None:
+        updates["concurrency"] = concurrency
     if status is not None:
         try:
             updates["status"] = RepoStatus(status)
@@ -60,5 +66,9 @@ def update_repo(
         console.print("[yellow]No updates specified.[/yellow]")
         return
 
-    repo_manager.update_repository(repo_name, **updates)
+    try:
+        repo_manager.update_repository(repo_name, **updates)
+    except ValueError as e:
+        console.print(f"[red]{e}[/red]")
+        return
     console.print(f"[green]Repository '{repo_name}' updated.[/green]")
@@ -13,6 +13,91 @@ API_PORT = int(os.environ.get("FORGEOPS_API_PORT", "8002"))
 # SQLite database path
 DB_PATH = Path(os.environ.get("FORGEOPS_DB_PATH", str(BASE_DIR / "forgeops.db")))
 
+# SQLite connection profile — applied as PRAGMAs on every pooled connection.
+# WAL lets readers proceed while a writer holds the lock; busy_timeout makes
+# contending writers wait instead of failing with "database is locked".
+SQLITE_JOURNAL_MODE = os.environ.get("FORGEOPS_SQLITE_JOURNAL_MODE", "WAL")
+SQLITE_SYNCHRONOUS = os.environ.get("FORGEOPS_SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get("FORGEOPS_SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_MMAP_SIZE = int(os.environ.get("FORGEOPS_SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+SQLITE_CACHE_SIZE = int(os.environ.get("FORGEOPS_SQLITE_CACHE_SIZE", "-65536"))  # negative = KiB
+SQLITE_TEMP_STORE = os.environ.get("FORGEOPS_SQLITE_TEMP_STORE", "MEMORY")
+
+SQLITE_PRAGMAS: dict[str, str | int] = {
+    "journal_mode": SQLITE_JOURNAL_MODE,
+    "synchronous": SQLITE_SYNCHRONOUS,
+    "busy_timeout": SQLITE_BUSY_TIMEOUT_MS,
+    "mmap_size": SQLITE_MMAP_SIZE,
+    "cache_size": SQLITE_CACHE_SIZE,
+    "temp_store": SQLITE_TEMP_STORE,
+}
+
+# Pagination — list endpoints return at most PAGE_SIZE_MAX rows per call, and
+# PAGE_SIZE_DEFAULT when the caller does not ask for a limit.
+PAGE_SIZE_DEFAULT = int(os.environ.get("FORGEOPS_PAGE_SIZE_DEFAULT", "100"))
+PAGE_SIZE_MAX = int(os.environ.get("FORGEOPS_PAGE_SIZE_MAX", "1000"))
+
+# Hook dispatch — "sync" runs handlers on the committing thread; "async" hands
+# events to HOOK_WORKERS threads, each with a queue of HOOK_QUEUE_SIZE events.
+# HOOK_OVERFLOW says what a full queue does: "block" the writer, "drop" the
+# event, or "spill" it to a file under HOOK_SPILL_DIR until the worker catches
+# up. HOOK_TIMEOUT_S (unset = no limit) bounds how long one handler may run.
+HOOK_DISPATCH_MODE = os.environ.get("FORGEOPS_HOOK_DISPATCH_MODE", "sync")
+HOOK_WORKERS = int(os.environ.get("FORGEOPS_HOOK_WORKERS", "4"))
+HOOK_QUEUE_SIZE = int(os.environ.get("FORGEOPS_HOOK_QUEUE_SIZE", "1000"))
+HOOK_OVERFLOW = os.environ.get("FORGEOPS_HOOK_OVERFLOW", "block")
+HOOK_TIMEOUT_S = float(os.environ["FORGEOPS_HOOK_TIMEOUT_S"]) if os.environ.get("FORGEOPS_HOOK_TIMEOUT_S") else None
+HOOK_SPILL_DIR = Path(os.environ.get("FORGEOPS_HOOK_SPILL_DIR", str(BASE_DIR / "hook-spill")))
+
+# Event outbox — when on, each unit of work also writes its hook events to the
+# event_outbox table before committing, and `forgeops hooks-worker` (or an
+# in-process core.outbox.OutboxWorker) delivers them to webhook subscribers.
+# A failed delivery is retried after OUTBOX_BACKOFF_S * 2^(attempt-1) seconds,
+# capped at OUTBOX_BACKOFF_MAX_S, and dead-lettered after OUTBOX_MAX_ATTEMPTS.
+# Delivered events are kept for OUTBOX_RETAIN_S so event streams can resume.
+EVENT_OUTBOX = os.environ.get("FORGEOPS_EVENT_OUTBOX", "0") == "1"
+OUTBOX_BATCH_SIZE = int(os.environ.get("FORGEOPS_OUTBOX_BATCH_SIZE", "100"))
+OUTBOX_MAX_ATTEMPTS = int(os.environ.get("FORGEOPS_OUTBOX_MAX_ATTEMPTS", "8"))
+OUTBOX_BACKOFF_S = float(os.environ.get("FORGEOPS_OUTBOX_BACKOFF_S", "1"))
+OUTBOX_BACKOFF_MAX_S = float(os.environ.get("FORGEOPS_OUTBOX_BACKOFF_MAX_S", "300"))
+OUTBOX_HTTP_TIMEOUT_S = float(os.environ.get("FORGEOPS_OUTBOX_HTTP_TIMEOUT_S", "5"))
+OUTBOX_POLL_INTERVAL_S = float(os.environ.get("FORGEOPS_OUTBOX_POLL_INTERVAL_S", "1"))
+OUTBOX_RETAIN_S = float(os.environ.get("FORGEOPS_OUTBOX_RETAIN_S", "300"))
+
+# Event streams — GET /events/stream and /events/ws relay outbox events (so they
+# need EVENT_OUTBOX on in every writing process). The API polls the outbox every
+# STREAM_POLL_INTERVAL_S, or at once after its own commits. Each listener buffers
+# up to STREAM_QUEUE_SIZE events; one that falls further behind reads the outbox
+# at its own pace instead. Idle streams get a keepalive every STREAM_KEEPALIVE_S.
+STREAM_POLL_INTERVAL_S = float(os.environ.get("FORGEOPS_STREAM_POLL_INTERVAL_S", "0.5"))
+STREAM_QUEUE_SIZE = int(os.environ.get("FORGEOPS_STREAM_QUEUE_SIZE", "256"))
+STREAM_KEEPALIVE_S = float(os.environ.get("FORGEOPS_STREAM_KEEPALIVE_S", "15"))
+
+# Read cache — each process keeps up to READ_CACHE_REPOS repositories and the
+# READ_CACHE_ITEMS most recently read work items per database (0 disables one).
+# Every lookup first checks PRAGMA data_version, so a commit from any connection,
+# in this process or another, empties the cache before it can serve stale rows.
+READ_CACHE_REPOS = int(os.environ.get("FORGEOPS_READ_CACHE_REPOS", "512"))
+READ_CACHE_ITEMS = int(os.environ.get("FORGEOPS_READ_CACHE_ITEMS", "2048"))
+
+# Conditional GETs — read endpoints carry an ETag derived from the ledger
+# version and answer a matching If-None-Match with 304. The API keeps the last
+# RESPONSE_CACHE_SIZE response bodies for the current version (0 disables it).
+RESPONSE_CACHE_SIZE = int(os.environ.get("FORGEOPS_RESPONSE_CACHE_SIZE", "256"))
+
+# MCP resource subscriptions — while a client is subscribed, the MCP server
+# checks the activity log's change sequence every MCP_RESOURCE_POLL_INTERVAL_S
+# (and right after its own commits) and sends resources/updated notifications.
+MCP_RESOURCE_POLL_INTERVAL_S = float(os.environ.get("FORGEOPS_MCP_RESOURCE_POLL_INTERVAL_S", "1"))
+
+# Execution leases — an item entering executing gets a lease that expires after
+# LEASE_TTL_S unless its executor heartbeats. `forgeops lease-sweeper` (or an
+# in-process core.leases.LeaseSweeper) checks every LEASE_SWEEP_INTERVAL_S and
+# returns items with expired leases to LEASE_EXPIRED_STATE ("queued" or "assigned").
+LEASE_TTL_S = float(os.environ.get("FORGEOPS_LEASE_TTL_S", "300"))
+LEASE_SWEEP_INTERVAL_S = float(os.environ.get("FORGEOPS_LEASE_SWEEP_INTERVAL_S", "15"))
+LEASE_EXPIRED_STATE = os.environ.get("FORGEOPS_LEASE_EXPIRED_STATE", "queued")
+
 # Legacy paths (used only during migration)
 LEGACY_ISSUES_DIR = BASE_DIR / "issues"
 LEGACY_COUNTER_FILE = BASE_DIR / "issue_counter.txt"
@@ -0,0 +1,213 @@
+"""Batch execution — an ordered list of ledger operations run as one unit of work.
+
+Each operation is ``{"op": <name>, "args": {...}, "ref": <optional name>}``.
+A ``task_id`` or ``parent_id`` written as ``"$<ref>"`` (or ``"$<index>"``,
+counting from 0) is replaced by the id of the row an earlier operation in the
+same batch returned, so a batch can create a work item and then transition
+it. Other arguments are passed through as written, so user text such as a
+title of ``"$0"`` is never mistaken for a reference. The
+batch is all-or-nothing: the first failing operation raises BatchError and
+nothing is committed; hook events fire once, in order, after the commit.
+
+Usage:
+    from core.batch import run_batch
+
+    with unit_of_work(engine) as session:
+        steps = run_batch(session, [
+            {"op": "create_work_item", "ref": "wi", "args": {"title": "Fix login"}},
+            {"op": "transition", "args": {"task_id": "$wi", "state": "assigned"}},
+        ])
+"""
+
+import inspect
+import re
+from typing import Any, Callable, NamedTuple, Optional
+
+from sqlmodel import Session
+
+import core.database as db
+from models import (
+    ActivityLog,
+    Assignment,
+    Attachment,
+    ExecutionRecord,
+    ExecutionStatus,
+    ExecutorType,
+    Priority,
+    Review,
+    ReviewDecision,
+    WorkItem,
+    WorkItemState,
+)
+
+MAX_BATCH_OPERATIONS = 500
+
+_REFERENCE = re.compile(r"^\$([A-Za-z0-9_][\w-]*)$")
+
+# The only arguments that take a work item id, and so the only ones "$ref" is resolved in.
+_ID_ARGS = frozenset({"task_id", "parent_id"})
+
+
+class BatchError(Exception):
+    """Operation ``index`` of a batch failed; the whole batch was rolled back."""
+
+    def __init__(self, index: int, op: str, cause: Exception):
+        self.index = index
+        self.op = op
+        self.cause = cause
+        super().__init__(f"Operation {index} ({op}) failed: {cause}")
+
+
+class BatchStep(NamedTuple):
+    op: str
+    ref: Optional[str]
+    result: Any  # a model row, a list of rows, or None
+
+
+def _create_work_item(session, title: str, state: str = "queued", priority: str = "medium", **fields) -> WorkItem:
+    return db.create_work_item(session, title, state=WorkItemState(state), priority=Priority(priority), **fields)
+
+
+def _update_work_item(session, task_id: int, **fields) -> WorkItem:
+    if "priority" in fields:
+        fields["priority"] = Priority(fields["priority"])
+    unknown = set(fields) - {"title", "description", "priority", "parent_id"}
+    if unknown:
+        raise ValueError(f"Cannot update {', '.join(sorted(unknown))}")
+    item = db.update_work_item(session, task_id, **fields)
+    if item is None:
+        raise ValueError(f"Work item {task_id} not found")
+    return item
+
+
+def _transition(session, task_id: int, state: str, actor: Optional[str] = None) -> WorkItem:
+    return db.transition_work_item(session, task_id, WorkItemState(state), actor=actor)
+
+
+def _fast_track(session, task_id: int, state: str, actor: Optional[str] = None) -> WorkItem:
+    return db.fast_track_work_item(session, task_id, WorkItemState(state), actor=actor)
+
+
+def _block(session, task_id: int, reason: str, actor: Optional[str] = None) -> WorkItem:
+    return db.block_work_item(session, task_id, reason, actor=actor)
+
+
+def _unblock(session, task_id: int, actor: Optional[str] = None) -> WorkItem:
+    return db.unblock_work_item(session, task_id, actor=actor)
+
+
+def _assign(
+    session, task_id: int, executor: str, executor_type: str = "agent", actor: Optional[str] = None
+) -> Assignment:
+    _require_item(session, task_id)
+    return db.create_assignment(session, task_id, executor, ExecutorType(executor_type), actor=actor)
+
+
+def _log_run(session, task_id: int, executor: str, status: str, **fields) -> ExecutionRecord:
+    _require_item(session, task_id)
+    return db.create_execution_record(session, task_id, executor, ExecutionStatus(status), **fields)
+
+
+def _review(session, task_id: int, reviewer: str, decision: str, **fields) -> Review:
+    _require_item(session, task_id)
+    return db.create_review(session, task_id, reviewer, ReviewDecision(decision), **fields)
+
+
+def _attach(session, task_id: int, url_or_path: str, label: Optional[str] = None) -> Attachment:
+    _require_item(session, task_id)
+    return db.create_attachment(session, task_id, url_or_path, label=label)
+
+
+def _get_work_item(session, task_id: int) -> WorkItem:
+    return _require_item(session, task_id)
+
+
+def _activity(session, task_id: Optional[int] = None, limit: int = 50) -> list[ActivityLog]:
+    return db.get_activity_log(session, task_id=task_id, limit=limit)
+
+
+def _require_item(session, task_id: int) -> WorkItem:
+    item = db.get_work_item(session, task_id)
+    if item is None:
+        raise ValueError(f"Work item {task_id} not found")
+    return item
+
+
+OPERATIONS: dict[str, Callable[..., Any]] = {
+    "create_work_item": _create_work_item,
+    "update_work_item": _update_work_item,
+    "transition": _transition,
+    "fast_track": _fast_track,
+    "block": _block,
+    "unblock": _unblock,
+    "assign": _assign,
+    "log_run": _log_run,
+    "review": _review,
+    "attach": _attach,
+    "get_work_item": _get_work_item,
+    "activity": _activity,
+}
+
+# Primary key of each result type — what "$ref" resolves to.
+_ID_FIELDS = {
+    WorkItem: "task_id",
+    Assignment: "assignment_id",
+    ExecutionRecord: "run_id",
+    Review: "review_id",
+    Attachment: "attachment_id",
+}
+
+
+def run_batch(session: Session, operations: list[dict]) -> list[BatchStep]:
+    """Run ``operations`` in order inside the caller's unit of work and return one BatchStep each.
+
+    Raises BatchError for the first operation that fails (ValueError for an
+    oversized batch); the caller's unit of work then rolls back everything the
+    batch wrote.
+    """
+    if len(operations) > MAX_BATCH_OPERATIONS:
+        raise ValueError(f"A batch takes at most {MAX_BATCH_OPERATIONS} operations")
+    ids: dict[str, int] = {}
+    steps: list[BatchStep] = []
+    for index, operation in enumerate(operations):
+        name = operation.get("op", "")
+        try:
+            handler = OPERATIONS.get(name)
+            if handler is None:
+                raise ValueError(f"Unknown operation '{name}'; expected one of {', '.join(OPERATIONS)}")
+            ref = operation.get("ref")
+            if ref is not None and (not isinstance(ref, str) or ref.isdigit() or not _REFERENCE.match(f"${ref}")):
+                raise ValueError(f"Invalid ref {ref!r}; use letters, digits, '_' or '-', not only digits")
+            if ref in ids:
+                raise ValueError(f"Duplicate ref '{ref}'")
+            args = {
+                key: _resolve(value, ids) if key in _ID_ARGS else value
+                for key, value in (operation.get("args") or {}).items()
+            }
+            try:
+                inspect.signature(handler).bind(session, **args)
+            except TypeError as e:
+                raise ValueError(f"Bad arguments: {e}") from None
+            result = handler(session, **args)
+        except Exception as e:
+            raise BatchError(index, name, e) from e
+
+        id_field = _ID_FIELDS.get(type(result))
+        if id_field:
+            ids[str(index)] = getattr(result, id_field)
+            if ref is not None:
+                ids[ref] = ids[str(index)]
+        steps.append(BatchStep(name, ref, result))
+    return steps
+
+
+def _resolve(value: Any, ids: dict[str, int]) -> Any:
+    if not isinstance(value, str):
+        return value
+    match = _REFERENCE.match(value)
+    if match is None:
+        return value
+    name = match.group(1)
+    if name not in ids:
+        raise ValueError(f"Reference '{value}' does not name an earlier operation that returned an id")
+    return ids[name]
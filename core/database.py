@@ -3,22 +3,65 @@
 Single source of truth — all interfaces (CLI, API) read and write through this module.
 """
 
-from datetime import UTC, datetime
+import base64
+import json
+import os
+import threading
+import weakref
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import UTC, datetime, timedelta
 from pathlib import Path
-from typing import Optional
-
-from sqlalchemy.orm import selectinload
-from sqlmodel import Session, SQLModel, col, create_engine, select
-
-from config import DB_PATH
+from typing import Iterable, Iterator, NamedTuple, Optional
+
+from sqlalchemy import (
+    Engine,
+    String,
+    bindparam,
+    case,
+    delete,
+    event,
+    false,
+    insert,
+    literal,
+    or_,
+    true,
+    tuple_,
+    union,
+    update,
+)
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import aliased, make_transient_to_detached, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.schema import CreateColumn
+from sqlmodel import Session, SQLModel, col, create_engine, func, select
+
+from config import (
+    DB_PATH,
+    EVENT_OUTBOX,
+    LEASE_TTL_S,
+    PAGE_SIZE_DEFAULT,
+    PAGE_SIZE_MAX,
+    READ_CACHE_ITEMS,
+    READ_CACHE_REPOS,
+    SQLITE_PRAGMAS,
+)
 from models import (
     ActivityAction,
     ActivityLog,
     Assignment,
     Attachment,
+    ConcurrencySlot,
+    ExecutionLease,
     ExecutionRecord,
     ExecutionStatus,
     ExecutorType,
+    LedgerVersion,
+    PRIORITY_RANK,
+    OutboxDeadLetter,
+    OutboxEvent,
+    OutboxSubscriber,
     Priority,
     RepoStatus,
     Repository,
@@ -29,17 +72,564 @@ from models import (
 )
 
 
-def get_engine(db_path: Optional[str | Path] = None):
+# Bump whenever models.py gains tables or indexes. Databases stamped with an
+# older PRAGMA user_version are brought up to date by create_db_and_tables();
+# current ones skip DDL and reflection entirely.
+SCHEMA_VERSION = 15
+
+# Children in these states count toward their parent's children_done.
+DONE_STATES = frozenset({WorkItemState.accepted, WorkItemState.closed})
+
+_engines: dict[str, Engine] = {}
+_engines_lock = threading.Lock()
+
+
+def get_engine(db_path: Optional[str | Path] = None, *, pragmas: Optional[dict[str, str | int]] = None):
+    """Return the process-wide engine for a database path.
+
+    Engines carrying the configured SQLite profile are cached per resolved path,
+    so every command, request and completion in a process shares one pool.
+    ``pragmas`` overrides ``config.SQLITE_PRAGMAS`` (``{}`` for a bare connection)
+    and always builds a fresh, uncached engine.
+    """
     path = db_path or DB_PATH
-    return create_engine(f"sqlite:///{path}", echo=False)
+    if pragmas is not None:
+        return _build_engine(path, pragmas)
+    key = os.path.abspath(path)
+    engine = _engines.get(key)
+    if engine is None:
+        with _engines_lock:
+            engine = _engines.get(key)
+            if engine is None:
+                engine = _engines[key] = _build_engine(path, SQLITE_PRAGMAS)
+    return engine
+
+
+def dispose_engines() -> None:
+    """Dispose and forget every cached engine (shutdown, tests)."""
+    with _engines_lock:
+        for engine in _engines.values():
+            engine.dispose()
+        _engines.clear()
+
+
+def _build_engine(path: str | Path, pragmas: dict[str, str | int]) -> Engine:
+    engine = create_engine(f"sqlite:///{path}", echo=False)
+    if pragmas:
+        event.listen(engine, "connect", _sqlite_profile_listener(pragmas))
+    return engine
+
+
+def _sqlite_profile_listener(pragmas: dict[str, str | int]):
+    def apply_pragmas(dbapi_connection, _connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+    return apply_pragmas
 
 
 def create_db_and_tables(db_path: Optional[str | Path] = None):
+    """Return the shared engine for ``db_path``, creating or upgrading the schema if needed.
+
+    The fast path is a single ``PRAGMA user_version`` read: when the stored
+    version matches SCHEMA_VERSION no DDL or table reflection is issued.
+    """
     engine = get_engine(db_path)
-    SQLModel.metadata.create_all(engine)
+    with engine.connect() as conn:
+        if _schema_version(conn) == SCHEMA_VERSION:
+            return engine
+    _upgrade_schema(engine)
     return engine
 
 
+def _schema_version(conn) -> int:
+    return conn.exec_driver_sql("PRAGMA user_version").scalar() or 0
+
+
+def _upgrade_schema(engine) -> None:
+    with engine.connect() as conn:
+        # Take the write lock first so concurrent first runs don't race create_all.
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+        if _schema_version(conn) != SCHEMA_VERSION:
+            # Replaced by concurrency_slots counters, which allow more than one executing item per repository.
+            conn.exec_driver_sql("DROP INDEX IF EXISTS ux_work_items_executing_repo")
+            SQLModel.metadata.create_all(conn)
+            _autoincrement_outbox(conn)
+            # create_all skips existing tables wholesale, including columns and indexes added to them since.
+            _add_missing_columns(conn)
+            for table in SQLModel.metadata.sorted_tables:
+                for index in table.indexes:
+                    try:
+                        index.create(conn, checkfirst=True)
+                    except IntegrityError as e:
+                        raise RuntimeError(
+                            f"Cannot upgrade {table.name}: existing rows violate {index.name} ({e.orig}). "
+                            "Resolve the duplicates and reopen the ledger."
+                        ) from None
+            _recount_children(conn)
+            _rank_priorities(conn)
+            _lease_executing(conn)
+            _recount_slots(conn)
+            conn.exec_driver_sql(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        conn.commit()
+
+
+def _add_missing_columns(conn) -> None:
+    """ALTER TABLE ... ADD COLUMN for model columns an older database lacks.
+
+    New NOT NULL columns must carry a server_default so existing rows get a value.
+    """
+    for table in SQLModel.metadata.sorted_tables:
+        existing = {row[1] for row in conn.exec_driver_sql(f"PRAGMA table_info({table.name})")}
+        for column in table.columns:
+            if column.name not in existing:
+                ddl = CreateColumn(column).compile(dialect=conn.dialect)
+                conn.exec_driver_sql(f"ALTER TABLE {table.name} ADD COLUMN {ddl}")
+
+
+def _autoincrement_outbox(conn) -> None:
+    """Rebuild an event_outbox created without AUTOINCREMENT, continuing its sequence past every issued id.
+
+    Plain rowids restart at 1 once pruning empties the table, behind every
+    subscriber offset and stream cursor.
+    """
+    ddl = conn.exec_driver_sql("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'event_outbox'").scalar()
+    if "AUTOINCREMENT" in ddl.upper():
+        return
+    table = OutboxEvent.__table__
+    issued = conn.execute(
+        select(
+            func.max(
+                func.coalesce(select(func.max(table.c.event_id)).scalar_subquery(), 0),
+                func.coalesce(select(func.max(OutboxSubscriber.__table__.c.last_event_id)).scalar_subquery(), 0),
+                func.coalesce(select(func.max(OutboxDeadLetter.__table__.c.event_id)).scalar_subquery(), 0),
+            )
+        )
+    ).scalar()
+    columns = ", ".join(table.columns.keys())
+    conn.exec_driver_sql("ALTER TABLE event_outbox RENAME TO event_outbox_old")
+    table.create(conn)
+    conn.exec_driver_sql(f"INSERT INTO event_outbox ({columns}) SELECT {columns} FROM event_outbox_old")
+    conn.exec_driver_sql("DROP TABLE event_outbox_old")
+    conn.exec_driver_sql("DELETE FROM sqlite_sequence WHERE name = 'event_outbox'")
+    conn.exec_driver_sql("INSERT INTO sqlite_sequence (name, seq) VALUES ('event_outbox', ?)", (issued,))
+
+
+def _recount_children(conn) -> None:
+    """Rebuild every children_total / children_done counter from the parent_id links."""
+    child = WorkItem.__table__.alias("child")
+    parent = WorkItem.__table__
+    children = select(func.count()).where(child.c.parent_id == parent.c.task_id)
+    conn.execute(
+        update(parent).values(
+            children_total=children.scalar_subquery(),
+            children_done=children.where(child.c.state.in_(DONE_STATES)).scalar_subquery(),
+        )
+    )
+
+
+def _rank_priorities(conn) -> None:
+    """Derive priority_rank from priority for every row (older ledgers predate the column)."""
+    table = WorkItem.__table__
+    rank = case({priority.name: rank for priority, rank in PRIORITY_RANK.items()}, value=table.c.priority, else_=2)
+    conn.execute(update(table).values(priority_rank=rank))
+
+
+def _lease_executing(conn) -> None:
+    """Give every executing item without a lease a fresh one (older ledgers predate execution_leases)."""
+    now = datetime.now(UTC)
+    items = WorkItem.__table__
+    conn.execute(
+        insert(ExecutionLease.__table__)
+        .prefix_with("OR IGNORE")
+        .from_select(
+            ["task_id", "started_at", "expires_at"],
+            select(
+                items.c.task_id,
+                literal(now, ExecutionLease.__table__.c.started_at.type),
+                literal(now + timedelta(seconds=LEASE_TTL_S), ExecutionLease.__table__.c.expires_at.type),
+            ).where(items.c.state == WorkItemState.executing.name),
+        )
+    )
+
+
+def _recount_slots(conn, repo_id: Optional[int] = None) -> None:
+    """Rebuild concurrency_slots, and the scopes each lease records, from executing items and current policies.
+
+    Runs on schema upgrade and when a repository's policy or default branch
+    changes, so counters always match the policy in force.
+    """
+    from core.state_engine import compile_concurrency
+
+    items, repos, leases, slots = (
+        WorkItem.__table__,
+        Repository.__table__,
+        ExecutionLease.__table__,
+        ConcurrencySlot.__table__,
+    )
+    assignments = Assignment.__table__
+    assignee = (
+        select(assignments.c.executor)
+        .where(assignments.c.task_id == items.c.task_id)
+        .order_by(assignments.c.assigned_at.desc(), assignments.c.assignment_id.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+    stmt = (
+        select(
+            items.c.task_id,
+            items.c.repo_id,
+            func.coalesce(items.c.branch, repos.c.default_branch),
+            repos.c.concurrency,
+            assignee,
+        )
+        .join(repos, repos.c.repo_id == items.c.repo_id)
+        .where(items.c.state == WorkItemState.executing.name)
+    )
+    if repo_id is not None:
+        stmt = stmt.where(items.c.repo_id == repo_id)
+
+    counts: dict[str, dict] = {}
+    held = []
+    for task_id, item_repo_id, branch, concurrency, executor in conn.execute(stmt).all():
+        scopes = _slot_scopes(compile_concurrency(concurrency), item_repo_id, branch, executor)
+        for scope, _, _, capacity in scopes:
+            entry = counts.setdefault(scope, {"scope": scope, "repo_id": item_repo_id, "used": 0, "capacity": capacity})
+            entry["used"] += 1
+        held.append({"b_task_id": task_id, "b_slots": json.dumps([scope for scope, *_ in scopes]) if scopes else None})
+
+    conn.execute(delete(slots) if repo_id is None else delete(slots).where(slots.c.repo_id == repo_id))
+    if counts:
+        conn.execute(insert(slots), list(counts.values()))
+    if held:
+        conn.execute(
+            update(leases).where(leases.c.task_id == bindparam("b_task_id")).values(slots=bindparam("b_slots")), held
+        )
+
+
+# --- Unit of work -------------------------------------------------------------
+
+_PENDING_HOOKS = "forgeops_pending_hooks"
+_PENDING_CONFLICTS = "forgeops_pending_conflicts"
+_UNIT = "forgeops_unit_of_work"
+_REPO_INFO = "forgeops_repo_info"
+
+
+@contextmanager
+def unit_of_work(engine, *, immediate: bool = True, versioned: bool = True) -> Iterator[Session]:
+    """Run one or more ledger operations as a single transaction.
+
+    Every function in this module accepts either an engine or the yielded
+    session. Given the session, it joins this unit instead of opening its own:
+    rows and their activity entries are flushed together and committed once on
+    exit, or rolled back together on error. Hook events queued by the
+    operations fire in order after the commit; with EVENT_OUTBOX on they are
+    also written to event_outbox inside the transaction. on_repo_conflict fires
+    once the transaction has ended either way, so its handlers can write.
+
+    ``immediate`` takes the SQLite write lock up front (``BEGIN IMMEDIATE``) so
+    a read-then-write unit can't fail on a stale WAL snapshot.
+
+    A unit that changed any row also bumps the ledger version (see
+    get_ledger_version). ``versioned=False`` is for bookkeeping that no read
+    endpoint shows, such as outbox delivery offsets.
+    """
+    with Session(engine, expire_on_commit=False) as session:
+        session.info[_WRITTEN] = True
+        session.info[_UNIT] = True
+        if immediate:
+            session.connection().exec_driver_sql("BEGIN IMMEDIATE")
+        changes = _total_changes(session) if versioned else None
+        try:
+            yield session
+            if EVENT_OUTBOX:
+                _record_outbox(session)
+            if versioned:
+                session.flush()
+                if _total_changes(session) != changes:
+                    _bump_ledger_version(session)
+            session.commit()
+        except BaseException:
+            session.rollback()
+            _fire_conflicts(session)
+            raise
+        pending = session.info.pop(_PENDING_HOOKS, [])
+
+    from core.hooks import hooks
+
+    hooks.fire_many(pending)
+    _fire_conflicts(session)  # conflicts a caller caught before committing
+
+
+@contextmanager
+def _reading(bind) -> Iterator[Session]:
+    """Yield ``bind`` if it is already a session, otherwise a short-lived read session."""
+    if isinstance(bind, Session):
+        yield bind
+    else:
+        with Session(bind) as session:
+            yield session
+
+
+@contextmanager
+def _writing(bind) -> Iterator[Session]:
+    """Yield ``bind`` if it is already a session, otherwise a fresh unit of work."""
+    if isinstance(bind, Session):
+        bind.info[_WRITTEN] = True
+        yield bind
+    else:
+        with unit_of_work(bind) as session:
+            yield session
+
+
+def _total_changes(session: Session) -> int:
+    """Rows inserted, updated or deleted on the session's connection since it was opened (no statement issued)."""
+    return session.connection().connection.driver_connection.total_changes
+
+
+def _bump_ledger_version(session: Session) -> None:
+    table = LedgerVersion.__table__
+    stmt = sqlite_insert(table).values(id=1, version=1)
+    session.execute(stmt.on_conflict_do_update(index_elements=[table.c.id], set_={"version": table.c.version + 1}))
+
+
+def get_ledger_version(engine) -> int:
+    """How many units of work have changed the ledger, in any process: a single primary key read.
+
+    Heartbeats renew leases outside any unit of work and do not move it.
+    """
+    with _reading(engine) as session:
+        return session.exec(select(LedgerVersion.version).where(LedgerVersion.id == 1)).first() or 0
+
+
+def _queue_hook(session: Session, event, payload: dict) -> None:
+    """Defer a hook event until the session's unit of work commits."""
+    session.info.setdefault(_PENDING_HOOKS, []).append((event, payload))
+
+
+def _hook_context(
+    session: Session,
+    repo_id: Optional[int],
+    priority: Optional[Priority],
+    title: Optional[str],
+    parent_id: Optional[int],
+) -> dict:
+    """Item fields every work item hook payload carries, so handlers don't have to re-read the item."""
+    return {
+        "repo": _repo_info(session, repo_id).name,
+        "priority": priority.value if priority else None,
+        "title": title,
+        "parent_id": parent_id,
+    }
+
+
+class _RepoInfo(NamedTuple):
+    name: Optional[str] = None
+    workflow: Optional[str] = None
+    concurrency: Optional[str] = None
+    default_branch: Optional[str] = None
+
+
+def _repo_info(session: Session, repo_id: Optional[int]) -> _RepoInfo:
+    """A repository's name and policies, read once per unit of work (the identity map alone is weak and may drop it)."""
+    if repo_id is None:
+        return _RepoInfo()
+    cache = session.info.setdefault(_REPO_INFO, {})
+    if repo_id not in cache:
+        shared = _read_cache(session, repos=True)
+        generation = shared.validate() if shared else None
+        info = shared.get(shared.repo_info, repo_id) if shared else None
+        if info is None:
+            row = session.exec(
+                select(*(getattr(Repository, field) for field in _RepoInfo._fields)).where(
+                    Repository.repo_id == repo_id
+                )
+            ).first()
+            info = _RepoInfo(*row) if row else _RepoInfo()
+            if shared and row:
+                shared.put(shared.repo_info, repo_id, info, generation)
+        cache[repo_id] = info
+    return cache[repo_id]
+
+
+def _workflow(session: Session, repo_id: Optional[int]):
+    """The compiled workflow that governs items in ``repo_id``."""
+    from core.state_engine import compile_workflow
+
+    return compile_workflow(_repo_info(session, repo_id).workflow)
+
+
+def _concurrency(session: Session, repo_id: int):
+    """The concurrency policy that caps executing items in ``repo_id``."""
+    from core.state_engine import compile_concurrency
+
+    return compile_concurrency(_repo_info(session, repo_id).concurrency)
+
+
+def _record_outbox(session: Session) -> None:
+    """Insert the unit's queued hook events into event_outbox with one executemany."""
+    pending = session.info.get(_PENDING_HOOKS)
+    if not pending:
+        return
+    now = datetime.now(UTC)
+    session.execute(
+        insert(OutboxEvent.__table__),
+        [
+            {
+                "event": event.value,
+                "task_id": payload.get("task_id"),
+                "payload": json.dumps(payload, default=str),
+                "created_at": now,
+            }
+            for event, payload in pending
+        ],
+    )
+
+
+# --- Read cache ---------------------------------------------------------------
+
+# Set on sessions that have been written through: their rows may be uncommitted, so
+# work items and Repository objects are read from the session itself, not the cache.
+_WRITTEN = "forgeops_written"
+# Set on sessions that changed repositories: every repository lookup reads the session.
+_REPOS_CHANGED = "forgeops_repos_changed"
+
+
+class _ReadCache:
+    """Process-wide read-through cache of repositories and recently read work items for one database.
+
+    Entries are column snapshots handed out as fresh detached instances, so no
+    two callers share an object. Every lookup first reads ``PRAGMA data_version``
+    on a connection the cache keeps for itself. That value changes whenever any
+    other connection commits, in this process or another, and a change empties
+    the cache. The pragma reads no pages, unlike the SELECT it saves. Entries
+    read before an emptying are not stored after it (``generation``).
+    """
+
+    def __init__(self, engine: Engine, repo_size: int = READ_CACHE_REPOS, item_size: int = READ_CACHE_ITEMS):
+        self._engine = weakref.ref(engine)  # the engine owns the cache, not the other way round
+        self.repo_size = repo_size
+        self.item_size = item_size
+        self.repos: OrderedDict[str, dict] = OrderedDict()  # name -> Repository columns
+        self.repo_info: OrderedDict[int, _RepoInfo] = OrderedDict()  # repo_id -> _RepoInfo
+        self.items: OrderedDict[int, tuple[dict, Optional[dict]]] = OrderedDict()  # task_id -> (item, repository)
+        self.generation = 0
+        self._lock = threading.Lock()
+        self._watch = None
+        self._data_version = None
+
+    def validate(self) -> int:
+        """Empty the cache if anything committed since the last check; return the generation to store under."""
+        with self._lock:
+            if self._watch is None:
+                # Outside the pool: waiting for a pooled connection here could deadlock with a writer.
+                engine = self._engine()
+                cargs, cparams = engine.dialect.create_connect_args(engine.url)
+                self._watch = engine.dialect.connect(*cargs, **cparams)
+            cursor = self._watch.cursor()
+            try:
+                cursor.execute("PRAGMA data_version")
+                data_version = cursor.fetchone()[0]
+            finally:
+                cursor.close()
+            if data_version != self._data_version:
+                self._clear()
+                self._data_version = data_version
+            return self.generation
+
+    def get(self, store: OrderedDict, key):
+        with self._lock:
+            value = store.get(key)
+            if value is not None:
+                store.move_to_end(key)
+            return value
+
+    def put(self, store: OrderedDict, key, value, generation: int) -> None:
+        size = self.item_size if store is self.items else self.repo_size
+        with self._lock:
+            if generation != self.generation or not size:
+                return
+            store[key] = value
+            store.move_to_end(key)
+            while len(store) > size:
+                store.popitem(last=False)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._watch is not None:
+                self._watch.close()
+                self._watch = None
+            self._data_version = None
+            self._clear()
+
+    def _clear(self) -> None:
+        self.repos.clear()
+        self.repo_info.clear()
+        self.items.clear()
+        self.generation += 1
+
+
+_read_caches: weakref.WeakKeyDictionary[Engine, _ReadCache] = weakref.WeakKeyDictionary()
+
+
+def _read_cache(session: Session, *, repos: bool = False) -> Optional[_ReadCache]:
+    """The read cache for ``session``'s database, or None where it must read its own rows.
+
+    ``repos`` asks for repository ids and policies only, which a session that
+    wrote other tables may still take from the cache.
+    """
+    if session.info.get(_REPOS_CHANGED) or (session.info.get(_WRITTEN) and not repos):
+        return None
+    if not (READ_CACHE_REPOS if repos else READ_CACHE_ITEMS):
+        return None
+    engine = session.get_bind()
+    if not isinstance(engine, Engine) or engine.url.database in (None, "", ":memory:"):
+        return None  # a watcher connection would open a database of its own
+    cache = _read_caches.get(engine)
+    if cache is None:
+        with _engines_lock:
+            cache = _read_caches.get(engine)
+            if cache is None:
+                cache = _read_caches[engine] = _ReadCache(engine)
+                event.listen(engine, "engine_disposed", lambda _engine: cache.close())
+    return cache
+
+
+def _columns(row) -> dict:
+    return {column.key: getattr(row, column.key) for column in row.__table__.columns}
+
+
+def _detached(model, values: dict):
+    """A detached instance carrying ``values``, as if loaded by a session that has since closed."""
+    obj = model(**values)
+    make_transient_to_detached(obj)
+    return obj
+
+
+def _repository_row(session: Session, name: str) -> Optional[dict]:
+    """The columns of the repository named ``name``, read through the cache."""
+    cache = _read_cache(session, repos=True)
+    generation = cache.validate() if cache else None
+    row = cache.get(cache.repos, name) if cache else None
+    if row is None:
+        repo = session.exec(select(Repository).where(Repository.name == name)).first()
+        if repo is None:
+            return None
+        row = _columns(repo)
+        if cache:
+            cache.put(cache.repos, name, row, generation)
+    return row
+
+
+def _repo_id_by_name(session: Session, name: str) -> Optional[int]:
+    row = _repository_row(session, name)
+    return row["repo_id"] if row else None
+
+
 # --- Repository CRUD ----------------------------------------------------------
 
 
@@ -57,10 +647,11 @@ def add_repository(
     deploy_target: Optional[str] = None,
     notes: Optional[str] = None,
 ) -> Repository:
-    with Session(engine) as session:
+    with _writing(engine) as session:
         existing = session.exec(select(Repository).where(Repository.name == name)).first()
         if existing:
             return existing
+        session.info[_REPOS_CHANGED] = True
         repo = Repository(
             name=name,
             org=org,
@@ -74,18 +665,21 @@ def add_repository(
             notes=notes,
         )
         session.add(repo)
-        session.commit()
-        session.refresh(repo)
+        session.flush()
         return repo
 
 
 def get_repository(engine, name: str) -> Optional[Repository]:
-    with Session(engine) as session:
-        return session.exec(select(Repository).where(Repository.name == name)).first()
+    """The repository named ``name``; outside a writing session, a detached copy from the read cache."""
+    with _reading(engine) as session:
+        if session.info.get(_WRITTEN):
+            return session.exec(select(Repository).where(Repository.name == name)).first()
+        row = _repository_row(session, name)
+        return _detached(Repository, row) if row else None
 
 
 def get_repositories(engine, *, include_archived: bool = False) -> list[Repository]:
-    with Session(engine) as session:
+    with _reading(engine) as session:
         stmt = select(Repository).order_by(Repository.name)
         if not include_archived:
             stmt = stmt.where(Repository.status == RepoStatus.active)
@@ -93,29 +687,86 @@ def get_repositories(engine, *, include_archived: bool = False) -> list[Reposito
 
 
 def update_repository(engine, name: str, **kwargs) -> Optional[Repository]:
-    with Session(engine) as session:
+    """Set the given fields; ``workflow`` and ``concurrency`` are validated first.
+
+    ``workflow`` takes a preset name, a transition map or None; ``concurrency`` a
+    ConcurrencyPolicy mapping or None. Changing the policy or the default branch
+    recounts the repository's concurrency slots from its executing items.
+    """
+    if "workflow" in kwargs:
+        from core.state_engine import normalize_workflow
+
+        kwargs["workflow"] = normalize_workflow(kwargs["workflow"])
+    if "concurrency" in kwargs:
+        from core.state_engine import normalize_concurrency
+
+        kwargs["concurrency"] = normalize_concurrency(kwargs["concurrency"])
+    with _writing(engine) as session:
         repo = session.exec(select(Repository).where(Repository.name == name)).first()
         if not repo:
             return None
+        session.info[_REPOS_CHANGED] = True
+        session.info.get(_REPO_INFO, {}).pop(repo.repo_id, None)
         for key, value in kwargs.items():
             if hasattr(repo, key):
                 setattr(repo, key, value)
         session.add(repo)
-        session.commit()
-        session.refresh(repo)
+        session.flush()
+        if "concurrency" in kwargs or "default_branch" in kwargs:
+            _recount_slots(session.connection(), repo.repo_id)
         return repo
 
 
 def remove_repository(engine, name: str) -> bool:
-    with Session(engine) as session:
+    with _writing(engine) as session:
         repo = session.exec(select(Repository).where(Repository.name == name)).first()
         if not repo:
             return False
+        session.info[_REPOS_CHANGED] = True
+        session.info.get(_REPO_INFO, {}).pop(repo.repo_id, None)
         session.delete(repo)
-        session.commit()
+        session.flush()
         return True
 
 
+_REPO_FIELDS = ("org", "default_branch", "url", "description", "local_path", "language", "deploy_target", "notes")
+
+
+def add_repositories_bulk(engine, repos: Iterable[str | dict]) -> dict[str, int]:
+    """Register many repositories in one transaction.
+
+    Each entry is a name or a dict of add_repository() fields (``name`` required).
+    Names already registered are left untouched. Returns name -> repo_id for every entry.
+    """
+    specs = [{"name": r} if isinstance(r, str) else r for r in repos]
+    if not specs:
+        return {}
+    names = [spec["name"] for spec in specs]
+    with _writing(engine) as session:
+        seen = set(_repo_ids_by_name(session, names))
+        rows = []
+        for spec in specs:
+            if spec["name"] in seen:
+                continue
+            seen.add(spec["name"])
+            row = {field: spec.get(field) for field in _REPO_FIELDS}
+            row.update(name=spec["name"], status=RepoStatus(spec.get("status") or RepoStatus.active))
+            rows.append(row)
+        if rows:
+            session.info[_REPOS_CHANGED] = True
+            session.execute(insert(Repository.__table__), rows)
+        return _repo_ids_by_name(session, names)
+
+
+def _repo_ids_by_name(session: Session, names: Iterable[str]) -> dict[str, int]:
+    """Resolve repository names to ids in a single query."""
+    unique = list(set(names))
+    if not unique:
+        return {}
+    stmt = select(Repository.name, Repository.repo_id).where(col(Repository.name).in_(unique))
+    return {name: repo_id for name, repo_id in session.exec(stmt).all()}
+
+
 # --- WorkItem CRUD ------------------------------------------------------------
 
 
@@ -129,39 +780,148 @@ def create_work_item(
     priority: Priority = Priority.medium,
     parent_id: Optional[int] = None,
     created_by: Optional[str] = None,
+    branch: Optional[str] = None,
 ) -> WorkItem:
-    with Session(engine) as session:
-        repo_id = None
-        if repo_name:
-            repo = session.exec(select(Repository).where(Repository.name == repo_name)).first()
-            if repo:
-                repo_id = repo.repo_id
+    with _writing(engine) as session:
+        repo_id = _repo_id_by_name(session, repo_name) if repo_name else None
+        scopes = _start_executing(session, None, repo_id, branch) if state == WorkItemState.executing else []
         item = WorkItem(
             title=title,
             repo_id=repo_id,
             description=description,
+            branch=branch,
             state=state,
             priority=priority,
+            priority_rank=PRIORITY_RANK[priority],
             parent_id=parent_id,
             created_by=created_by,
         )
         session.add(item)
-        session.commit()
-        session.refresh(item)
+        session.flush()
+        _adjust_rollup(session, parent_id, total=1, done=int(state in DONE_STATES))
+        _track_leases(session, [(item.task_id, None, state)], item.created_at, slots={item.task_id: scopes})
 
         _log_activity(
             session, item.task_id, ActivityAction.created, detail=f"Created in state {state.value}", actor=created_by
         )
-        session.refresh(item)
         return item
 
 
-def get_work_item(engine, task_id: int) -> Optional[WorkItem]:
-    with Session(engine) as session:
-        stmt = (
-            select(WorkItem).where(WorkItem.task_id == task_id).options(selectinload(WorkItem.repository))  # type: ignore[arg-type]
+def create_work_items_bulk(engine, items: Iterable[dict], *, created_by: Optional[str] = None) -> list[int]:
+    """Create many work items and their ``created`` activity entries in one transaction.
+
+    Each dict takes the keyword arguments of create_work_item() plus ``title``; a
+    per-item ``created_by`` overrides the call-level default. Repository names are
+    resolved with one query (unknown names leave repo_id empty, as in create_work_item)
+    and rows go out as executemany batches. Returns task_ids in input order.
+    """
+    specs = list(items)
+    if not specs:
+        return []
+    for index, spec in enumerate(specs):
+        if not isinstance(spec, dict):
+            raise ValueError(f"Item {index}: expected an object, got {type(spec).__name__}")
+    with _writing(engine) as session:
+        repo_ids = _repo_ids_by_name(session, (s["repo_name"] for s in specs if s.get("repo_name")))
+        now = datetime.now(UTC)
+        rows = [_work_item_row(index, spec, repo_ids, now, created_by) for index, spec in enumerate(specs)]
+        starting = [row for row in rows if row["state"] == WorkItemState.executing]
+        plans = _plan_slots(session, [(None, row["repo_id"], row["branch"]) for row in starting])
+        for plan in plans:
+            if isinstance(plan, Exception):
+                raise ValueError(f"Items would exceed a repository's concurrency policy: {plan}")
+
+        # SQLite hands a rowid table max(rowid) + 1 for each insert, and the write lock
+        # is held, so the new ids are exactly those above the current maximum, in input
+        # order. That keeps the insert a single executemany; RETURNING would force the
+        # driver back to one statement per row.
+        before = session.exec(select(func.coalesce(func.max(WorkItem.task_id), 0))).one()
+        session.execute(insert(WorkItem.__table__), rows)
+        task_ids = list(
+            session.exec(select(WorkItem.task_id).where(col(WorkItem.task_id) > before).order_by(WorkItem.task_id))
         )
-        return session.exec(stmt).first()
+        if len(task_ids) != len(rows):
+            raise RuntimeError("Bulk insert raced with another writer; task_ids cannot be matched to input rows")
+
+        session.execute(
+            insert(ActivityLog.__table__),
+            [
+                {
+                    "task_id": task_id,
+                    "action": ActivityAction.created,
+                    "detail": f"Created in state {row['state'].value}",
+                    "actor": row["created_by"],
+                    "created_at": now,
+                }
+                for task_id, row in zip(task_ids, rows)
+            ],
+        )
+
+        rollups: dict[int, list[int]] = {}
+        for row in rows:
+            if row["parent_id"] is not None:
+                counts = rollups.setdefault(row["parent_id"], [0, 0])
+                counts[0] += 1
+                counts[1] += row["state"] in DONE_STATES
+        for parent_id, (total, done) in rollups.items():
+            _adjust_rollup(session, parent_id, total=total, done=done)
+        _take_slots(session, plans)
+        held = iter([scope for scope, *_ in plan] for plan in plans)
+        _track_leases(
+            session,
+            [(task_id, None, row["state"]) for task_id, row in zip(task_ids, rows)],
+            now,
+            slots={
+                task_id: next(held) for task_id, row in zip(task_ids, rows) if row["state"] == WorkItemState.executing
+            },
+        )
+        return task_ids
+
+
+def _work_item_row(index: int, spec: dict, repo_ids: dict[str, int], now: datetime, created_by: Optional[str]) -> dict:
+    title = spec.get("title")
+    if not title:
+        raise ValueError(f"Item {index}: title is required")
+    try:
+        state = WorkItemState(spec.get("state") or WorkItemState.queued)
+        priority = Priority(spec.get("priority") or Priority.medium)
+    except ValueError as e:
+        raise ValueError(f"Item {index}: {e}") from None
+    return {
+        "title": title,
+        "repo_id": repo_ids.get(spec.get("repo_name") or ""),
+        "description": spec.get("description"),
+        "branch": spec.get("branch"),
+        "state": state,
+        "priority": priority,
+        "priority_rank": PRIORITY_RANK[priority],
+        "is_blocked": False,
+        "blocked_reason": None,
+        "parent_id": spec.get("parent_id"),
+        "created_by": spec.get("created_by", created_by),
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+def get_work_item(engine, task_id: int) -> Optional[WorkItem]:
+    """The item with its repository; outside a writing session, a detached copy from the read cache."""
+    with _reading(engine) as session:
+        cache = _read_cache(session)
+        generation = cache.validate() if cache else None
+        entry = cache.get(cache.items, task_id) if cache else None
+        if entry is None:
+            stmt = (
+                select(WorkItem).where(WorkItem.task_id == task_id).options(selectinload(WorkItem.repository))  # type: ignore[arg-type]
+            )
+            item = session.exec(stmt).first()
+            if item is None or cache is None:
+                return item
+            entry = (_columns(item), _columns(item.repository) if item.repository else None)
+            cache.put(cache.items, task_id, entry, generation)
+        item = _detached(WorkItem, entry[0])
+        set_committed_value(item, "repository", _detached(Repository, entry[1]) if entry[1] else None)
+        return item
 
 
 def list_work_items(
@@ -173,53 +933,194 @@ def list_work_items(
     priority: Optional[Priority] = None,
     parent_id: Optional[int] = None,
 ) -> list[WorkItem]:
-    with Session(engine) as session:
-        stmt = (
-            select(WorkItem)
-            .options(selectinload(WorkItem.repository))  # type: ignore[arg-type]
-            .order_by(WorkItem.task_id)
+    """Every matching item, by task_id. Interfaces should page with list_work_items_page()."""
+    with _reading(engine) as session:
+        stmt = _filter_work_items(
+            session,
+            select(WorkItem).options(selectinload(WorkItem.repository)),  # type: ignore[arg-type]
+            repo_name=repo_name,
+            state=state,
+            is_blocked=is_blocked,
+            priority=priority,
+            parent_id=parent_id,
         )
-        if repo_name:
-            repo = session.exec(select(Repository).where(Repository.name == repo_name)).first()
-            if repo:
-                stmt = stmt.where(WorkItem.repo_id == repo.repo_id)
-            else:
-                return []
-        if state:
-            stmt = stmt.where(WorkItem.state == state)
-        if is_blocked is not None:
-            stmt = stmt.where(WorkItem.is_blocked == is_blocked)
-        if priority:
-            stmt = stmt.where(WorkItem.priority == priority)
-        if parent_id is not None:
-            stmt = stmt.where(WorkItem.parent_id == parent_id)
-        return list(session.exec(stmt).all())
+        if stmt is None:
+            return []
+        return list(session.exec(stmt.order_by(WorkItem.task_id)).all())
+
+
+class WorkItemPage(NamedTuple):
+    items: list[WorkItem]
+    next_cursor: Optional[str]
+
 
+PAGE_ORDERS = ("task_id", "updated_at")
 
-def update_work_item(engine, task_id: int, **kwargs) -> Optional[WorkItem]:
-    with Session(engine) as session:
+
+def list_work_items_page(
+    engine,
+    *,
+    repo_name: Optional[str] = None,
+    state: Optional[WorkItemState] = None,
+    is_blocked: Optional[bool] = None,
+    priority: Optional[Priority] = None,
+    parent_id: Optional[int] = None,
+    order_by: str = "task_id",
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+) -> WorkItemPage:
+    """One page of matching items, ordered by ``task_id`` or ``(updated_at, task_id)``.
+
+    Keyset pagination: ``cursor`` is the opaque ``next_cursor`` of the previous page
+    and resumes strictly after its last row, so rows inserted mid-scan never shift
+    or repeat earlier pages. ``limit`` defaults to PAGE_SIZE_DEFAULT and is capped at
+    PAGE_SIZE_MAX. ``next_cursor`` is None on the last page.
+    """
+    if order_by not in PAGE_ORDERS:
+        raise ValueError(f"order_by must be one of {', '.join(PAGE_ORDERS)}")
+    limit = max(1, min(limit or PAGE_SIZE_DEFAULT, PAGE_SIZE_MAX))
+    with _reading(engine) as session:
+        stmt = _filter_work_items(
+            session,
+            select(WorkItem).options(selectinload(WorkItem.repository)),  # type: ignore[arg-type]
+            repo_name=repo_name,
+            state=state,
+            is_blocked=is_blocked,
+            priority=priority,
+            parent_id=parent_id,
+        )
+        if stmt is None:
+            return WorkItemPage([], None)
+
+        if order_by == "updated_at":
+            if cursor:
+                updated_at, task_id = _decode_cursor(cursor, order_by)
+                after = tuple_(WorkItem.updated_at, WorkItem.task_id) > tuple_(
+                    datetime.fromisoformat(updated_at), task_id
+                )
+                stmt = stmt.where(after)
+            stmt = stmt.order_by(WorkItem.updated_at, WorkItem.task_id)
+        else:
+            if cursor:
+                (task_id,) = _decode_cursor(cursor, order_by)
+                stmt = stmt.where(col(WorkItem.task_id) > task_id)
+            stmt = stmt.order_by(WorkItem.task_id)
+
+        # One extra row tells us whether another page exists without a COUNT.
+        items = list(session.exec(stmt.limit(limit + 1)).all())
+        if len(items) <= limit:
+            return WorkItemPage(items, None)
+        items = items[:limit]
+        last = items[-1]
+        key = [last.updated_at.isoformat(), last.task_id] if order_by == "updated_at" else [last.task_id]
+        return WorkItemPage(items, _encode_cursor(order_by, key))
+
+
+def _filter_work_items(
+    session: Session,
+    stmt,
+    *,
+    repo_name: Optional[str],
+    state: Optional[WorkItemState],
+    is_blocked: Optional[bool],
+    priority: Optional[Priority],
+    parent_id: Optional[int],
+):
+    """Apply the list filters to ``stmt``; None when the named repository does not exist."""
+    if repo_name:
+        repo_id = _repo_id_by_name(session, repo_name)
+        if repo_id is None:
+            return None
+        stmt = stmt.where(WorkItem.repo_id == repo_id)
+    if state:
+        stmt = stmt.where(WorkItem.state == state)
+    if is_blocked is not None:
+        stmt = stmt.where(WorkItem.is_blocked == is_blocked)
+    if priority:
+        stmt = stmt.where(WorkItem.priority == priority)
+    if parent_id is not None:
+        stmt = stmt.where(WorkItem.parent_id == parent_id)
+    return stmt
+
+
+def _encode_cursor(order_by: str, key: list) -> str:
+    raw = json.dumps({"o": order_by, "k": key}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str, order_by: str) -> list:
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        key = data["k"]
+        valid = (
+            data["o"] == order_by
+            and isinstance(key, list)
+            and len(key) == (2 if order_by == "updated_at" else 1)
+            and isinstance(key[-1], int)
+        )
+    except (ValueError, TypeError, KeyError):
+        valid = False
+    if not valid:
+        raise ValueError(f"Invalid cursor for order_by={order_by}")
+    return key
+
+
+def update_work_item(engine, task_id: int, *, actor: Optional[str] = None, **kwargs) -> Optional[WorkItem]:
+    """Set the given fields; an ``updated`` activity entry names the ones that actually changed."""
+    if kwargs.get("priority") is not None:
+        kwargs["priority"] = Priority(kwargs["priority"])
+        kwargs["priority_rank"] = PRIORITY_RANK[kwargs["priority"]]
+    with _writing(engine) as session:
         item = session.get(WorkItem, task_id)
         if not item:
             return None
+        old_parent, old_state, was_done = item.parent_id, item.state, item.state in DONE_STATES
+        new_parent = kwargs.get("parent_id", old_parent)
+        if new_parent != old_parent and new_parent is not None:
+            if new_parent == task_id or new_parent in {n.item.task_id for n in get_subtree(session, task_id)}:
+                raise ValueError(f"Work item {new_parent} is inside the subtree of {task_id}")
+        now = datetime.now(UTC)
+        repo_id, branch = kwargs.get("repo_id", item.repo_id), kwargs.get("branch", item.branch)
+        starting = kwargs.get("state", old_state) == WorkItemState.executing
+        if starting and old_state == WorkItemState.executing:
+            # An executing item moved to another repository or branch trades its slots for the new ones.
+            starting = (repo_id, branch) != (item.repo_id, item.branch)
+            if starting:
+                _track_leases(session, [(task_id, old_state, None)], now)
+                old_state = None
+        scopes = _start_executing(session, task_id, repo_id, branch) if starting else []
+        changed = [key for key, value in kwargs.items() if hasattr(item, key) and getattr(item, key) != value]
         for key, value in kwargs.items():
             if hasattr(item, key):
                 setattr(item, key, value)
-        item.updated_at = datetime.now(UTC)
+        item.updated_at = now
+        if changed:
+            fields = ", ".join(key for key in changed if key != "priority_rank")
+            _log_activity(session, task_id, ActivityAction.updated, detail=fields, actor=actor)
         session.add(item)
-        session.commit()
-        session.refresh(item)
+        session.flush()
+
+        is_done = item.state in DONE_STATES
+        if item.parent_id != old_parent:
+            _adjust_rollup(session, old_parent, total=-1, done=-was_done)
+            _adjust_rollup(session, item.parent_id, total=1, done=int(is_done))
+        else:
+            _adjust_rollup(session, item.parent_id, done=is_done - was_done)
+        _track_leases(session, [(task_id, old_state, item.state)], now, slots={task_id: scopes})
         return item
 
 
 def delete_work_item(engine, task_id: int, *, actor: Optional[str] = None) -> bool:
     """Delete a work item and its associated records."""
-    with Session(engine) as session:
+    with _writing(engine) as session:
         item = session.get(WorkItem, task_id)
         if not item:
             return False
         _log_activity(session, task_id, ActivityAction.state_change, detail="deleted", actor=actor)
+        _adjust_rollup(session, item.parent_id, total=-1, done=-(item.state in DONE_STATES))
+        _track_leases(session, [(task_id, item.state, None)], datetime.now(UTC))
         session.delete(item)
-        session.commit()
+        session.flush()
         return True
 
 
@@ -231,57 +1132,272 @@ def transition_work_item(
     actor: Optional[str] = None,
 ) -> WorkItem:
     """Transition a work item to a new state with validation and concurrency guard."""
-    from core.state_engine import validate_transition, check_repo_concurrency
-    from core.hooks import hooks, HookEvent
+    from core.state_engine import validate_transition
 
-    with Session(engine) as session:
+    with _writing(engine) as session:
         item = session.get(WorkItem, task_id)
         if not item:
             raise ValueError(f"Work item {task_id} not found")
 
         old_state = item.state
-        validate_transition(old_state, new_state)
-
-        if new_state == WorkItemState.executing:
-            try:
-                check_repo_concurrency(engine, item.repo_id, task_id)
-            except Exception as e:
-                hooks.fire(
-                    HookEvent.on_repo_conflict,
-                    {
-                        "task_id": task_id,
-                        "repo_id": item.repo_id,
-                        "error": str(e),
-                    },
-                )
-                raise
+        validate_transition(old_state, new_state, _workflow(session, item.repo_id))
 
+        scopes = []
+        if new_state == WorkItemState.executing and old_state != WorkItemState.executing:
+            scopes = _start_executing(session, task_id, item.repo_id, item.branch)
         item.state = new_state
         item.updated_at = datetime.now(UTC)
         session.add(item)
-        session.commit()
+        session.flush()
+        _adjust_rollup(session, item.parent_id, done=(new_state in DONE_STATES) - (old_state in DONE_STATES))
+        _track_leases(session, [(task_id, old_state, new_state)], item.updated_at, slots={task_id: scopes})
 
         _log_activity(
             session, task_id, ActivityAction.state_change, detail=f"{old_state.value} → {new_state.value}", actor=actor
         )
-        session.refresh(item)
+        session.flush()
 
-    # Fire hooks after session is committed
-    hooks.fire(
+        context = _hook_context(session, item.repo_id, item.priority, item.title, item.parent_id)
+        _queue_transition_hooks(session, task_id, old_state, new_state, actor, context)
+        return item
+
+
+def _queue_transition_hooks(
+    session: Session,
+    task_id: int,
+    old_state: WorkItemState,
+    new_state: WorkItemState,
+    actor: Optional[str],
+    context: dict,
+) -> None:
+    """Queue one step's hook events; they are delivered after the unit of work commits."""
+    from core.hooks import HookEvent
+
+    _queue_hook(
+        session,
         HookEvent.on_state_change,
         {
             "task_id": task_id,
             "old_state": old_state.value,
             "new_state": new_state.value,
             "actor": actor,
+            **context,
         },
     )
     if new_state == WorkItemState.completed:
-        hooks.fire(HookEvent.on_execution_complete, {"task_id": task_id, "actor": actor})
+        _queue_hook(session, HookEvent.on_execution_complete, {"task_id": task_id, "actor": actor, **context})
     if new_state == WorkItemState.rework_required:
-        hooks.fire(HookEvent.on_rework, {"task_id": task_id, "actor": actor})
+        _queue_hook(session, HookEvent.on_rework, {"task_id": task_id, "actor": actor, **context})
+
+
+def _fire_repo_conflict(session: Session, task_id: Optional[int], repo_id: Optional[int], error: Exception) -> None:
+    """Report a refused start; inside a unit of work, once the unit has released the write lock.
+
+    The conflict happened even though its unit rolls back, so unlike queued
+    hooks it fires on rollback too, and handlers may write to the ledger.
+    """
+    from core.hooks import HookEvent, hooks
+
+    payload = {"task_id": task_id, "repo_id": repo_id, "repo": getattr(error, "repo_name", None), "error": str(error)}
+    if session.info.get(_UNIT):
+        session.info.setdefault(_PENDING_CONFLICTS, []).append(payload)
+    else:
+        hooks.fire(HookEvent.on_repo_conflict, payload)
 
-    return item
+
+def _fire_conflicts(session: Session) -> None:
+    from core.hooks import HookEvent, hooks
+
+    for payload in session.info.pop(_PENDING_CONFLICTS, []):
+        hooks.fire(HookEvent.on_repo_conflict, payload)
+
+
+def _track_leases(
+    session: Session,
+    changes: Iterable[tuple[int, Optional[WorkItemState], Optional[WorkItemState]]],
+    now: datetime,
+    *,
+    executor: Optional[str] = None,
+    slots: Optional[dict[int, list[str]]] = None,
+) -> None:
+    """Open an execution lease for each (task_id, old, new) entering executing; drop it for each leaving.
+
+    ``slots`` maps a starting item to the concurrency scopes it took, which its
+    lease records; dropping a lease releases them.
+    """
+    started, ended = [], []
+    for task_id, old_state, new_state in changes:
+        if new_state == WorkItemState.executing and old_state != WorkItemState.executing:
+            started.append(task_id)
+        elif old_state == WorkItemState.executing and new_state != WorkItemState.executing:
+            ended.append(task_id)
+    if started:
+        expires_at = now + timedelta(seconds=LEASE_TTL_S)
+        held = slots or {}
+        session.execute(
+            insert(ExecutionLease.__table__).prefix_with("OR REPLACE"),
+            [
+                {
+                    "task_id": task_id,
+                    "executor": executor,
+                    "started_at": now,
+                    "expires_at": expires_at,
+                    "slots": json.dumps(held[task_id]) if held.get(task_id) else None,
+                }
+                for task_id in started
+            ],
+        )
+    leases = ExecutionLease.__table__
+    for chunk in _chunked(ended):
+        released = session.execute(delete(leases).where(leases.c.task_id.in_(chunk)).returning(leases.c.slots))
+        _release_slots(session, [row.slots for row in released])
+
+
+def _slot_scopes(
+    policy, repo_id: int, branch: Optional[str], executor: Optional[str]
+) -> list[tuple[str, str, Optional[str], int]]:
+    """The (scope, kind, key, capacity) counters an item entering executing takes under ``policy``.
+
+    An item on no particular branch counts under the empty branch name; an
+    unassigned item is not held to the executor cap.
+    """
+    scopes = []
+    if policy.repo is not None:
+        scopes.append((f"repo:{repo_id}", "repo", None, policy.repo))
+    if policy.branch is not None:
+        scopes.append((f"branch:{repo_id}:{branch or ''}", "branch", branch or "", policy.branch))
+    if policy.executor is not None and executor is not None:
+        scopes.append((f"executor:{repo_id}:{executor}", "executor", executor, policy.executor))
+    return scopes
+
+
+def _plan_slots(
+    session: Session,
+    starting: list[tuple[Optional[int], Optional[int], Optional[str]]],
+    *,
+    executor: Optional[str] = None,
+) -> list:
+    """Check each (task_id, repo_id, branch) about to enter executing against its repository's policy.
+
+    Returns, per item and in order, the (scope, repo_id, capacity) slots it
+    would take, or the RepoConcurrencyError that refuses it; items earlier in
+    the list count against later ones. Reads one primary key lookup for all
+    the counters involved and writes nothing; _take_slots() applies the plans.
+    The executor is ``executor`` or else the item's current assignee, and the
+    branch falls back to the repository's default_branch.
+    """
+    from core.state_engine import RepoConcurrencyError
+
+    policies = {repo_id: _concurrency(session, repo_id) for _, repo_id, _ in starting if repo_id is not None}
+    executors: dict[int, str] = {}
+    if executor is None:
+        capped = [
+            t for t, repo_id, _ in starting if t is not None and repo_id is not None and policies[repo_id].executor
+        ]
+        executors = _current_executors(session, capped)
+    wanted = [
+        _slot_scopes(
+            policies[repo_id],
+            repo_id,
+            branch or _repo_info(session, repo_id).default_branch,
+            executor or executors.get(task_id),
+        )
+        if repo_id is not None
+        else []
+        for task_id, repo_id, branch in starting
+    ]
+    used: dict[str, int] = {}
+    for chunk in _chunked(sorted({scope for scopes in wanted for scope, *_ in scopes})):
+        used.update(
+            session.execute(
+                select(ConcurrencySlot.scope, ConcurrencySlot.used).where(col(ConcurrencySlot.scope).in_(chunk))
+            ).all()
+        )
+
+    holders: dict[str, Optional[int]] = {}
+    plans: list = []
+    for (task_id, repo_id, _), scopes in zip(starting, wanted):
+        full = next((slot for slot in scopes if used.get(slot[0], 0) >= slot[3]), None)
+        if full is not None:
+            scope, kind, key, capacity = full
+            blocking = holders[scope] if scope in holders else _slot_holder(session, scope)
+            repo_name = _repo_info(session, repo_id).name or f"repo_id={repo_id}"
+            plans.append(RepoConcurrencyError(repo_name, blocking, limit=capacity, kind=kind, key=key))
+            continue
+        for scope, *_ in scopes:
+            used[scope] = used.get(scope, 0) + 1
+            holders.setdefault(scope, task_id)
+        plans.append([(scope, repo_id, capacity) for scope, _, _, capacity in scopes])
+    return plans
+
+
+def _take_slots(session: Session, plans: Iterable[list[tuple[str, int, int]]]) -> None:
+    """Count the planned slots as held: one upsert per scope, batched."""
+    counts: dict[str, dict] = {}
+    for plan in plans:
+        for scope, repo_id, capacity in plan:
+            entry = counts.setdefault(scope, {"scope": scope, "repo_id": repo_id, "used": 0, "capacity": capacity})
+            entry["used"] += 1
+    if not counts:
+        return
+    slots = ConcurrencySlot.__table__
+    stmt = sqlite_insert(slots)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[slots.c.scope],
+        set_={"used": slots.c.used + stmt.excluded.used, "capacity": stmt.excluded.capacity},
+    )
+    session.execute(stmt, list(counts.values()))
+
+
+def _release_slots(session: Session, held: Iterable[Optional[str]]) -> None:
+    """Give back the scopes recorded on dropped leases (JSON lists, as _track_leases stores them)."""
+    counts: dict[str, int] = {}
+    for text in held:
+        for scope in json.loads(text) if text else ():
+            counts[scope] = counts.get(scope, 0) + 1
+    if not counts:
+        return
+    slots = ConcurrencySlot.__table__
+    session.execute(
+        update(slots).where(slots.c.scope == bindparam("b_scope")).values(used=slots.c.used - bindparam("b_count")),
+        [{"b_scope": scope, "b_count": count} for scope, count in counts.items()],
+    )
+
+
+def _start_executing(
+    session: Session,
+    task_id: Optional[int],
+    repo_id: Optional[int],
+    branch: Optional[str],
+    *,
+    executor: Optional[str] = None,
+) -> list[str]:
+    """Take one starting item's slots and return their scopes; on a full slot fire on_repo_conflict and raise."""
+    (plan,) = _plan_slots(session, [(task_id, repo_id, branch)], executor=executor)
+    if isinstance(plan, Exception):
+        _fire_repo_conflict(session, task_id, repo_id, plan)
+        raise plan
+    _take_slots(session, [plan])
+    return [scope for scope, *_ in plan]
+
+
+def _slot_holder(session: Session, scope: str) -> Optional[int]:
+    """An executing item holding ``scope``, to name in a RepoConcurrencyError."""
+    needle = json.dumps(scope)
+    return session.exec(select(ExecutionLease.task_id).where(func.instr(ExecutionLease.slots, needle) > 0)).first()
+
+
+def _current_executors(session: Session, task_ids: list[int]) -> dict[int, str]:
+    """Each item's current assignee, for executor caps."""
+    executors: dict[int, str] = {}
+    for chunk in _chunked(task_ids):
+        rows = session.execute(
+            select(Assignment.task_id, Assignment.executor)
+            .where(col(Assignment.task_id).in_(chunk))
+            .order_by(Assignment.assigned_at, Assignment.assignment_id)
+        )
+        executors.update(rows.all())  # later assignments overwrite earlier ones
+    return executors
 
 
 def fast_track_work_item(
@@ -291,25 +1407,57 @@ def fast_track_work_item(
     *,
     actor: Optional[str] = None,
 ) -> WorkItem:
-    """Fast-track a work item to a target state, stepping through all intermediate states."""
-    from core.state_engine import fast_track_transition
+    """Fast-track a work item to a target state, stepping through all intermediate states.
+
+    The path is validated up front and applied as one write: a single update of the
+    item, one activity entry per step inserted in a batch, and every step's hook
+    events queued in order for delivery after the commit.
+    """
+    from core.state_engine import RepoConcurrencyError, fast_track_transition
 
-    with Session(engine) as session:
+    with _writing(engine) as session:
         item = session.get(WorkItem, task_id)
         if not item:
             raise ValueError(f"Work item {task_id} not found")
-        steps = fast_track_transition(item.state, target_state)
-
-    # Walk through each intermediate state using the normal transition
-    for step in steps:
-        item = transition_work_item(engine, task_id, step, actor=actor)
-    return item
+        steps = fast_track_transition(item.state, target_state, _workflow(session, item.repo_id))
+        if not steps:
+            return item
+        path = [item.state, *steps]
+
+        # Passing through executing needs a free slot too, though the item doesn't keep it.
+        if WorkItemState.executing in steps[:-1]:
+            (plan,) = _plan_slots(session, [(task_id, item.repo_id, item.branch)])
+            if isinstance(plan, RepoConcurrencyError):
+                _fire_repo_conflict(session, task_id, item.repo_id, plan)
+                raise plan
+
+        now = datetime.now(UTC)
+        scopes = []
+        if target_state == WorkItemState.executing:
+            scopes = _start_executing(session, task_id, item.repo_id, item.branch)
+        item.state = target_state
+        item.updated_at = now
+        session.add(item)
+        session.flush()
+        _adjust_rollup(session, item.parent_id, done=(target_state in DONE_STATES) - (path[0] in DONE_STATES))
+        _track_leases(session, [(task_id, path[0], target_state)], now, slots={task_id: scopes})
+
+        _log_activity_many(
+            session,
+            [(task_id, ActivityAction.state_change, f"{old.value} → {new.value}") for old, new in zip(path, steps)],
+            actor=actor,
+            created_at=now,
+        )
+        context = _hook_context(session, item.repo_id, item.priority, item.title, item.parent_id)
+        for old, new in zip(path, steps):
+            _queue_transition_hooks(session, task_id, old, new, actor, context)
+        return item
 
 
 def block_work_item(engine, task_id: int, reason: str, *, actor: Optional[str] = None) -> WorkItem:
-    from core.hooks import hooks, HookEvent
+    from core.hooks import HookEvent
 
-    with Session(engine) as session:
+    with _writing(engine) as session:
         item = session.get(WorkItem, task_id)
         if not item:
             raise ValueError(f"Work item {task_id} not found")
@@ -317,19 +1465,19 @@ def block_work_item(engine, task_id: int, reason: str, *, actor: Optional[str] =
         item.blocked_reason = reason
         item.updated_at = datetime.now(UTC)
         session.add(item)
-        session.commit()
 
         _log_activity(session, task_id, ActivityAction.blocked, detail=reason, actor=actor)
-        session.refresh(item)
+        session.flush()
 
-    hooks.fire(HookEvent.on_blocked, {"task_id": task_id, "reason": reason, "actor": actor})
-    return item
+        context = _hook_context(session, item.repo_id, item.priority, item.title, item.parent_id)
+        _queue_hook(session, HookEvent.on_blocked, {"task_id": task_id, "reason": reason, "actor": actor, **context})
+        return item
 
 
 def unblock_work_item(engine, task_id: int, *, actor: Optional[str] = None) -> WorkItem:
-    from core.hooks import hooks, HookEvent
+    from core.hooks import HookEvent
 
-    with Session(engine) as session:
+    with _writing(engine) as session:
         item = session.get(WorkItem, task_id)
         if not item:
             raise ValueError(f"Work item {task_id} not found")
@@ -337,13 +1485,222 @@ def unblock_work_item(engine, task_id: int, *, actor: Optional[str] = None) -> W
         item.blocked_reason = None
         item.updated_at = datetime.now(UTC)
         session.add(item)
-        session.commit()
 
         _log_activity(session, task_id, ActivityAction.unblocked, actor=actor)
-        session.refresh(item)
+        session.flush()
+
+        context = _hook_context(session, item.repo_id, item.priority, item.title, item.parent_id)
+        _queue_hook(session, HookEvent.on_unblocked, {"task_id": task_id, "actor": actor, **context})
+        return item
+
+
+# --- Bulk operations by filter ------------------------------------------------
+
+
+class WorkItemFilter(NamedTuple):
+    """Selects the work items a bulk operation applies to; set fields combine with AND."""
+
+    task_ids: Optional[list[int]] = None
+    repo_name: Optional[str] = None
+    state: Optional[WorkItemState] = None
+    is_blocked: Optional[bool] = None
+    priority: Optional[Priority] = None
+    parent_id: Optional[int] = None
 
-    hooks.fire(HookEvent.on_unblocked, {"task_id": task_id, "actor": actor})
-    return item
+
+class BulkResult(NamedTuple):
+    matched: int
+    updated: list[int]
+    failed: dict[int, str]  # task_id → reason the item was left unchanged
+
+
+# Keeps every IN (...) list well under SQLite's bound-parameter limit.
+_IN_CHUNK = 900
+
+
+def bulk_transition(
+    engine, where: WorkItemFilter, new_state: WorkItemState, *, actor: Optional[str] = None
+) -> BulkResult:
+    """Transition every item matching ``where`` to ``new_state`` in one unit of work.
+
+    Each item is validated against its repository's workflow from its own state (a set
+    lookup in the compiled table of states allowed into ``new_state``); invalid ones land
+    in ``failed`` and the rest move together with one UPDATE per chunk of ids and one
+    batched activity insert. Moving to executing admits items only up to each
+    repository's concurrency policy; the rest land in ``failed``.
+    """
+    from core.state_engine import InvalidTransitionError
+
+    with _writing(engine) as session:
+        rows = _match_work_items(session, where, WorkItem.task_id, WorkItem.state, WorkItem.branch, *_CONTEXT_COLUMNS)
+
+        workflows = {repo_id: _workflow(session, repo_id) for repo_id in {row[3] for row in rows}}
+        sources = {repo_id: workflow.sources(new_state) for repo_id, workflow in workflows.items()}
+        allowed: list[tuple[int, WorkItemState, Optional[str], tuple]] = []
+        failed: dict[int, str] = {}
+        for task_id, state, branch, *context in rows:
+            repo_id = context[0]
+            if state not in sources[repo_id]:
+                failed[task_id] = str(InvalidTransitionError(state, new_state, workflows[repo_id].allowed(state)))
+            else:
+                allowed.append((task_id, state, branch, tuple(context)))
+
+        plans: list = [[]] * len(allowed)
+        if new_state == WorkItemState.executing:
+            plans = _plan_slots(session, [(task_id, context[0], branch) for task_id, _, branch, context in allowed])
+        moved: list[tuple[int, WorkItemState, tuple]] = []
+        slots: dict[int, list[str]] = {}
+        for (task_id, state, _, context), plan in zip(allowed, plans):
+            if isinstance(plan, Exception):
+                failed[task_id] = str(plan)
+                continue
+            moved.append((task_id, state, context))
+            slots[task_id] = [scope for scope, *_ in plan]
+        if not moved:
+            return BulkResult(len(rows), [], failed)
+        _take_slots(session, [plan for plan in plans if not isinstance(plan, Exception)])
+
+        now = datetime.now(UTC)
+        task_ids = [task_id for task_id, _, _ in moved]
+        _update_in_chunks(session, task_ids, state=new_state, updated_at=now)
+
+        done_deltas: dict[int, int] = {}
+        for _, old_state, (*_, parent_id) in moved:
+            delta = (new_state in DONE_STATES) - (old_state in DONE_STATES)
+            if parent_id is not None and delta:
+                done_deltas[parent_id] = done_deltas.get(parent_id, 0) + delta
+        for parent_id, delta in done_deltas.items():
+            _adjust_rollup(session, parent_id, done=delta)
+        _track_leases(session, [(task_id, old_state, new_state) for task_id, old_state, _ in moved], now, slots=slots)
+
+        _log_activity_many(
+            session,
+            [(task_id, ActivityAction.state_change, f"{old.value} → {new_state.value}") for task_id, old, _ in moved],
+            actor=actor,
+            created_at=now,
+        )
+        for task_id, old_state, context in moved:
+            _queue_transition_hooks(session, task_id, old_state, new_state, actor, _hook_context(session, *context))
+        return BulkResult(len(rows), task_ids, failed)
+
+
+def bulk_block(engine, where: WorkItemFilter, reason: str, *, actor: Optional[str] = None) -> BulkResult:
+    """Block every item matching ``where`` with ``reason``; already-blocked items take the new reason."""
+    return _bulk_set_blocked(engine, where, reason, actor)
+
+
+def bulk_unblock(engine, where: WorkItemFilter, *, actor: Optional[str] = None) -> BulkResult:
+    """Unblock every item matching ``where``."""
+    return _bulk_set_blocked(engine, where, None, actor)
+
+
+def _bulk_set_blocked(engine, where: WorkItemFilter, reason: Optional[str], actor: Optional[str]) -> BulkResult:
+    from core.hooks import HookEvent
+
+    with _writing(engine) as session:
+        rows = _match_work_items(session, where, WorkItem.task_id, *_CONTEXT_COLUMNS)
+        if not rows:
+            return BulkResult(0, [], {})
+        task_ids = [task_id for task_id, *_ in rows]
+        now = datetime.now(UTC)
+        _update_in_chunks(session, task_ids, is_blocked=reason is not None, blocked_reason=reason, updated_at=now)
+        if reason is not None:
+            entries = [(task_id, ActivityAction.blocked, reason) for task_id in task_ids]
+            for task_id, *context in rows:
+                payload = {"task_id": task_id, "reason": reason, "actor": actor, **_hook_context(session, *context)}
+                _queue_hook(session, HookEvent.on_blocked, payload)
+        else:
+            entries = [(task_id, ActivityAction.unblocked, None) for task_id in task_ids]
+            for task_id, *context in rows:
+                payload = {"task_id": task_id, "actor": actor, **_hook_context(session, *context)}
+                _queue_hook(session, HookEvent.on_unblocked, payload)
+        _log_activity_many(session, entries, actor=actor, created_at=now)
+        return BulkResult(len(task_ids), task_ids, {})
+
+
+def bulk_assign(
+    engine,
+    where: WorkItemFilter,
+    executor: str,
+    executor_type: ExecutorType,
+    *,
+    actor: Optional[str] = None,
+) -> BulkResult:
+    """Assign every item matching ``where`` to ``executor``: one batched assignment and activity insert."""
+    from core.hooks import HookEvent
+
+    with _writing(engine) as session:
+        rows = _match_work_items(session, where, WorkItem.task_id, *_CONTEXT_COLUMNS)
+        if not rows:
+            return BulkResult(0, [], {})
+        task_ids = [task_id for task_id, *_ in rows]
+        now = datetime.now(UTC)
+        # New rows take the ids above the current maximum, in order (see create_work_items_bulk).
+        before = session.exec(select(func.coalesce(func.max(Assignment.assignment_id), 0))).one()
+        session.execute(
+            insert(Assignment.__table__),
+            [
+                {"task_id": task_id, "executor": executor, "executor_type": executor_type, "assigned_at": now}
+                for task_id in task_ids
+            ],
+        )
+        detail = f"{executor} ({executor_type.value})"
+        _log_activity_many(
+            session,
+            [(task_id, ActivityAction.assigned, detail, before + n) for n, task_id in enumerate(task_ids, 1)],
+            actor=actor,
+            created_at=now,
+        )
+        for task_id, *context in rows:
+            _queue_hook(
+                session,
+                HookEvent.on_assigned,
+                {
+                    "task_id": task_id,
+                    "executor": executor,
+                    "executor_type": executor_type.value,
+                    "actor": actor,
+                    **_hook_context(session, *context),
+                },
+            )
+        return BulkResult(len(task_ids), task_ids, {})
+
+
+# The columns _hook_context() takes, for bulk paths that read rows instead of items.
+_CONTEXT_COLUMNS = (WorkItem.repo_id, WorkItem.priority, WorkItem.title, WorkItem.parent_id)
+
+
+def _match_work_items(session: Session, where: WorkItemFilter, *columns) -> list[tuple]:
+    """Rows of ``columns`` for the items ``where`` selects, by task_id. Refuses an empty filter."""
+    if all(value is None for value in where):
+        raise ValueError("A bulk operation needs at least one filter")
+    stmt = _filter_work_items(
+        session,
+        select(*columns),
+        repo_name=where.repo_name,
+        state=where.state,
+        is_blocked=where.is_blocked,
+        priority=where.priority,
+        parent_id=where.parent_id,
+    )
+    if stmt is None:
+        return []
+    if where.task_ids is None:
+        return [tuple(row) for row in session.execute(stmt.order_by(WorkItem.task_id))]
+    rows = []
+    for chunk in _chunked(sorted(set(where.task_ids))):
+        rows.extend(tuple(row) for row in session.execute(stmt.where(col(WorkItem.task_id).in_(chunk))))
+    return sorted(rows, key=lambda row: row[0])
+
+
+def _update_in_chunks(session: Session, task_ids: list[int], **values) -> None:
+    for chunk in _chunked(task_ids):
+        session.execute(update(WorkItem).where(col(WorkItem.task_id).in_(chunk)).values(**values))
+
+
+def _chunked(ids: list[int]) -> Iterator[list[int]]:
+    for start in range(0, len(ids), _IN_CHUNK):
+        yield ids[start : start + _IN_CHUNK]
 
 
 def get_children(engine, parent_id: int) -> list[WorkItem]:
@@ -351,13 +1708,187 @@ def get_children(engine, parent_id: int) -> list[WorkItem]:
 
 
 def get_child_progress(engine, parent_id: int) -> tuple[int, int]:
-    """Return (completed_count, total_count) for children of a work item."""
-    children = get_children(engine, parent_id)
-    if not children:
-        return 0, 0
-    closed_states = {WorkItemState.accepted, WorkItemState.closed}
-    done = sum(1 for c in children if c.state in closed_states)
-    return done, len(children)
+    """Return (completed_count, total_count) for children of a work item, from its rollup counters."""
+    with _reading(engine) as session:
+        row = session.exec(
+            select(WorkItem.children_done, WorkItem.children_total).where(WorkItem.task_id == parent_id)
+        ).first()
+        return (row[0], row[1]) if row else (0, 0)
+
+
+# Recursion stops here even if a parent_id cycle slipped into the data.
+MAX_TREE_DEPTH = 32
+
+
+class SubtreeNode(NamedTuple):
+    item: WorkItem
+    depth: int  # 1 = direct child of the root
+
+
+def get_subtree(engine, root_id: int, *, max_depth: Optional[int] = None) -> list[SubtreeNode]:
+    """Every descendant of ``root_id`` in one recursive query, depth-first with siblings by task_id."""
+    tree = _subtree_cte(root_id, max_depth)
+    with _reading(engine) as session:
+        stmt = (
+            select(WorkItem, tree.c.depth)
+            .join(tree, tree.c.task_id == WorkItem.task_id)
+            .options(selectinload(WorkItem.repository))  # type: ignore[arg-type]
+            .order_by(tree.c.path)
+        )
+        return [SubtreeNode(item, depth) for item, depth in session.exec(stmt).all()]
+
+
+def get_subtree_progress(engine, root_id: int) -> tuple[int, int]:
+    """Return (completed_count, total_count) over every descendant of a work item."""
+    tree = _subtree_cte(root_id, None)
+    with _reading(engine) as session:
+        done, total = session.exec(
+            select(func.count(tree.c.task_id).filter(tree.c.state.in_(DONE_STATES)), func.count(tree.c.task_id))
+        ).one()
+        return done, total
+
+
+def _subtree_cte(root_id: int, max_depth: Optional[int]):
+    """Recursive CTE of (task_id, state, depth, path) below ``root_id``; ``path`` sorts depth-first."""
+    if max_depth is not None and max_depth < 1:
+        raise ValueError("max_depth must be at least 1")
+    limit = min(MAX_TREE_DEPTH if max_depth is None else max_depth, MAX_TREE_DEPTH)
+    tree = (
+        select(
+            WorkItem.task_id,
+            WorkItem.state,
+            literal(1).label("depth"),
+            func.printf("%012d", WorkItem.task_id, type_=String).label("path"),
+        )
+        .where(WorkItem.parent_id == root_id)
+        .cte("subtree", recursive=True)
+    )
+    child = aliased(WorkItem)
+    return tree.union_all(
+        select(
+            child.task_id,
+            child.state,
+            tree.c.depth + 1,
+            tree.c.path.concat("/").concat(func.printf("%012d", child.task_id, type_=String)),
+        ).where(child.parent_id == tree.c.task_id, tree.c.depth < limit)
+    )
+
+
+def _adjust_rollup(session: Session, parent_id: Optional[int], *, total: int = 0, done: int = 0) -> None:
+    """Shift a parent's children_total / children_done in the caller's transaction."""
+    if parent_id is None or not (total or done):
+        return
+    session.execute(
+        update(WorkItem)
+        .where(col(WorkItem.task_id) == parent_id)
+        .values(
+            children_total=WorkItem.children_total + total,
+            children_done=WorkItem.children_done + done,
+        )
+    )
+
+
+# --- Work queue -----------------------------------------------------------------
+
+# Candidates read per claim; the rest only matter when a repository's workflow can't reach the target.
+_CLAIM_SCAN = 32
+
+
+def claim_next_work_item(
+    engine,
+    executor: str,
+    executor_type: ExecutorType = ExecutorType.agent,
+    *,
+    repo_name: Optional[str] = None,
+    start: bool = True,
+    actor: Optional[str] = None,
+) -> Optional[WorkItem]:
+    """Take the next queued item for ``executor``, or None when nothing is claimable.
+
+    The next item is the unblocked queued one with the lowest priority_rank, then the
+    oldest, read in index order from ix_work_items_claim. It is assigned to ``executor``
+    and fast-tracked along its repository's workflow to executing in the same unit of
+    work, so it must fit its repository's concurrency policy, with ``executor`` counted
+    against any executor cap (items without a repository always qualify). Repositories
+    whose repo-wide slots are full are filtered out in SQL. With ``start=False`` the
+    item stops at assigned and repository capacity is not considered. Run from an
+    engine, the unit takes the write lock up front, so concurrent claimers are
+    serialized and never receive the same item; the writes are a handful of Core
+    statements to keep that lock short.
+    """
+    from core.hooks import HookEvent
+
+    target = WorkItemState.executing if start else WorkItemState.assigned
+    actor = actor or executor
+    with _writing(engine) as session:
+        stmt = (
+            select(WorkItem.task_id, WorkItem.branch, *_CONTEXT_COLUMNS)
+            .where(WorkItem.state == WorkItemState.queued, col(WorkItem.is_blocked) == false())
+            .order_by(WorkItem.priority_rank, WorkItem.created_at, WorkItem.task_id)
+            .limit(_CLAIM_SCAN)
+        )
+        if start:
+            full = select(ConcurrencySlot.repo_id).where(
+                col(ConcurrencySlot.scope).startswith("repo:"), ConcurrencySlot.used >= ConcurrencySlot.capacity
+            )
+            stmt = stmt.where(or_(col(WorkItem.repo_id).is_(None), col(WorkItem.repo_id).not_in(full)))
+        if repo_name is not None:
+            stmt = stmt.join(Repository).where(Repository.name == repo_name)
+        claim = None
+        for task_id, branch, *context in session.exec(stmt).all():
+            path = _workflow(session, context[0]).path(WorkItemState.queued, target)
+            if not path:
+                continue
+            plan = []
+            if start:
+                # Branch and executor caps aren't in the filter above, so each candidate checks its own slots.
+                (plan,) = _plan_slots(session, [(task_id, context[0], branch)], executor=executor)
+                if isinstance(plan, Exception):
+                    continue
+            claim = task_id, context, [WorkItemState.queued, *path], plan
+            break
+        if claim is None:
+            return None
+        task_id, context, path, plan = claim
+
+        now = datetime.now(UTC)
+        assignment_id = session.execute(
+            insert(Assignment.__table__),
+            {"task_id": task_id, "executor": executor, "executor_type": executor_type, "assigned_at": now},
+        ).inserted_primary_key[0]
+        _take_slots(session, [plan])
+        session.execute(update(WorkItem).where(WorkItem.task_id == task_id).values(state=target, updated_at=now))
+        _track_leases(
+            session,
+            [(task_id, WorkItemState.queued, target)],
+            now,
+            executor=executor,
+            slots={task_id: [scope for scope, *_ in plan]},
+        )
+        _log_activity_many(
+            session,
+            [(task_id, ActivityAction.assigned, f"{executor} ({executor_type.value})", assignment_id)]
+            + [
+                (task_id, ActivityAction.state_change, f"{old.value} → {new.value}") for old, new in zip(path, path[1:])
+            ],
+            actor=actor,
+            created_at=now,
+        )
+        hook_context = _hook_context(session, *context)
+        _queue_hook(
+            session,
+            HookEvent.on_assigned,
+            {
+                "task_id": task_id,
+                "executor": executor,
+                "executor_type": executor_type.value,
+                "actor": actor,
+                **hook_context,
+            },
+        )
+        for old, new in zip(path, path[1:]):
+            _queue_transition_hooks(session, task_id, old, new, actor, hook_context)
+        return session.get(WorkItem, task_id, populate_existing=True)
 
 
 # --- Assignment CRUD ----------------------------------------------------------
@@ -371,69 +1902,86 @@ def create_assignment(
     *,
     actor: Optional[str] = None,
 ) -> Assignment:
-    from core.hooks import hooks, HookEvent
+    from core.hooks import HookEvent
 
-    with Session(engine) as session:
+    with _writing(engine) as session:
         assignment = Assignment(
             task_id=task_id,
             executor=executor,
             executor_type=executor_type,
         )
         session.add(assignment)
-        session.commit()
+        session.flush()
 
         _log_activity(
-            session, task_id, ActivityAction.assigned, detail=f"{executor} ({executor_type.value})", actor=actor
+            session,
+            task_id,
+            ActivityAction.assigned,
+            detail=f"{executor} ({executor_type.value})",
+            actor=actor,
+            ref_id=assignment.assignment_id,
         )
-        session.refresh(assignment)
+        session.flush()
 
-    hooks.fire(
-        HookEvent.on_assigned,
-        {
-            "task_id": task_id,
-            "executor": executor,
-            "executor_type": executor_type.value,
-            "actor": actor,
-        },
-    )
-    return assignment
+        item = session.get(WorkItem, task_id)
+        _queue_hook(
+            session,
+            HookEvent.on_assigned,
+            {
+                "task_id": task_id,
+                "executor": executor,
+                "executor_type": executor_type.value,
+                "actor": actor,
+                **_hook_context(session, item.repo_id, item.priority, item.title, item.parent_id),
+            },
+        )
+        return assignment
 
 
 def get_assignments(engine, task_id: int) -> list[Assignment]:
-    with Session(engine) as session:
+    with _reading(engine) as session:
         stmt = select(Assignment).where(Assignment.task_id == task_id).order_by(Assignment.assigned_at)
         return list(session.exec(stmt).all())
 
 
+# Same-timestamp assignments resolve to the one inserted last.
+_LATEST_ASSIGNMENT_FIRST = (col(Assignment.assigned_at).desc(), col(Assignment.assignment_id).desc())
+
+
 def get_current_assignment(engine, task_id: int) -> Optional[Assignment]:
-    with Session(engine) as session:
-        stmt = select(Assignment).where(Assignment.task_id == task_id).order_by(col(Assignment.assigned_at).desc())
+    with _reading(engine) as session:
+        stmt = select(Assignment).where(Assignment.task_id == task_id).order_by(*_LATEST_ASSIGNMENT_FIRST)
         return session.exec(stmt).first()
 
 
 def list_items_by_executor(engine, executor: str) -> list[WorkItem]:
-    """Get work items currently assigned to an executor (latest assignment wins)."""
-    with Session(engine) as session:
-        # Get all assignments for this executor
-        stmt = select(Assignment).where(Assignment.executor == executor)
-        assignments = session.exec(stmt).all()
-        task_ids = {a.task_id for a in assignments}
-        if not task_ids:
-            return []
-        # Filter to only items where this executor is the *latest* assignment
-        result = []
-        for tid in task_ids:
-            latest = session.exec(
-                select(Assignment).where(Assignment.task_id == tid).order_by(col(Assignment.assigned_at).desc())
-            ).first()
-            if latest and latest.executor == executor:
-                item = session.exec(
-                    select(WorkItem).where(WorkItem.task_id == tid).options(selectinload(WorkItem.repository))  # type: ignore[arg-type]
-                ).first()
-                if item:
-                    result.append(item)
-        result.sort(key=lambda x: x.task_id or 0)
-        return result
+    """Get work items currently assigned to an executor (latest assignment wins).
+
+    One query: rank the assignments of every task the executor ever held, newest
+    first, and keep the tasks whose top-ranked row is theirs. Served by the
+    ``assignments(executor)`` and ``assignments(task_id, assigned_at)`` indexes.
+    """
+    with _reading(engine) as session:
+        held = select(Assignment.task_id).where(Assignment.executor == executor)
+        ranked = (
+            select(
+                Assignment.task_id,
+                Assignment.executor,
+                func.row_number()
+                .over(partition_by=Assignment.task_id, order_by=_LATEST_ASSIGNMENT_FIRST)
+                .label("rank"),
+            )
+            .where(col(Assignment.task_id).in_(held))
+            .subquery()
+        )
+        stmt = (
+            select(WorkItem)
+            .join(ranked, ranked.c.task_id == WorkItem.task_id)
+            .where(ranked.c.rank == 1, ranked.c.executor == executor)
+            .options(selectinload(WorkItem.repository))  # type: ignore[arg-type]
+            .order_by(WorkItem.task_id)
+        )
+        return list(session.exec(stmt).all())
 
 
 # --- ExecutionRecord CRUD -----------------------------------------------------
@@ -451,7 +1999,7 @@ def create_execution_record(
     artifact_ref: Optional[str] = None,
     actor: Optional[str] = None,
 ) -> ExecutionRecord:
-    with Session(engine) as session:
+    with _writing(engine) as session:
         record = ExecutionRecord(
             task_id=task_id,
             executor=executor,
@@ -462,21 +2010,62 @@ def create_execution_record(
             artifact_ref=artifact_ref,
         )
         session.add(record)
-        session.commit()
+        session.flush()
 
         _log_activity(
-            session, task_id, ActivityAction.execution_logged, detail=f"{status.value} by {executor}", actor=actor
+            session,
+            task_id,
+            ActivityAction.execution_logged,
+            detail=f"{status.value} by {executor}",
+            actor=actor,
+            ref_id=record.run_id,
         )
-        session.refresh(record)
+        session.flush()
         return record
 
 
 def get_execution_records(engine, task_id: int) -> list[ExecutionRecord]:
-    with Session(engine) as session:
+    with _reading(engine) as session:
         stmt = select(ExecutionRecord).where(ExecutionRecord.task_id == task_id).order_by(ExecutionRecord.created_at)
         return list(session.exec(stmt).all())
 
 
+def get_latest_execution_records(engine, task_ids: Iterable[int]) -> dict[int, ExecutionRecord]:
+    """Latest run per task for a set of task_ids, in one query.
+
+    Ranks each task's runs newest first (``run_id`` breaks same-timestamp ties) over
+    the ``execution_records(task_id, created_at)`` index. Tasks without runs are
+    absent from the result.
+    """
+    wanted = sorted(set(task_ids))
+    if not wanted:
+        return {}
+    with _reading(engine) as session:
+        ranked = (
+            select(
+                ExecutionRecord.run_id,
+                func.row_number()
+                .over(
+                    partition_by=ExecutionRecord.task_id,
+                    order_by=(col(ExecutionRecord.created_at).desc(), col(ExecutionRecord.run_id).desc()),
+                )
+                .label("rank"),
+            )
+            .where(col(ExecutionRecord.task_id).in_(wanted))
+            .subquery()
+        )
+        stmt = select(ExecutionRecord).join(ranked, ranked.c.run_id == ExecutionRecord.run_id).where(ranked.c.rank == 1)
+        return {record.task_id: record for record in session.exec(stmt).all()}
+
+
+def get_review_queue(engine) -> list[tuple[WorkItem, Optional[ExecutionRecord]]]:
+    """Items awaiting review, by task_id, each paired with its latest run (or None)."""
+    with _reading(engine) as session:
+        items = list_work_items(session, state=WorkItemState.awaiting_review)
+        latest = get_latest_execution_records(session, (item.task_id for item in items))
+        return [(item, latest.get(item.task_id)) for item in items]
+
+
 # --- Review CRUD --------------------------------------------------------------
 
 
@@ -489,9 +2078,9 @@ def create_review(
     note: Optional[str] = None,
     actor: Optional[str] = None,
 ) -> Review:
-    from core.hooks import hooks, HookEvent
+    from core.hooks import HookEvent
 
-    with Session(engine) as session:
+    with _writing(engine) as session:
         review = Review(
             task_id=task_id,
             reviewer=reviewer,
@@ -499,28 +2088,36 @@ def create_review(
             note=note,
         )
         session.add(review)
-        session.commit()
+        session.flush()
 
         _log_activity(
-            session, task_id, ActivityAction.review_submitted, detail=f"{decision.value} by {reviewer}", actor=actor
+            session,
+            task_id,
+            ActivityAction.review_submitted,
+            detail=f"{decision.value} by {reviewer}",
+            actor=actor,
+            ref_id=review.review_id,
         )
-        session.refresh(review)
+        session.flush()
 
-    hooks.fire(
-        HookEvent.on_review_submitted,
-        {
-            "task_id": task_id,
-            "reviewer": reviewer,
-            "decision": decision.value,
-            "note": note,
-            "actor": actor,
-        },
-    )
-    return review
+        item = session.get(WorkItem, task_id)
+        _queue_hook(
+            session,
+            HookEvent.on_review_submitted,
+            {
+                "task_id": task_id,
+                "reviewer": reviewer,
+                "decision": decision.value,
+                "note": note,
+                "actor": actor,
+                **_hook_context(session, item.repo_id, item.priority, item.title, item.parent_id),
+            },
+        )
+        return review
 
 
 def get_reviews(engine, task_id: int) -> list[Review]:
-    with Session(engine) as session:
+    with _reading(engine) as session:
         stmt = select(Review).where(Review.task_id == task_id).order_by(Review.created_at)
         return list(session.exec(stmt).all())
 
@@ -529,16 +2126,16 @@ def get_reviews(engine, task_id: int) -> list[Review]:
 
 
 def create_attachment(engine, task_id: int, url_or_path: str, *, label: Optional[str] = None) -> Attachment:
-    with Session(engine) as session:
+    with _writing(engine) as session:
         att = Attachment(task_id=task_id, url_or_path=url_or_path, label=label)
         session.add(att)
-        session.commit()
-        session.refresh(att)
+        session.flush()
+        _log_activity(session, task_id, ActivityAction.attached, detail=label or url_or_path, ref_id=att.attachment_id)
         return att
 
 
 def get_attachments(engine, task_id: int) -> list[Attachment]:
-    with Session(engine) as session:
+    with _reading(engine) as session:
         stmt = select(Attachment).where(Attachment.task_id == task_id).order_by(Attachment.created_at)
         return list(session.exec(stmt).all())
 
@@ -553,17 +2150,213 @@ def _log_activity(
     *,
     detail: Optional[str] = None,
     actor: Optional[str] = None,
+    ref_id: Optional[int] = None,
 ) -> None:
-    """Append an entry to the activity log. Called within an existing session."""
-    entry = ActivityLog(task_id=task_id, action=action, detail=detail, actor=actor)
+    """Append an entry to the activity log. Flushed and committed with the caller's unit of work."""
+    entry = ActivityLog(task_id=task_id, action=action, detail=detail, actor=actor, ref_id=ref_id)
     session.add(entry)
-    session.commit()
+
+
+def _log_activity_many(
+    session: Session,
+    entries: list[tuple],
+    *,
+    actor: Optional[str],
+    created_at: datetime,
+) -> None:
+    """Append (task_id, action, detail[, ref_id]) entries with one executemany in the caller's unit of work."""
+    session.execute(
+        insert(ActivityLog.__table__),
+        [
+            {
+                "task_id": task_id,
+                "action": action,
+                "detail": detail,
+                "actor": actor,
+                "ref_id": ref[0] if ref else None,
+                "created_at": created_at,
+            }
+            for task_id, action, detail, *ref in entries
+        ],
+    )
 
 
 def get_activity_log(engine, *, task_id: Optional[int] = None, limit: int = 50) -> list[ActivityLog]:
-    with Session(engine) as session:
-        stmt = select(ActivityLog).order_by(col(ActivityLog.created_at).desc())
+    with _reading(engine) as session:
+        stmt = select(ActivityLog).order_by(col(ActivityLog.created_at).desc(), col(ActivityLog.log_id).desc())
         if task_id is not None:
             stmt = stmt.where(ActivityLog.task_id == task_id)
         stmt = stmt.limit(limit)
         return list(session.exec(stmt).all())
+
+
+# --- Change feed ----------------------------------------------------------------
+
+
+class ChangeSet(NamedTuple):
+    """What changed in the ledger after a cursor, as of the entries up to ``cursor``."""
+
+    cursor: int
+    has_more: bool
+    work_items: list[WorkItem]
+    deleted: list[int]
+    assignments: list[Assignment]
+    runs: list[ExecutionRecord]
+    reviews: list[Review]
+    attachments: list[Attachment]
+
+
+# The table each ref_id-carrying activity action points into.
+_CHANGE_REFS = {
+    ActivityAction.assigned: Assignment,
+    ActivityAction.execution_logged: ExecutionRecord,
+    ActivityAction.review_submitted: Review,
+    ActivityAction.attached: Attachment,
+}
+
+
+def get_changes(engine, since: Optional[int] = None, *, limit: int = PAGE_SIZE_DEFAULT) -> ChangeSet:
+    """The delta since ``since``: every item, assignment, run, review and attachment the next ``limit`` entries touched.
+
+    The cursor is the activity log's ``log_id``, which every ledger mutation
+    stamps in commit order. Items are returned in their current state, once each
+    however often they changed; items deleted since are listed in ``deleted``.
+    Pass the returned ``cursor`` back as ``since`` to resume, and call again while
+    ``has_more``. ``since=None`` returns no changes and the current head, the
+    cursor a new consumer starts from. ``limit`` is capped at PAGE_SIZE_MAX.
+    """
+    limit = max(1, min(limit or PAGE_SIZE_DEFAULT, PAGE_SIZE_MAX))
+    with _reading(engine) as session:
+        if since is None:
+            head = session.exec(select(func.coalesce(func.max(ActivityLog.log_id), 0))).one()
+            return ChangeSet(head, False, [], [], [], [], [], [])
+
+        entries = session.exec(
+            select(ActivityLog.log_id, ActivityLog.task_id, ActivityLog.action, ActivityLog.ref_id)
+            .where(col(ActivityLog.log_id) > since)
+            .order_by(ActivityLog.log_id)
+            .limit(limit + 1)
+        ).all()
+        has_more = len(entries) > limit
+        entries = entries[:limit]
+        if not entries:
+            return ChangeSet(since, False, [], [], [], [], [], [])
+
+        task_ids = list(dict.fromkeys(task_id for _, task_id, _, _ in entries if task_id is not None))
+        items = []
+        for chunk in _chunked(task_ids):
+            items += session.exec(
+                select(WorkItem)
+                .options(selectinload(WorkItem.repository))  # type: ignore[arg-type]
+                .where(col(WorkItem.task_id).in_(chunk))
+            ).all()
+        order = {task_id: n for n, task_id in enumerate(task_ids)}
+        items.sort(key=lambda item: order[item.task_id])
+        present = {item.task_id for item in items}
+
+        ref_ids: dict[type, list[int]] = {model: [] for model in _CHANGE_REFS.values()}
+        for _, _, action, ref_id in entries:
+            if ref_id is not None and action in _CHANGE_REFS:
+                ref_ids[_CHANGE_REFS[action]].append(ref_id)
+        refs: dict[type, list] = {}
+        for model, ids in ref_ids.items():
+            key = model.__table__.primary_key.columns[0]
+            refs[model] = []
+            for chunk in _chunked(ids):
+                refs[model] += session.exec(select(model).where(key.in_(chunk)).order_by(key)).all()
+        return ChangeSet(
+            entries[-1][0],
+            has_more,
+            items,
+            [task_id for task_id in task_ids if task_id not in present],
+            refs[Assignment],
+            refs[ExecutionRecord],
+            refs[Review],
+            refs[Attachment],
+        )
+
+
+# --- Status summary -----------------------------------------------------------
+
+
+class StatusItem(NamedTuple):
+    """The columns status views render for an executing, blocked or awaiting-review item."""
+
+    task_id: int
+    title: str
+    state: WorkItemState
+    priority: Priority
+    is_blocked: bool
+    blocked_reason: Optional[str]
+    repository: Optional[str]
+
+
+class StatusSummary(NamedTuple):
+    total: int
+    by_state: dict[str, int]
+    by_repo_state: dict[Optional[str], dict[str, int]]  # by name; None (last) = items without a repository
+    blocked_count: int
+    executing: list[StatusItem]
+    blocked: list[StatusItem]
+    awaiting_review: list[StatusItem]
+
+
+def get_status_summary(engine) -> StatusSummary:
+    """Ledger counts plus the rows a status view lists, computed in SQL.
+
+    Two queries regardless of ledger size: one GROUP BY (repository, state) over
+    the covering ``ix_work_items_repo_id_state_blocked`` index, and one fetch of
+    only the executing, blocked and awaiting-review rows.
+    """
+    with _reading(engine) as session:
+        grouped = (
+            select(
+                WorkItem.repo_id,
+                WorkItem.state,
+                func.count().label("item_count"),
+                func.sum(WorkItem.is_blocked).label("blocked"),
+            )
+            .group_by(WorkItem.repo_id, WorkItem.state)
+            .subquery()
+        )
+        counts = session.exec(
+            select(Repository.name, grouped.c.state, grouped.c.item_count, grouped.c.blocked)
+            .select_from(grouped)
+            .outerjoin(Repository, grouped.c.repo_id == Repository.repo_id)
+        ).all()
+
+        by_state: dict[str, int] = {}
+        by_repo_state: dict[Optional[str], dict[str, int]] = {}
+        blocked_count = 0
+        for repo_name, state, count, blocked in counts:
+            by_state[state.value] = by_state.get(state.value, 0) + count
+            by_repo_state.setdefault(repo_name, {})[state.value] = count
+            blocked_count += blocked
+
+        listed = select(
+            WorkItem.task_id,
+            WorkItem.title,
+            WorkItem.state,
+            WorkItem.priority,
+            WorkItem.is_blocked,
+            WorkItem.blocked_reason,
+            Repository.name,
+        ).outerjoin(Repository, col(WorkItem.repo_id) == Repository.repo_id)
+        # A UNION rather than OR so each arm gets its own index: ix_work_items_state
+        # and the partial ix_work_items_blocked (which needs the literal ``= 1``).
+        wanted = union(
+            listed.where(col(WorkItem.state).in_([WorkItemState.executing, WorkItemState.awaiting_review])),
+            listed.where(col(WorkItem.is_blocked) == true()),
+        ).subquery()
+        rows = session.execute(select(wanted).order_by(wanted.c.task_id)).all()
+        items = [StatusItem(*row) for row in rows]
+
+    return StatusSummary(
+        total=sum(by_state.values()),
+        by_state=by_state,
+        by_repo_state=dict(sorted(by_repo_state.items(), key=lambda entry: (entry[0] is None, entry[0] or ""))),
+        blocked_count=blocked_count,
+        executing=[i for i in items if i.state == WorkItemState.executing],
+        blocked=[i for i in items if i.is_blocked],
+        awaiting_review=[i for i in items if i.state == WorkItemState.awaiting_review],
+    )
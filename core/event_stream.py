@@ -0,0 +1,244 @@
+"""Live event streams — fan committed outbox events out to many listeners in one API process.
+
+The stream source is ``event_outbox`` (``FORGEOPS_EVENT_OUTBOX=1``), so events
+raised by the CLI, the MCP server or another API instance reach listeners just
+like this process's own. One EventBroadcaster per process polls the outbox: a
+primary-key range read every STREAM_POLL_INTERVAL_S, or straight away when a
+local unit of work commits. It hands each new event to every live listener's
+bounded queue, without doing any work per listener beyond the queue push.
+
+A listener first reads the outbox itself from its cursor up to the present,
+then follows the queue, skipping anything it has already seen. If its queue
+fills because the client is slow, the broadcaster stops feeding it. It then
+goes back to reading the outbox at its own pace, so a slow client never
+blocks the others and loses nothing the outbox still retains
+(OUTBOX_RETAIN_S). A cursor older than that gets a ``gap`` notice, after
+which the client should re-sync, for example through GET /changes.
+
+While it runs, the broadcaster also prunes the outbox every
+``prune_interval_s`` (see core.outbox.prune_outbox), so a deployment that
+enables the outbox only for streams, with no hooks worker, stays bounded.
+
+Usage:
+    broadcaster = EventBroadcaster(engine)
+    async for event in broadcaster.listen(since, StreamFilter(repo="alpha")):
+        ...   # an event_body() dict, a gap notice, or None as a keepalive tick
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Iterable, Optional
+
+from config import OUTBOX_BATCH_SIZE, OUTBOX_RETAIN_S, STREAM_KEEPALIVE_S, STREAM_POLL_INTERVAL_S, STREAM_QUEUE_SIZE
+from core.database import list_items_by_executor
+from core.hooks import HookEvent, hooks
+from core.outbox import event_body, outbox_head, prune_outbox, read_events
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class StreamFilter:
+    """Server-side filters; every one that is set must match.
+
+    ``executor`` matches events that name it, plus events on items currently
+    assigned to it. That set is seeded when the stream opens and follows
+    on_assigned events from then on.
+    """
+
+    events: Optional[frozenset[str]] = None
+    repo: Optional[str] = None
+    task_id: Optional[int] = None
+    executor: Optional[str] = None
+    _held: set[int] = field(default_factory=set, repr=False)
+
+    def hold(self, task_ids: Iterable[int]) -> None:
+        """Record items currently assigned to ``executor``."""
+        self._held.update(task_ids)
+
+    def matches(self, body: dict) -> bool:
+        payload = body["payload"]
+        if self.executor is not None and body["event"] == HookEvent.on_assigned.value:
+            if payload.get("executor") == self.executor:
+                self._held.add(body["task_id"])
+            else:
+                self._held.discard(body["task_id"])
+        if self.events is not None and body["event"] not in self.events:
+            return False
+        if self.repo is not None and payload.get("repo") != self.repo:
+            return False
+        if self.task_id is not None and body["task_id"] != self.task_id:
+            return False
+        if self.executor is not None:
+            return payload.get("executor") == self.executor or body["task_id"] in self._held
+        return True
+
+
+class _Listener:
+    def __init__(self, queue_size: int):
+        self.queue: asyncio.Queue[dict] = asyncio.Queue(queue_size)
+        self.lagged = False
+
+
+class EventBroadcaster:
+    """Poll the outbox once for every listener in this process; start on the first listener, stop after the last."""
+
+    def __init__(
+        self,
+        engine,
+        *,
+        poll_interval_s: float = STREAM_POLL_INTERVAL_S,
+        queue_size: int = STREAM_QUEUE_SIZE,
+        keepalive_s: float = STREAM_KEEPALIVE_S,
+        batch_size: int = OUTBOX_BATCH_SIZE,
+        retain_s: float = OUTBOX_RETAIN_S,
+        prune_interval_s: float = 60.0,
+    ):
+        self.engine = engine
+        self.poll_interval_s = poll_interval_s
+        self.queue_size = queue_size
+        self.keepalive_s = keepalive_s
+        self.batch_size = batch_size
+        self.retain_s = retain_s
+        self.prune_interval_s = prune_interval_s
+        self._pruned_at: Optional[float] = None
+        self._listeners: set[_Listener] = set()
+        self._head = 0
+        self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def listeners(self) -> int:
+        return len(self._listeners)
+
+    def head(self) -> int:
+        """The cursor a stream opened without one starts from: the last event issued so far."""
+        return outbox_head(self.engine)
+
+    async def listen(self, since: Optional[int] = None, where: Optional[StreamFilter] = None) -> AsyncIterator:
+        """Yield the events after ``since`` (from now on when None) that ``where`` matches, forever.
+
+        Yields None after ``keepalive_s`` without a matching event, so the caller
+        can write a keepalive and notice a client that went away.
+        """
+        where = where or StreamFilter()
+        if where.executor is not None:
+            items = await asyncio.to_thread(list_items_by_executor, self.engine, where.executor)
+            where.hold(item.task_id for item in items)
+        listener = _Listener(self.queue_size)
+        self._listeners.add(listener)
+        self._ensure_running()
+        try:
+            cursor = await asyncio.to_thread(self.head) if since is None else since
+            while True:
+                # Catch up from the outbox; the queue then only carries what is newer.
+                listener.lagged = False
+                async for body in self._replay(cursor):
+                    if body["event"] == "gap":
+                        cursor = body["next_event_id"] - 1
+                        yield body
+                        continue
+                    cursor = body["event_id"]
+                    if where.matches(body):
+                        yield body
+                while not listener.lagged:
+                    try:
+                        body = await asyncio.wait_for(listener.queue.get(), self.keepalive_s)
+                    except TimeoutError:
+                        yield None
+                        continue
+                    if body["event_id"] <= cursor:
+                        continue
+                    if body["event_id"] > cursor + 1:
+                        break  # missed events: a queue overflow raced the flag, so replay them
+                    cursor = body["event_id"]
+                    if where.matches(body):
+                        yield body
+                while not listener.queue.empty():
+                    listener.queue.get_nowait()
+        finally:
+            self._listeners.discard(listener)
+
+    async def _replay(self, cursor: int) -> AsyncIterator[dict]:
+        """Read the outbox past ``cursor`` in batches, announcing a gap where pruning got there first."""
+        while True:
+            events = await asyncio.to_thread(read_events, self.engine, cursor, limit=self.batch_size)
+            if not events:
+                # Later events were issued but none is retained: pruned. Re-read in case one just committed.
+                head = await asyncio.to_thread(self.head)
+                if head > cursor and not await asyncio.to_thread(read_events, self.engine, cursor, limit=1):
+                    yield {"event": "gap", "after": cursor, "next_event_id": head + 1}
+                return
+            if events[0].event_id > cursor + 1:
+                yield {"event": "gap", "after": cursor, "next_event_id": events[0].event_id}
+            for event in events:
+                yield event_body(event)
+            cursor = events[-1].event_id
+            if len(events) < self.batch_size:
+                return
+
+    def notify(self) -> None:
+        """Poll now rather than at the next interval; safe to call from any thread."""
+        if self._loop is not None and self._wake is not None:
+            try:
+                self._loop.call_soon_threadsafe(self._wake.set)
+            except RuntimeError:
+                pass  # the loop has closed
+
+    def _on_commit(self, _events) -> None:
+        self.notify()
+
+    def _ensure_running(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._task is not None and not self._task.done() and self._loop is loop:
+            return
+        self._loop = loop
+        self._wake = asyncio.Event()
+        self._task = self._loop.create_task(self._run())
+
+    async def _run(self) -> None:
+        hooks.subscribe_batch(self._on_commit)
+        try:
+            self._head = await asyncio.to_thread(self.head)
+            while self._listeners:
+                try:
+                    await self._poll()
+                    await self._prune()
+                except Exception:
+                    logger.exception("Event stream poll failed")
+                try:
+                    await asyncio.wait_for(self._wake.wait(), self.poll_interval_s)
+                except TimeoutError:
+                    pass
+                self._wake.clear()
+        finally:
+            hooks.unsubscribe_batch(self._on_commit)
+
+    async def _prune(self) -> None:
+        now = time.monotonic()
+        if self._pruned_at is not None and now - self._pruned_at < self.prune_interval_s:
+            return
+        self._pruned_at = now
+        await asyncio.to_thread(prune_outbox, self.engine, retain_s=self.retain_s)
+
+    async def _poll(self) -> None:
+        while True:
+            events = await asyncio.to_thread(read_events, self.engine, self._head, limit=self.batch_size)
+            if not events:
+                return
+            bodies = [event_body(event) for event in events]
+            for listener in self._listeners:
+                if listener.lagged:
+                    continue
+                for body in bodies:
+                    try:
+                        listener.queue.put_nowait(body)
+                    except asyncio.QueueFull:
+                        listener.lagged = True  # it replays from the outbox instead
+                        break
+            self._head = events[-1].event_id
+            if len(events) < self.batch_size:
+                return
@@ -1,7 +1,9 @@
 """Event hook system — subscribe callbacks to state engine events.
 
-Hooks fire after the transition/operation is committed. They are synchronous
-and best-effort — a failing hook does not roll back the operation.
+Hooks fire after the transition/operation is committed. They are best-effort
+— a failing hook does not roll back the operation. By default handlers run
+synchronously on the committing thread; ``hooks.configure(mode="async")``
+(or ``FORGEOPS_HOOK_DISPATCH_MODE=async``) moves them onto worker threads.
 
 Usage:
     from core.hooks import hooks, HookEvent
@@ -10,17 +12,46 @@ Usage:
     def my_handler(payload):
         print(f"WI-{payload['task_id']} changed from {payload['old_state']} to {payload['new_state']}")
 
-    # Or register programmatically:
-    hooks.subscribe(HookEvent.on_assigned, my_callback)
+    # Or register programmatically, optionally with a time limit for this handler:
+    hooks.subscribe(HookEvent.on_assigned, my_callback, timeout=2.0)
+
+    # Only for events that match — fire() skips this handler for every other repo/state:
+    hooks.subscribe(HookEvent.on_state_change, notify_reviewers, repo="forgeops", new_state="awaiting_review")
+
+    # Or receive each committed unit of work's events as one ordered list:
+    hooks.subscribe_batch(lambda events: print([event.value for event, _payload in events]))
+
+    # Dispatch on 4 workers; wait for delivery in tests and at shutdown:
+    hooks.configure(mode="async", workers=4, queue_size=1000, overflow="spill")
+    hooks.flush()
 """
 
+import atexit
 import enum
+import itertools
+import json
 import logging
+import os
+import queue
+import threading
 from collections import defaultdict
-from typing import Any, Callable
+from operator import itemgetter
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import config
 
 logger = logging.getLogger(__name__)
 
+DISPATCH_MODES = ("sync", "async")
+OVERFLOW_POLICIES = ("block", "drop", "spill")
+
+# Payload keys a subscription can be restricted to, in dispatch-index key order.
+PREDICATES = ("repo", "new_state", "executor_type")
+_ANY = (None, None, None)
+
+_STOP = object()
+
 
 class HookEvent(str, enum.Enum):
     on_state_change = "on_state_change"
@@ -31,6 +62,19 @@ class HookEvent(str, enum.Enum):
     on_review_submitted = "on_review_submitted"
     on_repo_conflict = "on_repo_conflict"
     on_rework = "on_rework"
+    on_lease_expired = "on_lease_expired"
+
+
+class _Shard:
+    """One dispatch worker: a bounded queue, its thread and its spill file."""
+
+    def __init__(self, index: int, queue_size: int, spill_path: Path):
+        self.index = index
+        self.queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.spill_path = spill_path
+        self.spilling = False
+        self.lock = threading.Lock()
+        self.thread: Optional[threading.Thread] = None
 
 
 class HookRegistry:
@@ -38,44 +82,328 @@ class HookRegistry:
 
     def __init__(self):
         self._handlers: dict[HookEvent, list[Callable]] = defaultdict(list)
+        # event → predicate key → [(subscription number, handler)]; None in a key matches anything.
+        self._index: dict[HookEvent, dict[tuple, list[tuple[int, Callable]]]] = defaultdict(dict)
+        self._indexed: dict[HookEvent, tuple[bool, ...]] = {}  # which PREDICATES any subscription uses
+        self._sequence = itertools.count()
+        self._batch_handlers: list[Callable] = []
+        self._timeouts: dict[int, float] = {}  # subscription number → its own handler timeout
+        self._handler_timeout: Optional[float] = None
+        self._overflow = "block"
+        self._shards: list[_Shard] = []
+        self._pending = 0
+        self._idle = threading.Condition()
+        self._atexit_registered = False
+        self.dropped = 0
+        self.spilled = 0
 
-    def subscribe(self, event: HookEvent, handler: Callable) -> None:
+    @property
+    def mode(self) -> str:
+        return "async" if self._shards else "sync"
+
+    def subscribe(
+        self,
+        event: HookEvent,
+        handler: Callable,
+        *,
+        repo: Optional[str] = None,
+        new_state: Optional[str] = None,
+        executor_type: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> None:
+        """Register ``handler`` for ``event``.
+
+        ``repo``, ``new_state`` and ``executor_type`` restrict it to payloads
+        carrying that value under the same key. They are compiled into a
+        dispatch index, so fire() never calls a handler whose predicates don't
+        match. ``timeout`` overrides the registry's handler timeout.
+        """
+        key = (_plain(repo), _plain(new_state), _plain(executor_type))
+        number = next(self._sequence)
         self._handlers[event].append(handler)
+        self._index[event].setdefault(key, []).append((number, handler))
+        self._reindex(event)
+        if timeout is not None:
+            self._timeouts[number] = timeout
 
     def unsubscribe(self, event: HookEvent, handler: Callable) -> None:
         try:
             self._handlers[event].remove(handler)
+        except ValueError:
+            return
+        buckets = self._index[event]
+        for key, entries in buckets.items():
+            for entry in entries:
+                if entry[1] == handler:
+                    entries.remove(entry)
+                    self._timeouts.pop(entry[0], None)
+                    if not entries:
+                        del buckets[key]
+                    self._reindex(event)
+                    return
+
+    def _reindex(self, event: HookEvent) -> None:
+        keys = self._index[event]
+        self._indexed[event] = tuple(any(key[i] is not None for key in keys) for i in range(len(PREDICATES)))
+
+    def _matching(self, event: HookEvent, payload: dict[str, Any]) -> list[tuple[int, Callable]]:
+        """The (subscription number, handler) entries whose predicates ``payload`` satisfies, in order."""
+        buckets = self._index.get(event)
+        if not buckets:
+            return []
+        indexed = self._indexed[event]
+        if not any(indexed):
+            return list(buckets[_ANY])
+        # At most 2^len(PREDICATES) lookups, whatever the number of subscribers.
+        options = [
+            tuple(dict.fromkeys((payload.get(name), None))) if used else (None,)
+            for name, used in zip(PREDICATES, indexed)
+        ]
+        entries = [entry for key in itertools.product(*options) for entry in buckets.get(key, ())]
+        if len(entries) > 1:
+            entries.sort(key=itemgetter(0))
+        return entries
+
+    def subscribe_batch(self, handler: Callable) -> None:
+        """Call ``handler`` once per fire_many() with the ordered list of (event, payload) pairs."""
+        self._batch_handlers.append(handler)
+
+    def unsubscribe_batch(self, handler: Callable) -> None:
+        try:
+            self._batch_handlers.remove(handler)
         except ValueError:
             pass
 
-    def on(self, event: HookEvent):
-        """Decorator to register a hook handler."""
+    def on(self, event: HookEvent, **predicates):
+        """Decorator to register a hook handler; keyword arguments are as for subscribe()."""
 
         def decorator(fn: Callable) -> Callable:
-            self.subscribe(event, fn)
+            self.subscribe(event, fn, **predicates)
             return fn
 
         return decorator
 
+    # --- Dispatch ---------------------------------------------------------
+
+    def configure(
+        self,
+        mode: str = "sync",
+        *,
+        workers: int = config.HOOK_WORKERS,
+        queue_size: int = config.HOOK_QUEUE_SIZE,
+        overflow: str = config.HOOK_OVERFLOW,
+        handler_timeout: Optional[float] = config.HOOK_TIMEOUT_S,
+        spill_dir: Path = config.HOOK_SPILL_DIR,
+    ) -> None:
+        """Switch between synchronous and asynchronous dispatch.
+
+        In async mode events go to ``workers`` threads, each owning a queue of
+        at most ``queue_size`` events. Every event for one task_id goes to the
+        same worker, so a task's events are delivered in the order they fired.
+        ``overflow`` decides what fire() does when that queue is full: "block"
+        waits for room, "drop" discards the event (counted in ``dropped``), and
+        "spill" appends it to a file in ``spill_dir`` that the worker replays,
+        in order, once its queue drains. Reconfiguring flushes the old workers.
+        """
+        if mode not in DISPATCH_MODES:
+            raise ValueError(f"Unknown hook dispatch mode '{mode}'; expected one of {', '.join(DISPATCH_MODES)}")
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy '{overflow}'; expected one of {', '.join(OVERFLOW_POLICIES)}")
+        if workers < 1 or queue_size < 1:
+            raise ValueError("workers and queue_size must be at least 1")
+        self.shutdown()
+        self._handler_timeout = handler_timeout
+        self._overflow = overflow
+        if mode == "sync":
+            return
+
+        if overflow == "spill":
+            Path(spill_dir).mkdir(parents=True, exist_ok=True)
+        self._shards = [
+            _Shard(index, queue_size, Path(spill_dir) / f"hooks-{os.getpid()}-{index}.jsonl")
+            for index in range(workers)
+        ]
+        for shard in self._shards:
+            shard.thread = threading.Thread(
+                target=self._work, args=(shard,), name=f"forgeops-hooks-{shard.index}", daemon=True
+            )
+            shard.thread.start()
+        if not self._atexit_registered:
+            atexit.register(self.shutdown)
+            self._atexit_registered = True
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued and spilled event has been delivered; False if ``timeout`` ran out."""
+        with self._idle:
+            return self._idle.wait_for(lambda: self._pending == 0, timeout=timeout)
+
+    def shutdown(self, timeout: Optional[float] = None) -> None:
+        """Deliver outstanding events, stop the workers and return to synchronous dispatch."""
+        shards, self._shards = self._shards, []
+        if not shards:
+            return
+        # New events now run inline; the old workers finish what they hold.
+        with self._idle:
+            self._idle.wait_for(lambda: self._pending == 0, timeout=timeout)
+        for shard in shards:
+            shard.queue.put(_STOP)
+        for shard in shards:
+            shard.thread.join(timeout)
+            shard.spill_path.unlink(missing_ok=True)
+
     def fire(self, event: HookEvent, payload: dict[str, Any]) -> None:
         """Fire all handlers for an event. Exceptions are logged, not raised."""
-        for handler in self._handlers.get(event, []):
+        if self._shards:
+            if self._matching(event, payload):
+                self._enqueue(payload.get("task_id"), ("event", event, payload))
+            return
+        self._deliver(event, payload)
+
+    def fire_many(self, events: list[tuple[HookEvent, dict[str, Any]]]) -> None:
+        """Fire a committed unit of work's events in order, then hand the batch to batch handlers."""
+        for event, payload in events:
+            self.fire(event, payload)
+        if not events or not self._batch_handlers:
+            return
+        if self._shards:
+            self._enqueue(events[0][1].get("task_id"), ("batch", list(events)))
+        else:
+            self._deliver_batch(list(events))
+
+    def _deliver(self, event: HookEvent, payload: dict[str, Any]) -> None:
+        for number, handler in self._matching(event, payload):
+            timeout = self._timeouts.get(number, self._handler_timeout)
+            self._call(handler, payload, f"Hook handler {handler.__name__} for event {event.value}", timeout)
+
+    def _deliver_batch(self, events: list[tuple[HookEvent, dict[str, Any]]]) -> None:
+        for handler in list(self._batch_handlers):
+            self._call(handler, events, f"Batch hook handler {handler.__name__}", self._handler_timeout)
+
+    def _call(self, handler: Callable, argument: Any, label: str, timeout: Optional[float]) -> None:
+        if timeout is None:
+            try:
+                handler(argument)
+            except Exception:
+                logger.exception("%s failed", label)
+            return
+
+        def run() -> None:
             try:
-                handler(payload)
+                handler(argument)
             except Exception:
-                logger.exception(
-                    "Hook handler %s failed for event %s",
-                    handler.__name__,
-                    event.value,
-                )
+                logger.exception("%s failed", label)
+
+        # Python cannot cancel a thread: a handler that overruns is abandoned, not stopped.
+        thread = threading.Thread(target=run, name="forgeops-hook-call", daemon=True)
+        thread.start()
+        thread.join(timeout)
+        if thread.is_alive():
+            logger.warning("%s timed out after %.3gs", label, timeout)
+
+    def _enqueue(self, task_id: Any, item: tuple) -> None:
+        shards = self._shards
+        if not shards:  # shut down between the caller's check and here
+            self._dispatch(item)
+            return
+        shard = shards[hash(task_id) % len(shards)]
+        with self._idle:
+            self._pending += 1
+        if self._overflow == "block":
+            shard.queue.put(item)
+        elif self._overflow == "drop":
+            try:
+                shard.queue.put_nowait(item)
+            except queue.Full:
+                with self._idle:
+                    self.dropped += 1
+                self._done()
+                logger.warning("Hook queue %d is full; dropped %s", shard.index, _describe(item))
+        else:
+            with shard.lock:
+                # Once a shard spills, later events follow them to disk to keep per-task order.
+                if shard.spilling or shard.queue.full():
+                    with shard.spill_path.open("a", encoding="utf-8") as f:
+                        f.write(json.dumps(_encode(item), default=str) + "\n")
+                    shard.spilling = True
+                    self.spilled += 1
+                else:
+                    shard.queue.put_nowait(item)
+
+    def _work(self, shard: _Shard) -> None:
+        while True:
+            item = shard.queue.get()
+            if item is _STOP:
+                return
+            self._dispatch(item)
+            self._done()
+            if shard.spilling:
+                self._replay_spill(shard)
+
+    def _replay_spill(self, shard: _Shard) -> None:
+        with shard.lock:
+            if not shard.queue.empty():
+                return
+            with shard.spill_path.open(encoding="utf-8") as f:
+                lines = f.readlines()
+            shard.spill_path.unlink()
+            shard.spilling = False
+        # Events fired from here on queue behind these, so replaying them now keeps the order.
+        for line in lines:
+            self._dispatch(_decode(json.loads(line)))
+            self._done()
+
+    def _dispatch(self, item: tuple) -> None:
+        if item[0] == "event":
+            self._deliver(item[1], item[2])
+        else:
+            self._deliver_batch(item[1])
+
+    def _done(self) -> None:
+        with self._idle:
+            self._pending -= 1
+            if self._pending == 0:
+                self._idle.notify_all()
 
     def clear(self, event: HookEvent | None = None) -> None:
         """Remove all handlers, or handlers for a specific event."""
         if event is None:
             self._handlers.clear()
+            self._index.clear()
+            self._indexed.clear()
+            self._batch_handlers.clear()
+            self._timeouts.clear()
         else:
             self._handlers.pop(event, None)
+            for entries in self._index.pop(event, {}).values():
+                for number, _ in entries:
+                    self._timeouts.pop(number, None)
+            self._indexed.pop(event, None)
+
+
+def _plain(value: Any) -> Any:
+    """Predicate values compare against payload values, which hold enum values, not members."""
+    return value.value if isinstance(value, enum.Enum) else value
+
+
+def _encode(item: tuple) -> list:
+    if item[0] == "event":
+        return ["event", item[1].value, item[2]]
+    return ["batch", [[event.value, payload] for event, payload in item[1]]]
+
+
+def _decode(data: list) -> tuple:
+    if data[0] == "event":
+        return ("event", HookEvent(data[1]), data[2])
+    return ("batch", [(HookEvent(event), payload) for event, payload in data[1]])
+
+
+def _describe(item: tuple) -> str:
+    if item[0] == "event":
+        return f"{item[1].value} for task {item[2].get('task_id')}"
+    return f"a batch of {len(item[1])} events"
 
 
 # Singleton registry
 hooks = HookRegistry()
+if config.HOOK_DISPATCH_MODE != "sync":
+    hooks.configure(config.HOOK_DISPATCH_MODE)
@@ -0,0 +1,210 @@
+"""Execution leases — executor heartbeats, and a sweeper that reclaims items from dead executors.
+
+Every item that enters ``executing`` gets a row in ``execution_leases`` in the
+same transaction, expiring LEASE_TTL_S later; leaving ``executing`` removes it.
+A live executor extends its lease with heartbeat(), a single-row UPDATE of that
+narrow table in its own short transaction: no unit of work, activity entry or
+hook, and no write to work_items or its indexes. LeaseSweeper finds expired
+leases through ix_execution_leases_expires_at and moves their items back along
+the repository's workflow to LEASE_EXPIRED_STATE, which frees the repository
+for the next claim.
+
+Usage:
+    from core.leases import LeaseSweeper, heartbeat
+
+    heartbeat(engine, task_id, executor="codex")   # every few seconds while working
+    LeaseSweeper(engine).start()                    # or `forgeops lease-sweeper`
+"""
+
+import logging
+import threading
+from datetime import UTC, datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import or_, update
+from sqlmodel import Session, col, select
+
+from config import LEASE_EXPIRED_STATE, LEASE_SWEEP_INTERVAL_S, LEASE_TTL_S
+from core.database import (
+    _CONTEXT_COLUMNS,
+    _hook_context,
+    _log_activity_many,
+    _queue_hook,
+    _queue_transition_hooks,
+    _reading,
+    _track_leases,
+    _update_in_chunks,
+    _workflow,
+    _writing,
+)
+from core.hooks import HookEvent
+from models import ActivityAction, ExecutionLease, WorkItem, WorkItemState
+
+logger = logging.getLogger(__name__)
+
+SWEEPER_ACTOR = "lease-sweeper"
+
+
+def heartbeat(
+    engine, task_id: int, *, executor: Optional[str] = None, ttl_s: float = LEASE_TTL_S
+) -> Optional[datetime]:
+    """Extend ``task_id``'s lease by ``ttl_s``; return the new expiry, or None if it holds no lease.
+
+    None means the item is no longer executing (or was swept), so the executor
+    should stop. With ``executor``, a lease taken by a different claimant is not
+    extended.
+    """
+    now = datetime.now(UTC)
+    expires_at = now + timedelta(seconds=ttl_s)
+    stmt = (
+        update(ExecutionLease).where(ExecutionLease.task_id == task_id).values(heartbeat_at=now, expires_at=expires_at)
+    )
+    if executor is not None:
+        stmt = stmt.where(or_(col(ExecutionLease.executor).is_(None), ExecutionLease.executor == executor))
+    if isinstance(engine, Session):
+        result = engine.execute(stmt)
+    else:
+        with engine.begin() as conn:
+            result = conn.execute(stmt)
+    return expires_at if result.rowcount == 1 else None
+
+
+def get_leases(engine, *, expired: bool = False) -> list[ExecutionLease]:
+    """Current leases, soonest expiry first (only the lapsed ones with ``expired``)."""
+    with _reading(engine) as session:
+        stmt = select(ExecutionLease).order_by(ExecutionLease.expires_at)
+        if expired:
+            stmt = stmt.where(ExecutionLease.expires_at < datetime.now(UTC))
+        return list(session.exec(stmt))
+
+
+def sweep_expired_leases(
+    engine,
+    *,
+    state: WorkItemState | str = LEASE_EXPIRED_STATE,
+    now: Optional[datetime] = None,
+    limit: int = 500,
+) -> list[int]:
+    """Move up to ``limit`` items whose lease lapsed back to ``state`` (queued or assigned); return their task_ids.
+
+    Each item takes its workflow's shortest path out of executing, with an
+    ``lease_expired`` activity entry plus one per step, and fires
+    on_lease_expired followed by the usual transition hooks. Where the workflow
+    has no path to ``state`` it falls back to assigned; an item with neither
+    keeps executing and its lease is renewed for another LEASE_TTL_S.
+    """
+    state = WorkItemState(state)
+    if state not in (WorkItemState.queued, WorkItemState.assigned):
+        raise ValueError(f"Expired leases return items to queued or assigned, not {state.value}")
+    now = now or datetime.now(UTC)
+    # Checked first so an idle sweep doesn't take the write lock.
+    with _reading(engine) as session:
+        if session.exec(select(ExecutionLease.task_id).where(ExecutionLease.expires_at < now).limit(1)).first() is None:
+            return []
+
+    with _writing(engine) as session:
+        rows = session.exec(
+            select(
+                WorkItem.task_id, WorkItem.state, ExecutionLease.executor, ExecutionLease.expires_at, *_CONTEXT_COLUMNS
+            )
+            .join(ExecutionLease, col(ExecutionLease.task_id) == WorkItem.task_id)
+            .where(ExecutionLease.expires_at < now)
+            .order_by(ExecutionLease.expires_at)
+            .limit(limit)
+        ).all()
+
+        swept: list[tuple[int, list[WorkItemState], Optional[str], datetime, tuple]] = []
+        released: list[tuple[int, WorkItemState, Optional[WorkItemState]]] = []
+        for task_id, current, executor, expires_at, *context in rows:
+            workflow = _workflow(session, context[0])
+            path = workflow.path(current, state) or workflow.path(current, WorkItemState.assigned)
+            if current != WorkItemState.executing:
+                released.append((task_id, WorkItemState.executing, None))
+                continue
+            if not path:
+                # Renewed rather than dropped: the item still executes and holds its concurrency slots.
+                logger.warning("WI-%d: lease expired but its workflow has no way out of executing", task_id)
+                heartbeat(session, task_id)
+                continue
+            swept.append((task_id, [current, *path], executor, expires_at, tuple(context)))
+            released.append((task_id, current, path[-1]))
+        _track_leases(session, released, now)
+        if not swept:
+            return []
+
+        by_state: dict[WorkItemState, list[int]] = {}
+        for task_id, path, *_ in swept:
+            by_state.setdefault(path[-1], []).append(task_id)
+        for final, task_ids in by_state.items():
+            _update_in_chunks(session, task_ids, state=final, updated_at=now)
+
+        entries = []
+        for task_id, path, executor, expires_at, _ in swept:
+            holder = f" held by {executor}" if executor else ""
+            entries.append(
+                (task_id, ActivityAction.lease_expired, f"lease{holder} expired {expires_at:%Y-%m-%d %H:%M:%S}")
+            )
+            entries += [
+                (task_id, ActivityAction.state_change, f"{a.value} → {b.value}") for a, b in zip(path, path[1:])
+            ]
+        _log_activity_many(session, entries, actor=SWEEPER_ACTOR, created_at=now)
+
+        for task_id, path, executor, expires_at, context in swept:
+            hook_context = _hook_context(session, *context)
+            _queue_hook(
+                session,
+                HookEvent.on_lease_expired,
+                {
+                    "task_id": task_id,
+                    "executor": executor,
+                    "expired_at": expires_at.isoformat(),
+                    "new_state": path[-1].value,
+                    "actor": SWEEPER_ACTOR,
+                    **hook_context,
+                },
+            )
+            for old, new in zip(path, path[1:]):
+                _queue_transition_hooks(session, task_id, old, new, SWEEPER_ACTOR, hook_context)
+        return [task_id for task_id, *_ in swept]
+
+
+class LeaseSweeper:
+    """Sweep expired leases every ``interval_s`` on a daemon thread, or one round at a time with run_once()."""
+
+    def __init__(
+        self,
+        engine,
+        *,
+        interval_s: float = LEASE_SWEEP_INTERVAL_S,
+        state: WorkItemState | str = LEASE_EXPIRED_STATE,
+    ):
+        self.engine = engine
+        self.interval_s = interval_s
+        self.state = WorkItemState(state)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def run_once(self) -> list[int]:
+        swept = sweep_expired_leases(self.engine, state=self.state)
+        if swept:
+            logger.info("Reclaimed %d item(s) with expired leases: %s", len(swept), swept)
+        return swept
+
+    def run_forever(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception:
+                logger.exception("Lease sweep failed")
+            self._stop.wait(self.interval_s)
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run_forever, name="forgeops-lease-sweeper", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
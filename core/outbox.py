@@ -0,0 +1,381 @@
+"""Durable hook delivery — drain the event_outbox table to webhook subscribers.
+
+With ``FORGEOPS_EVENT_OUTBOX=1`` every unit of work writes its hook events to
+``event_outbox`` in the same transaction as the change, so an event exists if
+and only if its change committed. OutboxWorker delivers them to each row of
+``outbox_subscribers`` in event_id order, in batches, outside any write
+transaction. Each subscriber keeps its own offset (``last_event_id``). A failed
+delivery is retried with exponential backoff, and after ``max_attempts`` the
+event is copied to ``outbox_dead_letters`` and skipped. Delivery is
+at-least-once: a receiver should de-duplicate on ``event_id``.
+
+Usage:
+    from core.outbox import OutboxWorker, add_subscriber
+
+    add_subscriber(engine, "notifier", "http://127.0.0.1:9000/hooks", events=["on_state_change"])
+    OutboxWorker(engine).run_once()      # or .start() for a background thread,
+                                         # or `forgeops hooks-worker` as its own process
+"""
+
+import http.client
+import json
+import logging
+import threading
+import time
+from datetime import UTC, datetime, timedelta
+from typing import Callable, NamedTuple, Optional
+from urllib.parse import urlsplit
+
+from sqlalchemy import delete, exists, insert, literal, or_, text, update
+from sqlmodel import col, func, select
+
+from config import (
+    OUTBOX_BACKOFF_MAX_S,
+    OUTBOX_BACKOFF_S,
+    OUTBOX_BATCH_SIZE,
+    OUTBOX_HTTP_TIMEOUT_S,
+    OUTBOX_MAX_ATTEMPTS,
+    OUTBOX_POLL_INTERVAL_S,
+    OUTBOX_RETAIN_S,
+)
+from core.database import _reading, _writing, unit_of_work
+from core.hooks import HookEvent
+from models import OutboxDeadLetter, OutboxEvent, OutboxSubscriber
+
+logger = logging.getLogger(__name__)
+
+
+class SubscriberStatus(NamedTuple):
+    subscriber: OutboxSubscriber
+    pending: int  # outbox events past the subscriber's offset that its filter wants
+    dead_letters: int
+
+
+# --- Subscribers ----------------------------------------------------------------
+
+
+def add_subscriber(
+    engine,
+    name: str,
+    url: str,
+    *,
+    events: Optional[list[str]] = None,
+    from_start: bool = False,
+) -> OutboxSubscriber:
+    """Register a webhook. It receives events committed from now on, or every retained event with ``from_start``."""
+    if urlsplit(url).scheme not in ("http", "https"):
+        raise ValueError(f"Subscriber URL must be http:// or https://, got '{url}'")
+    try:
+        kinds = sorted({HookEvent(event).value for event in events}) if events else None
+    except ValueError as e:
+        raise ValueError(f"{e}; expected one of {', '.join(e.value for e in HookEvent)}") from None
+    with _writing(engine) as session:
+        if session.get(OutboxSubscriber, name) is not None:
+            raise ValueError(f"Subscriber '{name}' already exists")
+        offset = 0 if from_start else session.exec(select(func.max(OutboxEvent.event_id))).one() or 0
+        subscriber = OutboxSubscriber(
+            name=name, url=url, events=",".join(kinds) if kinds else None, last_event_id=offset
+        )
+        session.add(subscriber)
+        session.flush()
+        return subscriber
+
+
+def remove_subscriber(engine, name: str) -> bool:
+    with _writing(engine) as session:
+        subscriber = session.get(OutboxSubscriber, name)
+        if subscriber is None:
+            return False
+        session.delete(subscriber)
+        return True
+
+
+def get_subscribers(engine) -> list[OutboxSubscriber]:
+    with _reading(engine) as session:
+        return list(session.exec(select(OutboxSubscriber).order_by(OutboxSubscriber.name)))
+
+
+def get_outbox_status(engine) -> list[SubscriberStatus]:
+    """Every subscriber with its backlog and dead-letter count, in one query."""
+    pending = select(func.count()).where(*_pending()).correlate(OutboxSubscriber).scalar_subquery()
+    dead = (
+        select(func.count())
+        .where(OutboxDeadLetter.subscriber == OutboxSubscriber.name)
+        .correlate(OutboxSubscriber)
+        .scalar_subquery()
+    )
+    with _reading(engine) as session:
+        rows = session.exec(select(OutboxSubscriber, pending, dead).order_by(OutboxSubscriber.name))
+        return [SubscriberStatus(*row) for row in rows]
+
+
+def outbox_head(engine) -> int:
+    """The last event_id ever issued (0 before the first), even once pruning has emptied the table."""
+    with _reading(engine) as session:
+        seq = session.execute(text("SELECT seq FROM sqlite_sequence WHERE name = 'event_outbox'")).scalar()
+        return seq or 0
+
+
+def read_events(engine, after: int, *, limit: int = OUTBOX_BATCH_SIZE) -> list[OutboxEvent]:
+    """Up to ``limit`` retained events past ``after``, in event_id order."""
+    with _reading(engine) as session:
+        stmt = select(OutboxEvent).where(OutboxEvent.event_id > after).order_by(OutboxEvent.event_id).limit(limit)
+        return list(session.exec(stmt))
+
+
+def event_body(event: OutboxEvent) -> dict:
+    """The JSON document an event is delivered as, to webhooks and event streams alike."""
+    return {
+        "event_id": event.event_id,
+        "event": event.event,
+        "task_id": event.task_id,
+        "payload": json.loads(event.payload),
+        "created_at": event.created_at.isoformat(),
+    }
+
+
+def get_dead_letters(engine, *, subscriber: Optional[str] = None, limit: int = 50) -> list[OutboxDeadLetter]:
+    with _reading(engine) as session:
+        stmt = select(OutboxDeadLetter).order_by(col(OutboxDeadLetter.dead_letter_id).desc())
+        if subscriber is not None:
+            stmt = stmt.where(OutboxDeadLetter.subscriber == subscriber)
+        return list(session.exec(stmt.limit(limit)))
+
+
+def prune_outbox(engine, *, retain_s: float = OUTBOX_RETAIN_S) -> int:
+    """Delete events every subscriber is done with (all of them when nobody subscribes); return how many.
+
+    A subscriber is done with everything before the next event its filter
+    wants, even though its offset only moves when it is next drained. Events
+    younger than ``retain_s`` are kept, so a stream listener can resume from
+    its cursor. The hooks worker and the API's event streams both call this,
+    so the outbox stays bounded whichever of them a deployment runs.
+    """
+    cutoff = datetime.now(UTC) - timedelta(seconds=retain_s)
+    head = select(func.max(OutboxEvent.event_id)).scalar_subquery()
+    next_wanted = select(func.min(OutboxEvent.event_id)).where(*_pending()).correlate(OutboxSubscriber)
+    done = select(func.min(func.coalesce(next_wanted.scalar_subquery() - 1, head))).select_from(OutboxSubscriber)
+    floor = func.min(
+        func.coalesce(done.scalar_subquery(), head),
+        func.coalesce(
+            select(func.max(OutboxEvent.event_id)).where(OutboxEvent.created_at < cutoff).scalar_subquery(), 0
+        ),
+    )
+    with _reading(engine) as session:
+        oldest, prunable = session.exec(select(func.min(OutboxEvent.event_id), floor)).one()
+    # Checked first so an idle poll doesn't take the write lock.
+    if oldest is None or oldest > prunable:
+        return 0
+    with unit_of_work(engine, versioned=False) as session:
+        return session.execute(delete(OutboxEvent).where(OutboxEvent.event_id <= prunable)).rowcount
+
+
+# --- Delivery -------------------------------------------------------------------
+
+
+class WebhookDelivery:
+    """POST each event as JSON, keeping one connection alive per host."""
+
+    def __init__(self, timeout: float = OUTBOX_HTTP_TIMEOUT_S):
+        self.timeout = timeout
+        self._connections: dict[tuple[str, str], http.client.HTTPConnection] = {}
+
+    def __call__(self, subscriber: OutboxSubscriber, event: OutboxEvent) -> None:
+        url = urlsplit(subscriber.url)
+        body = json.dumps(event_body(event)).encode()
+        headers = {
+            "Content-Type": "application/json",
+            "X-ForgeOps-Event": event.event,
+            "X-ForgeOps-Event-Id": str(event.event_id),
+        }
+        key = (url.scheme, url.netloc)
+        connection = self._connections.get(key)
+        if connection is None:
+            cls = http.client.HTTPSConnection if url.scheme == "https" else http.client.HTTPConnection
+            connection = self._connections[key] = cls(url.netloc, timeout=self.timeout)
+        try:
+            connection.request("POST", url.path or "/", body=body, headers=headers)
+            response = connection.getresponse()
+            response.read()
+        except Exception:
+            connection.close()
+            del self._connections[key]
+            raise
+        if not 200 <= response.status < 300:
+            raise RuntimeError(f"HTTP {response.status} {response.reason}")
+
+    def close(self) -> None:
+        for connection in self._connections.values():
+            connection.close()
+        self._connections.clear()
+
+
+# --- Worker ---------------------------------------------------------------------
+
+
+class OutboxWorker:
+    """Deliver outbox events to every subscriber; safe to run in several processes at once.
+
+    A subscriber is leased (``lease_until``) for up to ``lease_s`` while one
+    worker drains a batch for it, so two workers never deliver to the same
+    subscriber concurrently. A worker stops a batch early rather than outlive
+    its lease.
+    """
+
+    def __init__(
+        self,
+        engine,
+        *,
+        deliver: Optional[Callable[[OutboxSubscriber, OutboxEvent], None]] = None,
+        batch_size: int = OUTBOX_BATCH_SIZE,
+        max_attempts: int = OUTBOX_MAX_ATTEMPTS,
+        backoff_s: float = OUTBOX_BACKOFF_S,
+        backoff_max_s: float = OUTBOX_BACKOFF_MAX_S,
+        lease_s: float = 60.0,
+        poll_interval_s: float = OUTBOX_POLL_INTERVAL_S,
+        retain_s: float = OUTBOX_RETAIN_S,
+    ):
+        self.engine = engine
+        self.deliver = deliver or WebhookDelivery()
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.backoff_s = backoff_s
+        self.backoff_max_s = backoff_max_s
+        self.lease_s = lease_s
+        self.poll_interval_s = poll_interval_s
+        self.retain_s = retain_s
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def run_once(self) -> int:
+        """Give every due subscriber one batch; return the number of events delivered.
+
+        Only subscribers with a wanted event past their offset are leased, so an
+        idle poll is a single read and never takes the write lock.
+        """
+        now = datetime.now(UTC)
+        due = exists(select(OutboxEvent.event_id).where(*_pending()).correlate(OutboxSubscriber))
+        with _reading(self.engine) as session:
+            names = list(session.exec(select(OutboxSubscriber.name).where(*_available(now), due)))
+        delivered = 0
+        for name in names:
+            subscriber = self._lease(name, now)
+            if subscriber is not None:
+                delivered += self._drain(subscriber)
+        self._prune()
+        return delivered
+
+    def run_forever(self) -> None:
+        """Poll until stop(); a round that delivered a full batch is followed immediately by the next."""
+        while not self._stop.is_set():
+            try:
+                delivered = self.run_once()
+            except Exception:
+                logger.exception("Outbox delivery round failed")
+                delivered = 0
+            if delivered < self.batch_size:
+                self._stop.wait(self.poll_interval_s)
+
+    def start(self) -> None:
+        """Run the worker on a daemon thread in this process."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run_forever, name="forgeops-outbox", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        if isinstance(self.deliver, WebhookDelivery):
+            self.deliver.close()
+
+    def _lease(self, name: str, now: datetime) -> Optional[OutboxSubscriber]:
+        with unit_of_work(self.engine, versioned=False) as session:
+            claimed = session.execute(
+                update(OutboxSubscriber)
+                .where(OutboxSubscriber.name == name, *_available(now))
+                .values(lease_until=now + timedelta(seconds=self.lease_s))
+            )
+            if claimed.rowcount != 1:
+                return None
+            return session.get(OutboxSubscriber, name)
+
+    def _drain(self, subscriber: OutboxSubscriber) -> int:
+        events = read_events(self.engine, subscriber.last_event_id, limit=self.batch_size)
+        wanted = set(subscriber.events.split(",")) if subscriber.events else None
+        deadline = time.monotonic() + self.lease_s / 2
+        offset, attempts, error, retry_at = subscriber.last_event_id, subscriber.attempts, subscriber.last_error, None
+        dead_letters = []
+        delivered = 0
+        for event in events:
+            if wanted is not None and event.event not in wanted:
+                offset = event.event_id
+                continue
+            if time.monotonic() > deadline:
+                break
+            try:
+                self.deliver(subscriber, event)
+            except Exception as e:
+                attempts += 1
+                error = f"{type(e).__name__}: {e}"
+                logger.warning(
+                    "Delivery of event %d to %s failed (attempt %d): %s",
+                    event.event_id,
+                    subscriber.name,
+                    attempts,
+                    error,
+                )
+                if attempts < self.max_attempts:
+                    retry_at = datetime.now(UTC) + timedelta(seconds=self._backoff(attempts))
+                    break
+                dead_letters.append(
+                    {
+                        "subscriber": subscriber.name,
+                        "event_id": event.event_id,
+                        "event": event.event,
+                        "payload": event.payload,
+                        "error": error,
+                        "attempts": attempts,
+                        "created_at": datetime.now(UTC),
+                    }
+                )
+                offset, attempts = event.event_id, 0
+                continue
+            offset, attempts, error = event.event_id, 0, None
+            delivered += 1
+
+        # Releasing the lease is all there is to write when the batch went nowhere.
+        values: dict = {"lease_until": None}
+        if offset != subscriber.last_event_id or attempts != subscriber.attempts or retry_at is not None:
+            values.update(last_event_id=offset, attempts=attempts, last_error=error, next_attempt_at=retry_at)
+        with unit_of_work(self.engine, versioned=False) as session:
+            if dead_letters:
+                session.execute(insert(OutboxDeadLetter.__table__), dead_letters)
+            session.execute(update(OutboxSubscriber).where(OutboxSubscriber.name == subscriber.name).values(**values))
+        return delivered
+
+    def _backoff(self, attempts: int) -> float:
+        return min(self.backoff_max_s, self.backoff_s * 2 ** (attempts - 1))
+
+    def _prune(self) -> None:
+        prune_outbox(self.engine, retain_s=self.retain_s)
+
+
+def _pending() -> tuple:
+    """Outbox events past a (correlated) subscriber's offset that its event filter wants."""
+    return (
+        OutboxEvent.event_id > OutboxSubscriber.last_event_id,
+        or_(
+            col(OutboxSubscriber.events).is_(None),
+            func.instr(literal(",") + OutboxSubscriber.events + ",", literal(",") + OutboxEvent.event + ",") > 0,
+        ),
+    )
+
+
+def _available(now: datetime) -> tuple:
+    """Subscribers that are neither backing off nor leased to another worker."""
+    return (
+        or_(col(OutboxSubscriber.next_attempt_at).is_(None), OutboxSubscriber.next_attempt_at <= now),
+        or_(col(OutboxSubscriber.lease_until).is_(None), OutboxSubscriber.lease_until < now),
+    )
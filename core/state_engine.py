@@ -6,11 +6,19 @@ The lifecycle:
                           └──────── rework_required ───────────────┘
 
 Key rules:
-  - Only valid transitions are allowed (see TRANSITIONS).
+  - Only valid transitions are allowed (see TRANSITIONS, or the repository's
+    own workflow — WORKFLOW_PRESETS or a JSON transition map).
   - Block mechanism is orthogonal — any state can be blocked/unblocked.
-  - Repo concurrency guard: one executing item per repo_id at a time.
+  - Repo concurrency guard: by default one executing item per repo_id at a time;
+    a repository's ConcurrencyPolicy can allow N per repo and cap items per branch
+    and per executor. core.database enforces it with concurrency_slots counter rows
+    updated in the transition's own transaction.
 """
 
+import json
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
 from models import WorkItemState
 
 # Valid transitions: from_state → set of allowed to_states
@@ -26,77 +34,277 @@ TRANSITIONS: dict[WorkItemState, set[WorkItemState]] = {
 }
 
 
+def _ordered(states) -> list[WorkItemState]:
+    """States in lifecycle (enum) order."""
+    return [state for state in WorkItemState if state in states]
+
+
 class InvalidTransitionError(Exception):
-    def __init__(self, from_state: WorkItemState, to_state: WorkItemState):
+    def __init__(
+        self,
+        from_state: WorkItemState,
+        to_state: WorkItemState,
+        allowed: Optional[frozenset[WorkItemState] | set[WorkItemState]] = None,
+    ):
         self.from_state = from_state
         self.to_state = to_state
+        if allowed is None:
+            allowed = TRANSITIONS[from_state]
         super().__init__(
             f"Invalid transition: {from_state.value} → {to_state.value}. "
-            f"Allowed from {from_state.value}: {', '.join(s.value for s in TRANSITIONS[from_state]) or 'none'}"
+            f"Allowed from {from_state.value}: {', '.join(s.value for s in _ordered(allowed)) or 'none'}"
         )
 
 
 class RepoConcurrencyError(Exception):
-    def __init__(self, repo_name: str, blocking_task_id: int):
+    def __init__(
+        self,
+        repo_name: str,
+        blocking_task_id: Optional[int],
+        *,
+        limit: int = 1,
+        kind: str = "repo",
+        key: Optional[str] = None,
+    ):
         self.repo_name = repo_name
         self.blocking_task_id = blocking_task_id
-        super().__init__(
-            f"Repository '{repo_name}' already has an item in executing state (WI-{blocking_task_id}). "
-            f"Only one work item per repository may be executing at a time."
-        )
+        self.limit = limit
+        self.kind = kind
+        self.key = key
+        blocking = f" (WI-{blocking_task_id})" if blocking_task_id else ""
+        if kind == "repo" and limit == 1:
+            message = (
+                f"Repository '{repo_name}' already has an item in executing state{blocking}. "
+                f"Only one work item per repository may be executing at a time."
+            )
+        else:
+            scope = {"repo": "", "branch": f" on branch '{key}'", "executor": f" by executor '{key}'"}[kind]
+            message = (
+                f"Repository '{repo_name}' already has {limit} item(s) executing{scope}{blocking}. "
+                f"Its concurrency policy allows at most {limit}."
+            )
+        super().__init__(message)
+
+
+# --- Workflows --------------------------------------------------------------------
+
+_S = WorkItemState
+
+# Named workflows a repository can select instead of spelling out a transition map.
+WORKFLOW_PRESETS: dict[str, dict[WorkItemState, set[WorkItemState]]] = {
+    "default": TRANSITIONS,
+    # Completed work is accepted directly; awaiting_review keeps its exits for items already there.
+    "no_review": {**TRANSITIONS, _S.completed: {_S.accepted, _S.closed}},
+    # Nothing closes without passing review first.
+    "review_required": {
+        _S.queued: {_S.assigned},
+        _S.assigned: {_S.executing, _S.queued},
+        _S.executing: {_S.completed, _S.assigned},
+        _S.completed: {_S.awaiting_review},
+        _S.awaiting_review: {_S.accepted, _S.rework_required},
+        _S.accepted: {_S.closed},
+        _S.rework_required: {_S.executing},
+        _S.closed: set(),
+    },
+}
+
+
+class CompiledWorkflow:
+    """A transition graph compiled once into lookup tables.
+
+    ``path(a, b)`` reads an all-pairs shortest-path table built by a BFS from
+    every state (successors visited in lifecycle order, so ties break the same
+    way every run); ``sources(b)`` is the inverse adjacency a bulk operation
+    checks a whole batch of current states against.
+    """
+
+    def __init__(self, transitions: dict[WorkItemState, set[WorkItemState]], name: Optional[str] = None):
+        self.name = name
+        self.transitions = {state: frozenset(transitions.get(state, ())) for state in WorkItemState}
+        self._paths: dict[tuple[WorkItemState, WorkItemState], tuple[WorkItemState, ...]] = {}
+        for start in WorkItemState:
+            self._paths[start, start] = ()
+            frontier = [start]
+            while frontier:
+                reached = []
+                for state in frontier:
+                    for next_state in _ordered(self.transitions[state]):
+                        if (start, next_state) not in self._paths:
+                            self._paths[start, next_state] = self._paths[start, state] + (next_state,)
+                            reached.append(next_state)
+                frontier = reached
+        self._sources = {
+            state: frozenset(source for source, targets in self.transitions.items() if state in targets)
+            for state in WorkItemState
+        }
+
+    def allows(self, from_state: WorkItemState, to_state: WorkItemState) -> bool:
+        return to_state in self.transitions[from_state]
+
+    def allowed(self, from_state: WorkItemState) -> frozenset[WorkItemState]:
+        return self.transitions[from_state]
+
+    def sources(self, to_state: WorkItemState) -> frozenset[WorkItemState]:
+        """States that may move directly to ``to_state``."""
+        return self._sources[to_state]
+
+    def path(self, from_state: WorkItemState, to_state: WorkItemState) -> Optional[tuple[WorkItemState, ...]]:
+        """Shortest sequence of states after ``from_state`` ending in ``to_state``; None when unreachable."""
+        return self._paths.get((from_state, to_state))
+
+    def reachable(self, from_state: WorkItemState) -> frozenset[WorkItemState]:
+        return frozenset(to for (start, to), steps in self._paths.items() if start == from_state and steps)
+
+    def to_dict(self) -> dict[str, list[str]]:
+        return {state.value: [s.value for s in _ordered(targets)] for state, targets in self.transitions.items()}
+
+
+def parse_workflow(definition: str | dict) -> dict[WorkItemState, set[WorkItemState]]:
+    """Turn a preset name, a JSON object or a dict of ``state → [states]`` into a transition map.
+
+    States the map leaves out have no outgoing transitions. Raises ValueError
+    for unknown presets, malformed JSON and unknown state names.
+    """
+    if isinstance(definition, str):
+        if definition in WORKFLOW_PRESETS:
+            return WORKFLOW_PRESETS[definition]
+        try:
+            definition = json.loads(definition)
+        except json.JSONDecodeError:
+            raise ValueError(
+                f"Unknown workflow '{definition}'; use one of {', '.join(WORKFLOW_PRESETS)} or a JSON transition map"
+            ) from None
+    if not isinstance(definition, dict):
+        raise ValueError("A workflow must map each state to a list of next states")
+    try:
+        return {
+            WorkItemState(state): {WorkItemState(to) for to in ([targets] if isinstance(targets, str) else targets)}
+            for state, targets in definition.items()
+        }
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid workflow: {e}") from None
+
+
+def normalize_workflow(definition: Optional[str | dict]) -> Optional[str]:
+    """Validate a workflow and return the text stored on the repository (None for the default)."""
+    if definition is None or definition == "" or definition == "default":
+        return None
+    if isinstance(definition, str) and definition in WORKFLOW_PRESETS:
+        return definition
+    return json.dumps(CompiledWorkflow(parse_workflow(definition)).to_dict(), separators=(",", ":"))
 
 
-def validate_transition(from_state: WorkItemState, to_state: WorkItemState) -> None:
-    allowed = TRANSITIONS.get(from_state, set())
-    if to_state not in allowed:
-        raise InvalidTransitionError(from_state, to_state)
+@lru_cache(maxsize=128)
+def compile_workflow(definition: Optional[str] = None) -> CompiledWorkflow:
+    """The compiled tables for a stored workflow, built once per distinct definition.
+
+    The cache is keyed by the definition text, so a repository whose workflow
+    changes simply looks up (or compiles) the new text.
+    """
+    if definition is None:
+        return CompiledWorkflow(TRANSITIONS, "default")
+    name = definition if definition in WORKFLOW_PRESETS else "custom"
+    return CompiledWorkflow(parse_workflow(definition), name)
+
+
+DEFAULT_WORKFLOW = compile_workflow(None)
 
 
-def fast_track_transition(from_state: WorkItemState, to_state: WorkItemState) -> list[WorkItemState]:
+def validate_transition(
+    from_state: WorkItemState, to_state: WorkItemState, workflow: Optional[CompiledWorkflow] = None
+) -> None:
+    workflow = workflow or DEFAULT_WORKFLOW
+    if not workflow.allows(from_state, to_state):
+        raise InvalidTransitionError(from_state, to_state, workflow.allowed(from_state))
+
+
+def fast_track_transition(
+    from_state: WorkItemState, to_state: WorkItemState, workflow: Optional[CompiledWorkflow] = None
+) -> list[WorkItemState]:
     """Return the sequence of intermediate states needed to reach to_state from from_state.
 
     Returns the path (excluding from_state, including to_state) or raises
     InvalidTransitionError if no path exists.
     """
-    # BFS to find shortest path through the transition graph
-    from collections import deque
-
-    if from_state == to_state:
-        return []
+    workflow = workflow or DEFAULT_WORKFLOW
+    path = workflow.path(from_state, to_state)
+    if path is None:
+        raise InvalidTransitionError(from_state, to_state, workflow.allowed(from_state))
+    return list(path)
 
-    queue: deque[list[WorkItemState]] = deque([[from_state]])
-    visited = {from_state}
 
-    while queue:
-        path = queue.popleft()
-        current = path[-1]
-        for next_state in TRANSITIONS.get(current, set()):
-            if next_state == to_state:
-                return path[1:] + [to_state]
-            if next_state not in visited:
-                visited.add(next_state)
-                queue.append(path + [next_state])
+def check_repo_concurrency(
+    engine, repo_id: int | None, task_id: int, *, branch: Optional[str] = None, executor: Optional[str] = None
+) -> None:
+    """Raise RepoConcurrencyError if starting ``task_id`` would exceed the repository's concurrency policy.
 
-    raise InvalidTransitionError(from_state, to_state)
+    Advisory only: writers take their slots in the writing transaction, which can't race.
 
-
-def check_repo_concurrency(engine, repo_id: int | None, task_id: int) -> None:
-    """Raise RepoConcurrencyError if another item for the same repo is already executing."""
+    ``engine`` may also be an open Session, in which case the check runs inside
+    the caller's transaction.
+    """
     if repo_id is None:
         return
 
-    from sqlmodel import Session, select
-    from models import WorkItem, Repository
+    from core.database import _plan_slots, _reading
 
-    with Session(engine) as session:
-        stmt = (
-            select(WorkItem)
-            .where(WorkItem.repo_id == repo_id)
-            .where(WorkItem.state == WorkItemState.executing)
-            .where(WorkItem.task_id != task_id)
-        )
-        blocking = session.exec(stmt).first()
-        if blocking:
-            repo = session.get(Repository, repo_id)
-            repo_name = repo.name if repo else f"repo_id={repo_id}"
-            raise RepoConcurrencyError(repo_name, blocking.task_id or 0)
+    with _reading(engine) as session:
+        (plan,) = _plan_slots(session, [(task_id, repo_id, branch)], executor=executor)
+    if isinstance(plan, RepoConcurrencyError):
+        raise plan
+
+
+# --- Concurrency policies ---------------------------------------------------------
+
+
+class ConcurrencyPolicy(NamedTuple):
+    """How many items may execute at once in one repository: overall, per branch and per executor.
+
+    None leaves that key uncapped. The default is the original guard, one
+    executing item per repository.
+    """
+
+    repo: Optional[int] = 1
+    branch: Optional[int] = None
+    executor: Optional[int] = None
+
+
+DEFAULT_CONCURRENCY = ConcurrencyPolicy()
+
+
+def parse_concurrency(definition: str | dict) -> ConcurrencyPolicy:
+    """Turn a JSON object (or its text) such as ``{"repo": 4, "branch": 1, "executor": 2}`` into a policy.
+
+    Keys left out keep their defaults. Raises ValueError for malformed JSON,
+    unknown keys and caps that aren't positive integers or null.
+    """
+    if isinstance(definition, str):
+        try:
+            definition = json.loads(definition)
+        except json.JSONDecodeError:
+            raise ValueError(f"Invalid concurrency policy '{definition}'; expected a JSON object") from None
+    if not isinstance(definition, dict):
+        raise ValueError("A concurrency policy must map repo, branch or executor to a cap")
+    unknown = set(definition) - set(ConcurrencyPolicy._fields)
+    if unknown:
+        raise ValueError(f"Unknown concurrency keys: {', '.join(sorted(unknown))} (use repo, branch, executor)")
+    for key, cap in definition.items():
+        if cap is not None and (isinstance(cap, bool) or not isinstance(cap, int) or cap < 1):
+            raise ValueError(f"Concurrency cap for {key} must be a positive integer or null, not {cap!r}")
+    return ConcurrencyPolicy(**definition)
+
+
+def normalize_concurrency(definition: Optional[str | dict]) -> Optional[str]:
+    """Validate a concurrency policy and return the text stored on the repository (None for the default)."""
+    if definition is None or definition == "" or definition == "default":
+        return None
+    policy = parse_concurrency(definition)
+    if policy == DEFAULT_CONCURRENCY:
+        return None
+    return json.dumps(policy._asdict(), separators=(",", ":"))
+
+
+@lru_cache(maxsize=128)
+def compile_concurrency(definition: Optional[str] = None) -> ConcurrencyPolicy:
+    """The policy for a stored definition, parsed once per distinct text."""
+    return parse_concurrency(definition) if definition else DEFAULT_CONCURRENCY
@@ -8,6 +8,7 @@ from typing import Optional
 
 import typer
 
+import config
 from core.database import create_db_and_tables, get_repositories
 
 from commands.add_repo import add_repo as _add_repo
@@ -19,6 +20,13 @@ from commands.attachments import list_attachments as _list_attachments
 from commands.create_issue import create_issue as _create_issue
 from commands.execution import log_run as _log_run
 from commands.execution import runs as _runs
+from commands.hooks import hooks_status as _hooks_status
+from commands.hooks import hooks_subscribe as _hooks_subscribe
+from commands.hooks import hooks_unsubscribe as _hooks_unsubscribe
+from commands.hooks import hooks_worker as _hooks_worker
+from commands.import_items import import_items as _import_items
+from commands.leases import lease_sweeper as _lease_sweeper
+from commands.leases import leases as _leases
 from commands.list_issues import list_issues as _list_issues
 from commands.list_repos import list_repos as _list_repos
 from commands.migrate_issues import migrate_issues as _migrate_issues
@@ -31,6 +39,7 @@ from commands.session import resume as _resume
 from commands.session import snapshot as _snapshot
 from commands.session import status_overview as _status_overview
 from commands.state import block as _block
+from commands.state import bulk_transition_items as _bulk_transition_items
 from commands.state import unblock as _unblock
 from commands.state import update_status as _update_status
 from commands.tasks import add_task as _add_task
@@ -82,9 +91,28 @@ def list_issues(
     state: Optional[str] = typer.Option(None, "--state", help="Filter by state (e.g. queued, executing)"),
     blocked: Optional[bool] = typer.Option(None, "--blocked", help="Filter blocked items"),
     priority: Optional[str] = typer.Option(None, "--priority", help="Filter by priority (low, medium, high, urgent)"),
+    limit: Optional[int] = typer.Option(None, "--limit", "-n", help="Page size (default 100)"),
+    cursor: Optional[str] = typer.Option(None, "--cursor", help="Resume after the previous page"),
 ):
-    """List work items, optionally filtered."""
-    _list_issues(repo_filter=repo, state_filter=state, show_blocked=blocked, priority_filter=priority)
+    """List work items, optionally filtered, one page at a time."""
+    _list_issues(
+        repo_filter=repo,
+        state_filter=state,
+        show_blocked=blocked,
+        priority_filter=priority,
+        limit=limit,
+        cursor=cursor,
+    )
+
+
+@app.command(name="import")
+def import_items(
+    file: str = typer.Argument(help="JSON array or .jsonl file of work items"),
+    created_by: Optional[str] = typer.Option(None, "--created-by", help="Creator for items that do not set one"),
+    create_repos: bool = typer.Option(False, "--create-repos", help="Register unknown repositories first"),
+):
+    """Bulk-import work items in a single transaction."""
+    _import_items(file, created_by=created_by, create_repos=create_repos)
 
 
 @app.command()
@@ -112,6 +140,32 @@ def update_status(
     _update_status(_parse_id(issue_id), state, actor=actor)
 
 
+@app.command()
+def bulk_transition(
+    state: str = typer.Option(..., "--state", "-s", help="Target state"),
+    ids: Optional[list[str]] = typer.Option(None, "--id", help="Work item ID (repeatable)"),
+    repo: Optional[str] = typer.Option(
+        None, "--repo", help="Only items in this repository", autocompletion=_complete_repo
+    ),
+    from_state: Optional[str] = typer.Option(None, "--from-state", help="Only items currently in this state"),
+    blocked: Optional[bool] = typer.Option(None, "--blocked/--unblocked", help="Only blocked / unblocked items"),
+    priority: Optional[str] = typer.Option(None, "--priority", help="Only items with this priority"),
+    parent: Optional[str] = typer.Option(None, "--parent", help="Only sub-tasks of this work item"),
+    actor: Optional[str] = typer.Option(None, "--actor", help="Who is making the change"),
+):
+    """Transition every matching work item in one transaction (at least one filter required)."""
+    _bulk_transition_items(
+        state,
+        task_ids=[_parse_id(i) for i in ids or []],
+        repo_name=repo,
+        from_state=from_state,
+        blocked=blocked,
+        priority=priority,
+        parent_id=_parse_id(parent) if parent else None,
+        actor=actor,
+    )
+
+
 @app.command()
 def block(
     issue_id: str = typer.Argument(help="Work item ID"),
@@ -288,9 +342,11 @@ def add_task(
 @app.command()
 def list_tasks(
     parent_id: str = typer.Argument(help="Parent work item ID"),
+    tree: bool = typer.Option(False, "--tree", "-t", help="Show the whole subtree, not just direct children"),
+    max_depth: Optional[int] = typer.Option(None, "--max-depth", help="Levels to show with --tree"),
 ):
     """List sub-tasks of a work item with progress rollup."""
-    _list_tasks(_parse_id(parent_id))
+    _list_tasks(_parse_id(parent_id), tree=tree, max_depth=max_depth)
 
 
 # --- Repositories -------------------------------------------------------------
@@ -342,6 +398,14 @@ def update_repo(
     language: Optional[str] = typer.Option(None, "--lang", help="Primary language/stack"),
     deploy_target: Optional[str] = typer.Option(None, "--deploy", help="Deploy target (docker, vercel, etc.)"),
     notes: Optional[str] = typer.Option(None, "--notes", help="Dev environment notes"),
+    workflow: Optional[str] = typer.Option(
+        None, "--workflow", help="Workflow: default, no_review, review_required or a JSON transition map"
+    ),
+    concurrency: Optional[str] = typer.Option(
+        None,
+        "--concurrency",
+        help='Executing-item caps as JSON, e.g. {"repo": 4, "branch": 1, "executor": 2}, or default',
+    ),
 ):
     """Update repository metadata."""
     _update_repo(
@@ -355,6 +419,8 @@ def update_repo(
         language=language,
         deploy_target=deploy_target,
         notes=notes,
+        workflow=workflow,
+        concurrency=concurrency,
     )
 
 
@@ -364,6 +430,60 @@ def remove_repo(repo_name: str = typer.Argument(help="Repository name to remove"
     _remove_repo(repo_name)
 
 
+# --- Event outbox -------------------------------------------------------------
+
+
+@app.command()
+def hooks_subscribe(
+    name: str = typer.Argument(help="Subscriber name"),
+    url: str = typer.Argument(help="Webhook URL that receives each event as a JSON POST"),
+    events: Optional[list[str]] = typer.Option(None, "--event", "-e", help="Only this hook event (repeatable)"),
+    from_start: bool = typer.Option(False, "--from-start", help="Also deliver events already in the outbox"),
+):
+    """Register a webhook subscriber for outbox events."""
+    _hooks_subscribe(name, url, events=events, from_start=from_start)
+
+
+@app.command()
+def hooks_unsubscribe(name: str = typer.Argument(help="Subscriber name")):
+    """Remove an outbox subscriber."""
+    _hooks_unsubscribe(name)
+
+
+@app.command()
+def hooks_status():
+    """Show each outbox subscriber's offset, backlog and dead letters."""
+    _hooks_status()
+
+
+@app.command()
+def hooks_worker(
+    once: bool = typer.Option(False, "--once", help="Deliver one batch per subscriber and exit"),
+    batch_size: int = typer.Option(config.OUTBOX_BATCH_SIZE, "--batch-size", help="Events per subscriber per round"),
+):
+    """Deliver outbox events to subscribers, retrying with backoff and dead-lettering."""
+    _hooks_worker(once=once, batch_size=batch_size)
+
+
+# --- Execution leases ---------------------------------------------------------
+
+
+@app.command()
+def leases(expired: bool = typer.Option(False, "--expired", help="Only leases that have lapsed")):
+    """Show executing items' leases and when they expire."""
+    _leases(expired=expired)
+
+
+@app.command()
+def lease_sweeper(
+    once: bool = typer.Option(False, "--once", help="Sweep once and exit"),
+    interval: float = typer.Option(config.LEASE_SWEEP_INTERVAL_S, "--interval", help="Seconds between sweeps"),
+    state: str = typer.Option(config.LEASE_EXPIRED_STATE, "--state", help="Return items to: queued or assigned"),
+):
+    """Return items whose executor stopped heartbeating to the queue."""
+    _lease_sweeper(once=once, interval_s=interval, state=state)
+
+
 # --- Migration ----------------------------------------------------------------
 
 
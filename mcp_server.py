@@ -4,7 +4,10 @@ Run: uv run python mcp_server.py
 Or via entry point: forgeops-mcp
 """
 
+import asyncio
 import json
+import logging
+import re
 from typing import Optional
 
 from mcp.server.fastmcp import FastMCP
@@ -19,6 +22,8 @@ server = FastMCP(
     ),
 )
 
+logger = logging.getLogger(__name__)
+
 # --- Lazy initialization ---------------------------------------------------
 
 _engine = None
@@ -33,6 +38,20 @@ def _get_engine():
     return _engine
 
 
+def _read_session():
+    """One read session per tool call."""
+    from sqlmodel import Session
+
+    return Session(_get_engine())
+
+
+def _unit_of_work():
+    """One unit of work per mutating tool call: a single commit, hooks fired after it."""
+    from core.database import unit_of_work
+
+    return unit_of_work(_get_engine())
+
+
 def _success(**kwargs) -> str:
     return json.dumps({"success": True, **kwargs}, default=str)
 
@@ -46,7 +65,10 @@ def _error(code: str, message: str) -> str:
 
 @server.tool(
     name="forgeops_list_work_items",
-    description="List work items with optional filters for repo, state, priority, blocked status, or parent.",
+    description=(
+        "List work items with optional filters for repo, state, priority, blocked status, or parent. "
+        "Returns one page ordered by task_id or updated_at; pass next_cursor back as cursor for the next page."
+    ),
 )
 def forgeops_list_work_items(
     repo: Optional[str] = None,
@@ -54,26 +76,32 @@ def forgeops_list_work_items(
     priority: Optional[str] = None,
     is_blocked: Optional[bool] = None,
     parent_id: Optional[int] = None,
+    order_by: str = "task_id",
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
 ) -> str:
-    """List work items, optionally filtered."""
+    """List one page of work items, optionally filtered."""
     try:
-        from core.database import list_work_items
+        from core.database import list_work_items_page
         from models import Priority, WorkItemState
 
-        kwargs = {}
-        if repo:
-            kwargs["repo_name"] = repo
-        if state:
-            kwargs["state"] = WorkItemState(state)
-        if priority:
-            kwargs["priority"] = Priority(priority)
-        if is_blocked is not None:
-            kwargs["is_blocked"] = is_blocked
-        if parent_id is not None:
-            kwargs["parent_id"] = parent_id
-
-        items = list_work_items(_get_engine(), **kwargs)
-        return _success(items=[_serialize_item(i) for i in items], count=len(items))
+        with _read_session() as session:
+            kwargs = {"order_by": order_by, "limit": limit, "cursor": cursor}
+            if repo:
+                kwargs["repo_name"] = repo
+            if state:
+                kwargs["state"] = WorkItemState(state)
+            if priority:
+                kwargs["priority"] = Priority(priority)
+            if is_blocked is not None:
+                kwargs["is_blocked"] = is_blocked
+            if parent_id is not None:
+                kwargs["parent_id"] = parent_id
+
+            page = list_work_items_page(session, **kwargs)
+            return _success(
+                items=[_serialize_item(i) for i in page.items], count=len(page.items), next_cursor=page.next_cursor
+            )
     except ValueError as e:
         return _error("VALIDATION_ERROR", str(e))
     except Exception as e:
@@ -89,17 +117,21 @@ def forgeops_get_work_item(task_id: int) -> str:
     try:
         from core.database import get_work_item
 
-        item = get_work_item(_get_engine(), task_id)
-        if not item:
-            return _error("NOT_FOUND", f"Work item {task_id} not found")
-        return _success(item=_serialize_item(item))
+        with _read_session() as session:
+            item = get_work_item(session, task_id)
+            if not item:
+                return _error("NOT_FOUND", f"Work item {task_id} not found")
+            return _success(item=_serialize_item(item))
     except Exception as e:
         return _error("GET_ERROR", str(e))
 
 
 @server.tool(
     name="forgeops_create_work_item",
-    description="Create a new work item. Optionally link to a repository and/or parent item.",
+    description=(
+        "Create a new work item. Optionally link to a repository and/or parent item; branch is the "
+        "branch the work lands on (defaults to the repository's default branch)."
+    ),
 )
 def forgeops_create_work_item(
     title: str,
@@ -108,32 +140,201 @@ def forgeops_create_work_item(
     priority: str = "medium",
     parent_id: Optional[int] = None,
     created_by: Optional[str] = None,
+    branch: Optional[str] = None,
 ) -> str:
     """Create a work item."""
     try:
         from core.database import create_work_item, get_work_item
         from models import Priority
 
-        item = create_work_item(
-            _get_engine(),
-            title,
-            repo_name=repo_name,
-            description=description,
-            priority=Priority(priority),
-            parent_id=parent_id,
-            created_by=created_by,
-        )
-        refreshed = get_work_item(_get_engine(), item.task_id)
-        return _success(item=_serialize_item(refreshed))
+        with _unit_of_work() as session:
+            item = create_work_item(
+                session,
+                title,
+                repo_name=repo_name,
+                description=description,
+                priority=Priority(priority),
+                parent_id=parent_id,
+                created_by=created_by,
+                branch=branch,
+            )
+            refreshed = get_work_item(session, item.task_id)
+            return _success(item=_serialize_item(refreshed))
+    except ValueError as e:
+        return _error("VALIDATION_ERROR", str(e))
+    except Exception as e:
+        return _error("CREATE_ERROR", str(e))
+
+
+@server.tool(
+    name="forgeops_create_work_items_bulk",
+    description=(
+        "Create many work items in one transaction. Each item takes title plus optional "
+        "repo_name, description, state, priority, parent_id, created_by. Returns task_ids in input order."
+    ),
+)
+def forgeops_create_work_items_bulk(items: list[dict], created_by: Optional[str] = None) -> str:
+    """Create work items in bulk."""
+    try:
+        from core.database import create_work_items_bulk
+
+        with _unit_of_work() as session:
+            task_ids = create_work_items_bulk(session, items, created_by=created_by)
+            return _success(task_ids=task_ids, count=len(task_ids))
     except ValueError as e:
         return _error("VALIDATION_ERROR", str(e))
     except Exception as e:
         return _error("CREATE_ERROR", str(e))
 
 
+_BULK_WHERE = (
+    "`where` selects items and needs at least one of: task_ids (list), repo_name, "
+    "state, is_blocked, priority, parent_id; set fields combine with AND."
+)
+
+
+@server.tool(
+    name="forgeops_bulk_transition",
+    description=(
+        "Transition every matching work item to `state` in one transaction, e.g. close all accepted "
+        "items in a repo. Items the state machine can't move are reported in `failed`. " + _BULK_WHERE
+    ),
+)
+def forgeops_bulk_transition(where: dict, state: str, actor: Optional[str] = None) -> str:
+    """Transition work items by filter."""
+    try:
+        from core.database import bulk_transition
+        from models import WorkItemState
+
+        with _unit_of_work() as session:
+            result = bulk_transition(session, _work_item_filter(where), WorkItemState(state), actor=actor)
+            return _success(**_serialize_bulk_result(result))
+    except ValueError as e:
+        return _error("VALIDATION_ERROR", str(e))
+    except Exception as e:
+        return _error("BULK_ERROR", str(e))
+
+
+@server.tool(
+    name="forgeops_bulk_block",
+    description=(
+        "Block every matching work item with `reason`, or unblock them with blocked=false, "
+        "in one transaction. " + _BULK_WHERE
+    ),
+)
+def forgeops_bulk_block(
+    where: dict, reason: Optional[str] = None, blocked: bool = True, actor: Optional[str] = None
+) -> str:
+    """Block or unblock work items by filter."""
+    try:
+        from core.database import bulk_block, bulk_unblock
+
+        with _unit_of_work() as session:
+            if blocked:
+                if not reason:
+                    return _error("VALIDATION_ERROR", "reason is required when blocking")
+                result = bulk_block(session, _work_item_filter(where), reason, actor=actor)
+            else:
+                result = bulk_unblock(session, _work_item_filter(where), actor=actor)
+            return _success(**_serialize_bulk_result(result))
+    except ValueError as e:
+        return _error("VALIDATION_ERROR", str(e))
+    except Exception as e:
+        return _error("BULK_ERROR", str(e))
+
+
+@server.tool(
+    name="forgeops_bulk_assign",
+    description="Assign every matching work item to one executor in one transaction. " + _BULK_WHERE,
+)
+def forgeops_bulk_assign(where: dict, executor: str, executor_type: str = "agent", actor: Optional[str] = None) -> str:
+    """Assign work items by filter."""
+    try:
+        from core.database import bulk_assign
+        from models import ExecutorType
+
+        with _unit_of_work() as session:
+            result = bulk_assign(session, _work_item_filter(where), executor, ExecutorType(executor_type), actor=actor)
+            return _success(**_serialize_bulk_result(result))
+    except ValueError as e:
+        return _error("VALIDATION_ERROR", str(e))
+    except Exception as e:
+        return _error("BULK_ERROR", str(e))
+
+
+@server.tool(
+    name="forgeops_claim_next",
+    description=(
+        "Claim the next work item from the queue: the highest-priority, oldest unblocked queued item "
+        "whose repository's concurrency policy has a free slot. It is assigned to the executor and moved to executing "
+        "(or only to assigned with start=false) in one transaction, so concurrent agents never get the "
+        "same item. Returns item=null when the queue is empty."
+    ),
+)
+def forgeops_claim_next(
+    executor: str,
+    executor_type: str = "agent",
+    repo_name: Optional[str] = None,
+    start: bool = True,
+    actor: Optional[str] = None,
+) -> str:
+    """Claim the next queued work item."""
+    try:
+        from core.database import claim_next_work_item, get_work_item
+        from models import ExecutorType
+
+        with _unit_of_work() as session:
+            item = claim_next_work_item(
+                session, executor, ExecutorType(executor_type), repo_name=repo_name, start=start, actor=actor
+            )
+            if item is None:
+                return _success(item=None)
+            return _success(item=_serialize_item(get_work_item(session, item.task_id)))
+    except ValueError as e:
+        return _error("VALIDATION_ERROR", str(e))
+    except Exception as e:
+        return _error(type(e).__name__.upper(), str(e))
+
+
+@server.tool(
+    name="forgeops_heartbeat",
+    description=(
+        "Renew the execution lease on a work item you are executing. Call it every few seconds while "
+        "working; an item whose lease lapses is returned to the queue by the lease sweeper. "
+        "NO_LEASE means the item is no longer yours to execute — stop working on it."
+    ),
+)
+def forgeops_heartbeat(task_id: int, executor: Optional[str] = None) -> str:
+    """Extend an executing item's lease."""
+    try:
+        from core.leases import heartbeat
+
+        expires_at = heartbeat(_get_engine(), task_id, executor=executor)
+        if expires_at is None:
+            return _error("NO_LEASE", f"Work item {task_id} holds no execution lease")
+        return _success(task_id=task_id, expires_at=expires_at.isoformat())
+    except Exception as e:
+        return _error(type(e).__name__.upper(), str(e))
+
+
+def _work_item_filter(where: dict):
+    from core.database import WorkItemFilter
+    from models import Priority, WorkItemState
+
+    unknown = set(where) - set(WorkItemFilter._fields)
+    if unknown:
+        raise ValueError(f"Unknown filter fields: {', '.join(sorted(unknown))}")
+    fields = dict(where)
+    if fields.get("state") is not None:
+        fields["state"] = WorkItemState(fields["state"])
+    if fields.get("priority") is not None:
+        fields["priority"] = Priority(fields["priority"])
+    return WorkItemFilter(**fields)
+
+
 @server.tool(
     name="forgeops_update_work_item",
-    description="Update a work item's title, description, priority, or repository.",
+    description="Update a work item's title, description, priority, repository, or branch.",
 )
 def forgeops_update_work_item(
     task_id: int,
@@ -141,33 +342,37 @@ def forgeops_update_work_item(
     description: Optional[str] = None,
     priority: Optional[str] = None,
     repo_name: Optional[str] = None,
+    branch: Optional[str] = None,
 ) -> str:
     """Update work item fields."""
     try:
         from core.database import update_work_item, get_work_item, get_repository
         from models import Priority
 
-        kwargs = {}
-        if title is not None:
-            kwargs["title"] = title
-        if description is not None:
-            kwargs["description"] = description
-        if priority is not None:
-            kwargs["priority"] = Priority(priority)
-        if repo_name is not None:
-            repo = get_repository(_get_engine(), repo_name)
-            if not repo:
-                return _error("NOT_FOUND", f"Repository '{repo_name}' not found")
-            kwargs["repo_id"] = repo.repo_id
-
-        if not kwargs:
-            return _error("VALIDATION_ERROR", "No fields to update")
-
-        item = update_work_item(_get_engine(), task_id, **kwargs)
-        if not item:
-            return _error("NOT_FOUND", f"Work item {task_id} not found")
-        refreshed = get_work_item(_get_engine(), item.task_id)
-        return _success(item=_serialize_item(refreshed))
+        with _unit_of_work() as session:
+            kwargs = {}
+            if title is not None:
+                kwargs["title"] = title
+            if description is not None:
+                kwargs["description"] = description
+            if priority is not None:
+                kwargs["priority"] = Priority(priority)
+            if branch is not None:
+                kwargs["branch"] = branch
+            if repo_name is not None:
+                repo = get_repository(session, repo_name)
+                if not repo:
+                    return _error("NOT_FOUND", f"Repository '{repo_name}' not found")
+                kwargs["repo_id"] = repo.repo_id
+
+            if not kwargs:
+                return _error("VALIDATION_ERROR", "No fields to update")
+
+            item = update_work_item(session, task_id, **kwargs)
+            if not item:
+                return _error("NOT_FOUND", f"Work item {task_id} not found")
+            refreshed = get_work_item(session, item.task_id)
+            return _success(item=_serialize_item(refreshed))
     except ValueError as e:
         return _error("VALIDATION_ERROR", str(e))
     except Exception as e:
@@ -186,10 +391,11 @@ def forgeops_delete_work_item(
     try:
         from core.database import delete_work_item
 
-        deleted = delete_work_item(_get_engine(), task_id, actor=actor)
-        if not deleted:
-            return _error("NOT_FOUND", f"Work item {task_id} not found")
-        return _success(deleted_task_id=task_id)
+        with _unit_of_work() as session:
+            deleted = delete_work_item(session, task_id, actor=actor)
+            if not deleted:
+                return _error("NOT_FOUND", f"Work item {task_id} not found")
+            return _success(deleted_task_id=task_id)
     except Exception as e:
         return _error("DELETE_ERROR", str(e))
 
@@ -202,7 +408,8 @@ def forgeops_delete_work_item(
     description=(
         "Transition a work item to a new state. Valid states: queued, assigned, executing, "
         "completed, awaiting_review, accepted, rework_required, closed. "
-        "Validates transitions and enforces repo concurrency (one executing item per repo)."
+        "Validates transitions and enforces the repository's concurrency policy "
+        "(by default one executing item per repo)."
     ),
 )
 def forgeops_transition(
@@ -215,14 +422,15 @@ def forgeops_transition(
         from core.database import transition_work_item, get_work_item
         from models import WorkItemState
 
-        item = transition_work_item(
-            _get_engine(),
-            task_id,
-            WorkItemState(state),
-            actor=actor,
-        )
-        refreshed = get_work_item(_get_engine(), item.task_id)
-        return _success(item=_serialize_item(refreshed))
+        with _unit_of_work() as session:
+            item = transition_work_item(
+                session,
+                task_id,
+                WorkItemState(state),
+                actor=actor,
+            )
+            refreshed = get_work_item(session, item.task_id)
+            return _success(item=_serialize_item(refreshed))
     except ValueError as e:
         return _error("NOT_FOUND", str(e))
     except Exception as e:
@@ -248,14 +456,15 @@ def forgeops_fast_track(
         from core.database import fast_track_work_item, get_work_item
         from models import WorkItemState
 
-        item = fast_track_work_item(
-            _get_engine(),
-            task_id,
-            WorkItemState(state),
-            actor=actor,
-        )
-        refreshed = get_work_item(_get_engine(), item.task_id)
-        return _success(item=_serialize_item(refreshed))
+        with _unit_of_work() as session:
+            item = fast_track_work_item(
+                session,
+                task_id,
+                WorkItemState(state),
+                actor=actor,
+            )
+            refreshed = get_work_item(session, item.task_id)
+            return _success(item=_serialize_item(refreshed))
     except ValueError as e:
         return _error("NOT_FOUND", str(e))
     except Exception as e:
@@ -276,9 +485,10 @@ def forgeops_block(
     try:
         from core.database import block_work_item, get_work_item
 
-        block_work_item(_get_engine(), task_id, reason, actor=actor)
-        refreshed = get_work_item(_get_engine(), task_id)
-        return _success(item=_serialize_item(refreshed))
+        with _unit_of_work() as session:
+            block_work_item(session, task_id, reason, actor=actor)
+            refreshed = get_work_item(session, task_id)
+            return _success(item=_serialize_item(refreshed))
     except ValueError as e:
         return _error("NOT_FOUND", str(e))
     except Exception as e:
@@ -297,9 +507,10 @@ def forgeops_unblock(
     try:
         from core.database import unblock_work_item, get_work_item
 
-        unblock_work_item(_get_engine(), task_id, actor=actor)
-        refreshed = get_work_item(_get_engine(), task_id)
-        return _success(item=_serialize_item(refreshed))
+        with _unit_of_work() as session:
+            unblock_work_item(session, task_id, actor=actor)
+            refreshed = get_work_item(session, task_id)
+            return _success(item=_serialize_item(refreshed))
     except ValueError as e:
         return _error("NOT_FOUND", str(e))
     except Exception as e:
@@ -324,26 +535,27 @@ def forgeops_assign(
         from core.database import create_assignment, get_work_item
         from models import ExecutorType
 
-        item = get_work_item(_get_engine(), task_id)
-        if not item:
-            return _error("NOT_FOUND", f"Work item {task_id} not found")
-
-        assignment = create_assignment(
-            _get_engine(),
-            task_id,
-            executor,
-            ExecutorType(executor_type),
-            actor=actor,
-        )
-        return _success(
-            assignment={
-                "assignment_id": assignment.assignment_id,
-                "task_id": assignment.task_id,
-                "executor": assignment.executor,
-                "executor_type": assignment.executor_type.value,
-                "assigned_at": str(assignment.assigned_at),
-            }
-        )
+        with _unit_of_work() as session:
+            item = get_work_item(session, task_id)
+            if not item:
+                return _error("NOT_FOUND", f"Work item {task_id} not found")
+
+            assignment = create_assignment(
+                session,
+                task_id,
+                executor,
+                ExecutorType(executor_type),
+                actor=actor,
+            )
+            return _success(
+                assignment={
+                    "assignment_id": assignment.assignment_id,
+                    "task_id": assignment.task_id,
+                    "executor": assignment.executor,
+                    "executor_type": assignment.executor_type.value,
+                    "assigned_at": str(assignment.assigned_at),
+                }
+            )
     except ValueError as e:
         return _error("VALIDATION_ERROR", str(e))
     except Exception as e:
@@ -359,8 +571,9 @@ def forgeops_my_items(executor: str) -> str:
     try:
         from core.database import list_items_by_executor
 
-        items = list_items_by_executor(_get_engine(), executor)
-        return _success(items=[_serialize_item(i) for i in items], count=len(items))
+        with _read_session() as session:
+            items = list_items_by_executor(session, executor)
+            return _success(items=[_serialize_item(i) for i in items], count=len(items))
     except Exception as e:
         return _error("LIST_ERROR", str(e))
 
@@ -387,32 +600,33 @@ def forgeops_log_run(
         from core.database import create_execution_record, get_work_item
         from models import ExecutionStatus
 
-        item = get_work_item(_get_engine(), task_id)
-        if not item:
-            return _error("NOT_FOUND", f"Work item {task_id} not found")
-
-        record = create_execution_record(
-            _get_engine(),
-            task_id,
-            executor,
-            ExecutionStatus(status),
-            branch=branch,
-            commit=commit,
-            logs_ref=logs_ref,
-            artifact_ref=artifact_ref,
-            actor=actor,
-        )
-        return _success(
-            run={
-                "run_id": record.run_id,
-                "task_id": record.task_id,
-                "executor": record.executor,
-                "status": record.status.value,
-                "branch": record.branch,
-                "commit": record.commit,
-                "created_at": str(record.created_at),
-            }
-        )
+        with _unit_of_work() as session:
+            item = get_work_item(session, task_id)
+            if not item:
+                return _error("NOT_FOUND", f"Work item {task_id} not found")
+
+            record = create_execution_record(
+                session,
+                task_id,
+                executor,
+                ExecutionStatus(status),
+                branch=branch,
+                commit=commit,
+                logs_ref=logs_ref,
+                artifact_ref=artifact_ref,
+                actor=actor,
+            )
+            return _success(
+                run={
+                    "run_id": record.run_id,
+                    "task_id": record.task_id,
+                    "executor": record.executor,
+                    "status": record.status.value,
+                    "branch": record.branch,
+                    "commit": record.commit,
+                    "created_at": str(record.created_at),
+                }
+            )
     except ValueError as e:
         return _error("VALIDATION_ERROR", str(e))
     except Exception as e:
@@ -428,20 +642,21 @@ def forgeops_list_runs(task_id: int) -> str:
     try:
         from core.database import get_execution_records
 
-        records = get_execution_records(_get_engine(), task_id)
-        return _success(
-            runs=[
-                {
-                    "run_id": r.run_id,
-                    "executor": r.executor,
-                    "status": r.status.value,
-                    "branch": r.branch,
-                    "commit": r.commit,
-                    "created_at": str(r.created_at),
-                }
-                for r in records
-            ]
-        )
+        with _read_session() as session:
+            records = get_execution_records(session, task_id)
+            return _success(
+                runs=[
+                    {
+                        "run_id": r.run_id,
+                        "executor": r.executor,
+                        "status": r.status.value,
+                        "branch": r.branch,
+                        "commit": r.commit,
+                        "created_at": str(r.created_at),
+                    }
+                    for r in records
+                ]
+            )
     except Exception as e:
         return _error("LIST_RUNS_ERROR", str(e))
 
@@ -465,34 +680,69 @@ def forgeops_submit_review(
         from core.database import create_review, get_work_item
         from models import ReviewDecision
 
-        item = get_work_item(_get_engine(), task_id)
-        if not item:
-            return _error("NOT_FOUND", f"Work item {task_id} not found")
-
-        review = create_review(
-            _get_engine(),
-            task_id,
-            reviewer,
-            ReviewDecision(decision),
-            note=note,
-            actor=actor,
-        )
-        return _success(
-            review={
-                "review_id": review.review_id,
-                "task_id": review.task_id,
-                "reviewer": review.reviewer,
-                "decision": review.decision.value,
-                "note": review.note,
-                "created_at": str(review.created_at),
-            }
-        )
+        with _unit_of_work() as session:
+            item = get_work_item(session, task_id)
+            if not item:
+                return _error("NOT_FOUND", f"Work item {task_id} not found")
+
+            review = create_review(
+                session,
+                task_id,
+                reviewer,
+                ReviewDecision(decision),
+                note=note,
+                actor=actor,
+            )
+            return _success(
+                review={
+                    "review_id": review.review_id,
+                    "task_id": review.task_id,
+                    "reviewer": review.reviewer,
+                    "decision": review.decision.value,
+                    "note": review.note,
+                    "created_at": str(review.created_at),
+                }
+            )
     except ValueError as e:
         return _error("VALIDATION_ERROR", str(e))
     except Exception as e:
         return _error("REVIEW_ERROR", str(e))
 
 
+@server.tool(
+    name="forgeops_review_queue",
+    description="List work items awaiting review, each with its latest execution record (run) or null.",
+)
+def forgeops_review_queue() -> str:
+    """Review queue with the latest run per item."""
+    try:
+        from core.database import get_review_queue
+
+        with _read_session() as session:
+            queue = get_review_queue(session)
+            return _success(
+                items=[
+                    {
+                        **_serialize_item(item),
+                        "last_run": {
+                            "run_id": run.run_id,
+                            "executor": run.executor,
+                            "status": run.status.value,
+                            "branch": run.branch,
+                            "commit": run.commit,
+                            "created_at": str(run.created_at),
+                        }
+                        if run
+                        else None,
+                    }
+                    for item, run in queue
+                ],
+                count=len(queue),
+            )
+    except Exception as e:
+        return _error("LIST_ERROR", str(e))
+
+
 @server.tool(
     name="forgeops_list_reviews",
     description="List all reviews for a work item.",
@@ -502,19 +752,20 @@ def forgeops_list_reviews(task_id: int) -> str:
     try:
         from core.database import get_reviews
 
-        reviews = get_reviews(_get_engine(), task_id)
-        return _success(
-            reviews=[
-                {
-                    "review_id": rv.review_id,
-                    "reviewer": rv.reviewer,
-                    "decision": rv.decision.value,
-                    "note": rv.note,
-                    "created_at": str(rv.created_at),
-                }
-                for rv in reviews
-            ]
-        )
+        with _read_session() as session:
+            reviews = get_reviews(session, task_id)
+            return _success(
+                reviews=[
+                    {
+                        "review_id": rv.review_id,
+                        "reviewer": rv.reviewer,
+                        "decision": rv.decision.value,
+                        "note": rv.note,
+                        "created_at": str(rv.created_at),
+                    }
+                    for rv in reviews
+                ]
+            )
     except Exception as e:
         return _error("LIST_REVIEWS_ERROR", str(e))
 
@@ -535,20 +786,21 @@ def forgeops_attach(
     try:
         from core.database import create_attachment, get_work_item
 
-        item = get_work_item(_get_engine(), task_id)
-        if not item:
-            return _error("NOT_FOUND", f"Work item {task_id} not found")
-
-        att = create_attachment(_get_engine(), task_id, url_or_path, label=label)
-        return _success(
-            attachment={
-                "attachment_id": att.attachment_id,
-                "task_id": att.task_id,
-                "url_or_path": att.url_or_path,
-                "label": att.label,
-                "created_at": str(att.created_at),
-            }
-        )
+        with _unit_of_work() as session:
+            item = get_work_item(session, task_id)
+            if not item:
+                return _error("NOT_FOUND", f"Work item {task_id} not found")
+
+            att = create_attachment(session, task_id, url_or_path, label=label)
+            return _success(
+                attachment={
+                    "attachment_id": att.attachment_id,
+                    "task_id": att.task_id,
+                    "url_or_path": att.url_or_path,
+                    "label": att.label,
+                    "created_at": str(att.created_at),
+                }
+            )
     except Exception as e:
         return _error("ATTACH_ERROR", str(e))
 
@@ -565,25 +817,26 @@ def forgeops_list_repos(include_archived: bool = False) -> str:
     try:
         from core.database import get_repositories
 
-        repos = get_repositories(_get_engine(), include_archived=include_archived)
-        return _success(
-            repositories=[
-                {
-                    "repo_id": r.repo_id,
-                    "name": r.name,
-                    "org": r.org,
-                    "default_branch": r.default_branch,
-                    "status": r.status.value,
-                    "url": r.url,
-                    "description": r.description,
-                    "local_path": r.local_path,
-                    "language": r.language,
-                    "deploy_target": r.deploy_target,
-                    "notes": r.notes,
-                }
-                for r in repos
-            ]
-        )
+        with _read_session() as session:
+            repos = get_repositories(session, include_archived=include_archived)
+            return _success(
+                repositories=[
+                    {
+                        "repo_id": r.repo_id,
+                        "name": r.name,
+                        "org": r.org,
+                        "default_branch": r.default_branch,
+                        "status": r.status.value,
+                        "url": r.url,
+                        "description": r.description,
+                        "local_path": r.local_path,
+                        "language": r.language,
+                        "deploy_target": r.deploy_target,
+                        "notes": r.notes,
+                    }
+                    for r in repos
+                ]
+            )
     except Exception as e:
         return _error("LIST_REPOS_ERROR", str(e))
 
@@ -607,29 +860,30 @@ def forgeops_add_repo(
     try:
         from core.database import add_repository
 
-        repo = add_repository(
-            _get_engine(),
-            name,
-            org=org,
-            default_branch=default_branch,
-            url=url,
-            description=description,
-            local_path=local_path,
-            language=language,
-            deploy_target=deploy_target,
-            notes=notes,
-        )
-        return _success(
-            repository={
-                "repo_id": repo.repo_id,
-                "name": repo.name,
-                "org": repo.org,
-                "status": repo.status.value,
-                "local_path": repo.local_path,
-                "language": repo.language,
-                "deploy_target": repo.deploy_target,
-            }
-        )
+        with _unit_of_work() as session:
+            repo = add_repository(
+                session,
+                name,
+                org=org,
+                default_branch=default_branch,
+                url=url,
+                description=description,
+                local_path=local_path,
+                language=language,
+                deploy_target=deploy_target,
+                notes=notes,
+            )
+            return _success(
+                repository={
+                    "repo_id": repo.repo_id,
+                    "name": repo.name,
+                    "org": repo.org,
+                    "status": repo.status.value,
+                    "local_path": repo.local_path,
+                    "language": repo.language,
+                    "deploy_target": repo.deploy_target,
+                }
+            )
     except Exception as e:
         return _error("ADD_REPO_ERROR", str(e))
 
@@ -647,20 +901,19 @@ def forgeops_add_repo(
 def forgeops_status() -> str:
     """Status overview."""
     try:
-        from core.database import list_work_items
-
-        items = list_work_items(_get_engine())
-        by_state = {}
-        for item in items:
-            by_state.setdefault(item.state.value, []).append(item)
-
-        return _success(
-            total=len(items),
-            by_state={s: len(v) for s, v in by_state.items()},
-            executing=[_serialize_item(i) for i in by_state.get("executing", [])],
-            blocked=[_serialize_item(i) for i in items if i.is_blocked],
-            awaiting_review=[_serialize_item(i) for i in by_state.get("awaiting_review", [])],
-        )
+        from core.database import get_status_summary
+
+        with _read_session() as session:
+            summary = get_status_summary(session)
+            return _success(
+                total=summary.total,
+                by_state=summary.by_state,
+                by_repo=[{"repository": repo, "by_state": counts} for repo, counts in summary.by_repo_state.items()],
+                blocked_count=summary.blocked_count,
+                executing=[_serialize_status_item(i) for i in summary.executing],
+                blocked=[_serialize_status_item(i) for i in summary.blocked],
+                awaiting_review=[_serialize_status_item(i) for i in summary.awaiting_review],
+            )
     except Exception as e:
         return _error("STATUS_ERROR", str(e))
 
@@ -677,44 +930,320 @@ def forgeops_activity(
     try:
         from core.database import get_activity_log
 
-        entries = get_activity_log(_get_engine(), task_id=task_id, limit=limit)
-        return _success(
-            entries=[
-                {
-                    "log_id": e.log_id,
-                    "task_id": e.task_id,
-                    "action": e.action.value,
-                    "detail": e.detail,
-                    "actor": e.actor,
-                    "created_at": str(e.created_at),
-                }
-                for e in entries
-            ]
-        )
+        with _read_session() as session:
+            entries = get_activity_log(session, task_id=task_id, limit=limit)
+            return _success(
+                entries=[
+                    {
+                        "log_id": e.log_id,
+                        "task_id": e.task_id,
+                        "action": e.action.value,
+                        "detail": e.detail,
+                        "actor": e.actor,
+                        "ref_id": e.ref_id,
+                        "created_at": str(e.created_at),
+                    }
+                    for e in entries
+                ]
+            )
     except Exception as e:
         return _error("ACTIVITY_ERROR", str(e))
 
 
+@server.tool(
+    name="forgeops_changes_since",
+    description=(
+        "Incremental sync: the work items (current state), deleted task_ids, assignments, runs and reviews "
+        "changed after cursor `since`. Omit `since` to get the current cursor; pass the returned cursor back "
+        "next time, and call again while has_more is true."
+    ),
+)
+def forgeops_changes_since(since: Optional[int] = None, limit: int = 100) -> str:
+    """Get changes after a cursor."""
+    try:
+        from core.database import get_changes
+
+        with _read_session() as session:
+            changes = get_changes(session, since, limit=limit)
+            return _success(
+                cursor=changes.cursor,
+                has_more=changes.has_more,
+                work_items=[_serialize_item(item) for item in changes.work_items],
+                deleted=changes.deleted,
+                assignments=[_serialize_row(a) for a in changes.assignments],
+                runs=[_serialize_row(r) for r in changes.runs],
+                reviews=[_serialize_row(rv) for rv in changes.reviews],
+                attachments=[_serialize_row(att) for att in changes.attachments],
+            )
+    except Exception as e:
+        return _error("CHANGES_ERROR", str(e))
+
+
 @server.tool(
     name="forgeops_children",
-    description="List sub-tasks of a work item with progress rollup (done/total).",
+    description=(
+        "List sub-tasks of a work item with progress rollup (done/total). "
+        "Set recursive=true for the whole subtree, depth-first, with per-item depth and subtree_progress."
+    ),
 )
-def forgeops_children(parent_id: int) -> str:
-    """Get children and progress."""
+def forgeops_children(parent_id: int, recursive: bool = False, max_depth: Optional[int] = None) -> str:
+    """Get children (or the whole subtree) and progress."""
     try:
-        from core.database import get_children, get_child_progress
-
-        children = get_children(_get_engine(), parent_id)
-        done, total = get_child_progress(_get_engine(), parent_id)
-        return _success(
-            parent_id=parent_id,
-            children=[_serialize_item(c) for c in children],
-            progress={"done": done, "total": total},
-        )
+        from core.database import get_child_progress, get_children, get_subtree, get_subtree_progress
+
+        with _read_session() as session:
+            done, total = get_child_progress(session, parent_id)
+            if not recursive:
+                return _success(
+                    parent_id=parent_id,
+                    children=[_serialize_item(c) for c in get_children(session, parent_id)],
+                    progress={"done": done, "total": total},
+                )
+            nodes = get_subtree(session, parent_id, max_depth=max_depth)
+            sub_done, sub_total = get_subtree_progress(session, parent_id)
+            return _success(
+                parent_id=parent_id,
+                children=[{**_serialize_item(n.item), "depth": n.depth} for n in nodes],
+                progress={"done": done, "total": total},
+                subtree_progress={"done": sub_done, "total": sub_total},
+            )
     except Exception as e:
         return _error("CHILDREN_ERROR", str(e))
 
 
+# --- Batch ----------------------------------------------------------------
+
+
+@server.tool(
+    name="forgeops_batch",
+    description=(
+        "Run an ordered list of operations in one transaction: all succeed or none are applied. "
+        'Each operation is {"op": name, "args": {...}, "ref": optional name}. Ops: create_work_item, '
+        "update_work_item, transition, fast_track, block, unblock, assign, log_run, review, attach, "
+        'get_work_item, activity (args match the single-item tools). A task_id or parent_id of "$<ref>" '
+        'or "$<index>" is replaced by the id an earlier operation returned, e.g. {"task_id": "$wi"}.'
+    ),
+)
+def forgeops_batch(operations: list[dict]) -> str:
+    """Run a batch of ledger operations atomically."""
+    try:
+        from core.batch import BatchError, run_batch
+
+        with _unit_of_work() as session:
+            steps = run_batch(session, operations)
+            results = [{"op": step.op, "ref": step.ref, "result": _serialize_row(step.result)} for step in steps]
+            return _success(results=results, count=len(results))
+    except BatchError as e:
+        return _error(type(e.cause).__name__.upper(), str(e))
+    except ValueError as e:
+        return _error("VALIDATION_ERROR", str(e))
+    except Exception as e:
+        return _error("BATCH_ERROR", str(e))
+
+
+# --- Resources ------------------------------------------------------------
+#
+# Read-only views an agent can subscribe to instead of polling tools. Their
+# contents are the JSON the matching tool returns.
+
+REVIEW_QUEUE_URI = "forgeops://review-queue"
+_WORK_ITEM_URI = re.compile(r"forgeops://work-item/(\d+)")
+_EXECUTOR_URI = re.compile(r"forgeops://executor/([^/]+)/items")
+
+
+@server.resource(
+    "forgeops://work-item/{task_id}",
+    name="work-item",
+    description="A work item, as forgeops_get_work_item returns it.",
+    mime_type="application/json",
+)
+def work_item_resource(task_id: int) -> str:
+    return forgeops_get_work_item(task_id)
+
+
+@server.resource(
+    "forgeops://executor/{name}/items",
+    name="executor-items",
+    description="An executor's inbox: the work items currently assigned to it, as forgeops_my_items returns them.",
+    mime_type="application/json",
+)
+def executor_items_resource(name: str) -> str:
+    return forgeops_my_items(name)
+
+
+@server.resource(
+    REVIEW_QUEUE_URI,
+    name="review-queue",
+    description="Work items awaiting review with their latest run, as forgeops_review_queue returns them.",
+    mime_type="application/json",
+)
+def review_queue_resource() -> str:
+    return forgeops_review_queue()
+
+
+class _ResourceWatcher:
+    """Send resources/updated to subscribed sessions when a committed change touches their resource.
+
+    While anything is subscribed it reads the activity log's head every
+    ``poll_interval_s``, one primary-key lookup that sees commits from every
+    process, and is woken at once by this process's own commits. Only when the
+    head moved does it read the change set and work out which resources it
+    touched. A work item is touched by any entry about it. An inbox is touched
+    by an assignment to its executor or a change to an item it held. The review
+    queue is touched by a change to an item that is or was awaiting review.
+    """
+
+    def __init__(self, poll_interval_s: Optional[float] = None):
+        self.poll_interval_s = poll_interval_s
+        self.subscriptions: dict[str, set] = {}
+        self._members: dict[str, set[int]] = {}  # the task_ids an inbox or the review queue held when last checked
+        self._cursor = 0
+        self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def subscribe(self, uri: str, session) -> None:
+        if not (uri == REVIEW_QUEUE_URI or _WORK_ITEM_URI.fullmatch(uri) or _EXECUTOR_URI.fullmatch(uri)):
+            raise ValueError(f"Unknown resource: {uri}")
+        if uri not in self._members:
+            self._members[uri] = await asyncio.to_thread(self._read_members, uri)
+        self.subscriptions.setdefault(uri, set()).add(session)
+        await self._ensure_running()
+
+    async def unsubscribe(self, uri: str, session) -> None:
+        sessions = self.subscriptions.get(uri, set())
+        sessions.discard(session)
+        if not sessions:
+            self.subscriptions.pop(uri, None)
+            self._members.pop(uri, None)
+        if not self.subscriptions:
+            self._cursor = 0  # the next first subscriber starts from the head again
+
+    def notify(self) -> None:
+        """Check now rather than at the next interval; safe to call from any thread."""
+        if self._loop is not None and self._wake is not None:
+            try:
+                self._loop.call_soon_threadsafe(self._wake.set)
+            except RuntimeError:
+                pass  # the loop has closed
+
+    async def check(self) -> list[str]:
+        """Notify the sessions of every subscribed resource changed since the last check; return those URIs."""
+        from pydantic import AnyUrl
+
+        touched = await asyncio.to_thread(self._touched)
+        for uri in touched:
+            for session in list(self.subscriptions.get(uri, ())):
+                try:
+                    await session.send_resource_updated(AnyUrl(uri))
+                except Exception:
+                    logger.debug("Dropping a closed session's subscription to %s", uri)
+                    await self.unsubscribe(uri, session)
+        return touched
+
+    def _touched(self) -> list[str]:
+        from config import PAGE_SIZE_MAX
+        from core.database import get_changes
+        from models import WorkItemState
+
+        engine = _get_engine()
+        if get_changes(engine).cursor == self._cursor:
+            return []
+        items: set[int] = set()
+        awaiting: set[int] = set()
+        executors: set[str] = set()
+        has_more = True
+        while has_more:
+            changes = get_changes(engine, self._cursor, limit=PAGE_SIZE_MAX)
+            items.update(item.task_id for item in changes.work_items)
+            items.update(changes.deleted)
+            awaiting.update(i.task_id for i in changes.work_items if i.state == WorkItemState.awaiting_review)
+            executors.update(assignment.executor for assignment in changes.assignments)
+            self._cursor, has_more = changes.cursor, changes.has_more
+
+        touched = []
+        for uri in list(self.subscriptions):
+            if match := _WORK_ITEM_URI.fullmatch(uri):
+                hit = int(match.group(1)) in items
+            elif match := _EXECUTOR_URI.fullmatch(uri):
+                hit = match.group(1) in executors or bool(items & self._members[uri])
+            else:
+                hit = bool(awaiting or items & self._members[uri])
+            if hit:
+                self._members[uri] = self._read_members(uri)
+                touched.append(uri)
+        return touched
+
+    def _read_members(self, uri: str) -> set[int]:
+        from core.database import get_changes, get_review_queue, list_items_by_executor
+
+        if not self._cursor:
+            self._cursor = get_changes(_get_engine()).cursor
+        if match := _EXECUTOR_URI.fullmatch(uri):
+            return {item.task_id for item in list_items_by_executor(_get_engine(), match.group(1))}
+        if uri == REVIEW_QUEUE_URI:
+            return {item.task_id for item, _ in get_review_queue(_get_engine())}
+        return set()
+
+    def _on_commit(self, _events) -> None:
+        self.notify()
+
+    async def _ensure_running(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._task is not None and not self._task.done() and self._loop is loop:
+            return
+        self._loop = loop
+        self._wake = asyncio.Event()
+        self._task = loop.create_task(self._run())
+
+    async def _run(self) -> None:
+        from config import MCP_RESOURCE_POLL_INTERVAL_S
+        from core.hooks import hooks
+
+        hooks.subscribe_batch(self._on_commit)
+        try:
+            while self.subscriptions:
+                try:
+                    await self.check()
+                except Exception:
+                    logger.exception("Resource change check failed")
+                try:
+                    await asyncio.wait_for(self._wake.wait(), self.poll_interval_s or MCP_RESOURCE_POLL_INTERVAL_S)
+                except TimeoutError:
+                    pass
+                self._wake.clear()
+        finally:
+            hooks.unsubscribe_batch(self._on_commit)
+
+
+_watcher = _ResourceWatcher()
+
+
+@server._mcp_server.subscribe_resource()
+async def _subscribe(uri) -> None:
+    await _watcher.subscribe(str(uri), server.get_context().session)
+
+
+@server._mcp_server.unsubscribe_resource()
+async def _unsubscribe(uri) -> None:
+    await _watcher.unsubscribe(str(uri), server.get_context().session)
+
+
+def _advertise_subscribe(get_capabilities):
+    """The SDK reports subscribe=False whatever handlers exist; report the handler registered above."""
+
+    def wrapper(*args, **kwargs):
+        capabilities = get_capabilities(*args, **kwargs)
+        if capabilities.resources is not None:
+            capabilities.resources.subscribe = True
+        return capabilities
+
+    return wrapper
+
+
+server._mcp_server.get_capabilities = _advertise_subscribe(server._mcp_server.get_capabilities)
+
+
 # --- Serialization --------------------------------------------------------
 
 
@@ -724,17 +1253,52 @@ def _serialize_item(item) -> dict:
         "title": item.title,
         "description": item.description,
         "repository": item.repository.name if item.repository else None,
+        "branch": item.branch,
         "state": item.state.value,
         "priority": item.priority.value,
         "is_blocked": item.is_blocked,
         "blocked_reason": item.blocked_reason,
         "parent_id": item.parent_id,
+        "children_total": item.children_total,
+        "children_done": item.children_done,
         "created_by": item.created_by,
         "created_at": str(item.created_at),
         "updated_at": str(item.updated_at),
     }
 
 
+def _serialize_row(row):
+    """A batch result: work items as in forgeops_get_work_item, other rows column by column."""
+    from models import WorkItem
+
+    if isinstance(row, list):
+        return [_serialize_row(r) for r in row]
+    if isinstance(row, WorkItem):
+        return _serialize_item(row)
+    return row.model_dump() if row is not None else None
+
+
+def _serialize_status_item(item) -> dict:
+    return {
+        "task_id": item.task_id,
+        "title": item.title,
+        "repository": item.repository,
+        "state": item.state.value,
+        "priority": item.priority.value,
+        "is_blocked": item.is_blocked,
+        "blocked_reason": item.blocked_reason,
+    }
+
+
+def _serialize_bulk_result(result) -> dict:
+    return {
+        "matched": result.matched,
+        "updated": result.updated,
+        "updated_count": len(result.updated),
+        "failed": [{"task_id": task_id, "error": error} for task_id, error in result.failed.items()],
+    }
+
+
 # --- Entry point ----------------------------------------------------------
 
 
@@ -2,12 +2,14 @@
 
 Defines the five core objects from the target data model:
   Repository, WorkItem, Assignment, ExecutionRecord, Review
+plus the activity log, attachments and the hook event outbox.
 """
 
 import enum
 from datetime import UTC, datetime
 from typing import Optional
 
+from sqlalchemy import Index, text
 from sqlmodel import Field, Relationship, SQLModel
 
 
@@ -37,6 +39,10 @@ class Priority(str, enum.Enum):
     urgent = "urgent"
 
 
+# Sort key for the work queue: lower ranks are claimed first.
+PRIORITY_RANK: dict[Priority, int] = {Priority.urgent: 0, Priority.high: 1, Priority.medium: 2, Priority.low: 3}
+
+
 class ExecutorType(str, enum.Enum):
     human = "human"
     agent = "agent"
@@ -62,6 +68,9 @@ class ActivityAction(str, enum.Enum):
     created = "created"
     review_submitted = "review_submitted"
     execution_logged = "execution_logged"
+    lease_expired = "lease_expired"
+    updated = "updated"
+    attached = "attached"
 
 
 # --- Repository ---------------------------------------------------------------
@@ -81,6 +90,11 @@ class Repository(SQLModel, table=True):
     language: Optional[str] = None
     deploy_target: Optional[str] = None
     notes: Optional[str] = None
+    # Preset name or JSON transition map (core.state_engine.WORKFLOW_PRESETS); None follows TRANSITIONS.
+    workflow: Optional[str] = None
+    # JSON caps on executing items per repo, branch and executor (core.state_engine.ConcurrencyPolicy);
+    # None is one executing item per repository.
+    concurrency: Optional[str] = None
 
     work_items: list["WorkItem"] = Relationship(back_populates="repository")
 
@@ -90,16 +104,31 @@ class Repository(SQLModel, table=True):
 
 class WorkItem(SQLModel, table=True):
     __tablename__ = "work_items"
+    __table_args__ = (
+        Index("ix_work_items_updated_at_task_id", "updated_at", "task_id"),
+        Index("ix_work_items_repo_id_state_blocked", "repo_id", "state", "is_blocked"),
+        Index("ix_work_items_blocked", "task_id", sqlite_where=text("is_blocked = 1")),
+        # The claim queue: unblocked queued items in (priority_rank, created_at, task_id) order.
+        Index("ix_work_items_claim", "state", "is_blocked", "priority_rank", "created_at"),
+    )
 
     task_id: Optional[int] = Field(default=None, primary_key=True)
     repo_id: Optional[int] = Field(default=None, foreign_key="repositories.repo_id", index=True)
     title: str
     description: Optional[str] = None
+    # Branch the work lands on, for per-branch concurrency caps; None means the repository's default_branch.
+    branch: Optional[str] = None
     state: WorkItemState = Field(default=WorkItemState.queued, index=True)
     priority: Priority = Field(default=Priority.medium)
+    # PRIORITY_RANK[priority], kept in step by every core.database writer that sets priority.
+    priority_rank: int = Field(default=2, sa_column_kwargs={"server_default": text("2")})
     is_blocked: bool = Field(default=False)
     blocked_reason: Optional[str] = None
-    parent_id: Optional[int] = Field(default=None, foreign_key="work_items.task_id")
+    parent_id: Optional[int] = Field(default=None, foreign_key="work_items.task_id", index=True)
+    # Rollup of direct children, maintained by core.database in the same transaction
+    # as every create, transition, reparent and delete.
+    children_total: int = Field(default=0, sa_column_kwargs={"server_default": text("0")})
+    children_done: int = Field(default=0, sa_column_kwargs={"server_default": text("0")})
     created_by: Optional[str] = None
     created_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
@@ -112,19 +141,63 @@ class WorkItem(SQLModel, table=True):
 
 class Assignment(SQLModel, table=True):
     __tablename__ = "assignments"
+    __table_args__ = (Index("ix_assignments_task_id_assigned_at", "task_id", "assigned_at"),)
 
     assignment_id: Optional[int] = Field(default=None, primary_key=True)
     task_id: int = Field(foreign_key="work_items.task_id", index=True)
-    executor: str
+    executor: str = Field(index=True)
     executor_type: ExecutorType
     assigned_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
 
 
+# --- ExecutionLease -----------------------------------------------------------
+
+
+class ExecutionLease(SQLModel, table=True):
+    """Liveness of an executing item: written when it enters executing, removed when it leaves.
+
+    Kept apart from work_items so a heartbeat rewrites one narrow row and one
+    index entry instead of the item and its indexes.
+    """
+
+    __tablename__ = "execution_leases"
+    __table_args__ = (Index("ix_execution_leases_expires_at", "expires_at"),)
+
+    task_id: int = Field(primary_key=True, foreign_key="work_items.task_id")
+    executor: Optional[str] = None  # the claimant, when the lease came from the work queue
+    started_at: datetime
+    heartbeat_at: Optional[datetime] = None
+    expires_at: datetime
+    # JSON list of the concurrency_slots scopes the item holds while executing, released when it leaves.
+    slots: Optional[str] = None
+
+
+# --- ConcurrencySlot ----------------------------------------------------------
+
+
+class ConcurrencySlot(SQLModel, table=True):
+    """Executing items counted against one concurrency scope of a repository's policy.
+
+    ``scope`` is ``repo:<repo_id>``, ``branch:<repo_id>:<branch>`` or
+    ``executor:<repo_id>:<executor>``. Transitions into and out of executing
+    adjust ``used`` in their own transaction, so enforcing a cap is a primary
+    key read rather than a COUNT over work_items.
+    """
+
+    __tablename__ = "concurrency_slots"
+
+    scope: str = Field(primary_key=True)
+    repo_id: int = Field(index=True)
+    used: int = 0
+    capacity: int
+
+
 # --- ExecutionRecord ----------------------------------------------------------
 
 
 class ExecutionRecord(SQLModel, table=True):
     __tablename__ = "execution_records"
+    __table_args__ = (Index("ix_execution_records_task_id_created_at", "task_id", "created_at"),)
 
     run_id: Optional[int] = Field(default=None, primary_key=True)
     task_id: int = Field(foreign_key="work_items.task_id", index=True)
@@ -155,6 +228,12 @@ class Review(SQLModel, table=True):
 
 
 class ActivityLog(SQLModel, table=True):
+    """One entry per ledger mutation; ``log_id`` doubles as the ledger's change sequence.
+
+    Writers hold the write lock, so ids are assigned in commit order and a reader
+    that has seen every entry up to N never misses a later commit with a lower id.
+    """
+
     __tablename__ = "activity_log"
 
     log_id: Optional[int] = Field(default=None, primary_key=True)
@@ -162,6 +241,8 @@ class ActivityLog(SQLModel, table=True):
     action: ActivityAction
     detail: Optional[str] = None
     actor: Optional[str] = None
+    # The assignment_id, run_id or review_id an assigned / execution_logged / review_submitted entry records.
+    ref_id: Optional[int] = None
     created_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
 
 
@@ -176,3 +257,70 @@ class Attachment(SQLModel, table=True):
     url_or_path: str
     label: Optional[str] = None
     created_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
+
+
+# --- Event outbox -------------------------------------------------------------
+
+
+class OutboxEvent(SQLModel, table=True):
+    """A committed hook event, written in the same transaction as the change that raised it.
+
+    AUTOINCREMENT keeps event_ids from being reused once pruning empties the
+    table, so subscriber offsets and stream cursors stay valid.
+    """
+
+    __tablename__ = "event_outbox"
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    event_id: Optional[int] = Field(default=None, primary_key=True)
+    event: str  # a core.hooks.HookEvent value
+    task_id: Optional[int] = None
+    payload: str  # JSON
+    created_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
+
+
+class OutboxSubscriber(SQLModel, table=True):
+    """A webhook that receives outbox events in event_id order; ``last_event_id`` is its offset."""
+
+    __tablename__ = "outbox_subscribers"
+
+    name: str = Field(primary_key=True)
+    url: str
+    events: Optional[str] = None  # comma-separated HookEvent values; None = every event
+    last_event_id: int = Field(default=0)
+    attempts: int = Field(default=0)
+    next_attempt_at: Optional[datetime] = None
+    lease_until: Optional[datetime] = None
+    last_error: Optional[str] = None
+    created_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
+
+
+class OutboxDeadLetter(SQLModel, table=True):
+    """An event a subscriber still refused after the maximum number of attempts."""
+
+    __tablename__ = "outbox_dead_letters"
+
+    dead_letter_id: Optional[int] = Field(default=None, primary_key=True)
+    subscriber: str = Field(index=True)
+    event_id: int
+    event: str
+    payload: str
+    error: Optional[str] = None
+    attempts: int
+    created_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
+
+
+# --- LedgerVersion ------------------------------------------------------------
+
+
+class LedgerVersion(SQLModel, table=True):
+    """A single row counting committed units of work that changed the ledger.
+
+    Read endpoints derive their ETags from it: one primary key read tells
+    whether anything they could show has changed since the client last asked.
+    """
+
+    __tablename__ = "ledger_version"
+
+    id: int = Field(default=1, primary_key=True)
+    version: int = 0
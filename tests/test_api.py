@@ -27,10 +27,12 @@ class TestAPI(unittest.TestCase):
         import api as api_mod
 
         importlib.reload(api_mod)
+        self.api = api_mod
         self.app = api_mod.app
         self.client = TestClient(self.app)
 
     def tearDown(self):
+        self.api.engine.dispose()
         self._cleanup()
         os.environ.pop("FORGEOPS_DB_PATH", None)
 
@@ -203,6 +205,19 @@ class TestAPI(unittest.TestCase):
         resp = self.client.get(f"/work-items/{item['task_id']}/reviews")
         self.assertEqual(len(resp.json()), 1)
 
+    def test_review_queue(self):
+        item = self.client.post("/work-items", json={"title": "Ready"}).json()
+        self.client.post(f"/work-items/{item['task_id']}/runs", json={"executor": "agent-1", "status": "failed"})
+        self.client.post(f"/work-items/{item['task_id']}/runs", json={"executor": "agent-1", "status": "success"})
+        self.client.post(f"/work-items/{item['task_id']}/fast-track", json={"state": "awaiting_review"})
+        self.client.post("/work-items", json={"title": "Not ready"})
+
+        resp = self.client.get("/review-queue")
+        self.assertEqual(resp.status_code, 200)
+        queue = resp.json()
+        self.assertEqual([q["task_id"] for q in queue], [item["task_id"]])
+        self.assertEqual(queue[0]["last_run"]["status"], "success")
+
     # --- Attachments ----------------------------------------------------------
 
     def test_create_and_list_attachments(self):
@@ -258,10 +273,12 @@ class TestAPIAuth(unittest.TestCase):
         import api as api_mod
 
         importlib.reload(api_mod)
+        self.api = api_mod
         self.app = api_mod.app
         self.client = TestClient(self.app)
 
     def tearDown(self):
+        self.api.engine.dispose()
         self._cleanup()
         os.environ.pop("FORGEOPS_DB_PATH", None)
         os.environ.pop("API_BEARER_TOKEN", None)
@@ -3,6 +3,7 @@
 import os
 import unittest
 import importlib
+from unittest.mock import patch
 
 from fastapi.testclient import TestClient
 
@@ -23,9 +24,11 @@ class TestAPIErrors(unittest.TestCase):
         import api as api_mod
 
         importlib.reload(api_mod)
+        self.api = api_mod
         self.client = TestClient(api_mod.app)
 
     def tearDown(self):
+        self.api.engine.dispose()
         self._cleanup()
         os.environ.pop("FORGEOPS_DB_PATH", None)
 
@@ -59,6 +62,13 @@ class TestAPIErrors(unittest.TestCase):
         resp = self.client.post("/work-items/9999/unblock")
         self.assertEqual(resp.status_code, 404)
 
+    def test_failed_commit_is_an_error(self):
+        client = TestClient(self.api.app, raise_server_exceptions=False)
+        with patch("core.database._bump_ledger_version", side_effect=RuntimeError("commit failed")):
+            resp = client.post("/work-items", json={"title": "Lost"})
+        self.assertEqual(resp.status_code, 500)
+        self.assertEqual(self.client.get("/work-items").json(), [])
+
     # --- Concurrency guard via API ---
 
     def test_concurrency_guard_via_api(self):
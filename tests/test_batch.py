@@ -0,0 +1,222 @@
+"""Tests for transactional batches — core.batch.run_batch, POST /batch and forgeops_batch."""
+
+import json
+import os
+import unittest
+from unittest.mock import patch
+
+from sqlalchemy import event
+
+from core.batch import MAX_BATCH_OPERATIONS, OPERATIONS, BatchError, run_batch
+from core.database import (
+    add_repository,
+    create_db_and_tables,
+    create_work_item,
+    get_attachments,
+    get_execution_records,
+    get_work_item,
+    list_work_items,
+    unit_of_work,
+)
+from core.hooks import HookEvent, hooks
+from core.state_engine import InvalidTransitionError
+from models import WorkItemState
+
+AGENT_FINISH = [
+    {"op": "log_run", "ref": "run", "args": {"task_id": "$wi", "executor": "agent-1", "status": "success"}},
+    {"op": "transition", "args": {"task_id": "$wi", "state": "completed", "actor": "agent-1"}},
+    {"op": "transition", "args": {"task_id": "$wi", "state": "awaiting_review", "actor": "agent-1"}},
+    {"op": "attach", "args": {"task_id": "$wi", "url_or_path": "https://ci/run/1", "label": "CI"}},
+    {"op": "activity", "args": {"task_id": "$wi", "limit": 5}},
+]
+
+
+class TestRunBatch(unittest.TestCase):
+    TEST_DB = "test_batch.db"
+
+    def setUp(self):
+        self._cleanup()
+        self.engine = create_db_and_tables(self.TEST_DB)
+
+    def tearDown(self):
+        hooks.clear()
+        self.engine.dispose()
+        self._cleanup()
+
+    def _cleanup(self):
+        if os.path.isfile(self.TEST_DB):
+            os.remove(self.TEST_DB)
+
+    def _run(self, operations):
+        with unit_of_work(self.engine) as session:
+            return run_batch(session, operations)
+
+    def test_references_to_created_ids(self):
+        steps = self._run(
+            [
+                {"op": "create_work_item", "ref": "epic", "args": {"title": "Epic"}},
+                {"op": "create_work_item", "ref": "wi", "args": {"title": "Task", "parent_id": "$epic"}},
+                {"op": "transition", "args": {"task_id": "$1", "state": "assigned"}},
+                {"op": "assign", "args": {"task_id": "$wi", "executor": "agent-1"}},
+            ]
+        )
+        epic, task = steps[0].result.task_id, steps[1].result.task_id
+        self.assertEqual(steps[1].result.parent_id, epic)
+        self.assertEqual(get_work_item(self.engine, task).state, WorkItemState.assigned)
+        self.assertEqual([s.op for s in steps], ["create_work_item", "create_work_item", "transition", "assign"])
+        self.assertEqual(steps[3].result.executor, "agent-1")
+
+    def test_agent_finish_in_one_commit(self):
+        item = create_work_item(self.engine, "Task", state=WorkItemState.executing)
+        operations = [{**op, "args": {**op["args"], "task_id": item.task_id}} for op in AGENT_FINISH]
+        commits = []
+        event.listen(self.engine, "commit", lambda conn: commits.append(1))
+        steps = self._run(operations)
+        self.assertEqual(len(commits), 1)
+        self.assertEqual(get_work_item(self.engine, item.task_id).state, WorkItemState.awaiting_review)
+        self.assertEqual(len(get_execution_records(self.engine, item.task_id)), 1)
+        self.assertEqual(get_attachments(self.engine, item.task_id)[0].label, "CI")
+        self.assertEqual([e.detail for e in steps[-1].result[:2]], ["CI", "completed → awaiting_review"])
+
+    def test_failure_rolls_back_everything(self):
+        fired = []
+        hooks.subscribe(HookEvent.on_state_change, fired.append)
+        with self.assertRaises(BatchError) as ctx:
+            self._run(
+                [
+                    {"op": "create_work_item", "ref": "wi", "args": {"title": "Doomed"}},
+                    {"op": "transition", "args": {"task_id": "$wi", "state": "assigned"}},
+                    {"op": "transition", "args": {"task_id": "$wi", "state": "accepted"}},
+                ]
+            )
+        self.assertEqual((ctx.exception.index, ctx.exception.op), (2, "transition"))
+        self.assertIsInstance(ctx.exception.cause, InvalidTransitionError)
+        self.assertEqual(list_work_items(self.engine), [])
+        self.assertEqual(fired, [])
+
+    def test_rejects_bad_operations(self):
+        item = create_work_item(self.engine, "Task")
+        cases = [
+            {"op": "drop_table", "args": {}},
+            {"op": "transition", "args": {"task_id": "$missing", "state": "assigned"}},
+            {"op": "transition", "args": {"task_id": item.task_id, "colour": "red"}},
+            {"op": "attach", "args": {"task_id": 9999, "url_or_path": "x"}},
+            {"op": "create_work_item", "ref": "1", "args": {"title": "numeric ref"}},
+        ]
+        for operation in cases:
+            with self.subTest(op=operation):
+                with self.assertRaises(BatchError):
+                    self._run([operation])
+        with self.assertRaises(ValueError):
+            self._run([{"op": "get_work_item", "args": {"task_id": item.task_id}}] * (MAX_BATCH_OPERATIONS + 1))
+
+    def test_literal_dollar_strings_pass_through(self):
+        first, second, blocked = self._run(
+            [
+                {"op": "create_work_item", "args": {"title": "Costs $5 per run"}},
+                {"op": "create_work_item", "args": {"title": "$0", "description": "$0", "parent_id": "$0"}},
+                {"op": "block", "args": {"task_id": "$1", "reason": "$HOME"}},
+            ]
+        )
+        self.assertEqual(first.result.title, "Costs $5 per run")
+        self.assertEqual((second.result.title, second.result.description), ("$0", "$0"))
+        self.assertEqual(second.result.parent_id, first.result.task_id)
+        self.assertEqual(blocked.result.blocked_reason, "$HOME")
+
+    def test_handler_type_errors_are_not_bad_arguments(self):
+        def broken(session, task_id):
+            raise TypeError("inside the handler")
+
+        with patch.dict(OPERATIONS, {"broken": broken}):
+            with self.assertRaises(BatchError) as ctx:
+                self._run([{"op": "broken", "args": {"task_id": 1}}])
+            self.assertIsInstance(ctx.exception.cause, TypeError)
+            with self.assertRaises(BatchError) as ctx:
+                self._run([{"op": "broken", "args": {"colour": "red"}}])
+            self.assertIn("Bad arguments", str(ctx.exception.cause))
+
+
+class TestBatchInterfaces(unittest.TestCase):
+    TEST_DB = "test_batch_interfaces.db"
+
+    def setUp(self):
+        self._cleanup()
+        os.environ["FORGEOPS_DB_PATH"] = self.TEST_DB
+        os.environ.pop("API_BEARER_TOKEN", None)
+        import importlib
+
+        import config
+        import core.database
+
+        importlib.reload(config)
+        importlib.reload(core.database)
+        import api as api_mod
+
+        importlib.reload(api_mod)
+        from fastapi.testclient import TestClient
+
+        self.api = api_mod
+        self.client = TestClient(api_mod.app)
+        add_repository(api_mod.engine, "repo")
+
+    def tearDown(self):
+        self.api.engine.dispose()
+        os.environ.pop("FORGEOPS_DB_PATH", None)
+        self._cleanup()
+
+    def _cleanup(self):
+        if os.path.isfile(self.TEST_DB):
+            os.remove(self.TEST_DB)
+
+    def _operations(self):
+        return [
+            {"op": "create_work_item", "ref": "wi", "args": {"title": "Task", "repo_name": "repo"}},
+            {"op": "fast_track", "args": {"task_id": "$wi", "state": "executing"}},
+            *AGENT_FINISH,
+        ]
+
+    def test_api_batch(self):
+        resp = self.client.post("/batch", json={"operations": self._operations()})
+        self.assertEqual(resp.status_code, 200)
+        results = resp.json()["results"]
+        self.assertEqual(results[0]["result"]["repository"], "repo")
+        self.assertEqual(results[2]["ref"], "run")
+        self.assertEqual(results[2]["result"]["status"], "success")
+        self.assertEqual(results[4]["result"]["state"], "awaiting_review")
+        self.assertEqual([e["action"] for e in results[-1]["result"][:2]], ["attached", "state_change"])
+
+    def test_api_batch_errors(self):
+        resp = self.client.post(
+            "/batch",
+            json={
+                "operations": [
+                    {"op": "create_work_item", "ref": "wi", "args": {"title": "Task"}},
+                    {"op": "transition", "args": {"task_id": "$wi", "state": "closed"}},
+                    {"op": "transition", "args": {"task_id": "$wi", "state": "queued"}},
+                ]
+            },
+        )
+        self.assertEqual(resp.status_code, 409)
+        self.assertEqual(resp.json()["detail"]["index"], 2)
+        self.assertEqual(self.client.get("/work-items").json(), [])
+        resp = self.client.post("/batch", json={"operations": [{"op": "nope"}]})
+        self.assertEqual(resp.status_code, 422)
+
+    def test_mcp_batch(self):
+        import mcp_server
+
+        mcp_server._engine = None
+        try:
+            result = json.loads(mcp_server.forgeops_batch(self._operations()))
+            self.assertTrue(result["success"])
+            self.assertEqual(result["count"], 7)
+            self.assertEqual(result["results"][2]["result"]["executor"], "agent-1")
+            bad = json.loads(mcp_server.forgeops_batch([{"op": "transition", "args": {"task_id": 9999}}]))
+            self.assertFalse(bad["success"])
+            self.assertIn("Operation 0 (transition)", bad["error"]["message"])
+        finally:
+            mcp_server._engine = None
+
+
+if __name__ == "__main__":
+    unittest.main()
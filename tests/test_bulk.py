@@ -0,0 +1,221 @@
+"""Tests for bulk ingestion — create_work_items_bulk, add_repositories_bulk and their interfaces."""
+
+import json
+import os
+import tempfile
+import unittest
+from io import StringIO
+from unittest.mock import patch
+
+from sqlalchemy import event
+from sqlmodel import Session, func, select
+
+from core.database import (
+    add_repositories_bulk,
+    add_repository,
+    create_db_and_tables,
+    create_work_items_bulk,
+    get_activity_log,
+    get_repository,
+    get_work_item,
+)
+from models import ActivityAction, ActivityLog, Priority, WorkItem, WorkItemState
+
+
+class TestBulkDatabase(unittest.TestCase):
+    TEST_DB = "test_bulk.db"
+
+    def setUp(self):
+        self._cleanup()
+        self.engine = create_db_and_tables(self.TEST_DB)
+
+    def tearDown(self):
+        self.engine.dispose()
+        self._cleanup()
+
+    def _cleanup(self):
+        if os.path.isfile(self.TEST_DB):
+            os.remove(self.TEST_DB)
+
+    def _count(self, model) -> int:
+        with Session(self.engine) as session:
+            return session.exec(select(func.count()).select_from(model)).one()
+
+    def test_add_repositories_bulk_returns_ids(self):
+        existing = add_repository(self.engine, "alpha")
+        ids = add_repositories_bulk(self.engine, ["alpha", {"name": "beta", "org": "acme"}, "beta"])
+        self.assertEqual(ids["alpha"], existing.repo_id)
+        self.assertEqual(set(ids), {"alpha", "beta"})
+        self.assertEqual(get_repository(self.engine, "beta").org, "acme")
+
+    def test_add_repositories_bulk_empty(self):
+        self.assertEqual(add_repositories_bulk(self.engine, []), {})
+
+    def test_create_returns_ids_in_input_order(self):
+        task_ids = create_work_items_bulk(self.engine, [{"title": f"Item {n}"} for n in range(5)])
+        self.assertEqual(len(task_ids), 5)
+        for n, task_id in enumerate(task_ids):
+            self.assertEqual(get_work_item(self.engine, task_id).title, f"Item {n}")
+
+    def test_fields_and_repo_resolution(self):
+        add_repository(self.engine, "alpha")
+        task_ids = create_work_items_bulk(
+            self.engine,
+            [
+                {"title": "A", "repo_name": "alpha", "priority": "high", "created_by": "planner"},
+                {"title": "B", "repo_name": "unknown", "state": WorkItemState.assigned},
+            ],
+            created_by="importer",
+        )
+        first, second = (get_work_item(self.engine, t) for t in task_ids)
+        self.assertEqual(first.repository.name, "alpha")
+        self.assertEqual(first.priority, Priority.high)
+        self.assertEqual(first.state, WorkItemState.queued)
+        self.assertEqual(first.created_by, "planner")
+        self.assertFalse(first.is_blocked)
+        self.assertIsNone(second.repo_id)
+        self.assertEqual(second.state, WorkItemState.assigned)
+        self.assertEqual(second.created_by, "importer")
+
+    def test_logs_created_activity_per_item(self):
+        task_ids = create_work_items_bulk(self.engine, [{"title": "A"}, {"title": "B", "state": "assigned"}])
+        log = get_activity_log(self.engine, task_id=task_ids[1])
+        self.assertEqual(len(log), 1)
+        self.assertEqual(log[0].action, ActivityAction.created)
+        self.assertEqual(log[0].detail, "Created in state assigned")
+        self.assertEqual(self._count(ActivityLog), 2)
+
+    def test_invalid_item_writes_nothing(self):
+        with self.assertRaises(ValueError) as ctx:
+            create_work_items_bulk(self.engine, [{"title": "ok"}, {"title": "bad", "priority": "whenever"}])
+        self.assertIn("Item 1", str(ctx.exception))
+        with self.assertRaises(ValueError):
+            create_work_items_bulk(self.engine, [{"description": "no title"}])
+        self.assertEqual(self._count(WorkItem), 0)
+
+    def test_non_object_item_is_rejected(self):
+        with self.assertRaises(ValueError) as ctx:
+            create_work_items_bulk(self.engine, [{"title": "A"}, "B"])
+        self.assertIn("Item 1", str(ctx.exception))
+
+    def test_single_commit_with_batched_statements(self):
+        commits = []
+        statements = []
+        event.listen(self.engine, "commit", lambda conn: commits.append(1))
+        event.listen(self.engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        create_work_items_bulk(self.engine, [{"title": f"Item {n}", "repo_name": "r"} for n in range(2000)])
+        self.assertEqual(len(commits), 1)
+        self.assertLess(len([s for s in statements if s.startswith("INSERT")]), 20)
+        self.assertEqual(self._count(WorkItem), 2000)
+
+
+class TestBulkInterfaces(unittest.TestCase):
+    TEST_DB = "test_bulk_interfaces.db"
+
+    def setUp(self):
+        self._cleanup()
+        os.environ["FORGEOPS_DB_PATH"] = self.TEST_DB
+        os.environ.pop("API_BEARER_TOKEN", None)
+        import importlib
+
+        import config
+        import core.database
+
+        importlib.reload(config)
+        importlib.reload(core.database)
+        import api as api_mod
+
+        importlib.reload(api_mod)
+        from fastapi.testclient import TestClient
+
+        self.api = api_mod
+        self.client = TestClient(api_mod.app)
+
+    def tearDown(self):
+        self.api.engine.dispose()
+        os.environ.pop("FORGEOPS_DB_PATH", None)
+        self._cleanup()
+
+    def _cleanup(self):
+        if os.path.isfile(self.TEST_DB):
+            os.remove(self.TEST_DB)
+
+    def test_api_bulk_create(self):
+        self.client.post("/repositories", json={"name": "repo"})
+        resp = self.client.post(
+            "/work-items:bulk",
+            json={"items": [{"title": "A", "repo_name": "repo"}, {"title": "B"}], "created_by": "planner"},
+        )
+        self.assertEqual(resp.status_code, 201)
+        data = resp.json()
+        self.assertEqual(data["count"], 2)
+        item = self.client.get(f"/work-items/{data['task_ids'][0]}").json()
+        self.assertEqual(item["repository"], "repo")
+        self.assertEqual(item["created_by"], "planner")
+
+    def test_api_bulk_create_rejects_bad_item(self):
+        resp = self.client.post("/work-items:bulk", json={"items": [{"title": "A"}, {"title": "B", "state": "nope"}]})
+        self.assertEqual(resp.status_code, 422)
+        resp = self.client.post("/work-items:bulk", json={"items": [{"title": ""}]})
+        self.assertEqual(resp.status_code, 422)
+        self.assertEqual(self.client.get("/work-items").json(), [])
+
+    def test_mcp_bulk_create(self):
+        import mcp_server
+
+        mcp_server._engine = None
+        try:
+            result = json.loads(mcp_server.forgeops_create_work_items_bulk([{"title": "A"}, {"title": "B"}]))
+            self.assertTrue(result["success"])
+            self.assertEqual(result["count"], 2)
+            bad = json.loads(mcp_server.forgeops_create_work_items_bulk([{"title": "A", "priority": "whenever"}]))
+            self.assertEqual(bad["error"]["code"], "VALIDATION_ERROR")
+        finally:
+            mcp_server._engine = None
+
+    def test_cli_import_jsonl(self):
+        from commands.import_items import import_items
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "plan.jsonl")
+            with open(path, "w") as f:
+                f.write('{"title": "A", "repo_name": "new-repo"}\n\n{"title": "B", "priority": "urgent"}\n')
+            with patch("commands.import_items.create_db_and_tables", return_value=self.api.engine):
+                with patch("sys.stdout", new_callable=StringIO) as out:
+                    import_items(path, created_by="cli", create_repos=True)
+        self.assertIn("Imported 2 work items", out.getvalue())
+        items = self.client.get("/work-items").json()
+        self.assertEqual([i["repository"] for i in items if i["title"] == "A"], ["new-repo"])
+
+    def test_cli_import_invalid_file(self):
+        from commands.import_items import import_items
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "plan.json")
+            with open(path, "w") as f:
+                json.dump({"items": [{"title": "A"}, {"priority": "high"}]}, f)
+            with patch("commands.import_items.create_db_and_tables", return_value=self.api.engine):
+                with patch("sys.stdout", new_callable=StringIO) as out:
+                    import_items(path)
+        self.assertIn("nothing was written", out.getvalue())
+        self.assertEqual(self.client.get("/work-items").json(), [])
+
+    def test_cli_import_rejects_non_objects(self):
+        from commands.import_items import import_items
+
+        with tempfile.TemporaryDirectory() as tmp:
+            for name, text in (("plan.json", '[{"title": "A"}, "B"]'), ("plan.jsonl", '{"title": "A"}\n[1, 2]\n')):
+                with self.subTest(file=name):
+                    path = os.path.join(tmp, name)
+                    with open(path, "w") as f:
+                        f.write(text)
+                    with patch("commands.import_items.create_db_and_tables", return_value=self.api.engine):
+                        with patch("sys.stdout", new_callable=StringIO) as out:
+                            import_items(path)
+                    self.assertIn("Import failed", out.getvalue())
+                    self.assertIn("item 1 is not an object", out.getvalue())
+        self.assertEqual(self.client.get("/work-items").json(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,227 @@
+"""Tests for filter-driven bulk operations — bulk_transition, bulk_block, bulk_assign and their interfaces."""
+
+import json
+import os
+import unittest
+from io import StringIO
+from unittest.mock import patch
+
+from sqlalchemy import event
+
+from core.database import (
+    WorkItemFilter,
+    add_repository,
+    bulk_assign,
+    bulk_block,
+    bulk_transition,
+    bulk_unblock,
+    create_db_and_tables,
+    create_work_item,
+    create_work_items_bulk,
+    get_activity_log,
+    get_child_progress,
+    get_current_assignment,
+    get_work_item,
+)
+from core.hooks import HookEvent, hooks
+from models import ActivityAction, ExecutorType, WorkItemState
+
+
+class TestBulkOperations(unittest.TestCase):
+    TEST_DB = "test_bulk_ops.db"
+
+    def setUp(self):
+        self._cleanup()
+        self.engine = create_db_and_tables(self.TEST_DB)
+        add_repository(self.engine, "alpha")
+        add_repository(self.engine, "beta")
+
+    def tearDown(self):
+        hooks.clear()
+        self.engine.dispose()
+        self._cleanup()
+
+    def _cleanup(self):
+        if os.path.isfile(self.TEST_DB):
+            os.remove(self.TEST_DB)
+
+    def _seed(self, count: int, **fields) -> list[int]:
+        return create_work_items_bulk(self.engine, [{"title": f"Item {n}", **fields} for n in range(count)])
+
+    def test_close_accepted_in_repo(self):
+        accepted = self._seed(3, repo_name="alpha", state="accepted")
+        other_repo = self._seed(2, repo_name="beta", state="accepted")
+        queued = self._seed(2, repo_name="alpha")
+        result = bulk_transition(
+            self.engine, WorkItemFilter(repo_name="alpha", state=WorkItemState.accepted), WorkItemState.closed
+        )
+        self.assertEqual((result.matched, result.updated, result.failed), (3, accepted, {}))
+        self.assertEqual(get_work_item(self.engine, accepted[0]).state, WorkItemState.closed)
+        for task_id in other_repo + queued:
+            self.assertNotEqual(get_work_item(self.engine, task_id).state, WorkItemState.closed)
+
+    def test_invalid_transitions_reported_per_item(self):
+        executing = self._seed(1, state="executing")
+        queued = self._seed(2)
+        both = executing + queued
+        result = bulk_transition(self.engine, WorkItemFilter(task_ids=both), WorkItemState.assigned)
+        self.assertEqual(result.updated, both)
+        result = bulk_transition(self.engine, WorkItemFilter(task_ids=both), WorkItemState.queued)
+        self.assertEqual(result.updated, both)
+        result = bulk_transition(self.engine, WorkItemFilter(task_ids=queued), WorkItemState.completed)
+        self.assertEqual(result.updated, [])
+        self.assertEqual(set(result.failed), set(queued))
+        self.assertIn("Invalid transition: queued → completed", result.failed[queued[0]])
+
+    def test_executing_admits_one_item_per_repo(self):
+        running = create_work_item(self.engine, "Running", repo_name="beta", state=WorkItemState.executing).task_id
+        alpha = self._seed(3, repo_name="alpha", state="assigned")
+        beta = self._seed(1, repo_name="beta", state="assigned")
+        loose = self._seed(2, state="assigned")
+        result = bulk_transition(self.engine, WorkItemFilter(state=WorkItemState.assigned), WorkItemState.executing)
+        self.assertEqual(result.updated, [alpha[0], *loose])
+        self.assertEqual(set(result.failed), {alpha[1], alpha[2], beta[0]})
+        self.assertIn(f"WI-{running}", result.failed[beta[0]])
+
+    def test_activity_hooks_and_rollups(self):
+        parent = create_work_item(self.engine, "Epic").task_id
+        children = self._seed(3, parent_id=parent, state="accepted")
+        events = []
+        hooks.subscribe(HookEvent.on_state_change, events.append)
+        bulk_transition(self.engine, WorkItemFilter(parent_id=parent), WorkItemState.closed, actor="sweeper")
+        self.assertEqual([e["task_id"] for e in events], children)
+        self.assertEqual({e["actor"] for e in events}, {"sweeper"})
+        self.assertEqual(get_child_progress(self.engine, parent), (3, 3))
+        log = get_activity_log(self.engine, task_id=children[0])
+        self.assertEqual((log[0].action, log[0].detail), (ActivityAction.state_change, "accepted → closed"))
+
+    def test_empty_filter_rejected(self):
+        self._seed(2)
+        with self.assertRaises(ValueError):
+            bulk_transition(self.engine, WorkItemFilter(), WorkItemState.closed)
+        self.assertEqual(bulk_block(self.engine, WorkItemFilter(repo_name="missing"), "x").matched, 0)
+
+    def test_block_unblock_and_assign(self):
+        task_ids = self._seed(3, repo_name="alpha")
+        blocked = bulk_block(self.engine, WorkItemFilter(repo_name="alpha"), "infra down", actor="ops")
+        self.assertEqual(blocked.updated, task_ids)
+        item = get_work_item(self.engine, task_ids[1])
+        self.assertEqual((item.is_blocked, item.blocked_reason), (True, "infra down"))
+        unblocked = bulk_unblock(self.engine, WorkItemFilter(task_ids=task_ids[:2]))
+        self.assertEqual(unblocked.updated, task_ids[:2])
+        self.assertFalse(get_work_item(self.engine, task_ids[0]).is_blocked)
+        self.assertTrue(get_work_item(self.engine, task_ids[2]).is_blocked)
+
+        assigned = []
+        hooks.subscribe(HookEvent.on_assigned, assigned.append)
+        bulk_assign(self.engine, WorkItemFilter(is_blocked=False), "agent-7", ExecutorType.agent)
+        self.assertEqual([e["task_id"] for e in assigned], task_ids[:2])
+        self.assertEqual({(e["repo"], e["priority"]) for e in assigned}, {("alpha", "medium")})
+        self.assertEqual(get_current_assignment(self.engine, task_ids[0]).executor, "agent-7")
+        self.assertIsNone(get_current_assignment(self.engine, task_ids[2]))
+
+    def test_sweep_is_constant_statements(self):
+        task_ids = self._seed(5000, repo_name="alpha", state="assigned")
+        statements = []
+        listener = lambda conn, cursor, statement, *rest: statements.append(statement)  # noqa: E731
+        event.listen(self.engine, "before_cursor_execute", listener)
+        try:
+            result = bulk_transition(self.engine, WorkItemFilter(repo_name="alpha"), WorkItemState.queued)
+        finally:
+            event.remove(self.engine, "before_cursor_execute", listener)
+        self.assertEqual(len(result.updated), len(task_ids))
+        self.assertLess(len(statements), 20)
+
+
+class TestBulkOperationInterfaces(unittest.TestCase):
+    TEST_DB = "test_bulk_ops_interfaces.db"
+
+    def setUp(self):
+        self._cleanup()
+        os.environ["FORGEOPS_DB_PATH"] = self.TEST_DB
+        os.environ.pop("API_BEARER_TOKEN", None)
+        import importlib
+
+        import config
+        import core.database
+
+        importlib.reload(config)
+        importlib.reload(core.database)
+        import api as api_mod
+
+        importlib.reload(api_mod)
+        from fastapi.testclient import TestClient
+
+        self.api = api_mod
+        self.client = TestClient(api_mod.app)
+        core.database.add_repository(api_mod.engine, "alpha")
+        self.task_ids = core.database.create_work_items_bulk(
+            api_mod.engine,
+            [{"title": "Done", "repo_name": "alpha", "state": "accepted"}, {"title": "Open", "repo_name": "alpha"}],
+        )
+
+    def tearDown(self):
+        self.api.engine.dispose()
+        os.environ.pop("FORGEOPS_DB_PATH", None)
+        self._cleanup()
+
+    def _cleanup(self):
+        if os.path.isfile(self.TEST_DB):
+            os.remove(self.TEST_DB)
+
+    def test_api_bulk_transition(self):
+        resp = self.client.post(
+            "/work-items:bulk-transition", json={"where": {"repo_name": "alpha"}, "state": "closed", "actor": "ops"}
+        )
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json()["updated_count"], 2)
+        resp = self.client.post("/work-items:bulk-transition", json={"where": {}, "state": "closed"})
+        self.assertEqual(resp.status_code, 422)
+
+    def test_api_bulk_transition_reports_failures(self):
+        resp = self.client.post(
+            "/work-items:bulk-transition", json={"where": {"task_ids": self.task_ids}, "state": "assigned"}
+        )
+        data = resp.json()
+        self.assertEqual(data["updated"], [self.task_ids[1]])
+        self.assertEqual([f["task_id"] for f in data["failed"]], [self.task_ids[0]])
+
+    def test_api_bulk_block_and_assign(self):
+        where = {"where": {"task_ids": self.task_ids}}
+        self.assertEqual(self.client.post("/work-items:bulk-block", json=where).status_code, 422)
+        resp = self.client.post("/work-items:bulk-block", json={**where, "reason": "freeze"})
+        self.assertEqual(resp.json()["updated_count"], 2)
+        resp = self.client.post("/work-items:bulk-block", json={**where, "blocked": False})
+        self.assertEqual(resp.json()["updated_count"], 2)
+        resp = self.client.post("/work-items:bulk-assign", json={**where, "executor": "alice"})
+        self.assertEqual(resp.json()["updated"], self.task_ids)
+
+    def test_mcp_bulk_tools(self):
+        import mcp_server
+
+        mcp_server._engine = None
+        try:
+            result = json.loads(mcp_server.forgeops_bulk_transition({"state": "accepted"}, "closed"))
+            self.assertEqual(result["updated"], [self.task_ids[0]])
+            bad = json.loads(mcp_server.forgeops_bulk_transition({"colour": "red"}, "closed"))
+            self.assertEqual(bad["error"]["code"], "VALIDATION_ERROR")
+            result = json.loads(mcp_server.forgeops_bulk_assign({"repo_name": "alpha"}, "agent-1"))
+            self.assertEqual(result["updated_count"], 2)
+            result = json.loads(mcp_server.forgeops_bulk_block({"repo_name": "alpha"}, reason="freeze"))
+            self.assertEqual(result["updated_count"], 2)
+        finally:
+            mcp_server._engine = None
+
+    def test_cli_bulk_transition(self):
+        from commands.state import bulk_transition_items
+
+        with patch("commands.state.create_db_and_tables", return_value=self.api.engine):
+            with patch("sys.stdout", new_callable=StringIO) as out:
+                bulk_transition_items("assigned", repo_name="alpha")
+        output = out.getvalue()
+        self.assertIn("1 of 2 matching items → assigned", output)
+        self.assertIn(f"WI-{self.task_ids[0]}: Invalid transition", output)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,184 @@
+"""Tests for the incremental change feed — cursor semantics, deltas, paging and its interfaces."""
+
+import json
+import os
+import unittest
+
+from core.database import (
+    WorkItemFilter,
+    add_repository,
+    bulk_assign,
+    claim_next_work_item,
+    create_attachment,
+    create_assignment,
+    create_db_and_tables,
+    create_execution_record,
+    create_review,
+    create_work_item,
+    create_work_items_bulk,
+    delete_work_item,
+    get_activity_log,
+    get_changes,
+    transition_work_item,
+    update_work_item,
+)
+from models import ActivityAction, ExecutionStatus, ExecutorType, ReviewDecision, WorkItemState
+
+
+class TestChangeFeed(unittest.TestCase):
+    TEST_DB = "test_change_feed.db"
+
+    def setUp(self):
+        self._cleanup()
+        self.engine = create_db_and_tables(self.TEST_DB)
+        add_repository(self.engine, "alpha")
+
+    def tearDown(self):
+        self.engine.dispose()
+        self._cleanup()
+
+    def _cleanup(self):
+        if os.path.isfile(self.TEST_DB):
+            os.remove(self.TEST_DB)
+
+    def _head(self) -> int:
+        return get_changes(self.engine).cursor
+
+    def test_head_without_since(self):
+        self.assertEqual(get_changes(self.engine), (0, False, [], [], [], [], [], []))
+        create_work_item(self.engine, "Task")
+        head = get_changes(self.engine)
+        self.assertGreater(head.cursor, 0)
+        self.assertEqual(head.work_items, [])
+        self.assertEqual(get_changes(self.engine, head.cursor).cursor, head.cursor)
+
+    def test_delta_collapses_items_and_loads_records(self):
+        item = create_work_item(self.engine, "Task", repo_name="alpha")
+        untouched = create_work_item(self.engine, "Untouched")
+        since = self._head()
+
+        assignment = create_assignment(self.engine, item.task_id, "codex", ExecutorType.agent)
+        transition_work_item(self.engine, item.task_id, WorkItemState.assigned)
+        transition_work_item(self.engine, item.task_id, WorkItemState.executing)
+        run = create_execution_record(self.engine, item.task_id, "codex", ExecutionStatus.success)
+        transition_work_item(self.engine, item.task_id, WorkItemState.completed)
+        transition_work_item(self.engine, item.task_id, WorkItemState.awaiting_review)
+        review = create_review(self.engine, item.task_id, "lead", ReviewDecision.accepted)
+
+        changes = get_changes(self.engine, since)
+        self.assertFalse(changes.has_more)
+        self.assertEqual([i.task_id for i in changes.work_items], [item.task_id])
+        self.assertNotIn(untouched.task_id, [i.task_id for i in changes.work_items])
+        self.assertEqual(changes.work_items[0].state, WorkItemState.awaiting_review)
+        self.assertEqual(changes.work_items[0].repository.name, "alpha")
+        self.assertEqual([a.assignment_id for a in changes.assignments], [assignment.assignment_id])
+        self.assertEqual([r.run_id for r in changes.runs], [run.run_id])
+        self.assertEqual([r.review_id for r in changes.reviews], [review.review_id])
+        self.assertEqual(get_changes(self.engine, changes.cursor).work_items, [])
+
+    def test_paging(self):
+        since = self._head()
+        task_ids = create_work_items_bulk(self.engine, [{"title": f"Task {n}"} for n in range(5)])
+        seen, pages = [], 0
+        while True:
+            changes = get_changes(self.engine, since, limit=2)
+            seen += [i.task_id for i in changes.work_items]
+            since, pages = changes.cursor, pages + 1
+            if not changes.has_more:
+                break
+        self.assertEqual((seen, pages), (task_ids, 3))
+
+    def test_updates_and_deletes(self):
+        item = create_work_item(self.engine, "Task")
+        gone = create_work_item(self.engine, "Gone")
+        since = self._head()
+        update_work_item(self.engine, item.task_id, title="Renamed", description="Why")
+        update_work_item(self.engine, item.task_id, title="Renamed")
+        delete_work_item(self.engine, gone.task_id)
+
+        entries = [e for e in get_activity_log(self.engine, task_id=item.task_id) if e.action == ActivityAction.updated]
+        self.assertEqual([e.detail for e in entries], ["title, description"])
+        changes = get_changes(self.engine, since)
+        self.assertEqual([i.title for i in changes.work_items], ["Renamed"])
+        self.assertEqual(changes.deleted, [gone.task_id])
+
+    def test_attachments(self):
+        item = create_work_item(self.engine, "Task")
+        since = self._head()
+        att = create_attachment(self.engine, item.task_id, "build.log", label="Build log")
+        changes = get_changes(self.engine, since)
+        self.assertEqual([i.task_id for i in changes.work_items], [item.task_id])
+        self.assertEqual([a.attachment_id for a in changes.attachments], [att.attachment_id])
+        entry = get_activity_log(self.engine, task_id=item.task_id)[0]
+        self.assertEqual((entry.action, entry.detail), (ActivityAction.attached, "Build log"))
+
+    def test_bulk_and_claim_record_assignments(self):
+        first, second = create_work_items_bulk(self.engine, [{"title": "One"}, {"title": "Two"}])
+        since = self._head()
+        bulk_assign(self.engine, WorkItemFilter(task_ids=[first, second]), "codex", ExecutorType.agent)
+        claim_next_work_item(self.engine, "claude")
+        changes = get_changes(self.engine, since)
+        self.assertEqual(
+            [(a.task_id, a.executor) for a in changes.assignments],
+            [(first, "codex"), (second, "codex"), (first, "claude")],
+        )
+
+
+class TestChangeFeedInterfaces(unittest.TestCase):
+    TEST_DB = "test_change_feed_interfaces.db"
+
+    def setUp(self):
+        self._cleanup()
+        os.environ["FORGEOPS_DB_PATH"] = self.TEST_DB
+        os.environ.pop("API_BEARER_TOKEN", None)
+        import importlib
+
+        import config
+        import core.database
+
+        importlib.reload(config)
+        importlib.reload(core.database)
+        import api as api_mod
+
+        importlib.reload(api_mod)
+        from fastapi.testclient import TestClient
+
+        self.api = api_mod
+        self.client = TestClient(api_mod.app)
+        self.task_id = core.database.create_work_item(api_mod.engine, "Task").task_id
+
+    def tearDown(self):
+        self.api.engine.dispose()
+        os.environ.pop("FORGEOPS_DB_PATH", None)
+        self._cleanup()
+
+    def _cleanup(self):
+        if os.path.isfile(self.TEST_DB):
+            os.remove(self.TEST_DB)
+
+    def test_api_changes(self):
+        head = self.client.get("/changes").json()
+        self.assertEqual(head["work_items"], [])
+        assignment = {"executor": "codex", "executor_type": "agent"}
+        self.client.post(f"/work-items/{self.task_id}/assignments", json=assignment)
+        resp = self.client.get("/changes", params={"since": head["cursor"]})
+        self.assertEqual(resp.status_code, 200)
+        data = resp.json()
+        self.assertEqual([i["task_id"] for i in data["work_items"]], [self.task_id])
+        self.assertEqual([a["executor"] for a in data["assignments"]], ["codex"])
+        self.assertGreater(data["cursor"], head["cursor"])
+        self.assertEqual(self.client.get("/changes", params={"since": -1}).status_code, 422)
+
+    def test_mcp_changes_since(self):
+        import mcp_server
+
+        mcp_server._engine = None
+        data = json.loads(mcp_server.forgeops_changes_since(since=0))
+        self.assertTrue(data["success"])
+        self.assertEqual([i["task_id"] for i in data["work_items"]], [self.task_id])
+        self.assertEqual(json.loads(mcp_server.forgeops_changes_since(since=data["cursor"]))["work_items"], [])
+        mcp_server._engine = None
+
+
+if __name__ == "__main__":
+    unittest.main()
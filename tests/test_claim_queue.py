@@ -0,0 +1,195 @@
+"""Tests for the pull-based work queue — claim order, repo capacity, atomicity and its interfaces."""
+
+import json
+import os
+import threading
+import unittest
+
+from sqlmodel import Session, select
+
+from core.database import (
+    add_repository,
+    block_work_item,
+    claim_next_work_item,
+    create_db_and_tables,
+    create_work_item,
+    create_work_items_bulk,
+    get_current_assignment,
+    get_work_item,
+    transition_work_item,
+    update_repository,
+    update_work_item,
+)
+from core.hooks import HookEvent, hooks
+from models import PRIORITY_RANK, ExecutorType, Priority, WorkItem, WorkItemState
+
+
+class TestClaimQueue(unittest.TestCase):
+    TEST_DB = "test_claim_queue.db"
+
+    def setUp(self):
+        self._cleanup()
+        self.engine = create_db_and_tables(self.TEST_DB)
+        for name in ("alpha", "beta"):
+            add_repository(self.engine, name)
+
+    def tearDown(self):
+        hooks.clear()
+        self.engine.dispose()
+        self._cleanup()
+
+    def _cleanup(self):
+        if os.path.isfile(self.TEST_DB):
+            os.remove(self.TEST_DB)
+
+    def _claimed(self, count: int, **options) -> list[int]:
+        return [claim_next_work_item(self.engine, f"agent-{n}", **options).task_id for n in range(count)]
+
+    def test_highest_priority_then_oldest(self):
+        low = create_work_item(self.engine, "Low", priority=Priority.low)
+        first_high = create_work_item(self.engine, "High 1", priority=Priority.high)
+        second_high = create_work_item(self.engine, "High 2", priority=Priority.high)
+        urgent = create_work_item(self.engine, "Urgent", priority=Priority.urgent)
+        order = self._claimed(4)
+        self.assertEqual(order, [urgent.task_id, first_high.task_id, second_high.task_id, low.task_id])
+        self.assertIsNone(claim_next_work_item(self.engine, "agent"))
+
+    def test_claim_assigns_and_starts(self):
+        item = create_work_item(self.engine, "Task", repo_name="alpha")
+        claimed = claim_next_work_item(self.engine, "codex", ExecutorType.agent)
+        self.assertEqual(claimed.task_id, item.task_id)
+        self.assertEqual(get_work_item(self.engine, item.task_id).state, WorkItemState.executing)
+        self.assertEqual(get_current_assignment(self.engine, item.task_id).executor, "codex")
+
+    def test_start_false_stops_at_assigned(self):
+        create_work_item(self.engine, "Task", repo_name="alpha")
+        claimed = claim_next_work_item(self.engine, "codex", start=False)
+        self.assertEqual(claimed.state, WorkItemState.assigned)
+
+    def test_skips_blocked_and_busy_repos(self):
+        busy = create_work_item(self.engine, "Busy", repo_name="alpha", priority=Priority.urgent)
+        blocked = create_work_item(self.engine, "Blocked", repo_name="beta", priority=Priority.urgent)
+        block_work_item(self.engine, blocked.task_id, "waiting")
+        free = create_work_item(self.engine, "Free", repo_name="beta")
+        loose = create_work_item(self.engine, "No repo", priority=Priority.low)
+        running = create_work_item(self.engine, "Running", repo_name="alpha")
+        transition_work_item(self.engine, running.task_id, WorkItemState.assigned)
+        transition_work_item(self.engine, running.task_id, WorkItemState.executing)
+        self.assertEqual(self._claimed(2), [free.task_id, loose.task_id])
+        self.assertIsNone(claim_next_work_item(self.engine, "agent"))
+        self.assertEqual(get_work_item(self.engine, busy.task_id).state, WorkItemState.queued)
+
+    def test_one_claim_per_repo(self):
+        create_work_items_bulk(self.engine, [{"title": f"Task {n}", "repo_name": "alpha"} for n in range(3)])
+        claim_next_work_item(self.engine, "agent-1")
+        self.assertIsNone(claim_next_work_item(self.engine, "agent-2"))
+        self.assertIsNotNone(claim_next_work_item(self.engine, "agent-2", start=False))
+
+    def test_repo_filter(self):
+        create_work_item(self.engine, "Alpha", repo_name="alpha", priority=Priority.urgent)
+        beta = create_work_item(self.engine, "Beta", repo_name="beta")
+        self.assertEqual(claim_next_work_item(self.engine, "agent", repo_name="beta").task_id, beta.task_id)
+
+    def test_skips_items_the_workflow_cannot_start(self):
+        update_repository(self.engine, "alpha", workflow={"queued": ["closed"]})
+        create_work_item(self.engine, "Stuck", repo_name="alpha", priority=Priority.urgent)
+        other = create_work_item(self.engine, "Other", repo_name="beta")
+        self.assertEqual(claim_next_work_item(self.engine, "agent").task_id, other.task_id)
+
+    def test_hooks_fire_after_claim(self):
+        events = []
+        hooks.subscribe(HookEvent.on_assigned, lambda p: events.append(("assigned", p["executor"])))
+        hooks.subscribe(HookEvent.on_state_change, lambda p: events.append(("state", p["new_state"])))
+        create_work_item(self.engine, "Task")
+        claim_next_work_item(self.engine, "codex")
+        self.assertEqual(events, [("assigned", "codex"), ("state", "assigned"), ("state", "executing")])
+
+    def test_priority_rank_follows_priority(self):
+        item = create_work_item(self.engine, "Task")
+        (bulk,) = create_work_items_bulk(self.engine, [{"title": "Bulk", "priority": "urgent"}])
+        update_work_item(self.engine, item.task_id, priority="high")
+        with Session(self.engine) as session:
+            ranks = dict(session.exec(select(WorkItem.task_id, WorkItem.priority_rank)).all())
+        self.assertEqual(ranks, {item.task_id: PRIORITY_RANK[Priority.high], bulk: PRIORITY_RANK[Priority.urgent]})
+
+    def test_concurrent_claimers_never_share_an_item(self):
+        create_work_items_bulk(self.engine, [{"title": f"Task {n}"} for n in range(40)])
+        claimed: list[int] = []
+        lock = threading.Lock()
+
+        def claimer(name: str) -> None:
+            while (item := claim_next_work_item(self.engine, name)) is not None:
+                with lock:
+                    claimed.append(item.task_id)
+
+        threads = [threading.Thread(target=claimer, args=(f"agent-{n}",)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(sorted(claimed), list(range(1, 41)))
+
+    def test_upgrade_backfills_priority_rank(self):
+        item = create_work_item(self.engine, "Task", priority=Priority.urgent)
+        with self.engine.connect() as conn:
+            conn.exec_driver_sql("DROP INDEX ix_work_items_claim")
+            conn.exec_driver_sql("ALTER TABLE work_items DROP COLUMN priority_rank")
+            conn.exec_driver_sql("PRAGMA user_version = 9")
+            conn.commit()
+        create_db_and_tables(self.TEST_DB)
+        create_work_item(self.engine, "Later", priority=Priority.high)
+        self.assertEqual(claim_next_work_item(self.engine, "agent").task_id, item.task_id)
+
+
+class TestClaimInterfaces(unittest.TestCase):
+    TEST_DB = "test_claim_queue_interfaces.db"
+
+    def setUp(self):
+        self._cleanup()
+        os.environ["FORGEOPS_DB_PATH"] = self.TEST_DB
+        os.environ.pop("API_BEARER_TOKEN", None)
+        import importlib
+
+        import config
+        import core.database
+
+        importlib.reload(config)
+        importlib.reload(core.database)
+        import api as api_mod
+
+        importlib.reload(api_mod)
+        from fastapi.testclient import TestClient
+
+        self.api = api_mod
+        self.client = TestClient(api_mod.app)
+        self.task_id = core.database.create_work_item(api_mod.engine, "Task", priority=Priority.high).task_id
+
+    def tearDown(self):
+        self.api.engine.dispose()
+        os.environ.pop("FORGEOPS_DB_PATH", None)
+        self._cleanup()
+
+    def _cleanup(self):
+        if os.path.isfile(self.TEST_DB):
+            os.remove(self.TEST_DB)
+
+    def test_api_claim(self):
+        resp = self.client.post("/queue/claim", json={"executor": "codex"})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual((resp.json()["task_id"], resp.json()["state"]), (self.task_id, "executing"))
+        self.assertEqual(self.client.post("/queue/claim", json={"executor": "codex"}).status_code, 204)
+
+    def test_mcp_claim(self):
+        import mcp_server
+
+        mcp_server._engine = None
+        data = json.loads(mcp_server.forgeops_claim_next("codex", start=False))
+        self.assertTrue(data["success"])
+        self.assertEqual((data["item"]["task_id"], data["item"]["state"]), (self.task_id, "assigned"))
+        self.assertIsNone(json.loads(mcp_server.forgeops_claim_next("codex"))["item"])
+        self.assertFalse(json.loads(mcp_server.forgeops_claim_next("codex", executor_type="robot"))["success"])
+        mcp_server._engine = None
+
+
+if __name__ == "__main__":
+    unittest.main()
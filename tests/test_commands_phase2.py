@@ -288,6 +288,20 @@ class TestSessionCommands(Phase2CommandBase):
                 status_overview()
         self.assertIn("queued", out.getvalue())
 
+    def test_status_lists_executing_and_blocked(self):
+        running = create_work_item(self.engine, "Running item", state=WorkItemState.executing)
+        stuck = create_work_item(self.engine, "Stuck item")
+        block_work_item(self.engine, stuck.task_id, "waiting on keys")
+        from commands.session import status_overview
+
+        with patch("commands.session.create_db_and_tables", return_value=self.engine):
+            with patch("sys.stdout", new_callable=StringIO) as out:
+                status_overview()
+        output = out.getvalue()
+        self.assertIn(f"WI-{running.task_id}", output)
+        self.assertIn("waiting on keys", output)
+        self.assertIn("blocked: 1", output)
+
     def test_next_actions_empty(self):
         from commands.session import next_actions
 
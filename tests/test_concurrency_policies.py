@@ -0,0 +1,283 @@
+"""Tests for per-repository concurrency policies — N per repo, per-branch and per-executor caps."""
+
+import os
+import threading
+import unittest
+from io import StringIO
+from unittest.mock import patch
+
+from sqlmodel import Session, select
+
+from core.database import (
+    WorkItemFilter,
+    add_repository,
+    bulk_transition,
+    claim_next_work_item,
+    create_assignment,
+    create_db_and_tables,
+    create_work_item,
+    create_work_items_bulk,
+    dispose_engines,
+    fast_track_work_item,
+    get_repository,
+    get_work_item,
+    transition_work_item,
+    update_repository,
+    update_work_item,
+)
+from core.hooks import HookEvent, hooks
+from core.state_engine import (
+    DEFAULT_CONCURRENCY,
+    ConcurrencyPolicy,
+    RepoConcurrencyError,
+    compile_concurrency,
+    normalize_concurrency,
+)
+from models import ConcurrencySlot, ExecutorType, WorkItemState
+
+S = WorkItemState
+
+
+class TestConcurrencyPolicy(unittest.TestCase):
+    def test_normalize(self):
+        self.assertIsNone(normalize_concurrency(None))
+        self.assertIsNone(normalize_concurrency("default"))
+        self.assertIsNone(normalize_concurrency({"repo": 1}))
+        stored = normalize_concurrency('{"executor": 2, "repo": 4}')
+        self.assertEqual(compile_concurrency(stored), ConcurrencyPolicy(repo=4, branch=None, executor=2))
+        self.assertEqual(compile_concurrency(normalize_concurrency({"repo": None})).repo, None)
+        self.assertIs(compile_concurrency(None), DEFAULT_CONCURRENCY)
+        for bad in ("four", "[1]", {"repos": 2}, {"repo": 0}, {"branch": "2"}, {"executor": True}):
+            with self.subTest(definition=bad):
+                with self.assertRaises(ValueError):
+                    normalize_concurrency(bad)
+
+
+class TestConcurrencyPolicies(unittest.TestCase):
+    TEST_DB = "test_concurrency_policies.db"
+
+    def setUp(self):
+        self._cleanup()
+        self.engine = create_db_and_tables(self.TEST_DB)
+        add_repository(self.engine, "mono", default_branch="main")
+        self.conflicts = []
+        hooks.subscribe(HookEvent.on_repo_conflict, self.conflicts.append)
+
+    def tearDown(self):
+        hooks.clear()
+        dispose_engines()
+        self._cleanup()
+
+    def _cleanup(self):
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.isfile(self.TEST_DB + suffix):
+                os.remove(self.TEST_DB + suffix)
+
+    def _assigned(self, count: int, **fields) -> list[int]:
+        specs = [{"title": f"Item {n}", "repo_name": "mono", "state": "assigned", **fields} for n in range(count)]
+        return create_work_items_bulk(self.engine, specs)
+
+    def _slots(self) -> dict[str, int]:
+        with Session(self.engine) as session:
+            return dict(session.exec(select(ConcurrencySlot.scope, ConcurrencySlot.used)).all())
+
+    def test_n_per_repo(self):
+        update_repository(self.engine, "mono", concurrency={"repo": 2})
+        first, second, third = self._assigned(3)
+        transition_work_item(self.engine, first, S.executing)
+        transition_work_item(self.engine, second, S.executing)
+        with self.assertRaises(RepoConcurrencyError) as ctx:
+            transition_work_item(self.engine, third, S.executing)
+        self.assertEqual(ctx.exception.limit, 2)
+        self.assertIn(ctx.exception.blocking_task_id, (first, second))
+        self.assertEqual(len(self.conflicts), 1)
+
+        transition_work_item(self.engine, first, S.completed)
+        transition_work_item(self.engine, third, S.executing)
+        repo_id = get_repository(self.engine, "mono").repo_id
+        self.assertEqual(self._slots(), {f"repo:{repo_id}": 2})
+
+    def test_per_branch(self):
+        update_repository(self.engine, "mono", concurrency={"repo": None, "branch": 1})
+        on_main, default, feature = create_work_items_bulk(
+            self.engine,
+            [
+                {"title": "Main", "repo_name": "mono", "state": "assigned", "branch": "main"},
+                {"title": "Default", "repo_name": "mono", "state": "assigned"},
+                {"title": "Feature", "repo_name": "mono", "state": "assigned", "branch": "feature/x"},
+            ],
+        )
+        transition_work_item(self.engine, on_main, S.executing)
+        transition_work_item(self.engine, feature, S.executing)
+        # No branch of its own: counts against the repository's default branch.
+        with self.assertRaises(RepoConcurrencyError) as ctx:
+            transition_work_item(self.engine, default, S.executing)
+        self.assertEqual((ctx.exception.kind, ctx.exception.key), ("branch", "main"))
+        self.assertIn("on branch 'main'", str(ctx.exception))
+
+        update_work_item(self.engine, default, branch="feature/y")
+        transition_work_item(self.engine, default, S.executing)
+
+    def test_moving_an_executing_item_trades_slots(self):
+        update_repository(self.engine, "mono", concurrency={"repo": None, "branch": 1})
+        first, second = self._assigned(2, branch="one")
+        transition_work_item(self.engine, first, S.executing)
+        update_work_item(self.engine, first, branch="two")
+        transition_work_item(self.engine, second, S.executing)
+        repo_id = get_repository(self.engine, "mono").repo_id
+        self.assertEqual(self._slots(), {f"branch:{repo_id}:one": 1, f"branch:{repo_id}:two": 1})
+
+    def test_per_executor(self):
+        update_repository(self.engine, "mono", concurrency={"repo": 3, "executor": 1})
+        first, second, third = self._assigned(3)
+        for task_id, executor in ((first, "codex"), (second, "codex"), (third, "claude")):
+            create_assignment(self.engine, task_id, executor, ExecutorType.agent)
+        transition_work_item(self.engine, first, S.executing)
+        with self.assertRaises(RepoConcurrencyError) as ctx:
+            transition_work_item(self.engine, second, S.executing)
+        self.assertEqual((ctx.exception.kind, ctx.exception.key), ("executor", "codex"))
+        transition_work_item(self.engine, third, S.executing)
+
+    def test_claim_honours_policy(self):
+        update_repository(self.engine, "mono", concurrency={"repo": 2, "executor": 1})
+        create_work_items_bulk(self.engine, [{"title": f"Task {n}", "repo_name": "mono"} for n in range(4)])
+        self.assertIsNotNone(claim_next_work_item(self.engine, "codex"))
+        # codex is at its cap in this repository; another agent still fits.
+        self.assertIsNone(claim_next_work_item(self.engine, "codex"))
+        self.assertIsNotNone(claim_next_work_item(self.engine, "claude"))
+        self.assertIsNone(claim_next_work_item(self.engine, "gemini"))
+        self.assertEqual(self.conflicts, [])
+
+    def test_bulk_transition_fills_up_to_the_cap(self):
+        update_repository(self.engine, "mono", concurrency={"repo": 2})
+        task_ids = self._assigned(4)
+        result = bulk_transition(self.engine, WorkItemFilter(task_ids=task_ids), S.executing)
+        self.assertEqual(result.updated, task_ids[:2])
+        self.assertEqual(sorted(result.failed), task_ids[2:])
+        self.assertIn("at most 2", result.failed[task_ids[2]])
+
+    def test_bulk_create_respects_cap(self):
+        with self.assertRaises(ValueError):
+            create_work_items_bulk(
+                self.engine, [{"title": f"Run {n}", "repo_name": "mono", "state": "executing"} for n in range(2)]
+            )
+        update_repository(self.engine, "mono", concurrency={"repo": 2})
+        create_work_items_bulk(
+            self.engine, [{"title": f"Run {n}", "repo_name": "mono", "state": "executing"} for n in range(2)]
+        )
+
+    def test_fast_track_through_full_repo(self):
+        update_repository(self.engine, "mono", concurrency={"repo": 2})
+        running = self._assigned(2)
+        for task_id in running:
+            transition_work_item(self.engine, task_id, S.executing)
+        item = create_work_item(self.engine, "Later", repo_name="mono")
+        with self.assertRaises(RepoConcurrencyError):
+            fast_track_work_item(self.engine, item.task_id, S.completed)
+        self.assertEqual(get_work_item(self.engine, item.task_id).state, S.queued)
+
+    def test_policy_change_recounts(self):
+        update_repository(self.engine, "mono", concurrency={"repo": None})
+        task_ids = self._assigned(4)
+        for task_id in task_ids[:3]:
+            transition_work_item(self.engine, task_id, S.executing)
+        self.assertEqual(self._slots(), {})
+        update_repository(self.engine, "mono", concurrency={"repo": 3})
+        repo_id = get_repository(self.engine, "mono").repo_id
+        self.assertEqual(self._slots(), {f"repo:{repo_id}": 3})
+        with self.assertRaises(RepoConcurrencyError):
+            transition_work_item(self.engine, task_ids[3], S.executing)
+        transition_work_item(self.engine, task_ids[0], S.completed)
+        transition_work_item(self.engine, task_ids[3], S.executing)
+        self.assertEqual(self._slots(), {f"repo:{repo_id}": 3})
+
+    def test_concurrent_transitions_never_exceed_cap(self):
+        update_repository(self.engine, "mono", concurrency={"repo": 3})
+        task_ids = self._assigned(12)
+        barrier = threading.Barrier(len(task_ids))
+        outcomes = []
+
+        def worker(task_id: int) -> None:
+            barrier.wait()
+            try:
+                transition_work_item(self.engine, task_id, S.executing)
+                outcomes.append("ok")
+            except RepoConcurrencyError:
+                outcomes.append("conflict")
+
+        threads = [threading.Thread(target=worker, args=(task_id,)) for task_id in task_ids]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(outcomes.count("ok"), 3)
+        executing = [task_id for task_id in task_ids if get_work_item(self.engine, task_id).state == S.executing]
+        self.assertEqual(len(executing), 3)
+
+    def test_cli_update_repo(self):
+        from commands.update_repo import update_repo
+
+        with patch("commands.update_repo.create_db_and_tables", return_value=self.engine):
+            with patch("sys.stdout", new_callable=StringIO) as out:
+                update_repo("mono", concurrency='{"repo": 4}')
+                update_repo("mono", concurrency='{"repo": -1}')
+        self.assertIn("positive integer", out.getvalue())
+        self.assertEqual(compile_concurrency(get_repository(self.engine, "mono").concurrency).repo, 4)
+
+
+class TestConcurrencyApi(unittest.TestCase):
+    TEST_DB = "test_concurrency_api.db"
+
+    def setUp(self):
+        self._cleanup()
+        os.environ["FORGEOPS_DB_PATH"] = self.TEST_DB
+        os.environ.pop("API_BEARER_TOKEN", None)
+        import importlib
+
+        import config
+        import core.database
+
+        importlib.reload(config)
+        importlib.reload(core.database)
+        import api as api_mod
+
+        importlib.reload(api_mod)
+        from fastapi.testclient import TestClient
+
+        self.api = api_mod
+        self.client = TestClient(api_mod.app)
+        core.database.add_repository(api_mod.engine, "mono")
+
+    def tearDown(self):
+        self.api.engine.dispose()
+        os.environ.pop("FORGEOPS_DB_PATH", None)
+        self._cleanup()
+
+    def _cleanup(self):
+        if os.path.isfile(self.TEST_DB):
+            os.remove(self.TEST_DB)
+
+    def test_patch_concurrency_and_branch(self):
+        resp = self.client.patch("/repositories/mono", json={"concurrency": {"repo": 2, "branch": 1}})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(compile_concurrency(resp.json()["concurrency"]), ConcurrencyPolicy(2, 1, None))
+        resp = self.client.patch("/repositories/mono", json={"concurrency": {"executor": 0}})
+        self.assertEqual(resp.status_code, 422)
+
+        ids = [
+            self.client.post("/work-items", json={"title": "A", "repo_name": "mono", "branch": b}).json()["task_id"]
+            for b in ("main", "main")
+        ]
+        self.assertEqual(self.client.get(f"/work-items/{ids[0]}").json()["branch"], "main")
+        for task_id in ids:
+            self.client.post(f"/work-items/{task_id}/transition", json={"state": "assigned"})
+        self.assertEqual(
+            self.client.post(f"/work-items/{ids[0]}/transition", json={"state": "executing"}).status_code, 200
+        )
+        resp = self.client.post(f"/work-items/{ids[1]}/transition", json={"state": "executing"})
+        self.assertEqual(resp.status_code, 409)
+        self.assertIn("on branch 'main'", resp.json()["detail"])
+
+
+if __name__ == "__main__":
+    unittest.main()
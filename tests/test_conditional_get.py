@@ -0,0 +1,178 @@
+"""Tests for the ledger version, ETag/If-None-Match handling and the API's response cache."""
+
+import importlib
+import os
+import unittest
+from unittest.mock import patch
+
+from core.database import (
+    claim_next_work_item,
+    create_db_and_tables,
+    create_work_item,
+    dispose_engines,
+    get_ledger_version,
+    unit_of_work,
+    update_work_item,
+)
+from core.leases import heartbeat
+from core.outbox import OutboxWorker, add_subscriber
+
+
+class TestLedgerVersion(unittest.TestCase):
+    TEST_DB = "test_ledger_version.db"
+
+    def setUp(self):
+        self._cleanup()
+        self.engine = create_db_and_tables(self.TEST_DB)
+
+    def tearDown(self):
+        dispose_engines()
+        self._cleanup()
+
+    def _cleanup(self):
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.isfile(self.TEST_DB + suffix):
+                os.remove(self.TEST_DB + suffix)
+
+    def test_moves_once_per_changing_unit(self):
+        self.assertEqual(get_ledger_version(self.engine), 0)
+        item = create_work_item(self.engine, "Task")
+        self.assertEqual(get_ledger_version(self.engine), 1)
+        with unit_of_work(self.engine) as session:
+            update_work_item(session, item.task_id, title="One")
+            update_work_item(session, item.task_id, title="Two")
+        self.assertEqual(get_ledger_version(self.engine), 2)
+        with self.assertRaises(RuntimeError):
+            with unit_of_work(self.engine) as session:
+                update_work_item(session, item.task_id, title="Rolled back")
+                raise RuntimeError
+        self.assertEqual(get_ledger_version(self.engine), 2)
+
+    def test_no_op_units_and_bookkeeping_keep_it(self):
+        item = create_work_item(self.engine, "Task")
+        version = get_ledger_version(self.engine)
+        with unit_of_work(self.engine):
+            pass
+        self.assertIsNotNone(claim_next_work_item(self.engine, "codex"))
+        self.assertIsNone(claim_next_work_item(self.engine, "codex"))
+        self.assertEqual(get_ledger_version(self.engine), version + 1)
+
+        self.assertIsNotNone(heartbeat(self.engine, item.task_id))
+        add_subscriber(self.engine, "audit", "http://example.invalid/hook")
+        version = get_ledger_version(self.engine)
+        OutboxWorker(self.engine, deliver=lambda subscriber, event: None).run_once()
+        self.assertEqual(get_ledger_version(self.engine), version)
+
+
+class TestConditionalGet(unittest.TestCase):
+    TEST_DB = "test_conditional_get.db"
+
+    def setUp(self):
+        self._cleanup()
+        os.environ["FORGEOPS_DB_PATH"] = self.TEST_DB
+        os.environ.pop("API_BEARER_TOKEN", None)
+
+        import config
+        import core.database
+
+        importlib.reload(config)
+        importlib.reload(core.database)
+        import api as api_mod
+
+        importlib.reload(api_mod)
+        from fastapi.testclient import TestClient
+
+        self.api = api_mod
+        self.client = TestClient(api_mod.app)
+        self.task_id = self.client.post("/work-items", json={"title": "Task"}).json()["task_id"]
+
+    def tearDown(self):
+        self.api.engine.dispose()
+        os.environ.pop("FORGEOPS_DB_PATH", None)
+        self._cleanup()
+
+    def _cleanup(self):
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.isfile(self.TEST_DB + suffix):
+                os.remove(self.TEST_DB + suffix)
+
+    def test_not_modified_until_a_write(self):
+        first = self.client.get("/status")
+        etag = first.headers["ETag"]
+        again = self.client.get("/status", headers={"If-None-Match": etag})
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(again.content, b"")
+        self.assertEqual(again.headers["ETag"], etag)
+        self.assertEqual(self.client.get("/status", headers={"If-None-Match": f'W/{etag}, "x"'}).status_code, 304)
+
+        self.client.patch(f"/work-items/{self.task_id}", json={"title": "Renamed"})
+        changed = self.client.get("/status", headers={"If-None-Match": etag})
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed.headers["ETag"], etag)
+        self.assertEqual(changed.json()["total"], 1)
+
+    def test_cached_responses(self):
+        summary = self.api.get_status_summary
+        with patch.object(self.api, "get_status_summary", wraps=summary) as spy:
+            bodies = [self.client.get("/status").json() for _ in range(3)]
+            self.assertEqual(spy.call_count, 1)
+            self.assertEqual(bodies[0], bodies[2])
+            self.client.post("/work-items", json={"title": "Another"})
+            self.assertEqual(self.client.get("/status").json()["total"], 2)
+            self.assertEqual(spy.call_count, 2)
+
+        self.client.post("/work-items", json={"title": "Third"})
+        page = self.client.get("/work-items", params={"limit": 1})
+        cached = self.client.get("/work-items", params={"limit": 1})
+        self.assertEqual(cached.headers["X-Next-Cursor"], page.headers["X-Next-Cursor"])
+        self.assertEqual(cached.json(), page.json())
+        self.assertEqual(len(self.client.get("/work-items", params={"limit": 2}).json()), 2)
+
+    def test_errors_and_unversioned_paths(self):
+        missing = self.client.get("/work-items/999")
+        self.assertEqual(missing.status_code, 404)
+        self.assertNotIn("ETag", missing.headers)
+        self.assertNotIn("ETag", self.client.get("/leases").headers)
+
+    def test_tags_are_per_resource(self):
+        etag = self.client.get(f"/work-items/{self.task_id}").headers["ETag"]
+        self.assertNotEqual(self.client.get("/status").headers["ETag"], etag)
+        self.assertNotEqual(self.client.get("/work-items", params={"limit": 1}).headers["ETag"], etag)
+        for path, status in (("/work-items/999", 404), ("/work-items?limit=0", 422), ("/nowhere", 404)):
+            with self.subTest(path=path):
+                self.assertEqual(self.client.get(path, headers={"If-None-Match": "*"}).status_code, status)
+
+    def test_not_modified_after_eviction(self):
+        etag = self.client.get(f"/work-items/{self.task_id}").headers["ETag"]
+        for app in self._middlewares():
+            app._cache.clear()
+        resp = self.client.get(f"/work-items/{self.task_id}", headers={"If-None-Match": etag})
+        self.assertEqual((resp.status_code, resp.content, resp.headers["ETag"]), (304, b"", etag))
+
+    def _middlewares(self):
+        app = self.client.app.middleware_stack
+        while app is not None:
+            if isinstance(app, self.api.ConditionalGetMiddleware):
+                yield app
+            app = getattr(app, "app", None)
+
+    def test_auth_is_checked_before_the_cache(self):
+        self.client.get("/status")
+        with patch.object(self.api, "API_BEARER_TOKEN", "secret"):
+            self.assertEqual(self.client.get("/status").status_code, 401)
+            etag = self.client.get("/status", headers={"Authorization": "Bearer secret"}).headers["ETag"]
+            resp = self.client.get("/status", headers={"If-None-Match": etag})
+            self.assertEqual(resp.status_code, 401)
+
+    def test_cache_is_bounded(self):
+        middleware = self.api.ConditionalGetMiddleware(None, max_entries=2)
+        for n in range(3):
+            middleware._store((f"/{n}", b"", 1), (200, [], b""))
+        self.assertEqual([key[0] for key in middleware._cache], ["/1", "/2"])
+        middleware._store(("/new", b"", 2), (200, [], b""))
+        middleware._store(("/late", b"", 1), (200, [], b""))
+        self.assertEqual(list(middleware._cache), [("/new", b"", 2)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,10 +3,16 @@
 import os
 import unittest
 
+from sqlalchemy import event, text
+
 from core.database import (
+    SCHEMA_VERSION,
     add_repository,
     create_db_and_tables,
     create_work_item,
+    dispose_engines,
+    get_child_progress,
+    get_engine,
     get_repositories,
     get_repository,
     get_work_item,
@@ -180,5 +186,138 @@ class TestDatabaseLayer(unittest.TestCase):
         self.assertIsNone(get_work_item(self.engine, 9999))
 
 
+class TestSQLiteProfile(unittest.TestCase):
+    TEST_DB = "test_sqlite_profile.db"
+
+    def setUp(self):
+        self._cleanup()
+
+    def tearDown(self):
+        self._cleanup()
+
+    def _cleanup(self):
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.isfile(self.TEST_DB + suffix):
+                os.remove(self.TEST_DB + suffix)
+
+    def _pragma(self, engine, name):
+        with engine.connect() as conn:
+            return conn.execute(text(f"PRAGMA {name}")).scalar()
+
+    def test_default_profile_applied_to_connections(self):
+        engine = get_engine(self.TEST_DB)
+        try:
+            self.assertEqual(self._pragma(engine, "journal_mode"), "wal")
+            self.assertEqual(self._pragma(engine, "synchronous"), 1)  # NORMAL
+            self.assertEqual(self._pragma(engine, "busy_timeout"), 5000)
+            self.assertEqual(self._pragma(engine, "temp_store"), 2)  # MEMORY
+            self.assertEqual(self._pragma(engine, "cache_size"), -65536)
+        finally:
+            engine.dispose()
+
+    def test_profile_override(self):
+        engine = get_engine(self.TEST_DB, pragmas={"busy_timeout": 1234, "cache_size": -1000})
+        try:
+            self.assertEqual(self._pragma(engine, "busy_timeout"), 1234)
+            self.assertEqual(self._pragma(engine, "cache_size"), -1000)
+            self.assertEqual(self._pragma(engine, "journal_mode"), "delete")
+        finally:
+            engine.dispose()
+
+    def test_empty_profile_leaves_sqlite_defaults(self):
+        engine = get_engine(self.TEST_DB, pragmas={})
+        try:
+            self.assertEqual(self._pragma(engine, "journal_mode"), "delete")
+            self.assertEqual(self._pragma(engine, "synchronous"), 2)  # FULL
+        finally:
+            engine.dispose()
+
+
+class TestEngineRegistry(unittest.TestCase):
+    TEST_DB = "test_engine_registry.db"
+
+    def setUp(self):
+        self._cleanup()
+
+    def tearDown(self):
+        dispose_engines()
+        self._cleanup()
+
+    def _cleanup(self):
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.isfile(self.TEST_DB + suffix):
+                os.remove(self.TEST_DB + suffix)
+
+    def _capture_statements(self, engine) -> list[str]:
+        statements: list[str] = []
+        event.listen(engine, "before_cursor_execute", lambda c, cur, stmt, *a: statements.append(stmt))
+        return statements
+
+    def test_engine_cached_per_path(self):
+        e1 = create_db_and_tables(self.TEST_DB)
+        e2 = create_db_and_tables(os.path.abspath(self.TEST_DB))
+        self.assertIs(e1, e2)
+        self.assertIs(get_engine(self.TEST_DB), e1)
+
+    def test_explicit_pragmas_bypass_registry(self):
+        engine = get_engine(self.TEST_DB, pragmas={})
+        try:
+            self.assertIsNot(engine, get_engine(self.TEST_DB))
+        finally:
+            engine.dispose()
+
+    def test_schema_version_stamped(self):
+        engine = create_db_and_tables(self.TEST_DB)
+        with engine.connect() as conn:
+            self.assertEqual(conn.exec_driver_sql("PRAGMA user_version").scalar(), SCHEMA_VERSION)
+
+    def test_warm_start_issues_no_ddl_or_reflection(self):
+        create_db_and_tables(self.TEST_DB)
+        dispose_engines()  # simulate a fresh CLI process against an existing ledger
+
+        statements = self._capture_statements(get_engine(self.TEST_DB))
+        create_db_and_tables(self.TEST_DB)
+        self.assertEqual(statements, ["PRAGMA user_version"])
+
+    def test_outdated_schema_is_upgraded(self):
+        engine = create_db_and_tables(self.TEST_DB)
+        with engine.connect() as conn:
+            conn.exec_driver_sql("DROP TABLE attachments")
+            conn.exec_driver_sql("PRAGMA user_version = 0")
+            conn.commit()
+
+        statements = self._capture_statements(engine)
+        create_db_and_tables(self.TEST_DB)
+        self.assertTrue(any(s.strip().startswith("CREATE TABLE attachments") for s in statements))
+        with engine.connect() as conn:
+            self.assertEqual(conn.exec_driver_sql("PRAGMA user_version").scalar(), SCHEMA_VERSION)
+
+    def test_upgrade_adds_new_indexes_to_existing_tables(self):
+        engine = create_db_and_tables(self.TEST_DB)
+        with engine.connect() as conn:
+            conn.exec_driver_sql("DROP INDEX ix_work_items_updated_at_task_id")
+            conn.exec_driver_sql("PRAGMA user_version = 1")
+            conn.commit()
+
+        create_db_and_tables(self.TEST_DB)
+        with engine.connect() as conn:
+            names = {row[1] for row in conn.exec_driver_sql("PRAGMA index_list(work_items)")}
+        self.assertIn("ix_work_items_updated_at_task_id", names)
+
+    def test_upgrade_adds_columns_and_backfills_rollups(self):
+        engine = create_db_and_tables(self.TEST_DB)
+        parent = create_work_item(engine, "Parent")
+        create_work_item(engine, "Child", parent_id=parent.task_id, state=WorkItemState.closed)
+        with engine.connect() as conn:
+            conn.exec_driver_sql("ALTER TABLE work_items DROP COLUMN children_total")
+            conn.exec_driver_sql("ALTER TABLE work_items DROP COLUMN children_done")
+            conn.exec_driver_sql("PRAGMA user_version = 5")
+            conn.commit()
+
+        create_db_and_tables(self.TEST_DB)
+        self.assertEqual(get_work_item(engine, parent.task_id).children_total, 1)
+        self.assertEqual(get_child_progress(engine, parent.task_id), (1, 1))
+
+
 if __name__ == "__main__":
     unittest.main()
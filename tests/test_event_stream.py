@@ -0,0 +1,369 @@
+"""Tests for live event streams — fan-out, filters, resume, slow listeners, cross-process pickup and endpoints."""
+
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from sqlalchemy import delete
+from sqlmodel import Session, select
+
+import core.database as db
+from core.database import (
+    add_repository,
+    create_assignment,
+    create_db_and_tables,
+    create_work_item,
+    transition_work_item,
+)
+from core.event_stream import EventBroadcaster, StreamFilter
+from core.hooks import hooks
+from core.outbox import OutboxWorker, outbox_head
+from models import ExecutorType, OutboxEvent, WorkItemState
+
+S = WorkItemState
+
+
+async def _collect(stream, count: int, timeout: float = 10.0) -> list[dict]:
+    """The first ``count`` events (keepalive ticks skipped) from ``stream``."""
+    received = []
+
+    async def run():
+        async for body in stream:
+            if body is not None:
+                received.append(body)
+                if len(received) == count:
+                    return
+
+    await asyncio.wait_for(run(), timeout)
+    return received
+
+
+class TestEventStream(unittest.TestCase):
+    TEST_DB = "test_event_stream.db"
+
+    def setUp(self):
+        self._cleanup()
+        patcher = patch.object(db, "EVENT_OUTBOX", True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.engine = create_db_and_tables(self.TEST_DB)
+        add_repository(self.engine, "alpha")
+        add_repository(self.engine, "beta")
+
+    def tearDown(self):
+        hooks.clear()
+        self.engine.dispose()
+        self._cleanup()
+
+    def _cleanup(self):
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.isfile(self.TEST_DB + suffix):
+                os.remove(self.TEST_DB + suffix)
+
+    def _broadcaster(self, **options) -> EventBroadcaster:
+        return EventBroadcaster(self.engine, **{"poll_interval_s": 0.05, "keepalive_s": 0.2, **options})
+
+    def _walk_later(self, task_id: int, *states: WorkItemState, delay: float = 0.2) -> threading.Thread:
+        def walk():
+            time.sleep(delay)
+            for state in states:
+                transition_work_item(self.engine, task_id, state)
+
+        thread = threading.Thread(target=walk)
+        thread.start()
+        self.addCleanup(thread.join)
+        return thread
+
+    def test_live_events_in_order(self):
+        item = create_work_item(self.engine, "Task", repo_name="alpha")
+        broadcaster = self._broadcaster()
+
+        async def main():
+            self._walk_later(item.task_id, S.assigned, S.executing, S.completed)
+            return await _collect(broadcaster.listen(), 4)
+
+        received = asyncio.run(main())
+        self.assertEqual([body["event"] for body in received], ["on_state_change"] * 3 + ["on_execution_complete"])
+        self.assertEqual(
+            [body["payload"]["new_state"] for body in received[:3]], ["assigned", "executing", "completed"]
+        )
+        ids = [body["event_id"] for body in received]
+        self.assertEqual(ids, list(range(ids[0], ids[0] + 4)))
+        self.assertEqual(broadcaster.listeners, 0)
+
+    def test_resume_from_cursor(self):
+        item = create_work_item(self.engine, "Task")
+        transition_work_item(self.engine, item.task_id, S.assigned)
+        cursor = outbox_head(self.engine)
+        transition_work_item(self.engine, item.task_id, S.executing)
+        transition_work_item(self.engine, item.task_id, S.completed)
+        received = asyncio.run(_collect(self._broadcaster().listen(cursor), 3))
+        self.assertEqual(received[0]["event_id"], cursor + 1)
+        self.assertEqual(received[0]["payload"]["new_state"], "executing")
+
+    def test_filters(self):
+        alpha = create_work_item(self.engine, "Alpha", repo_name="alpha")
+        beta = create_work_item(self.engine, "Beta", repo_name="beta")
+        create_assignment(self.engine, beta.task_id, "codex", ExecutorType.agent)
+
+        def changes():
+            time.sleep(0.2)
+            for task_id in (alpha.task_id, beta.task_id):
+                transition_work_item(self.engine, task_id, S.assigned)
+            create_assignment(self.engine, alpha.task_id, "codex", ExecutorType.agent)
+            transition_work_item(self.engine, alpha.task_id, S.executing)
+
+        async def main() -> dict[str, list[tuple]]:
+            broadcaster = self._broadcaster()
+            filters = {
+                "repo": (StreamFilter(repo="beta"), 1),
+                "events": (StreamFilter(events=frozenset({"on_assigned"})), 1),
+                "executor": (StreamFilter(executor="codex"), 3),
+            }
+            streams = {
+                name: _collect(broadcaster.listen(None, where), count) for name, (where, count) in filters.items()
+            }
+            collected = asyncio.gather(*streams.values())
+            await asyncio.to_thread(changes)
+            results = await collected
+            return {name: [(b["task_id"], b["event"]) for b in bodies] for name, bodies in zip(streams, results)}
+
+        received = asyncio.run(main())
+        self.assertEqual(received["repo"], [(beta.task_id, "on_state_change")])
+        self.assertEqual(received["events"], [(alpha.task_id, "on_assigned")])
+        # beta was codex's when the stream opened; alpha becomes codex's while it is open.
+        self.assertEqual(
+            received["executor"],
+            [(beta.task_id, "on_state_change"), (alpha.task_id, "on_assigned"), (alpha.task_id, "on_state_change")],
+        )
+
+    def test_slow_listener_replays_from_the_outbox(self):
+        item = create_work_item(self.engine, "Task")
+        broadcaster = self._broadcaster(queue_size=2)
+        states = [S.assigned, S.queued] * 6
+
+        async def main():
+            stream = broadcaster.listen()
+            first = await _collect(stream, 1)
+            # Stop reading while a burst overflows the two-event queue.
+            for state in states[1:]:
+                await asyncio.to_thread(transition_work_item, self.engine, item.task_id, state)
+            await asyncio.sleep(0.3)
+            return first + await _collect(stream, len(states) - 1)
+
+        self._walk_later(item.task_id, states[0])
+        received = asyncio.run(main())
+        self.assertEqual([body["payload"]["new_state"] for body in received], [s.value for s in states])
+        ids = [body["event_id"] for body in received]
+        self.assertEqual(ids, list(range(ids[0], ids[0] + len(states))))
+
+    def test_gap_after_pruning(self):
+        item = create_work_item(self.engine, "Task")
+        transition_work_item(self.engine, item.task_id, S.assigned)
+        transition_work_item(self.engine, item.task_id, S.executing)
+        with Session(self.engine) as session:
+            first = session.exec(select(OutboxEvent.event_id).order_by(OutboxEvent.event_id)).first()
+            session.execute(delete(OutboxEvent).where(OutboxEvent.event_id == first))
+            session.commit()
+        gap, event = asyncio.run(_collect(self._broadcaster().listen(0), 2))
+        self.assertEqual((gap["event"], gap["next_event_id"]), ("gap", first + 1))
+        self.assertEqual(event["event_id"], first + 1)
+
+        OutboxWorker(self.engine, retain_s=0)._prune()
+        (gap,) = asyncio.run(_collect(self._broadcaster().listen(0), 1))
+        self.assertEqual(gap["next_event_id"], outbox_head(self.engine) + 1)
+
+    def test_streams_prune_without_a_hooks_worker(self):
+        item = create_work_item(self.engine, "Task")
+        transition_work_item(self.engine, item.task_id, S.assigned)
+        old = outbox_head(self.engine)
+        broadcaster = self._broadcaster(retain_s=0)
+
+        async def main():
+            self._walk_later(item.task_id, S.executing)
+            return await _collect(broadcaster.listen(), 1)
+
+        (body,) = asyncio.run(main())
+        self.assertGreater(body["event_id"], old)
+        with Session(self.engine) as session:
+            remaining = session.exec(select(OutboxEvent.event_id)).all()
+        self.assertTrue(all(event_id > old for event_id in remaining))
+
+    def test_events_from_another_process(self):
+        item = create_work_item(self.engine, "Task")
+        script = (
+            "from core.database import create_db_and_tables, transition_work_item\n"
+            "from models import WorkItemState\n"
+            f"engine = create_db_and_tables({self.TEST_DB!r})\n"
+            f"transition_work_item(engine, {item.task_id}, WorkItemState.assigned)\n"
+        )
+        env = {**os.environ, "FORGEOPS_EVENT_OUTBOX": "1"}
+
+        async def main():
+            stream = self._broadcaster().listen()
+            collecting = asyncio.ensure_future(_collect(stream, 1))
+            await asyncio.sleep(0.2)
+            await asyncio.to_thread(subprocess.run, [sys.executable, "-c", script], env=env, check=True)
+            return await collecting
+
+        (body,) = asyncio.run(main())
+        self.assertEqual((body["task_id"], body["payload"]["new_state"]), (item.task_id, "assigned"))
+
+
+class TestOutboxSequence(unittest.TestCase):
+    TEST_DB = "test_event_stream_outbox.db"
+
+    def setUp(self):
+        self._cleanup()
+        patcher = patch.object(db, "EVENT_OUTBOX", True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.engine = create_db_and_tables(self.TEST_DB)
+
+    def tearDown(self):
+        self.engine.dispose()
+        self._cleanup()
+
+    def _cleanup(self):
+        if os.path.isfile(self.TEST_DB):
+            os.remove(self.TEST_DB)
+
+    def test_ids_continue_after_pruning_everything(self):
+        item = create_work_item(self.engine, "Task")
+        transition_work_item(self.engine, item.task_id, S.assigned)
+        head = outbox_head(self.engine)
+        OutboxWorker(self.engine, retain_s=0)._prune()
+        transition_work_item(self.engine, item.task_id, S.executing)
+        with Session(self.engine) as session:
+            self.assertEqual(session.exec(select(OutboxEvent.event_id)).all(), [head + 1])
+
+    def test_retention_keeps_recent_events(self):
+        item = create_work_item(self.engine, "Task")
+        transition_work_item(self.engine, item.task_id, S.assigned)
+        OutboxWorker(self.engine, retain_s=60)._prune()
+        with Session(self.engine) as session:
+            self.assertEqual(len(session.exec(select(OutboxEvent.event_id)).all()), 1)
+
+    def test_upgrade_adds_autoincrement(self):
+        item = create_work_item(self.engine, "Task")
+        transition_work_item(self.engine, item.task_id, S.assigned)
+        head = outbox_head(self.engine)
+        with self.engine.connect() as conn:
+            conn.exec_driver_sql("DROP TABLE event_outbox")
+            conn.exec_driver_sql(
+                "CREATE TABLE event_outbox (event_id INTEGER NOT NULL PRIMARY KEY, event VARCHAR NOT NULL, "
+                "task_id INTEGER, payload VARCHAR NOT NULL, created_at DATETIME NOT NULL)"
+            )
+            conn.exec_driver_sql("UPDATE outbox_subscribers SET last_event_id = 0")
+            conn.exec_driver_sql(
+                f"INSERT INTO outbox_subscribers (name, url, last_event_id, attempts, created_at) "
+                f"VALUES ('sink', 'http://127.0.0.1/', {head}, 0, '2026-01-01')"
+            )
+            conn.exec_driver_sql("PRAGMA user_version = 13")
+            conn.commit()
+        create_db_and_tables(self.TEST_DB)
+        self.assertEqual(outbox_head(self.engine), head)
+        transition_work_item(self.engine, item.task_id, S.executing)
+        self.assertEqual(outbox_head(self.engine), head + 1)
+
+
+class TestEventStreamApi(unittest.TestCase):
+    TEST_DB = "test_event_stream_api.db"
+
+    def setUp(self):
+        self._cleanup()
+        os.environ["FORGEOPS_DB_PATH"] = self.TEST_DB
+        os.environ.pop("API_BEARER_TOKEN", None)
+        import importlib
+
+        import config
+        import core.database
+
+        importlib.reload(config)
+        importlib.reload(core.database)
+        import api as api_mod
+
+        importlib.reload(api_mod)
+        from fastapi.testclient import TestClient
+
+        for module in (core.database, api_mod):
+            patcher = patch.object(module, "EVENT_OUTBOX", True)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.api = api_mod
+        self.database = core.database
+        self.client = TestClient(api_mod.app)
+        self.task_id = core.database.create_work_item(api_mod.engine, "Task").task_id
+
+    def tearDown(self):
+        hooks.clear()
+        self.api.engine.dispose()
+        os.environ.pop("FORGEOPS_DB_PATH", None)
+        self._cleanup()
+
+    def _cleanup(self):
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.isfile(self.TEST_DB + suffix):
+                os.remove(self.TEST_DB + suffix)
+
+    def test_websocket(self):
+        with self.client.websocket_connect("/events/ws?events=on_state_change") as ws:
+            opened = ws.receive_json()
+            self.assertEqual(opened["event"], "stream_open")
+            self.client.post(f"/work-items/{self.task_id}/assignments", json={"executor": "codex"})
+            self.client.post(f"/work-items/{self.task_id}/transition", json={"state": "assigned"})
+            body = ws.receive_json()
+        self.assertEqual((body["event"], body["payload"]["new_state"]), ("on_state_change", "assigned"))
+        self.assertEqual(body["event_id"], opened["cursor"] + 2)
+
+    def test_validation(self):
+        self.assertEqual(self.client.get("/events/stream", params={"events": "on_tuesday"}).status_code, 422)
+        with patch.object(self.api, "EVENT_OUTBOX", False):
+            self.assertEqual(self.client.get("/events/stream").status_code, 503)
+
+    def test_server_sent_events(self):
+        import httpx
+        import uvicorn
+
+        with socket.socket() as probe:
+            probe.bind(("127.0.0.1", 0))
+            port = probe.getsockname()[1]
+        server = uvicorn.Server(uvicorn.Config(self.api.app, host="127.0.0.1", port=port, log_level="error"))
+        thread = threading.Thread(target=server.run, daemon=True)
+        thread.start()
+        self.addCleanup(thread.join, 5)
+        self.addCleanup(setattr, server, "should_exit", True)
+        while not server.started:
+            time.sleep(0.01)
+
+        self.database.transition_work_item(self.api.engine, self.task_id, S.assigned)
+        messages = []
+        with httpx.stream("GET", f"http://127.0.0.1:{port}/events/stream", params={"since": 0}, timeout=10) as resp:
+            self.assertEqual(resp.headers["content-type"].split(";")[0], "text/event-stream")
+            message = {}
+            for line in resp.iter_lines():
+                if line:
+                    field, _, value = line.partition(": ")
+                    message[field] = value
+                elif message:
+                    messages.append(message)
+                    message = {}
+                    if len(messages) == 2:
+                        break
+        opening, event = messages
+        self.assertEqual(opening, {"id": "0"})
+        self.assertEqual(
+            (event["event"], json.loads(event["data"])["payload"]["new_state"]), ("on_state_change", "assigned")
+        )
+        self.assertEqual(event["id"], str(json.loads(event["data"])["event_id"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,235 @@
+"""Tests for the work item hierarchy — rollup counters, subtree queries and their interfaces."""
+
+import json
+import os
+import unittest
+from io import StringIO
+from unittest.mock import patch
+
+from sqlalchemy import event
+
+from core.database import (
+    MAX_TREE_DEPTH,
+    create_db_and_tables,
+    create_work_item,
+    create_work_items_bulk,
+    delete_work_item,
+    get_child_progress,
+    get_subtree,
+    get_subtree_progress,
+    get_work_item,
+    transition_work_item,
+    update_work_item,
+)
+from models import WorkItemState
+
+
+class TestRollupCounters(unittest.TestCase):
+    TEST_DB = "test_hierarchy.db"
+
+    def setUp(self):
+        self._cleanup()
+        self.engine = create_db_and_tables(self.TEST_DB)
+        self.parent = create_work_item(self.engine, "Epic").task_id
+
+    def tearDown(self):
+        self.engine.dispose()
+        self._cleanup()
+
+    def _cleanup(self):
+        if os.path.isfile(self.TEST_DB):
+            os.remove(self.TEST_DB)
+
+    def _counters(self, task_id: int) -> tuple[int, int]:
+        item = get_work_item(self.engine, task_id)
+        return item.children_done, item.children_total
+
+    def test_create_and_bulk_create(self):
+        create_work_item(self.engine, "Open", parent_id=self.parent)
+        create_work_item(self.engine, "Done", parent_id=self.parent, state=WorkItemState.closed)
+        create_work_items_bulk(
+            self.engine,
+            [
+                {"title": "Bulk open", "parent_id": self.parent},
+                {"title": "Bulk done", "parent_id": self.parent, "state": "closed"},
+                {"title": "Orphan"},
+            ],
+        )
+        self.assertEqual(self._counters(self.parent), (2, 4))
+
+    def test_state_changes_in_and_out_of_done(self):
+        child = create_work_item(self.engine, "Child", parent_id=self.parent, state=WorkItemState.awaiting_review)
+        transition_work_item(self.engine, child.task_id, WorkItemState.accepted)
+        self.assertEqual(get_child_progress(self.engine, self.parent), (1, 1))
+        transition_work_item(self.engine, child.task_id, WorkItemState.closed)
+        self.assertEqual(get_child_progress(self.engine, self.parent), (1, 1))
+        update_work_item(self.engine, child.task_id, state=WorkItemState.queued)
+        self.assertEqual(get_child_progress(self.engine, self.parent), (0, 1))
+
+    def test_reparent_moves_counts(self):
+        other = create_work_item(self.engine, "Other epic").task_id
+        child = create_work_item(self.engine, "Child", parent_id=self.parent, state=WorkItemState.closed).task_id
+        update_work_item(self.engine, child, parent_id=other)
+        self.assertEqual(self._counters(self.parent), (0, 0))
+        self.assertEqual(self._counters(other), (1, 1))
+        update_work_item(self.engine, child, parent_id=None)
+        self.assertEqual(self._counters(other), (0, 0))
+
+    def test_reparent_into_own_subtree_rejected(self):
+        child = create_work_item(self.engine, "Child", parent_id=self.parent).task_id
+        grandchild = create_work_item(self.engine, "Grandchild", parent_id=child).task_id
+        for new_parent in (self.parent, grandchild):
+            with self.assertRaises(ValueError):
+                update_work_item(self.engine, self.parent, parent_id=new_parent)
+        self.assertIsNone(get_work_item(self.engine, self.parent).parent_id)
+
+    def test_delete_decrements(self):
+        child = create_work_item(self.engine, "Child", parent_id=self.parent, state=WorkItemState.closed).task_id
+        create_work_item(self.engine, "Sibling", parent_id=self.parent)
+        delete_work_item(self.engine, child)
+        self.assertEqual(get_child_progress(self.engine, self.parent), (0, 1))
+
+    def test_missing_parent(self):
+        self.assertEqual(get_child_progress(self.engine, 9999), (0, 0))
+
+    def test_progress_is_one_query(self):
+        create_work_items_bulk(self.engine, [{"title": f"Leaf {n}", "parent_id": self.parent} for n in range(300)])
+        statements = []
+        listener = lambda conn, cursor, statement, *rest: statements.append(statement)  # noqa: E731
+        event.listen(self.engine, "before_cursor_execute", listener)
+        try:
+            self.assertEqual(get_child_progress(self.engine, self.parent), (0, 300))
+        finally:
+            event.remove(self.engine, "before_cursor_execute", listener)
+        self.assertEqual(len(statements), 1)
+
+
+class TestSubtree(unittest.TestCase):
+    TEST_DB = "test_subtree.db"
+
+    def setUp(self):
+        self._cleanup()
+        self.engine = create_db_and_tables(self.TEST_DB)
+
+        # epic ─┬─ story A ─┬─ task A1 ── subtask
+        #       │           └─ task A2 (closed)
+        #       └─ story B (accepted)
+        def create(title, parent=None, **fields):
+            return create_work_item(self.engine, title, parent_id=parent, **fields).task_id
+
+        self.epic = create("Epic")
+        self.story_a = create("Story A", self.epic)
+        self.story_b = create("Story B", self.epic, state=WorkItemState.accepted)
+        self.task_a1 = create("Task A1", self.story_a)
+        self.task_a2 = create("Task A2", self.story_a, state=WorkItemState.closed)
+        self.subtask = create("Subtask", self.task_a1)
+
+    def tearDown(self):
+        self.engine.dispose()
+        self._cleanup()
+
+    def _cleanup(self):
+        if os.path.isfile(self.TEST_DB):
+            os.remove(self.TEST_DB)
+
+    def test_depth_first_order(self):
+        nodes = get_subtree(self.engine, self.epic)
+        self.assertEqual(
+            [(n.item.task_id, n.depth) for n in nodes],
+            [(self.story_a, 1), (self.task_a1, 2), (self.subtask, 3), (self.task_a2, 2), (self.story_b, 1)],
+        )
+
+    def test_max_depth(self):
+        nodes = get_subtree(self.engine, self.epic, max_depth=2)
+        self.assertNotIn(self.subtask, [n.item.task_id for n in nodes])
+        self.assertEqual(len(nodes), 4)
+        for bad in (0, -1):
+            with self.assertRaises(ValueError):
+                get_subtree(self.engine, self.epic, max_depth=bad)
+
+    def test_leaf_has_empty_subtree(self):
+        self.assertEqual(get_subtree(self.engine, self.subtask), [])
+        self.assertEqual(get_subtree_progress(self.engine, self.subtask), (0, 0))
+
+    def test_subtree_progress(self):
+        self.assertEqual(get_subtree_progress(self.engine, self.epic), (2, 5))
+        self.assertEqual(get_child_progress(self.engine, self.epic), (1, 2))
+
+    def test_cycle_is_bounded(self):
+        with self.engine.begin() as conn:
+            conn.exec_driver_sql(f"UPDATE work_items SET parent_id = {self.subtask} WHERE task_id = {self.epic}")
+        nodes = get_subtree(self.engine, self.epic)
+        self.assertEqual(max(n.depth for n in nodes), MAX_TREE_DEPTH)
+
+
+class TestHierarchyInterfaces(unittest.TestCase):
+    TEST_DB = "test_hierarchy_interfaces.db"
+
+    def setUp(self):
+        self._cleanup()
+        os.environ["FORGEOPS_DB_PATH"] = self.TEST_DB
+        os.environ.pop("API_BEARER_TOKEN", None)
+        import importlib
+
+        import config
+        import core.database
+
+        importlib.reload(config)
+        importlib.reload(core.database)
+        import api as api_mod
+
+        importlib.reload(api_mod)
+        from fastapi.testclient import TestClient
+
+        self.api = api_mod
+        self.client = TestClient(api_mod.app)
+        engine = api_mod.engine
+        self.epic = core.database.create_work_item(engine, "Epic").task_id
+        self.story = core.database.create_work_item(engine, "Story", parent_id=self.epic).task_id
+        core.database.create_work_item(engine, "Task", parent_id=self.story, state=WorkItemState.closed)
+
+    def tearDown(self):
+        self.api.engine.dispose()
+        os.environ.pop("FORGEOPS_DB_PATH", None)
+        self._cleanup()
+
+    def _cleanup(self):
+        if os.path.isfile(self.TEST_DB):
+            os.remove(self.TEST_DB)
+
+    def _check_recursive(self, data: dict):
+        self.assertEqual([(c["title"], c["depth"]) for c in data["children"]], [("Story", 1), ("Task", 2)])
+        self.assertEqual(data["progress"], {"done": 0, "total": 1})
+        self.assertEqual(data["subtree_progress"], {"done": 1, "total": 2})
+        self.assertEqual((data["children"][0]["children_done"], data["children"][0]["children_total"]), (1, 1))
+
+    def test_api_children(self):
+        data = self.client.get(f"/work-items/{self.epic}/children").json()
+        self.assertEqual([c["title"] for c in data["children"]], ["Story"])
+        self.assertNotIn("subtree_progress", data)
+        self._check_recursive(self.client.get(f"/work-items/{self.epic}/children", params={"recursive": True}).json())
+        shallow = self.client.get(f"/work-items/{self.epic}/children", params={"recursive": True, "max_depth": 1})
+        self.assertEqual(len(shallow.json()["children"]), 1)
+
+    def test_mcp_children(self):
+        import mcp_server
+
+        mcp_server._engine = None
+        try:
+            self._check_recursive(json.loads(mcp_server.forgeops_children(self.epic, recursive=True)))
+        finally:
+            mcp_server._engine = None
+
+    def test_cli_tree(self):
+        from commands.tasks import list_tasks
+
+        with patch("commands.tasks.create_db_and_tables", return_value=self.api.engine):
+            with patch("sys.stdout", new_callable=StringIO) as out:
+                list_tasks(self.epic, tree=True)
+        output = out.getvalue()
+        self.assertIn("1/2 complete", output)
+        self.assertIn(f"  WI-{self.story + 1}", output)
+
+
+if __name__ == "__main__":
+    unittest.main()
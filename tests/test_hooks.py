@@ -15,7 +15,7 @@ from core.database import (
 from core.hooks import HookEvent, HookRegistry, hooks
 from core.state_engine import RepoConcurrencyError
 from core.database import add_repository
-from models import ExecutorType, ReviewDecision, WorkItemState
+from models import ExecutorType, Priority, ReviewDecision, WorkItemState
 
 
 class TestHookRegistry(unittest.TestCase):
@@ -52,6 +52,21 @@ class TestHookRegistry(unittest.TestCase):
         self.registry.fire(HookEvent.on_state_change, {"task_id": 1})
         self.assertEqual(len(received), 0)
 
+    def test_fire_many_in_order_then_batch(self):
+        calls = []
+        self.registry.subscribe(HookEvent.on_state_change, lambda p: calls.append(("single", p["task_id"])))
+        self.registry.subscribe_batch(lambda events: calls.append(("batch", [p["task_id"] for _, p in events])))
+        self.registry.fire_many(
+            [(HookEvent.on_state_change, {"task_id": 1}), (HookEvent.on_state_change, {"task_id": 2})]
+        )
+        self.assertEqual(calls, [("single", 1), ("single", 2), ("batch", [1, 2])])
+
+    def test_fire_many_empty_skips_batch_handlers(self):
+        batches = []
+        self.registry.subscribe_batch(batches.append)
+        self.registry.fire_many([])
+        self.assertEqual(batches, [])
+
     def test_unsubscribe_nonexistent(self):
         # Should not raise
         self.registry.unsubscribe(HookEvent.on_state_change, lambda p: None)
@@ -91,6 +106,56 @@ class TestHookRegistry(unittest.TestCase):
         # Should not raise
         self.registry.fire(HookEvent.on_rework, {"task_id": 1})
 
+    def test_predicates_select_handlers_in_subscription_order(self):
+        calls = []
+        self.registry.subscribe(HookEvent.on_state_change, lambda p: calls.append("any"))
+        self.registry.subscribe(HookEvent.on_state_change, lambda p: calls.append("alpha"), repo="alpha")
+        self.registry.subscribe(
+            HookEvent.on_state_change, lambda p: calls.append("alpha-review"), repo="alpha", new_state="awaiting_review"
+        )
+        self.registry.subscribe(
+            HookEvent.on_state_change, lambda p: calls.append("review"), new_state="awaiting_review"
+        )
+        self.registry.fire(HookEvent.on_state_change, {"repo": "alpha", "new_state": "awaiting_review"})
+        self.assertEqual(calls, ["any", "alpha", "alpha-review", "review"])
+        calls.clear()
+        self.registry.fire(HookEvent.on_state_change, {"repo": "beta", "new_state": "awaiting_review"})
+        self.assertEqual(calls, ["any", "review"])
+        calls.clear()
+        self.registry.fire(HookEvent.on_state_change, {"repo": "alpha", "new_state": "closed"})
+        self.assertEqual(calls, ["any", "alpha"])
+
+    def test_non_matching_handlers_are_never_called(self):
+        called = []
+        for n in range(100):
+            self.registry.subscribe(HookEvent.on_state_change, lambda p, n=n: called.append(n), repo=f"repo-{n}")
+        self.registry.fire(HookEvent.on_state_change, {"repo": "repo-42"})
+        self.assertEqual(called, [42])
+
+    def test_predicates_accept_enums_and_unsubscribe(self):
+        calls = []
+
+        def handler(p):
+            calls.append(p["executor"])
+
+        self.registry.subscribe(HookEvent.on_assigned, handler, executor_type=ExecutorType.agent)
+        self.registry.fire(HookEvent.on_assigned, {"executor": "bot", "executor_type": "agent"})
+        self.registry.fire(HookEvent.on_assigned, {"executor": "alice", "executor_type": "human"})
+        self.registry.unsubscribe(HookEvent.on_assigned, handler)
+        self.registry.fire(HookEvent.on_assigned, {"executor": "bot", "executor_type": "agent"})
+        self.assertEqual(calls, ["bot"])
+
+    def test_decorator_with_predicates(self):
+        calls = []
+
+        @self.registry.on(HookEvent.on_state_change, new_state=WorkItemState.closed)
+        def handler(payload):
+            calls.append(payload["task_id"])
+
+        self.registry.fire(HookEvent.on_state_change, {"task_id": 1, "new_state": "assigned"})
+        self.registry.fire(HookEvent.on_state_change, {"task_id": 2, "new_state": "closed"})
+        self.assertEqual(calls, [2])
+
 
 class TestHooksIntegration(unittest.TestCase):
     """Integration tests — hooks fire from database operations."""
@@ -181,6 +246,33 @@ class TestHooksIntegration(unittest.TestCase):
         with self.assertRaises(RepoConcurrencyError):
             transition_work_item(self.engine, item2.task_id, WorkItemState.executing)
         self.assertEqual(len(self.received), 1)
+        self.assertEqual(self.received[0]["repo"], "conflict-repo")
+
+    def test_payloads_carry_item_context(self):
+        add_repository(self.engine, "ctx-repo")
+        parent = create_work_item(self.engine, "Epic")
+        item = create_work_item(
+            self.engine, "Context", repo_name="ctx-repo", priority=Priority.high, parent_id=parent.task_id
+        )
+        for event in (HookEvent.on_state_change, HookEvent.on_assigned, HookEvent.on_blocked):
+            hooks.subscribe(event, self.received.append)
+        transition_work_item(self.engine, item.task_id, WorkItemState.assigned)
+        create_assignment(self.engine, item.task_id, "bot", ExecutorType.agent)
+        block_work_item(self.engine, item.task_id, "waiting")
+        for payload in self.received:
+            self.assertEqual(
+                (payload["repo"], payload["priority"], payload["title"], payload["parent_id"]),
+                ("ctx-repo", "high", "Context", parent.task_id),
+            )
+
+    def test_scoped_subscription_from_database_operations(self):
+        add_repository(self.engine, "alpha")
+        add_repository(self.engine, "beta")
+        hooks.subscribe(HookEvent.on_state_change, self.received.append, repo="alpha", new_state="assigned")
+        for name in ("alpha", "beta"):
+            item = create_work_item(self.engine, name, repo_name=name)
+            transition_work_item(self.engine, item.task_id, WorkItemState.assigned)
+        self.assertEqual([p["title"] for p in self.received], ["alpha"])
 
 
 if __name__ == "__main__":
@@ -0,0 +1,197 @@
+"""Tests for asynchronous hook dispatch — worker queues, overflow policies, timeouts and flush()."""
+
+import os
+import shutil
+import threading
+import time
+import unittest
+
+from core.database import create_db_and_tables, create_work_item, transition_work_item
+from core.hooks import HookEvent, HookRegistry, hooks
+from models import WorkItemState
+
+SPILL_DIR = "test_hook_spill"
+
+
+class TestAsyncDispatch(unittest.TestCase):
+    def setUp(self):
+        self.registry = HookRegistry()
+
+    def tearDown(self):
+        self.registry.shutdown(timeout=5)
+        shutil.rmtree(SPILL_DIR, ignore_errors=True)
+
+    def _configure(self, **options):
+        self.registry.configure("async", **{"spill_dir": SPILL_DIR, "handler_timeout": None, **options})
+
+    def _gated(self, received: list) -> threading.Event:
+        """Subscribe a handler that holds its worker until the returned event is set."""
+        gate = threading.Event()
+
+        def handler(payload):
+            gate.wait(5)
+            received.append(payload["seq"])
+
+        self.registry.subscribe(HookEvent.on_state_change, handler)
+        return gate
+
+    def test_handlers_run_off_the_firing_thread(self):
+        threads = []
+        self.registry.subscribe(HookEvent.on_state_change, lambda p: (time.sleep(0.2), threads.append(p)))
+        self._configure(workers=2)
+        started = time.perf_counter()
+        self.registry.fire(HookEvent.on_state_change, {"task_id": 1})
+        self.assertLess(time.perf_counter() - started, 0.1)
+        self.assertEqual(threads, [])
+        self.assertTrue(self.registry.flush(timeout=5))
+        self.assertEqual(threads, [{"task_id": 1}])
+
+    def test_ordered_per_task(self):
+        received = []
+        self.registry.subscribe(HookEvent.on_state_change, lambda p: received.append((p["task_id"], p["seq"])))
+        self._configure(workers=4)
+        for seq in range(200):
+            self.registry.fire(HookEvent.on_state_change, {"task_id": seq % 7, "seq": seq})
+        self.registry.flush(timeout=5)
+        self.assertEqual(len(received), 200)
+        for task_id in range(7):
+            seqs = [seq for t, seq in received if t == task_id]
+            self.assertEqual(seqs, sorted(seqs))
+
+    def test_block_policy_delivers_everything(self):
+        received = []
+        gate = self._gated(received)
+        self._configure(workers=1, queue_size=2, overflow="block")
+        releaser = threading.Timer(0.1, gate.set)
+        releaser.start()
+        for seq in range(10):
+            self.registry.fire(HookEvent.on_state_change, {"task_id": 1, "seq": seq})
+        self.registry.flush(timeout=5)
+        self.assertEqual(received, list(range(10)))
+
+    def test_drop_policy(self):
+        received = []
+        gate = self._gated(received)
+        self._configure(workers=1, queue_size=2, overflow="drop")
+        for seq in range(10):
+            self.registry.fire(HookEvent.on_state_change, {"task_id": 1, "seq": seq})
+        gate.set()
+        self.registry.flush(timeout=5)
+        self.assertGreater(self.registry.dropped, 0)
+        self.assertEqual(len(received) + self.registry.dropped, 10)
+        self.assertEqual(received, sorted(received))
+
+    def test_spill_policy_preserves_order(self):
+        received = []
+        gate = self._gated(received)
+        self._configure(workers=1, queue_size=2, overflow="spill")
+        for seq in range(50):
+            self.registry.fire(HookEvent.on_state_change, {"task_id": 1, "seq": seq})
+        self.assertGreater(self.registry.spilled, 0)
+        gate.set()
+        self.assertTrue(self.registry.flush(timeout=5))
+        self.assertEqual(received, list(range(50)))
+        self.assertEqual(os.listdir(SPILL_DIR), [])
+
+    def test_handler_timeout(self):
+        received = []
+        release = threading.Event()
+        self.registry.subscribe(HookEvent.on_blocked, lambda p: release.wait(5), timeout=0.05)
+        self.registry.subscribe(HookEvent.on_blocked, lambda p: received.append(p))
+        self._configure(workers=1)
+        started = time.perf_counter()
+        self.registry.fire(HookEvent.on_blocked, {"task_id": 1})
+        with self.assertLogs("core.hooks", level="WARNING") as logs:
+            self.registry.flush(timeout=5)
+        release.set()
+        self.assertLess(time.perf_counter() - started, 1)
+        self.assertEqual(received, [{"task_id": 1}])
+        self.assertIn("timed out", logs.output[0])
+
+    def test_timeouts_are_per_subscription(self):
+        release = threading.Event()
+
+        def slow(payload):
+            release.wait(0.3)
+
+        self.registry.subscribe(HookEvent.on_blocked, slow, timeout=0.01)
+        self.registry.subscribe(HookEvent.on_unblocked, slow, timeout=5)
+        with self.assertLogs("core.hooks", level="WARNING") as logs:
+            self.registry.fire(HookEvent.on_blocked, {"task_id": 1})
+            self.registry.fire(HookEvent.on_unblocked, {"task_id": 1})
+        release.set()
+        self.assertEqual(len(logs.output), 1)
+        self.assertIn("on_blocked timed out", logs.output[0])
+
+        self.registry.unsubscribe(HookEvent.on_blocked, slow)
+        self.registry.unsubscribe(HookEvent.on_unblocked, slow)
+        self.assertEqual(self.registry._timeouts, {})
+
+    def test_batch_handlers_and_failures(self):
+        calls = []
+
+        def bad_handler(payload):
+            raise RuntimeError("boom")
+
+        self.registry.subscribe(HookEvent.on_state_change, bad_handler)
+        self.registry.subscribe(HookEvent.on_state_change, lambda p: calls.append(("single", p["task_id"])))
+        self.registry.subscribe_batch(lambda events: calls.append(("batch", [p["task_id"] for _, p in events])))
+        self._configure(workers=1)
+        with self.assertLogs("core.hooks", level="ERROR"):
+            self.registry.fire_many(
+                [(HookEvent.on_state_change, {"task_id": 1}), (HookEvent.on_state_change, {"task_id": 2})]
+            )
+            self.registry.flush(timeout=5)
+        self.assertEqual(calls, [("single", 1), ("single", 2), ("batch", [1, 2])])
+
+    def test_shutdown_returns_to_sync(self):
+        received = []
+        self.registry.subscribe(HookEvent.on_state_change, lambda p: (time.sleep(0.05), received.append(p)))
+        self._configure(workers=2)
+        self.registry.fire(HookEvent.on_state_change, {"task_id": 1})
+        self.registry.shutdown()
+        self.assertEqual(self.registry.mode, "sync")
+        self.assertEqual(len(received), 1)
+        self.registry.fire(HookEvent.on_state_change, {"task_id": 2})
+        self.assertEqual(len(received), 2)
+
+    def test_invalid_configuration(self):
+        for options in ({"mode": "eager"}, {"overflow": "explode"}, {"workers": 0}):
+            with self.subTest(options=options):
+                with self.assertRaises(ValueError):
+                    self.registry.configure(**{"mode": "async", **options})
+        self.assertEqual(self.registry.mode, "sync")
+
+
+class TestAsyncHooksIntegration(unittest.TestCase):
+    TEST_DB = "test_hooks_async.db"
+
+    def setUp(self):
+        self._cleanup()
+        self.engine = create_db_and_tables(self.TEST_DB)
+        hooks.configure("async", workers=2, handler_timeout=None)
+
+    def tearDown(self):
+        hooks.configure("sync")
+        hooks.clear()
+        self.engine.dispose()
+        self._cleanup()
+
+    def _cleanup(self):
+        if os.path.isfile(self.TEST_DB):
+            os.remove(self.TEST_DB)
+
+    def test_slow_subscriber_does_not_delay_transition(self):
+        received = []
+        hooks.subscribe(HookEvent.on_state_change, lambda p: (time.sleep(0.3), received.append(p["new_state"])))
+        item = create_work_item(self.engine, "Async hook")
+        started = time.perf_counter()
+        transition_work_item(self.engine, item.task_id, WorkItemState.assigned)
+        transition_work_item(self.engine, item.task_id, WorkItemState.executing)
+        self.assertLess(time.perf_counter() - started, 0.3)
+        hooks.flush(timeout=5)
+        self.assertEqual(received, ["assigned", "executing"])
+
+
+if __name__ == "__main__":
+    unittest.main()
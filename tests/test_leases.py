@@ -0,0 +1,231 @@
+"""Tests for execution leases — lease lifecycle, heartbeats, the expiry sweeper and their interfaces."""
+
+import json
+import os
+import unittest
+from datetime import UTC, datetime, timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from sqlmodel import Session, select
+
+from core.database import (
+    add_repository,
+    claim_next_work_item,
+    create_db_and_tables,
+    create_work_item,
+    delete_work_item,
+    fast_track_work_item,
+    get_activity_log,
+    get_work_item,
+    transition_work_item,
+    update_repository,
+    update_work_item,
+)
+from core.hooks import HookEvent, hooks
+from core.leases import SWEEPER_ACTOR, LeaseSweeper, get_leases, heartbeat, sweep_expired_leases
+from models import ActivityAction, ExecutionLease, WorkItemState
+
+S = WorkItemState
+LATER = datetime.now(UTC) + timedelta(hours=1)
+
+
+class TestLeases(unittest.TestCase):
+    TEST_DB = "test_leases.db"
+
+    def setUp(self):
+        self._cleanup()
+        self.engine = create_db_and_tables(self.TEST_DB)
+        add_repository(self.engine, "alpha")
+
+    def tearDown(self):
+        hooks.clear()
+        self.engine.dispose()
+        self._cleanup()
+
+    def _cleanup(self):
+        if os.path.isfile(self.TEST_DB):
+            os.remove(self.TEST_DB)
+
+    def _leased(self) -> set[int]:
+        return {lease.task_id for lease in get_leases(self.engine)}
+
+    def _executing(self, repo_name: str = "alpha") -> int:
+        item = create_work_item(self.engine, "Task", repo_name=repo_name)
+        fast_track_work_item(self.engine, item.task_id, S.executing)
+        return item.task_id
+
+    def test_lease_follows_executing(self):
+        task_id = self._executing()
+        self.assertEqual(self._leased(), {task_id})
+        transition_work_item(self.engine, task_id, S.completed)
+        self.assertEqual(self._leased(), set())
+
+        other = self._executing()
+        update_work_item(self.engine, other, state="completed")
+        self.assertEqual(self._leased(), set())
+        update_work_item(self.engine, other, state="executing")
+        self.assertEqual(self._leased(), {other})
+        delete_work_item(self.engine, other)
+        self.assertEqual(self._leased(), set())
+
+    def test_claim_records_executor(self):
+        item = create_work_item(self.engine, "Task")
+        claim_next_work_item(self.engine, "codex")
+        (lease,) = get_leases(self.engine)
+        self.assertEqual((lease.task_id, lease.executor), (item.task_id, "codex"))
+        self.assertGreater(lease.expires_at, lease.started_at)
+
+    def test_heartbeat_extends_lease(self):
+        item = create_work_item(self.engine, "Task")
+        claim_next_work_item(self.engine, "codex")
+        (before,) = get_leases(self.engine)
+        expires_at = heartbeat(self.engine, item.task_id, executor="codex", ttl_s=3600)
+        self.assertGreater(expires_at, before.expires_at)
+        (after,) = get_leases(self.engine)
+        self.assertIsNotNone(after.heartbeat_at)
+        self.assertIsNone(heartbeat(self.engine, item.task_id, executor="someone-else"))
+        self.assertIsNotNone(heartbeat(self.engine, item.task_id))
+
+    def test_heartbeat_without_lease(self):
+        item = create_work_item(self.engine, "Task")
+        self.assertIsNone(heartbeat(self.engine, item.task_id))
+        self.assertIsNone(heartbeat(self.engine, 999))
+
+    def test_heartbeat_does_not_touch_the_item(self):
+        task_id = self._executing()
+        updated_at = get_work_item(self.engine, task_id).updated_at
+        entries = len(get_activity_log(self.engine, task_id=task_id))
+        heartbeat(self.engine, task_id)
+        self.assertEqual(get_work_item(self.engine, task_id).updated_at, updated_at)
+        self.assertEqual(len(get_activity_log(self.engine, task_id=task_id)), entries)
+
+    def test_sweep_returns_item_to_queue(self):
+        events = []
+        hooks.subscribe(HookEvent.on_lease_expired, lambda p: events.append(("expired", p["executor"])))
+        hooks.subscribe(HookEvent.on_state_change, lambda p: events.append(("state", p["new_state"])))
+        item = create_work_item(self.engine, "Task", repo_name="alpha")
+        claim_next_work_item(self.engine, "codex")
+        events.clear()
+
+        self.assertEqual(sweep_expired_leases(self.engine), [])
+        self.assertEqual(sweep_expired_leases(self.engine, now=LATER), [item.task_id])
+        self.assertEqual(get_work_item(self.engine, item.task_id).state, S.queued)
+        self.assertEqual(self._leased(), set())
+        self.assertEqual(events, [("expired", "codex"), ("state", "assigned"), ("state", "queued")])
+        latest = get_activity_log(self.engine, task_id=item.task_id)[:3]
+        self.assertEqual({entry.actor for entry in latest}, {SWEEPER_ACTOR})
+        self.assertIn(ActivityAction.lease_expired, [entry.action for entry in latest])
+        # The repository is free again, so the item can be claimed anew.
+        self.assertEqual(claim_next_work_item(self.engine, "claude").task_id, item.task_id)
+
+    def test_sweep_to_assigned(self):
+        task_id = self._executing()
+        self.assertEqual(sweep_expired_leases(self.engine, state="assigned", now=LATER), [task_id])
+        self.assertEqual(get_work_item(self.engine, task_id).state, S.assigned)
+        with self.assertRaises(ValueError):
+            sweep_expired_leases(self.engine, state="closed")
+
+    def test_sweep_falls_back_to_assigned(self):
+        workflow = {"queued": ["assigned"], "assigned": ["executing"], "executing": ["assigned"]}
+        update_repository(self.engine, "alpha", workflow=workflow)
+        task_id = self._executing()
+        sweep_expired_leases(self.engine, now=LATER)
+        self.assertEqual(get_work_item(self.engine, task_id).state, S.assigned)
+
+    def test_live_leases_survive(self):
+        stale, live = self._executing(), self._executing(repo_name=None)
+        heartbeat(self.engine, live, ttl_s=7200)
+        self.assertEqual(sweep_expired_leases(self.engine, now=LATER), [stale])
+        self.assertEqual(self._leased(), {live})
+        self.assertEqual(get_work_item(self.engine, live).state, S.executing)
+
+    def test_sweeper_run_once(self):
+        task_id = self._executing()
+        heartbeat(self.engine, task_id, ttl_s=-1)
+        self.assertEqual([lease.task_id for lease in get_leases(self.engine, expired=True)], [task_id])
+        self.assertEqual(LeaseSweeper(self.engine).run_once(), [task_id])
+
+    def test_upgrade_adds_leases_for_executing_items(self):
+        task_id = self._executing()
+        with self.engine.connect() as conn:
+            conn.exec_driver_sql("DROP TABLE execution_leases")
+            conn.exec_driver_sql("PRAGMA user_version = 10")
+            conn.commit()
+        create_db_and_tables(self.TEST_DB)
+        with Session(self.engine) as session:
+            self.assertEqual(session.exec(select(ExecutionLease.task_id)).all(), [task_id])
+
+    def test_cli(self):
+        from commands.leases import lease_sweeper, leases
+
+        task_id = self._executing()
+        heartbeat(self.engine, task_id, ttl_s=-1)
+        with patch("commands.leases.create_db_and_tables", return_value=self.engine):
+            with patch("sys.stdout", new_callable=StringIO) as out:
+                leases(expired=True)
+                lease_sweeper(once=True, interval_s=1, state="queued")
+                lease_sweeper(once=True, interval_s=1, state="closed")
+        self.assertIn("expired", out.getvalue())
+        self.assertIn(f"WI-{task_id}", out.getvalue())
+        self.assertIn("queued or assigned", out.getvalue())
+
+
+class TestLeaseInterfaces(unittest.TestCase):
+    TEST_DB = "test_leases_interfaces.db"
+
+    def setUp(self):
+        self._cleanup()
+        os.environ["FORGEOPS_DB_PATH"] = self.TEST_DB
+        os.environ.pop("API_BEARER_TOKEN", None)
+        import importlib
+
+        import config
+        import core.database
+
+        importlib.reload(config)
+        importlib.reload(core.database)
+        import api as api_mod
+
+        importlib.reload(api_mod)
+        from fastapi.testclient import TestClient
+
+        self.api = api_mod
+        self.client = TestClient(api_mod.app)
+        self.task_id = core.database.create_work_item(api_mod.engine, "Task").task_id
+        core.database.claim_next_work_item(api_mod.engine, "codex")
+
+    def tearDown(self):
+        self.api.engine.dispose()
+        os.environ.pop("FORGEOPS_DB_PATH", None)
+        self._cleanup()
+
+    def _cleanup(self):
+        if os.path.isfile(self.TEST_DB):
+            os.remove(self.TEST_DB)
+
+    def test_api_heartbeat(self):
+        resp = self.client.post(f"/work-items/{self.task_id}/heartbeat", json={"executor": "codex", "ttl_s": 60})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json()["task_id"], self.task_id)
+        self.assertEqual(self.client.post(f"/work-items/{self.task_id}/heartbeat").status_code, 200)
+        resp = self.client.post(f"/work-items/{self.task_id}/heartbeat", json={"executor": "other"})
+        self.assertEqual(resp.status_code, 409)
+        leases = self.client.get("/leases").json()
+        self.assertEqual([(lease["task_id"], lease["executor"]) for lease in leases], [(self.task_id, "codex")])
+        self.assertEqual(self.client.get("/leases", params={"expired": True}).json(), [])
+
+    def test_mcp_heartbeat(self):
+        import mcp_server
+
+        mcp_server._engine = None
+        data = json.loads(mcp_server.forgeops_heartbeat(self.task_id, executor="codex"))
+        self.assertTrue(data["success"])
+        self.assertIn("expires_at", data)
+        data = json.loads(mcp_server.forgeops_heartbeat(self.task_id, executor="other"))
+        self.assertEqual(data["error"]["code"], "NO_LEASE")
+        mcp_server._engine = None
+
+
+if __name__ == "__main__":
+    unittest.main()
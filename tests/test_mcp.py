@@ -157,6 +157,16 @@ class TestMCPTools(unittest.TestCase):
         self.assertTrue(r["success"])
         self.assertEqual(len(r["reviews"]), 1)
 
+    def test_review_queue(self):
+        task_id = _parse(forgeops_create_work_item("Ready"))["item"]["task_id"]
+        forgeops_log_run(task_id, "agent-1", "success")
+        mcp_server.forgeops_fast_track(task_id, "awaiting_review")
+
+        r = _parse(mcp_server.forgeops_review_queue())
+        self.assertTrue(r["success"])
+        self.assertEqual(r["count"], 1)
+        self.assertEqual(r["items"][0]["last_run"]["status"], "success")
+
     def test_attach(self):
         r = _parse(forgeops_create_work_item("Attached"))
         task_id = r["item"]["task_id"]
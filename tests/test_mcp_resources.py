@@ -0,0 +1,157 @@
+"""Tests for MCP resources and resources/updated notifications to subscribed clients."""
+
+import asyncio
+import importlib
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+from mcp import types
+from mcp.shared.memory import create_connected_server_and_client_session
+from pydantic import AnyUrl
+
+import mcp_server
+from models import ExecutionStatus, ExecutorType, WorkItemState
+
+S = WorkItemState
+
+
+class TestMCPResources(unittest.TestCase):
+    TEST_DB = "test_mcp_resources.db"
+
+    def setUp(self):
+        self._cleanup()
+        os.environ["FORGEOPS_DB_PATH"] = self.TEST_DB
+        import config
+        import core.database
+
+        importlib.reload(config)
+        importlib.reload(core.database)
+        self.db = core.database
+        mcp_server._engine = None
+        mcp_server._watcher = mcp_server._ResourceWatcher(poll_interval_s=0.05)
+        self.engine = mcp_server._get_engine()
+        self.item = self.db.create_work_item(self.engine, "Watched").task_id
+        self.other = self.db.create_work_item(self.engine, "Other").task_id
+
+    def tearDown(self):
+        mcp_server._watcher = mcp_server._ResourceWatcher()
+        if mcp_server._engine:
+            mcp_server._engine.dispose()
+        mcp_server._engine = None
+        os.environ.pop("FORGEOPS_DB_PATH", None)
+        self._cleanup()
+
+    def _cleanup(self):
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.isfile(self.TEST_DB + suffix):
+                os.remove(self.TEST_DB + suffix)
+
+    def _run(self, uris: list[str], *changes, settle: float = 0.3) -> list[str]:
+        """Subscribe to ``uris``, apply each change in a thread, and return the URIs notified in order."""
+        updated = []
+
+        async def on_message(message):
+            if isinstance(message, types.ServerNotification) and isinstance(
+                message.root, types.ResourceUpdatedNotification
+            ):
+                updated.append(str(message.root.params.uri))
+
+        async def main():
+            async with create_connected_server_and_client_session(mcp_server.server, message_handler=on_message) as c:
+                for uri in uris:
+                    await c.subscribe_resource(AnyUrl(uri))
+                for change in changes:
+                    await asyncio.to_thread(change)
+                    await asyncio.sleep(settle)
+                for uri in uris:
+                    await c.unsubscribe_resource(AnyUrl(uri))
+
+        asyncio.run(main())
+        return updated
+
+    def test_read_resources(self):
+        async def main():
+            async with create_connected_server_and_client_session(mcp_server.server) as client:
+                capabilities = client.get_server_capabilities()
+                self.assertTrue(capabilities.resources.subscribe)
+                templates = (await client.list_resource_templates()).resourceTemplates
+                self.assertEqual(
+                    {t.uriTemplate for t in templates},
+                    {"forgeops://work-item/{task_id}", "forgeops://executor/{name}/items"},
+                )
+                item = await client.read_resource(AnyUrl(f"forgeops://work-item/{self.item}"))
+                queue = await client.read_resource(AnyUrl(mcp_server.REVIEW_QUEUE_URI))
+                return json.loads(item.contents[0].text), json.loads(queue.contents[0].text)
+
+        item, queue = asyncio.run(main())
+        self.assertEqual(item["item"]["title"], "Watched")
+        self.assertEqual(queue["items"], [])
+
+    def test_work_item_updates_only_its_subscribers(self):
+        updated = self._run(
+            [f"forgeops://work-item/{self.item}"],
+            lambda: self.db.update_work_item(self.engine, self.other, title="Elsewhere"),
+            lambda: self.db.update_work_item(self.engine, self.item, title="Renamed"),
+        )
+        self.assertEqual(updated, [f"forgeops://work-item/{self.item}"])
+
+    def test_executor_inbox(self):
+        inbox = "forgeops://executor/codex/items"
+
+        def leave_inbox():
+            self.db.create_assignment(self.engine, self.item, "claude", ExecutorType.agent)
+
+        updated = self._run(
+            [inbox],
+            lambda: self.db.create_assignment(self.engine, self.other, "claude", ExecutorType.agent),
+            lambda: self.db.create_assignment(self.engine, self.item, "codex", ExecutorType.agent),
+            lambda: self.db.transition_work_item(self.engine, self.item, S.assigned),
+            leave_inbox,
+            lambda: self.db.update_work_item(self.engine, self.item, title="Not codex's any more"),
+        )
+        # Assigned, changed while held, reassigned away; nothing after it left.
+        self.assertEqual(updated, [inbox] * 3)
+
+    def test_review_queue(self):
+        def submit():
+            self.db.transition_work_item(self.engine, self.item, S.assigned)
+            self.db.transition_work_item(self.engine, self.item, S.executing)
+            self.db.create_execution_record(self.engine, self.item, "codex", ExecutionStatus.success)
+            self.db.transition_work_item(self.engine, self.item, S.completed)
+            self.db.transition_work_item(self.engine, self.item, S.awaiting_review)
+
+        updated = self._run(
+            [mcp_server.REVIEW_QUEUE_URI],
+            submit,
+            lambda: self.db.transition_work_item(self.engine, self.other, S.assigned),
+            lambda: self.db.transition_work_item(self.engine, self.item, S.accepted),
+        )
+        self.assertEqual(updated, [mcp_server.REVIEW_QUEUE_URI] * 2)
+
+    def test_changes_from_another_process(self):
+        script = (
+            "from core.database import get_engine, update_work_item\n"
+            f"update_work_item(get_engine({self.TEST_DB!r}), {self.item}, title='From the CLI')\n"
+        )
+        env = {**os.environ, "PYTHONPATH": os.getcwd()}
+        updated = self._run(
+            [f"forgeops://work-item/{self.item}"],
+            lambda: subprocess.run([sys.executable, "-c", script], env=env, check=True),
+        )
+        self.assertEqual(updated, [f"forgeops://work-item/{self.item}"])
+
+    def test_unknown_resource(self):
+        async def main():
+            async with create_connected_server_and_client_session(mcp_server.server) as client:
+                await client.subscribe_resource(AnyUrl("forgeops://nothing"))
+
+        with self.assertRaises(Exception):
+            asyncio.run(main())
+        self.assertEqual(mcp_server._watcher.subscriptions, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,239 @@
+"""Tests for the durable event outbox — transactional writes, webhook delivery, retries and dead letters."""
+
+import json
+import os
+import threading
+import unittest
+from datetime import UTC, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+from unittest.mock import patch
+
+from sqlalchemy import event
+from sqlmodel import Session, func, select, update
+
+import core.database as db
+from core.database import create_db_and_tables, create_work_item, transition_work_item, unit_of_work
+from core.outbox import (
+    OutboxWorker,
+    add_subscriber,
+    get_dead_letters,
+    get_outbox_status,
+    remove_subscriber,
+)
+from models import OutboxEvent, OutboxSubscriber, WorkItemState
+
+
+class _Receiver(BaseHTTPRequestHandler):
+    """Records each POSTed event; answers with the next status in ``server.statuses`` (200 once exhausted)."""
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        status = self.server.statuses.pop(0) if self.server.statuses else 200
+        if status == 200:
+            self.server.received.append(body)
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class TestOutbox(unittest.TestCase):
+    TEST_DB = "test_outbox.db"
+
+    def setUp(self):
+        self._cleanup()
+        self.engine = create_db_and_tables(self.TEST_DB)
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _Receiver)
+        self.server.received, self.server.statuses = [], []
+        threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_port}/hooks"
+        patcher = patch.object(db, "EVENT_OUTBOX", True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.engine.dispose()
+        self._cleanup()
+
+    def _cleanup(self):
+        if os.path.isfile(self.TEST_DB):
+            os.remove(self.TEST_DB)
+
+    def _worker(self, **options) -> OutboxWorker:
+        worker = OutboxWorker(self.engine, **{"backoff_s": 0, "retain_s": 0, **options})
+        self.addCleanup(worker.stop)
+        return worker
+
+    def _outbox_size(self) -> int:
+        with Session(self.engine) as session:
+            return session.exec(select(func.count()).select_from(OutboxEvent)).one()
+
+    def _walk(self, task_id: int, *states: WorkItemState) -> None:
+        for state in states:
+            transition_work_item(self.engine, task_id, state)
+
+    def test_events_written_with_the_change(self):
+        item = create_work_item(self.engine, "Task")
+        transition_work_item(self.engine, item.task_id, WorkItemState.assigned)
+        with self.assertRaises(RuntimeError):
+            with unit_of_work(self.engine) as session:
+                transition_work_item(session, item.task_id, WorkItemState.executing)
+                raise RuntimeError("crash before commit")
+        with Session(self.engine) as session:
+            rows = list(session.exec(select(OutboxEvent)))
+        self.assertEqual([(r.event, r.task_id) for r in rows], [("on_state_change", item.task_id)])
+        self.assertEqual(json.loads(rows[0].payload)["new_state"], "assigned")
+
+    def test_disabled_writes_nothing(self):
+        with patch.object(db, "EVENT_OUTBOX", False):
+            item = create_work_item(self.engine, "Task")
+            transition_work_item(self.engine, item.task_id, WorkItemState.assigned)
+        self.assertEqual(self._outbox_size(), 0)
+
+    def test_delivers_in_order_and_prunes(self):
+        add_subscriber(self.engine, "sink", self.url)
+        item = create_work_item(self.engine, "Task")
+        self._walk(item.task_id, WorkItemState.assigned, WorkItemState.executing, WorkItemState.completed)
+        self.assertEqual(self._worker().run_once(), 4)
+        received = self.server.received
+        self.assertEqual([e["event"] for e in received], ["on_state_change"] * 3 + ["on_execution_complete"])
+        self.assertEqual([e["payload"]["new_state"] for e in received[:3]], ["assigned", "executing", "completed"])
+        self.assertEqual([e["event_id"] for e in received], sorted(e["event_id"] for e in received))
+        self.assertEqual(self._outbox_size(), 0)
+        self.assertEqual(get_outbox_status(self.engine)[0].pending, 0)
+
+    def test_event_filter_and_offsets_per_subscriber(self):
+        add_subscriber(self.engine, "all", self.url)
+        add_subscriber(self.engine, "done", self.url, events=["on_execution_complete"])
+        item = create_work_item(self.engine, "Task")
+        self._walk(item.task_id, WorkItemState.assigned, WorkItemState.executing, WorkItemState.completed)
+        self._worker().run_once()
+        self.assertEqual(len(self.server.received), 5)
+        statuses = {s.subscriber.name: s for s in get_outbox_status(self.engine)}
+        self.assertEqual(statuses["all"].subscriber.last_event_id, statuses["done"].subscriber.last_event_id)
+        with self.assertRaises(ValueError):
+            add_subscriber(self.engine, "bad", self.url, events=["on_tuesday"])
+
+    def test_idle_polls_take_no_write_lock(self):
+        add_subscriber(self.engine, "sink", self.url)
+        add_subscriber(self.engine, "done", self.url, events=["on_execution_complete"])
+        item = create_work_item(self.engine, "Task")
+        worker = self._worker(retain_s=3600)
+        worker.run_once()
+        transition_work_item(self.engine, item.task_id, WorkItemState.assigned)  # unwanted by "done"
+        self.assertEqual(worker.run_once(), 1)
+
+        writes = []
+
+        def record_writes(conn, cursor, statement, *args):
+            if not statement.lstrip().upper().startswith(("SELECT", "PRAGMA")):
+                writes.append(statement)
+
+        event.listen(self.engine, "before_cursor_execute", record_writes)
+        for _ in range(3):
+            self.assertEqual(worker.run_once(), 0)
+        self.assertEqual(writes, [])
+        self.assertEqual([s.pending for s in get_outbox_status(self.engine)], [0, 0])
+
+        worker.retain_s = 0
+        worker.run_once()
+        self.assertEqual(self._outbox_size(), 0)
+
+    def test_batches(self):
+        add_subscriber(self.engine, "sink", self.url)
+        items = [create_work_item(self.engine, f"Task {n}") for n in range(5)]
+        for item in items:
+            transition_work_item(self.engine, item.task_id, WorkItemState.assigned)
+        worker = self._worker(batch_size=2)
+        self.assertEqual([worker.run_once() for _ in range(4)], [2, 2, 1, 0])
+
+    def test_retry_with_backoff_then_recover(self):
+        add_subscriber(self.engine, "sink", self.url)
+        item = create_work_item(self.engine, "Task")
+        self._walk(item.task_id, WorkItemState.assigned, WorkItemState.executing)
+        self.server.statuses = [503]
+        worker = self._worker(backoff_s=60)
+        self.assertEqual(worker.run_once(), 0)
+        (status,) = get_outbox_status(self.engine)
+        self.assertEqual((status.subscriber.attempts, status.pending), (1, 2))
+        self.assertIn("HTTP 503", status.subscriber.last_error)
+        self.assertEqual(worker.run_once(), 0)  # still backing off
+        with unit_of_work(self.engine) as session:
+            session.execute(update(OutboxSubscriber).values(next_attempt_at=datetime.now(UTC) - timedelta(seconds=1)))
+        self.assertEqual(worker.run_once(), 2)
+        self.assertEqual([e["payload"]["new_state"] for e in self.server.received], ["assigned", "executing"])
+        self.assertIsNone(get_outbox_status(self.engine)[0].subscriber.last_error)
+
+    def test_dead_letter_after_max_attempts(self):
+        add_subscriber(self.engine, "sink", self.url)
+        item = create_work_item(self.engine, "Task")
+        self._walk(item.task_id, WorkItemState.assigned, WorkItemState.executing)
+        self.server.statuses = [500, 500, 500]
+        worker = self._worker(max_attempts=3)
+        for _ in range(3):
+            worker.run_once()
+        (dead,) = get_dead_letters(self.engine, subscriber="sink")
+        self.assertEqual((dead.event, dead.attempts), ("on_state_change", 3))
+        self.assertEqual(json.loads(dead.payload)["new_state"], "assigned")
+        self.assertEqual([e["payload"]["new_state"] for e in self.server.received], ["executing"])
+        self.assertEqual(get_outbox_status(self.engine)[0].dead_letters, 1)
+
+    def test_unreachable_receiver(self):
+        add_subscriber(self.engine, "gone", "http://127.0.0.1:9/hooks")
+        create_work_item(self.engine, "Task")
+        transition_work_item(self.engine, 1, WorkItemState.assigned)
+        self.assertEqual(self._worker().run_once(), 0)
+        self.assertEqual(get_outbox_status(self.engine)[0].subscriber.attempts, 1)
+
+    def test_leased_subscriber_is_skipped(self):
+        add_subscriber(self.engine, "sink", self.url)
+        transition_work_item(self.engine, create_work_item(self.engine, "Task").task_id, WorkItemState.assigned)
+        with unit_of_work(self.engine) as session:
+            session.execute(update(OutboxSubscriber).values(lease_until=datetime.now(UTC) + timedelta(minutes=1)))
+        self.assertEqual(self._worker().run_once(), 0)
+        self.assertEqual(self.server.received, [])
+
+    def test_new_subscriber_starts_at_tail(self):
+        item = create_work_item(self.engine, "Task")
+        transition_work_item(self.engine, item.task_id, WorkItemState.assigned)
+        add_subscriber(self.engine, "late", self.url)
+        add_subscriber(self.engine, "replay", self.url, from_start=True)
+        self._worker().run_once()
+        self.assertEqual(len(self.server.received), 1)
+        self.assertTrue(remove_subscriber(self.engine, "late"))
+        self.assertFalse(remove_subscriber(self.engine, "late"))
+
+    def test_background_thread(self):
+        add_subscriber(self.engine, "sink", self.url)
+        worker = self._worker(poll_interval_s=0.01)
+        worker.start()
+        transition_work_item(self.engine, create_work_item(self.engine, "Task").task_id, WorkItemState.assigned)
+        for _ in range(200):
+            if self.server.received:
+                break
+            threading.Event().wait(0.01)
+        worker.stop(timeout=5)
+        self.assertEqual(len(self.server.received), 1)
+
+    def test_cli(self):
+        from commands.hooks import hooks_status, hooks_subscribe, hooks_worker
+
+        with patch("commands.hooks.create_db_and_tables", return_value=self.engine):
+            with patch("sys.stdout", new_callable=StringIO) as out:
+                hooks_subscribe("sink", self.url, events=["on_state_change"])
+                transition_work_item(self.engine, create_work_item(self.engine, "Task").task_id, WorkItemState.assigned)
+                hooks_worker(once=True)
+                hooks_status()
+        output = out.getvalue()
+        self.assertIn("Subscribed sink", output)
+        self.assertIn("Delivered 1 event(s)", output)
+        self.assertIn("on_state_change", output)
+
+
+if __name__ == "__main__":
+    unittest.main()
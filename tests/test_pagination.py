@@ -0,0 +1,169 @@
+"""Tests for keyset pagination of work items across the library, REST, MCP and CLI."""
+
+import json
+import os
+import unittest
+from datetime import UTC, datetime, timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from config import PAGE_SIZE_DEFAULT, PAGE_SIZE_MAX
+from core.database import (
+    add_repository,
+    create_db_and_tables,
+    create_work_items_bulk,
+    list_work_items_page,
+    update_work_item,
+)
+from models import WorkItemState
+
+
+class TestListWorkItemsPage(unittest.TestCase):
+    TEST_DB = "test_pagination.db"
+
+    def setUp(self):
+        self._cleanup()
+        self.engine = create_db_and_tables(self.TEST_DB)
+
+    def tearDown(self):
+        self.engine.dispose()
+        self._cleanup()
+
+    def _cleanup(self):
+        if os.path.isfile(self.TEST_DB):
+            os.remove(self.TEST_DB)
+
+    def _seed(self, count: int, **fields) -> list[int]:
+        return create_work_items_bulk(self.engine, [{"title": f"Item {n}", **fields} for n in range(count)])
+
+    def _collect(self, **kwargs) -> list[int]:
+        seen, cursor = [], None
+        while True:
+            page = list_work_items_page(self.engine, cursor=cursor, **kwargs)
+            seen.extend(i.task_id for i in page.items)
+            if page.next_cursor is None:
+                return seen
+            cursor = page.next_cursor
+
+    def test_pages_by_task_id(self):
+        task_ids = self._seed(25)
+        first = list_work_items_page(self.engine, limit=10)
+        self.assertEqual([i.task_id for i in first.items], task_ids[:10])
+        self.assertIsNotNone(first.next_cursor)
+        self.assertEqual(self._collect(limit=10), task_ids)
+
+    def test_last_page_has_no_cursor(self):
+        self._seed(10)
+        self.assertIsNone(list_work_items_page(self.engine, limit=10).next_cursor)
+
+    def test_pages_by_updated_at(self):
+        task_ids = self._seed(6)
+        # Touch the oldest items last; they move to the end of the updated_at order.
+        later = datetime.now(UTC) + timedelta(seconds=1)
+        for task_id in task_ids[:2]:
+            update_work_item(self.engine, task_id, updated_at=later)
+        self.assertEqual(self._collect(order_by="updated_at", limit=4), task_ids[2:] + task_ids[:2])
+
+    def test_stable_under_concurrent_inserts(self):
+        task_ids = self._seed(10)
+        page = list_work_items_page(self.engine, limit=5)
+        new_ids = self._seed(3)
+        rest = list_work_items_page(self.engine, limit=100, cursor=page.next_cursor)
+        self.assertEqual([i.task_id for i in page.items + rest.items], task_ids + new_ids)
+
+    def test_filters_apply_across_pages(self):
+        add_repository(self.engine, "alpha")
+        alpha = self._seed(7, repo_name="alpha", state="assigned")
+        self._seed(5)
+        self.assertEqual(self._collect(repo_name="alpha", state=WorkItemState.assigned, limit=3), alpha)
+        self.assertEqual(list_work_items_page(self.engine, repo_name="missing").items, [])
+
+    def test_limit_defaults_and_cap(self):
+        self._seed(PAGE_SIZE_DEFAULT + 1)
+        self.assertEqual(len(list_work_items_page(self.engine).items), PAGE_SIZE_DEFAULT)
+        with patch("core.database.PAGE_SIZE_MAX", 3):
+            self.assertEqual(len(list_work_items_page(self.engine, limit=PAGE_SIZE_MAX).items), 3)
+
+    def test_invalid_cursor_rejected(self):
+        self._seed(3)
+        task_id_cursor = list_work_items_page(self.engine, limit=1).next_cursor
+        for bad in ("not-a-cursor", task_id_cursor):
+            with self.assertRaises(ValueError):
+                list_work_items_page(self.engine, order_by="updated_at", cursor=bad)
+        with self.assertRaises(ValueError):
+            list_work_items_page(self.engine, order_by="title")
+
+
+class TestPaginationInterfaces(unittest.TestCase):
+    TEST_DB = "test_pagination_interfaces.db"
+
+    def setUp(self):
+        self._cleanup()
+        os.environ["FORGEOPS_DB_PATH"] = self.TEST_DB
+        os.environ.pop("API_BEARER_TOKEN", None)
+        import importlib
+
+        import config
+        import core.database
+
+        importlib.reload(config)
+        importlib.reload(core.database)
+        import api as api_mod
+
+        importlib.reload(api_mod)
+        from fastapi.testclient import TestClient
+
+        self.api = api_mod
+        self.client = TestClient(api_mod.app)
+        self.task_ids = core.database.create_work_items_bulk(api_mod.engine, [{"title": f"Item {n}"} for n in range(5)])
+
+    def tearDown(self):
+        self.api.engine.dispose()
+        os.environ.pop("FORGEOPS_DB_PATH", None)
+        self._cleanup()
+
+    def _cleanup(self):
+        if os.path.isfile(self.TEST_DB):
+            os.remove(self.TEST_DB)
+
+    def test_api_next_cursor_header(self):
+        resp = self.client.get("/work-items", params={"limit": 3})
+        self.assertEqual([i["task_id"] for i in resp.json()], self.task_ids[:3])
+        cursor = resp.headers["X-Next-Cursor"]
+        resp = self.client.get("/work-items", params={"limit": 3, "cursor": cursor})
+        self.assertEqual([i["task_id"] for i in resp.json()], self.task_ids[3:])
+        self.assertNotIn("X-Next-Cursor", resp.headers)
+
+    def test_api_rejects_bad_paging_params(self):
+        self.assertEqual(self.client.get("/work-items", params={"cursor": "garbage"}).status_code, 400)
+        self.assertEqual(self.client.get("/work-items", params={"limit": PAGE_SIZE_MAX + 1}).status_code, 422)
+        self.assertEqual(self.client.get("/work-items", params={"order_by": "title"}).status_code, 422)
+
+    def test_mcp_next_cursor(self):
+        import mcp_server
+
+        mcp_server._engine = None
+        try:
+            first = json.loads(mcp_server.forgeops_list_work_items(limit=2, order_by="updated_at"))
+            self.assertEqual(first["count"], 2)
+            second = json.loads(mcp_server.forgeops_list_work_items(limit=10, cursor=first["next_cursor"]))
+            self.assertEqual(second["error"]["code"], "VALIDATION_ERROR")
+            second = json.loads(
+                mcp_server.forgeops_list_work_items(limit=10, order_by="updated_at", cursor=first["next_cursor"])
+            )
+            self.assertEqual([i["task_id"] for i in second["items"]], self.task_ids[2:])
+            self.assertIsNone(second["next_cursor"])
+        finally:
+            mcp_server._engine = None
+
+    def test_cli_prints_next_page_hint(self):
+        from commands.list_issues import list_issues
+
+        with patch("commands.list_issues.create_db_and_tables", return_value=self.api.engine):
+            with patch("sys.stdout", new_callable=StringIO) as out:
+                list_issues(limit=2)
+        self.assertIn("Next page: --cursor", out.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
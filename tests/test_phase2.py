@@ -3,6 +3,10 @@ activity log, attachments, task hierarchy, and session continuity."""
 
 import os
 import unittest
+from datetime import UTC, datetime
+
+from sqlalchemy import event
+from sqlmodel import Session
 
 from core.database import (
     add_repository,
@@ -20,6 +24,8 @@ from core.database import (
     get_children,
     get_current_assignment,
     get_execution_records,
+    get_latest_execution_records,
+    get_review_queue,
     get_reviews,
     get_work_item,
     list_items_by_executor,
@@ -34,6 +40,8 @@ from core.state_engine import (
 )
 from models import (
     ActivityAction,
+    Assignment,
+    ExecutionRecord,
     ExecutionStatus,
     ExecutorType,
     ReviewDecision,
@@ -294,6 +302,48 @@ class TestAssignments(unittest.TestCase):
         bob_items = list_items_by_executor(self.engine, "bob")
         self.assertEqual(len(bob_items), 1)
 
+    def test_reassignment_back_to_original_executor(self):
+        add_repository(self.engine, "repo")
+        item = create_work_item(self.engine, "Round trip", repo_name="repo")
+        other = create_work_item(self.engine, "Still bob's")
+        for executor in ("alice", "bob", "alice"):
+            create_assignment(self.engine, item.task_id, executor, ExecutorType.human)
+        create_assignment(self.engine, other.task_id, "bob", ExecutorType.human)
+
+        alice_items = list_items_by_executor(self.engine, "alice")
+        self.assertEqual([i.task_id for i in alice_items], [item.task_id])
+        self.assertEqual(alice_items[0].repository.name, "repo")
+        self.assertEqual([i.task_id for i in list_items_by_executor(self.engine, "bob")], [other.task_id])
+
+    def test_same_timestamp_assignments_latest_insert_wins(self):
+        item = create_work_item(self.engine, "Tie")
+        stamp = datetime.now(UTC)
+        with Session(self.engine) as session:
+            session.add(
+                Assignment(task_id=item.task_id, executor="alice", executor_type=ExecutorType.human, assigned_at=stamp)
+            )
+            session.add(
+                Assignment(task_id=item.task_id, executor="bob", executor_type=ExecutorType.human, assigned_at=stamp)
+            )
+            session.commit()
+        self.assertEqual(get_current_assignment(self.engine, item.task_id).executor, "bob")
+        self.assertEqual(list_items_by_executor(self.engine, "alice"), [])
+        self.assertEqual(len(list_items_by_executor(self.engine, "bob")), 1)
+
+    def test_list_items_by_executor_is_one_query(self):
+        items = [create_work_item(self.engine, f"Item {n}") for n in range(10)]
+        for item in items:
+            create_assignment(self.engine, item.task_id, "alice", ExecutorType.agent)
+            create_assignment(self.engine, item.task_id, "bob", ExecutorType.agent)
+        statements = []
+        listener = lambda conn, cursor, statement, *rest: statements.append(statement)  # noqa: E731
+        event.listen(self.engine, "before_cursor_execute", listener)
+        try:
+            self.assertEqual(len(list_items_by_executor(self.engine, "bob")), 10)
+        finally:
+            event.remove(self.engine, "before_cursor_execute", listener)
+        self.assertEqual(len(statements), 1)
+
     def test_assignment_logs_activity(self):
         item = create_work_item(self.engine, "Log assign")
         create_assignment(self.engine, item.task_id, "alice", ExecutorType.human, actor="admin")
@@ -340,6 +390,48 @@ class TestExecutionRecords(unittest.TestCase):
         self.assertEqual(records[0].status, ExecutionStatus.failed)
         self.assertEqual(records[1].status, ExecutionStatus.success)
 
+    def test_latest_execution_records_batched(self):
+        retried = create_work_item(self.engine, "Retried")
+        single = create_work_item(self.engine, "Single")
+        idle = create_work_item(self.engine, "No runs")
+        for status in (ExecutionStatus.failed, ExecutionStatus.partial, ExecutionStatus.success):
+            create_execution_record(self.engine, retried.task_id, "agent-1", status)
+        create_execution_record(self.engine, single.task_id, "agent-2", ExecutionStatus.failed)
+
+        statements = []
+        listener = lambda conn, cursor, statement, *rest: statements.append(statement)  # noqa: E731
+        event.listen(self.engine, "before_cursor_execute", listener)
+        try:
+            latest = get_latest_execution_records(self.engine, [retried.task_id, single.task_id, idle.task_id])
+        finally:
+            event.remove(self.engine, "before_cursor_execute", listener)
+        self.assertEqual(len(statements), 1)
+        self.assertEqual(set(latest), {retried.task_id, single.task_id})
+        self.assertEqual(latest[retried.task_id].status, ExecutionStatus.success)
+        self.assertEqual(latest[single.task_id].executor, "agent-2")
+        self.assertEqual(get_latest_execution_records(self.engine, []), {})
+
+    def test_latest_execution_record_same_timestamp_uses_run_id(self):
+        item = create_work_item(self.engine, "Tie")
+        stamp = datetime.now(UTC)
+        with Session(self.engine) as session:
+            for status in (ExecutionStatus.success, ExecutionStatus.failed):
+                session.add(ExecutionRecord(task_id=item.task_id, executor="agent-1", status=status, created_at=stamp))
+            session.commit()
+        latest = get_latest_execution_records(self.engine, [item.task_id])
+        self.assertEqual(latest[item.task_id].status, ExecutionStatus.failed)
+
+    def test_review_queue_pairs_items_with_latest_run(self):
+        waiting = create_work_item(self.engine, "Waiting", state=WorkItemState.awaiting_review)
+        unrun = create_work_item(self.engine, "Never run", state=WorkItemState.awaiting_review)
+        create_work_item(self.engine, "Queued")
+        create_execution_record(self.engine, waiting.task_id, "agent-1", ExecutionStatus.failed)
+        create_execution_record(self.engine, waiting.task_id, "agent-1", ExecutionStatus.success, branch="fix")
+        queue = get_review_queue(self.engine)
+        self.assertEqual([item.task_id for item, _ in queue], [waiting.task_id, unrun.task_id])
+        self.assertEqual(queue[0][1].branch, "fix")
+        self.assertIsNone(queue[1][1])
+
     def test_execution_logs_activity(self):
         item = create_work_item(self.engine, "Log exec")
         create_execution_record(self.engine, item.task_id, "agent-1", ExecutionStatus.success)
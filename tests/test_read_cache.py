@@ -0,0 +1,139 @@
+"""Tests for the in-process read cache — hits, local and cross-process invalidation, and bounds."""
+
+import os
+import subprocess
+import sys
+import unittest
+
+from sqlalchemy import event
+
+import core.database as database
+from core.database import (
+    add_repository,
+    create_db_and_tables,
+    create_work_item,
+    dispose_engines,
+    get_repository,
+    get_work_item,
+    list_work_items,
+    transition_work_item,
+    unit_of_work,
+    update_repository,
+)
+from core.repository_manager import RepositoryManager
+from models import WorkItemState
+
+
+class TestReadCache(unittest.TestCase):
+    TEST_DB = "test_read_cache.db"
+
+    def setUp(self):
+        self._cleanup()
+        self.engine = create_db_and_tables(self.TEST_DB)
+        add_repository(self.engine, "alpha", description="First")
+        self.statements: list[str] = []
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+
+    def tearDown(self):
+        event.remove(self.engine, "before_cursor_execute", self._on_execute)
+        dispose_engines()
+        self._cleanup()
+
+    def _cleanup(self):
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.isfile(self.TEST_DB + suffix):
+                os.remove(self.TEST_DB + suffix)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def _reads(self, table: str) -> int:
+        return sum(1 for s in self.statements if s.startswith("SELECT") and f"FROM {table}" in s)
+
+    def _cache(self) -> "database._ReadCache":
+        return database._read_caches[self.engine]
+
+    def test_repository_lookups_read_once(self):
+        first = get_repository(self.engine, "alpha")
+        second = RepositoryManager(self.engine).get_repository("alpha")
+        list_work_items(self.engine, repo_name="alpha")
+        create_work_item(self.engine, "Task", repo_name="alpha")
+        self.assertEqual(self._reads("repositories"), 1)
+        self.assertEqual((first.name, first.description), ("alpha", "First"))
+        self.assertIsNot(first, second)
+        first.description = "Changed locally"
+        self.assertEqual(get_repository(self.engine, "alpha").description, "First")
+        self.assertIsNone(get_repository(self.engine, "missing"))
+        self.assertIsNone(get_repository(self.engine, "missing"))
+
+    def test_local_writes_invalidate(self):
+        self.assertEqual(get_repository(self.engine, "alpha").description, "First")
+        update_repository(self.engine, "alpha", description="Second")
+        self.assertEqual(get_repository(self.engine, "alpha").description, "Second")
+
+        item = create_work_item(self.engine, "Task", repo_name="alpha")
+        self.assertEqual(get_work_item(self.engine, item.task_id).state, WorkItemState.queued)
+        transition_work_item(self.engine, item.task_id, WorkItemState.assigned)
+        self.assertEqual(get_work_item(self.engine, item.task_id).state, WorkItemState.assigned)
+
+    def test_changes_from_another_process(self):
+        self.assertEqual(get_repository(self.engine, "alpha").description, "First")
+        script = (
+            "from core.database import get_engine, update_repository\n"
+            f"update_repository(get_engine({self.TEST_DB!r}), 'alpha', description='From the CLI')\n"
+        )
+        env = {**os.environ, "PYTHONPATH": os.getcwd()}
+        subprocess.run([sys.executable, "-c", script], env=env, check=True)
+        self.assertEqual(get_repository(self.engine, "alpha").description, "From the CLI")
+
+    def test_units_that_change_repositories_read_their_own_rows(self):
+        get_repository(self.engine, "alpha")
+        with self.assertRaises(RuntimeError):
+            with unit_of_work(self.engine) as session:
+                add_repository(session, "beta")
+                item = create_work_item(session, "Task", repo_name="beta")
+                self.assertIsNotNone(item.repo_id)
+                raise RuntimeError
+        self.assertIsNone(get_repository(self.engine, "beta"))
+        self.assertIsNone(create_work_item(self.engine, "Orphan", repo_name="beta").repo_id)
+
+    def test_work_items_come_back_detached_with_their_repository(self):
+        task_id = create_work_item(self.engine, "Task", repo_name="alpha").task_id
+        self.statements.clear()
+        first = get_work_item(self.engine, task_id)
+        second = get_work_item(self.engine, task_id)
+        self.assertEqual(self._reads("work_items"), 1)
+        self.assertIsNot(first, second)
+        self.assertEqual(second.repository.name, "alpha")
+
+        with unit_of_work(self.engine) as session:
+            attached = get_work_item(session, task_id)
+            self.assertIn(attached, session)
+            attached.title = "Renamed"
+        self.assertEqual(get_work_item(self.engine, task_id).title, "Renamed")
+
+    def test_bounded_and_generation_checked(self):
+        task_ids = [create_work_item(self.engine, f"Task {n}").task_id for n in range(3)]
+        get_work_item(self.engine, task_ids[0])
+        cache = self._cache()
+        cache.item_size = 2
+        for task_id in task_ids:
+            get_work_item(self.engine, task_id)
+        self.assertEqual(list(cache.items), task_ids[1:])
+
+        generation = cache.validate()
+        update_repository(self.engine, "alpha", description="Second")
+        cache.validate()
+        cache.put(cache.repos, "alpha", {"name": "alpha", "description": "Stale"}, generation)
+        self.assertNotIn("alpha", cache.repos)
+
+    def test_dispose_closes_the_cache(self):
+        get_repository(self.engine, "alpha")
+        cache = self._cache()
+        self.engine.dispose()
+        self.assertEqual((cache.repos, cache._watch), ({}, None))
+        self.assertEqual(get_repository(self.engine, "alpha").name, "alpha")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,152 @@
+"""Tests for the atomic repo concurrency guard (concurrency_slots counters under the default policy)."""
+
+import os
+import threading
+import unittest
+
+from sqlmodel import Session, func, select
+
+from core.database import (
+    add_repository,
+    block_work_item,
+    create_db_and_tables,
+    create_work_item,
+    create_work_items_bulk,
+    dispose_engines,
+    get_work_item,
+    transition_work_item,
+    unit_of_work,
+    update_work_item,
+)
+from core.hooks import HookEvent, hooks
+from core.state_engine import RepoConcurrencyError
+from models import WorkItem, WorkItemState
+
+
+class TestRepoGuard(unittest.TestCase):
+    TEST_DB = "test_repo_guard.db"
+
+    def setUp(self):
+        self._cleanup()
+        self.engine = create_db_and_tables(self.TEST_DB)
+        add_repository(self.engine, "repo")
+        self.conflicts = []
+        hooks.subscribe(HookEvent.on_repo_conflict, self.conflicts.append)
+
+    def tearDown(self):
+        hooks.clear()
+        dispose_engines()
+        self._cleanup()
+
+    def _cleanup(self):
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.isfile(self.TEST_DB + suffix):
+                os.remove(self.TEST_DB + suffix)
+
+    def _assigned(self, count: int, repo_name: str = "repo") -> list[int]:
+        return create_work_items_bulk(
+            self.engine, [{"title": f"Item {n}", "repo_name": repo_name, "state": "assigned"} for n in range(count)]
+        )
+
+    def _executing_per_repo(self) -> list[int]:
+        with Session(self.engine) as session:
+            stmt = (
+                select(func.count())
+                .where(WorkItem.state == WorkItemState.executing, WorkItem.repo_id.is_not(None))
+                .group_by(WorkItem.repo_id)
+            )
+            return list(session.exec(stmt))
+
+    def test_update_cannot_bypass_guard(self):
+        first, second = self._assigned(2)
+        transition_work_item(self.engine, first, WorkItemState.executing)
+        with self.assertRaises(RepoConcurrencyError) as ctx:
+            update_work_item(self.engine, second, state=WorkItemState.executing)
+        self.assertEqual(ctx.exception.blocking_task_id, first)
+        self.assertEqual(get_work_item(self.engine, second).state, WorkItemState.assigned)
+        self.assertEqual(len(self.conflicts), 1)
+
+    def test_conflict_handlers_can_write(self):
+        first, second = self._assigned(2)
+        transition_work_item(self.engine, first, WorkItemState.executing)
+        hooks.subscribe(
+            HookEvent.on_repo_conflict, lambda p: block_work_item(self.engine, p["task_id"], "repository busy")
+        )
+        with self.assertRaises(RepoConcurrencyError):
+            with unit_of_work(self.engine) as session:
+                transition_work_item(session, second, WorkItemState.executing)
+                self.assertEqual(self.conflicts, [])  # not while the write lock is held
+        item = get_work_item(self.engine, second)
+        self.assertEqual(
+            (item.state, item.is_blocked, item.blocked_reason), (WorkItemState.assigned, True, "repository busy")
+        )
+        self.assertEqual(len(self.conflicts), 1)
+
+    def test_create_and_bulk_cannot_bypass_guard(self):
+        create_work_item(self.engine, "Running", repo_name="repo", state=WorkItemState.executing)
+        with self.assertRaises(RepoConcurrencyError):
+            create_work_item(self.engine, "Also running", repo_name="repo", state=WorkItemState.executing)
+        with self.assertRaises(ValueError):
+            create_work_items_bulk(self.engine, [{"title": "Bulk", "repo_name": "repo", "state": "executing"}])
+        self.assertEqual(self._executing_per_repo(), [1])
+
+    def test_conflict_leaves_unit_of_work_usable(self):
+        first, second, third = self._assigned(3)
+        with unit_of_work(self.engine) as session:
+            transition_work_item(session, first, WorkItemState.executing)
+            with self.assertRaises(RepoConcurrencyError):
+                transition_work_item(session, second, WorkItemState.executing)
+            transition_work_item(session, third, WorkItemState.queued)
+        self.assertEqual(get_work_item(self.engine, first).state, WorkItemState.executing)
+        self.assertEqual(get_work_item(self.engine, second).state, WorkItemState.assigned)
+        self.assertEqual(get_work_item(self.engine, third).state, WorkItemState.queued)
+
+    def test_upgrade_replaces_unique_index_with_counters(self):
+        first, second = self._assigned(2)
+        transition_work_item(self.engine, first, WorkItemState.executing)
+        with self.engine.begin() as conn:
+            conn.exec_driver_sql("DROP TABLE concurrency_slots")
+            conn.exec_driver_sql(
+                "CREATE UNIQUE INDEX ux_work_items_executing_repo ON work_items (repo_id) WHERE state = 'executing'"
+            )
+            conn.exec_driver_sql("PRAGMA user_version = 11")
+        create_db_and_tables(self.TEST_DB)
+        with self.engine.connect() as conn:
+            indexes = {row[1] for row in conn.exec_driver_sql("PRAGMA index_list(work_items)")}
+        self.assertNotIn("ux_work_items_executing_repo", indexes)
+        # The counter is rebuilt from the item already executing.
+        with self.assertRaises(RepoConcurrencyError) as ctx:
+            transition_work_item(self.engine, second, WorkItemState.executing)
+        self.assertEqual(ctx.exception.blocking_task_id, first)
+
+    def test_concurrent_transitions_execute_once_per_repo(self):
+        repos = [f"stress-{n}" for n in range(4)]
+        for name in repos:
+            add_repository(self.engine, name)
+        task_ids = [task_id for name in repos for task_id in self._assigned(6, name)]
+
+        barrier = threading.Barrier(len(task_ids))
+        outcomes = []
+
+        def worker(task_id: int) -> None:
+            barrier.wait()
+            try:
+                transition_work_item(self.engine, task_id, WorkItemState.executing, actor=f"agent-{task_id}")
+                outcomes.append("ok")
+            except RepoConcurrencyError:
+                outcomes.append("conflict")
+
+        threads = [threading.Thread(target=worker, args=(task_id,)) for task_id in task_ids]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(outcomes.count("ok"), len(repos))
+        self.assertEqual(outcomes.count("conflict"), len(task_ids) - len(repos))
+        self.assertEqual(self._executing_per_repo(), [1] * len(repos))
+        self.assertEqual(len(self.conflicts), len(task_ids) - len(repos))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,162 @@
+"""Tests for get_status_summary and the status views built on it."""
+
+import json
+import os
+import unittest
+
+from sqlalchemy import event
+
+from core.database import (
+    add_repository,
+    block_work_item,
+    create_db_and_tables,
+    create_work_items_bulk,
+    get_status_summary,
+)
+from models import WorkItemState
+
+
+class TestStatusSummary(unittest.TestCase):
+    TEST_DB = "test_status_summary.db"
+
+    def setUp(self):
+        self._cleanup()
+        self.engine = create_db_and_tables(self.TEST_DB)
+
+    def tearDown(self):
+        self.engine.dispose()
+        self._cleanup()
+
+    def _cleanup(self):
+        if os.path.isfile(self.TEST_DB):
+            os.remove(self.TEST_DB)
+
+    def _seed(self):
+        add_repository(self.engine, "alpha")
+        add_repository(self.engine, "beta")
+        return create_work_items_bulk(
+            self.engine,
+            [
+                {"title": "Running", "repo_name": "alpha", "state": "executing"},
+                {"title": "Queued A", "repo_name": "alpha"},
+                {"title": "Queued B", "repo_name": "beta"},
+                {"title": "Review me", "repo_name": "beta", "state": "awaiting_review"},
+                {"title": "Done", "state": "closed"},
+            ],
+        )
+
+    def test_empty_ledger(self):
+        summary = get_status_summary(self.engine)
+        self.assertEqual(summary.total, 0)
+        self.assertEqual(summary.by_state, {})
+        self.assertEqual(summary.executing, [])
+
+    def test_counts(self):
+        task_ids = self._seed()
+        block_work_item(self.engine, task_ids[1], "waiting on infra")
+        summary = get_status_summary(self.engine)
+        self.assertEqual(summary.total, 5)
+        self.assertEqual(summary.by_state, {"executing": 1, "queued": 2, "awaiting_review": 1, "closed": 1})
+        self.assertEqual(
+            summary.by_repo_state,
+            {
+                "alpha": {"executing": 1, "queued": 1},
+                "beta": {"queued": 1, "awaiting_review": 1},
+                None: {"closed": 1},
+            },
+        )
+        self.assertEqual(list(summary.by_repo_state), ["alpha", "beta", None])
+        self.assertEqual(summary.blocked_count, 1)
+
+    def test_lists_only_status_rows(self):
+        task_ids = self._seed()
+        block_work_item(self.engine, task_ids[0], "flaky CI")
+        summary = get_status_summary(self.engine)
+        self.assertEqual([i.task_id for i in summary.executing], [task_ids[0]])
+        self.assertEqual([i.task_id for i in summary.awaiting_review], [task_ids[3]])
+        (blocked,) = summary.blocked
+        self.assertEqual(blocked.task_id, task_ids[0])
+        self.assertEqual(blocked.blocked_reason, "flaky CI")
+        self.assertEqual(blocked.repository, "alpha")
+        self.assertEqual(blocked.state, WorkItemState.executing)
+
+    def test_query_count_independent_of_ledger_size(self):
+        self._seed()
+        create_work_items_bulk(self.engine, [{"title": f"Bulk {n}", "state": "closed"} for n in range(500)])
+        statements = []
+        listener = lambda conn, cursor, statement, *rest: statements.append(statement)  # noqa: E731
+        event.listen(self.engine, "before_cursor_execute", listener)
+        try:
+            summary = get_status_summary(self.engine)
+        finally:
+            event.remove(self.engine, "before_cursor_execute", listener)
+        self.assertEqual(summary.total, 505)
+        self.assertEqual(len(statements), 2)
+
+
+class TestStatusInterfaces(unittest.TestCase):
+    TEST_DB = "test_status_interfaces.db"
+
+    def setUp(self):
+        self._cleanup()
+        os.environ["FORGEOPS_DB_PATH"] = self.TEST_DB
+        os.environ.pop("API_BEARER_TOKEN", None)
+        import importlib
+
+        import config
+        import core.database
+
+        importlib.reload(config)
+        importlib.reload(core.database)
+        import api as api_mod
+
+        importlib.reload(api_mod)
+        from fastapi.testclient import TestClient
+
+        self.api = api_mod
+        self.client = TestClient(api_mod.app)
+        core.database.add_repository(api_mod.engine, "alpha")
+        self.task_ids = core.database.create_work_items_bulk(
+            api_mod.engine,
+            [{"title": "Running", "repo_name": "alpha", "state": "executing"}, {"title": "Idle"}],
+        )
+        core.database.block_work_item(api_mod.engine, self.task_ids[1], "needs input")
+
+    def tearDown(self):
+        self.api.engine.dispose()
+        os.environ.pop("FORGEOPS_DB_PATH", None)
+        self._cleanup()
+
+    def _cleanup(self):
+        if os.path.isfile(self.TEST_DB):
+            os.remove(self.TEST_DB)
+
+    def _check(self, data: dict):
+        self.assertEqual(data["total"], 2)
+        self.assertEqual(data["blocked_count"], 1)
+        self.assertEqual(
+            data["by_repo"],
+            [
+                {"repository": "alpha", "by_state": {"executing": 1}},
+                {"repository": None, "by_state": {"queued": 1}},
+            ],
+        )
+        self.assertEqual(data["executing"][0]["repository"], "alpha")
+        self.assertEqual(data["blocked"][0]["blocked_reason"], "needs input")
+        self.assertEqual(data["awaiting_review"], [])
+
+    def test_api_status(self):
+        self._check(self.client.get("/status").json())
+
+    def test_mcp_status(self):
+        import mcp_server
+
+        mcp_server._engine = None
+        try:
+            self._check(json.loads(mcp_server.forgeops_status()))
+        finally:
+            mcp_server._engine = None
+
+
+if __name__ == "__main__":
+    unittest.main()
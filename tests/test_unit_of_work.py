@@ -0,0 +1,309 @@
+"""Tests for the unit of work — one transaction, one commit per ledger operation."""
+
+import os
+import unittest
+
+from sqlalchemy import event
+from sqlmodel import Session, select
+
+from core.database import (
+    add_repository,
+    block_work_item,
+    create_assignment,
+    create_db_and_tables,
+    create_execution_record,
+    create_review,
+    create_work_item,
+    fast_track_work_item,
+    get_activity_log,
+    get_work_item,
+    list_work_items,
+    transition_work_item,
+    unit_of_work,
+)
+from core.hooks import HookEvent, hooks
+from core.state_engine import InvalidTransitionError, RepoConcurrencyError
+from models import ActivityLog, ExecutionStatus, ExecutorType, ReviewDecision, WorkItem, WorkItemState
+
+
+class TestUnitOfWork(unittest.TestCase):
+    TEST_DB = "test_unit_of_work.db"
+
+    def setUp(self):
+        self._cleanup()
+        self.engine = create_db_and_tables(self.TEST_DB)
+        self.commits = 0
+        self.statements: list[str] = []
+        event.listen(self.engine, "commit", self._on_commit)
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        hooks.clear()
+
+    def tearDown(self):
+        hooks.clear()
+        event.remove(self.engine, "commit", self._on_commit)
+        event.remove(self.engine, "before_cursor_execute", self._on_execute)
+        self.engine.dispose()
+        self._cleanup()
+
+    def _cleanup(self):
+        if os.path.isfile(self.TEST_DB):
+            os.remove(self.TEST_DB)
+
+    def _on_commit(self, conn):
+        self.commits += 1
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def _reset_counters(self):
+        self.commits = 0
+        self.statements = []
+
+    def _writes(self) -> list[str]:
+        return [s for s in self.statements if s.split()[0] in ("INSERT", "UPDATE", "DELETE")]
+
+    # --- Commit and query budgets per operation -------------------------------
+
+    def test_create_work_item_single_commit(self):
+        add_repository(self.engine, "repo")
+        self._reset_counters()
+        item = create_work_item(self.engine, "Task", repo_name="repo")
+        self.assertEqual(self.commits, 1)
+        # BEGIN, repo lookup, item insert, activity insert, ledger version upsert
+        self.assertEqual(len(self.statements), 5)
+        self.assertEqual(len(self._writes()), 3)
+        self.assertIsNotNone(item.task_id)
+        self.assertEqual(item.title, "Task")  # usable without a refresh
+
+    def test_transition_single_commit(self):
+        item = create_work_item(self.engine, "Task")
+        self._reset_counters()
+        updated = transition_work_item(self.engine, item.task_id, WorkItemState.assigned)
+        self.assertEqual(self.commits, 1)
+        self.assertEqual(len(self.statements), 5)  # BEGIN, load, update, activity insert, version upsert
+        self.assertEqual(updated.state, WorkItemState.assigned)
+
+    def test_transition_to_executing_adds_only_slot_and_lease_writes(self):
+        add_repository(self.engine, "repo")
+        item = create_work_item(self.engine, "Task", repo_name="repo")
+        transition_work_item(self.engine, item.task_id, WorkItemState.assigned)
+        self._reset_counters()
+        transition_work_item(self.engine, item.task_id, WorkItemState.executing)
+        self.assertEqual(self.commits, 1)
+        # the 5 above, the repo's policy and name (shared with the hook payload), the
+        # concurrency slot read and upsert, and the execution lease insert
+        self.assertEqual(len(self.statements), 9)
+
+    def test_block_single_commit(self):
+        item = create_work_item(self.engine, "Task")
+        self._reset_counters()
+        block_work_item(self.engine, item.task_id, "waiting")
+        self.assertEqual(self.commits, 1)
+        self.assertEqual(len(self.statements), 5)
+
+    def test_child_records_single_commit(self):
+        item = create_work_item(self.engine, "Task")
+        ops = (
+            lambda: create_assignment(self.engine, item.task_id, "alice", ExecutorType.agent),
+            lambda: create_execution_record(self.engine, item.task_id, "alice", ExecutionStatus.success),
+            lambda: create_review(self.engine, item.task_id, "bob", ReviewDecision.accepted),
+        )
+        for op in ops:
+            self._reset_counters()
+            op()
+            self.assertEqual(self.commits, 1)
+            # BEGIN, row insert, activity insert, version upsert, and the item read for a hook payload
+            self.assertEqual(len(self.statements), 4 if op is ops[1] else 5)
+
+    def test_fast_track_single_commit(self):
+        item = create_work_item(self.engine, "Task")
+        self._reset_counters()
+        fast_track_work_item(self.engine, item.task_id, WorkItemState.completed)
+        self.assertEqual(self.commits, 1)
+
+    def test_fast_track_statements_independent_of_path_length(self):
+        add_repository(self.engine, "repo")
+        short = create_work_item(self.engine, "Short", repo_name="repo")
+        long = create_work_item(self.engine, "Long", repo_name="repo")
+        self._reset_counters()
+        fast_track_work_item(self.engine, short.task_id, WorkItemState.assigned)
+        one_step = len(self.statements)
+        self._reset_counters()
+        fast_track_work_item(self.engine, long.task_id, WorkItemState.accepted)
+        # One extra read: the concurrency slots for passing through executing
+        self.assertEqual(len(self.statements), one_step + 1)
+        self.assertEqual(len(self._writes()), 3)  # item update, batched activity insert, version upsert
+
+    def test_fast_track_logs_each_step_in_order(self):
+        item = create_work_item(self.engine, "Task")
+        fast_track_work_item(self.engine, item.task_id, WorkItemState.awaiting_review, actor="agent")
+        log = get_activity_log(self.engine, task_id=item.task_id)
+        self.assertEqual(
+            [e.detail for e in reversed(log[:4])],
+            ["queued → assigned", "assigned → executing", "executing → completed", "completed → awaiting_review"],
+        )
+        self.assertEqual({e.actor for e in log[:4]}, {"agent"})
+
+    def test_fast_track_hooks_delivered_as_one_ordered_batch(self):
+        batches = []
+        hooks.subscribe_batch(batches.append)
+        item = create_work_item(self.engine, "Task")
+        batches.clear()
+        fast_track_work_item(self.engine, item.task_id, WorkItemState.completed)
+        (batch,) = batches
+        self.assertEqual(
+            [(e.value, p.get("new_state")) for e, p in batch],
+            [
+                ("on_state_change", "assigned"),
+                ("on_state_change", "executing"),
+                ("on_state_change", "completed"),
+                ("on_execution_complete", None),
+            ],
+        )
+
+    def test_fast_track_through_busy_repo_rejected(self):
+        add_repository(self.engine, "repo")
+        running = create_work_item(self.engine, "Running", repo_name="repo", state=WorkItemState.executing)
+        item = create_work_item(self.engine, "Task", repo_name="repo")
+        conflicts = []
+        hooks.subscribe(HookEvent.on_repo_conflict, conflicts.append)
+        with self.assertRaises(RepoConcurrencyError):
+            fast_track_work_item(self.engine, item.task_id, WorkItemState.completed)
+        self.assertEqual(get_work_item(self.engine, item.task_id).state, WorkItemState.queued)
+        self.assertEqual(len(conflicts), 1)
+        self.assertIn(f"WI-{running.task_id}", conflicts[0]["error"])
+
+    # --- Grouping and atomicity -----------------------------------------------
+
+    def test_operations_share_one_commit(self):
+        item = create_work_item(self.engine, "Task")
+        self._reset_counters()
+        with unit_of_work(self.engine) as session:
+            create_assignment(session, item.task_id, "alice", ExecutorType.agent)
+            transition_work_item(session, item.task_id, WorkItemState.assigned)
+            transition_work_item(session, item.task_id, WorkItemState.executing)
+        self.assertEqual(self.commits, 1)
+        self.assertEqual(get_work_item(self.engine, item.task_id).state, WorkItemState.executing)
+
+    def test_failure_rolls_back_row_and_activity(self):
+        item = create_work_item(self.engine, "Task")
+        with self.assertRaises(InvalidTransitionError):
+            with unit_of_work(self.engine) as session:
+                transition_work_item(session, item.task_id, WorkItemState.assigned)
+                transition_work_item(session, item.task_id, WorkItemState.closed)
+                transition_work_item(session, item.task_id, WorkItemState.executing)
+        self.assertEqual(get_work_item(self.engine, item.task_id).state, WorkItemState.queued)
+        self.assertEqual(len(get_activity_log(self.engine, task_id=item.task_id)), 1)  # just "created"
+
+    def test_activity_committed_with_row(self):
+        with unit_of_work(self.engine) as session:
+            item = create_work_item(session, "Task")
+            pending = session.exec(select(ActivityLog).where(ActivityLog.task_id == item.task_id)).all()
+            self.assertEqual(len(pending), 1)
+        with Session(self.engine) as session:
+            self.assertEqual(len(session.exec(select(WorkItem)).all()), 1)
+            self.assertEqual(len(session.exec(select(ActivityLog)).all()), 1)
+
+    def test_reads_join_the_unit(self):
+        with unit_of_work(self.engine) as session:
+            create_work_item(session, "Uncommitted")
+            self.assertEqual(len(list_work_items(session)), 1)
+
+    # --- Hooks ----------------------------------------------------------------
+
+    def test_hooks_fire_after_commit_in_order(self):
+        seen = []
+        hooks.subscribe(HookEvent.on_state_change, lambda p: seen.append((p["new_state"], self.commits)))
+        item = create_work_item(self.engine, "Task")
+        self._reset_counters()
+        with unit_of_work(self.engine) as session:
+            transition_work_item(session, item.task_id, WorkItemState.assigned)
+            transition_work_item(session, item.task_id, WorkItemState.executing)
+            self.assertEqual(seen, [])
+        self.assertEqual(seen, [("assigned", 1), ("executing", 1)])
+
+    def test_hooks_dropped_on_rollback(self):
+        seen = []
+        hooks.subscribe(HookEvent.on_state_change, lambda p: seen.append(p))
+        item = create_work_item(self.engine, "Task")
+        with self.assertRaises(RuntimeError):
+            with unit_of_work(self.engine) as session:
+                transition_work_item(session, item.task_id, WorkItemState.assigned)
+                raise RuntimeError("abort")
+        self.assertEqual(seen, [])
+
+
+class TestRequestScopedSessions(unittest.TestCase):
+    """API requests and MCP tool calls each commit exactly once."""
+
+    TEST_DB = "test_uow_requests.db"
+
+    def setUp(self):
+        self._cleanup()
+        os.environ["FORGEOPS_DB_PATH"] = self.TEST_DB
+        os.environ.pop("API_BEARER_TOKEN", None)
+        import importlib
+
+        import config
+        import core.database
+
+        importlib.reload(config)
+        importlib.reload(core.database)
+        import api as api_mod
+
+        importlib.reload(api_mod)
+        from fastapi.testclient import TestClient
+
+        self.api = api_mod
+        self.client = TestClient(api_mod.app)
+        self.commits = 0
+        event.listen(api_mod.engine, "commit", self._on_commit)
+
+    def tearDown(self):
+        event.remove(self.api.engine, "commit", self._on_commit)
+        self.api.engine.dispose()
+        os.environ.pop("FORGEOPS_DB_PATH", None)
+        self._cleanup()
+
+    def _cleanup(self):
+        if os.path.isfile(self.TEST_DB):
+            os.remove(self.TEST_DB)
+
+    def _on_commit(self, conn):
+        self.commits += 1
+
+    def test_api_mutations_commit_once(self):
+        self.client.post("/repositories", json={"name": "repo"})
+        self.commits = 0
+        task_id = self.client.post("/work-items", json={"title": "T", "repo_name": "repo"}).json()["task_id"]
+        self.assertEqual(self.commits, 1)
+        self.commits = 0
+        resp = self.client.post(f"/work-items/{task_id}/transition", json={"state": "assigned"})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(self.commits, 1)
+
+    def test_api_failed_request_commits_nothing(self):
+        task_id = self.client.post("/work-items", json={"title": "T"}).json()["task_id"]
+        self.commits = 0
+        resp = self.client.post(f"/work-items/{task_id}/transition", json={"state": "accepted"})
+        self.assertEqual(resp.status_code, 409)
+        self.assertEqual(self.commits, 0)
+
+    def test_mcp_tool_commits_once(self):
+        import json
+
+        import mcp_server
+
+        mcp_server._engine = None
+        try:
+            item = json.loads(mcp_server.forgeops_create_work_item("T"))["item"]
+            self.commits = 0
+            result = json.loads(mcp_server.forgeops_fast_track(item["task_id"], "completed"))
+            self.assertTrue(result["success"])
+            self.assertEqual(self.commits, 1)
+        finally:
+            mcp_server._engine = None
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,215 @@
+"""Tests for compiled transition tables and per-repository workflows."""
+
+import json
+import os
+import unittest
+from io import StringIO
+from unittest.mock import patch
+
+from core.database import (
+    WorkItemFilter,
+    add_repository,
+    bulk_transition,
+    create_db_and_tables,
+    create_work_item,
+    fast_track_work_item,
+    get_activity_log,
+    get_repository,
+    transition_work_item,
+    unit_of_work,
+    update_repository,
+)
+from core.state_engine import (
+    DEFAULT_WORKFLOW,
+    TRANSITIONS,
+    WORKFLOW_PRESETS,
+    CompiledWorkflow,
+    InvalidTransitionError,
+    compile_workflow,
+    fast_track_transition,
+    normalize_workflow,
+)
+from models import WorkItemState
+
+S = WorkItemState
+
+
+class TestCompiledWorkflow(unittest.TestCase):
+    def test_default_matches_transitions(self):
+        for from_state in WorkItemState:
+            self.assertEqual(DEFAULT_WORKFLOW.allowed(from_state), TRANSITIONS[from_state])
+            for to_state in WorkItemState:
+                self.assertEqual(from_state in DEFAULT_WORKFLOW.sources(to_state), to_state in TRANSITIONS[from_state])
+
+    def test_paths_are_shortest_and_valid(self):
+        for workflow in map(compile_workflow, [None, *WORKFLOW_PRESETS]):
+            for from_state in WorkItemState:
+                for to_state in workflow.reachable(from_state):
+                    path = workflow.path(from_state, to_state)
+                    self.assertEqual(path[-1], to_state)
+                    for old, new in zip((from_state, *path), path):
+                        self.assertTrue(workflow.allows(old, new))
+        self.assertEqual(
+            fast_track_transition(S.queued, S.accepted),
+            [S.assigned, S.executing, S.completed, S.awaiting_review, S.accepted],
+        )
+        self.assertEqual(fast_track_transition(S.queued, S.queued), [])
+
+    def test_unreachable(self):
+        self.assertIsNone(DEFAULT_WORKFLOW.path(S.closed, S.queued))
+        self.assertEqual(DEFAULT_WORKFLOW.reachable(S.closed), frozenset())
+        with self.assertRaises(InvalidTransitionError):
+            fast_track_transition(S.closed, S.queued)
+
+    def test_presets(self):
+        no_review = compile_workflow("no_review")
+        self.assertEqual(no_review.path(S.queued, S.accepted), (S.assigned, S.executing, S.completed, S.accepted))
+        review_required = compile_workflow("review_required")
+        self.assertFalse(any(review_required.allows(state, S.closed) for state in WorkItemState if state != S.accepted))
+        self.assertIn(S.awaiting_review, review_required.path(S.queued, S.closed))
+
+    def test_compiled_once_per_definition(self):
+        definition = normalize_workflow({"queued": ["closed"]})
+        self.assertIs(compile_workflow(definition), compile_workflow(definition))
+        self.assertIsNot(compile_workflow(definition), compile_workflow(normalize_workflow({"queued": ["assigned"]})))
+
+    def test_normalize(self):
+        self.assertIsNone(normalize_workflow("default"))
+        self.assertIsNone(normalize_workflow(None))
+        self.assertEqual(normalize_workflow("no_review"), "no_review")
+        stored = normalize_workflow('{"assigned": "closed", "queued": ["closed", "assigned"]}')
+        self.assertEqual(json.loads(stored)["queued"], ["assigned", "closed"])
+        self.assertEqual(CompiledWorkflow({S.queued: {S.closed}}).to_dict()["assigned"], [])
+        for bad in ("sometimes_review", '{"queued": ["nowhere"]}', '["queued"]', {"limbo": []}):
+            with self.subTest(definition=bad):
+                with self.assertRaises(ValueError):
+                    normalize_workflow(bad)
+
+
+class TestRepositoryWorkflows(unittest.TestCase):
+    TEST_DB = "test_workflows.db"
+
+    def setUp(self):
+        self._cleanup()
+        self.engine = create_db_and_tables(self.TEST_DB)
+        add_repository(self.engine, "fast")
+        add_repository(self.engine, "strict")
+        add_repository(self.engine, "plain")
+        update_repository(self.engine, "fast", workflow="no_review")
+        update_repository(self.engine, "strict", workflow="review_required")
+
+    def tearDown(self):
+        self.engine.dispose()
+        self._cleanup()
+
+    def _cleanup(self):
+        if os.path.isfile(self.TEST_DB):
+            os.remove(self.TEST_DB)
+
+    def _completed(self, repo_name: str) -> int:
+        item = create_work_item(self.engine, "Task", repo_name=repo_name)
+        fast_track_work_item(self.engine, item.task_id, S.completed)
+        return item.task_id
+
+    def test_transition_follows_repo_workflow(self):
+        fast, plain = self._completed("fast"), self._completed("plain")
+        self.assertEqual(transition_work_item(self.engine, fast, S.accepted).state, S.accepted)
+        with self.assertRaises(InvalidTransitionError) as ctx:
+            transition_work_item(self.engine, plain, S.accepted)
+        self.assertIn("awaiting_review", str(ctx.exception))
+
+    def test_strict_repo_has_no_shortcut_to_closed(self):
+        item = create_work_item(self.engine, "Task", repo_name="strict")
+        with self.assertRaises(InvalidTransitionError):
+            transition_work_item(self.engine, item.task_id, S.closed)
+        moved = fast_track_work_item(self.engine, item.task_id, S.closed)
+        self.assertEqual(moved.state, S.closed)
+
+    def test_fast_track_uses_repo_paths(self):
+        item = create_work_item(self.engine, "Task", repo_name="fast")
+        fast_track_work_item(self.engine, item.task_id, S.accepted)
+        steps = [entry.detail for entry in reversed(get_activity_log(self.engine, task_id=item.task_id))]
+        self.assertIn("completed → accepted", steps)
+        self.assertNotIn("completed → awaiting_review", steps)
+
+    def test_bulk_transition_checks_each_repo(self):
+        task_ids = [self._completed(name) for name in ("fast", "plain", "strict")]
+        result = bulk_transition(self.engine, WorkItemFilter(task_ids=task_ids), S.accepted)
+        self.assertEqual(result.updated, [task_ids[0]])
+        self.assertEqual(sorted(result.failed), task_ids[1:])
+
+    def test_workflow_change_takes_effect_in_the_same_unit(self):
+        plain = self._completed("plain")
+        with unit_of_work(self.engine) as session:
+            with self.assertRaises(InvalidTransitionError):
+                transition_work_item(session, plain, S.accepted)
+            update_repository(session, "plain", workflow="no_review")
+            transition_work_item(session, plain, S.accepted)
+        self.assertEqual(get_repository(self.engine, "plain").workflow, "no_review")
+
+    def test_custom_workflow(self):
+        update_repository(self.engine, "plain", workflow={"queued": ["closed"]})
+        item = create_work_item(self.engine, "Task", repo_name="plain")
+        with self.assertRaises(InvalidTransitionError):
+            transition_work_item(self.engine, item.task_id, S.assigned)
+        transition_work_item(self.engine, item.task_id, S.closed)
+        with self.assertRaises(ValueError):
+            update_repository(self.engine, "plain", workflow="sometimes_review")
+        update_repository(self.engine, "plain", workflow="default")
+        self.assertIsNone(get_repository(self.engine, "plain").workflow)
+
+    def test_cli_update_repo(self):
+        from commands.update_repo import update_repo
+
+        with patch("commands.update_repo.create_db_and_tables", return_value=self.engine):
+            with patch("sys.stdout", new_callable=StringIO) as out:
+                update_repo("plain", workflow="no_review")
+                update_repo("plain", workflow="nope")
+        self.assertIn("Unknown workflow", out.getvalue())
+        self.assertEqual(get_repository(self.engine, "plain").workflow, "no_review")
+
+
+class TestWorkflowApi(unittest.TestCase):
+    TEST_DB = "test_workflows_api.db"
+
+    def setUp(self):
+        self._cleanup()
+        os.environ["FORGEOPS_DB_PATH"] = self.TEST_DB
+        os.environ.pop("API_BEARER_TOKEN", None)
+        import importlib
+
+        import config
+        import core.database
+
+        importlib.reload(config)
+        importlib.reload(core.database)
+        import api as api_mod
+
+        importlib.reload(api_mod)
+        from fastapi.testclient import TestClient
+
+        self.api = api_mod
+        self.client = TestClient(api_mod.app)
+        core.database.add_repository(api_mod.engine, "alpha")
+
+    def tearDown(self):
+        self.api.engine.dispose()
+        os.environ.pop("FORGEOPS_DB_PATH", None)
+        self._cleanup()
+
+    def _cleanup(self):
+        if os.path.isfile(self.TEST_DB):
+            os.remove(self.TEST_DB)
+
+    def test_patch_workflow(self):
+        resp = self.client.patch("/repositories/alpha", json={"workflow": {"queued": ["closed"]}})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(json.loads(resp.json()["workflow"])["queued"], ["closed"])
+        resp = self.client.patch("/repositories/alpha", json={"workflow": "no_review"})
+        self.assertEqual(resp.json()["workflow"], "no_review")
+        resp = self.client.patch("/repositories/alpha", json={"workflow": {"queued": ["limbo"]}})
+        self.assertEqual(resp.status_code, 422)
+
+
+if __name__ == "__main__":
+    unittest.main()